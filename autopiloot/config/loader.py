@@ -4,8 +4,13 @@ Loads and validates settings from settings.yaml.
 """
 
 import os
+import sys
+import copy
+import time
+import types
+import threading
 import yaml
-from typing import TypedDict, List, Dict, Optional, Union, Literal
+from typing import TypedDict, List, Dict, Optional, Union, Literal, Any
 from pathlib import Path
 
 # Define VideoStatus locally to avoid circular imports
@@ -100,6 +105,15 @@ class ConfigValidationError(Exception):
     pass
 
 
+# Default settings.yaml location (same directory as this file)
+DEFAULT_CONFIG_PATH = Path(__file__).parent / "settings.yaml"
+
+# Minimum seconds between mtime checks of the cached config snapshot
+SNAPSHOT_MTIME_CHECK_INTERVAL_SEC = 1.0
+
+_MISSING = object()
+
+
 def _validate_config(config: dict) -> None:
     """
     Validate configuration values according to task requirements.
@@ -282,8 +296,7 @@ def load_app_config(config_path: Optional[str] = None) -> AppConfig:
     
     if config_path is None:
         # Default to settings.yaml in the same directory as this file
-        config_dir = Path(__file__).parent
-        config_path = config_dir / "settings.yaml"
+        config_path = DEFAULT_CONFIG_PATH
     
     config_path = Path(config_path)
     
@@ -513,9 +526,169 @@ def get_orchestrator_max_retries_per_video(config: AppConfig) -> int:
     return config.get("orchestrator", {}).get("policies", {}).get("max_retries_per_video", 3)
 
 
+class ConfigSnapshot:
+    """
+    Immutable, process-wide view of a validated settings.yaml.
+
+    Holds the parsed configuration together with a flattened dotted-path index
+    (every nested dict key, e.g. "rag.opensearch.timeout_ms") so lookups are a
+    single dict access instead of a file read, YAML parse and validation.
+    Container values are deep-copied on the way out so callers can never
+    mutate the shared snapshot.
+    """
+
+    __slots__ = ("path", "mtime_ns", "size", "loaded_at", "_config", "_index")
+
+    def __init__(self, path: Path, mtime_ns: int, size: int, config: dict):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.loaded_at = time.time()
+        self._config = config
+        self._index = _build_dotted_index(config)
+
+    def get(self, key_path: str, default=None):
+        """
+        Get a configuration value by dotted path.
+
+        Args:
+            key_path: Dot-separated path (e.g., "rag.cache.backend")
+            default: Default value if key is not found
+
+        Returns:
+            Configuration value (copied if it is a dict or list) or default
+        """
+        value = self._index.get(key_path, _MISSING)
+        if value is _MISSING:
+            return default
+        if isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
+
+    def __contains__(self, key_path: str) -> bool:
+        return key_path in self._index
+
+    def as_dict(self) -> AppConfig:
+        """Return a deep copy of the full configuration."""
+        return copy.deepcopy(self._config)
+
+    def matches(self, path: Path, mtime_ns: int, size: int) -> bool:
+        """Check whether this snapshot was loaded from the given file state."""
+        return self.path == path and self.mtime_ns == mtime_ns and self.size == size
+
+
+def _build_dotted_index(config: dict) -> Dict[str, Any]:
+    """
+    Flatten nested dicts into a {dotted.path: value} index.
+
+    Only string keys without dots are indexed, mirroring the key.split('.')
+    traversal used by get_config_value so both resolve identically.
+    """
+    index: Dict[str, Any] = {}
+    stack = [("", config)]
+
+    while stack:
+        prefix, node = stack.pop()
+        for key, value in node.items():
+            if not isinstance(key, str) or "." in key:
+                continue
+            path = f"{prefix}.{key}" if prefix else key
+            index[path] = value
+            if isinstance(value, dict):
+                stack.append((path, value))
+
+    return index
+
+
+_snapshot: Optional[ConfigSnapshot] = None
+_snapshot_checked_at = 0.0
+_snapshot_lock = threading.Lock()
+
+
+def get_config_snapshot(force_reload: bool = False) -> ConfigSnapshot:
+    """
+    Get the cached configuration snapshot, reloading it when settings.yaml changes.
+
+    The file's mtime/size is checked at most every SNAPSHOT_MTIME_CHECK_INTERVAL_SEC
+    seconds; a change triggers a full load_app_config() (parse + validation).
+
+    Args:
+        force_reload: Reload from disk even if the file is unchanged
+
+    Returns:
+        Current ConfigSnapshot
+
+    Raises:
+        ConfigValidationError: If configuration is invalid
+        FileNotFoundError: If config file doesn't exist
+        yaml.YAMLError: If YAML parsing fails
+    """
+    global _snapshot, _snapshot_checked_at
+
+    snapshot = _snapshot
+    now = time.monotonic()
+    if (
+        snapshot is not None
+        and not force_reload
+        and snapshot.path == Path(DEFAULT_CONFIG_PATH)
+        and now - _snapshot_checked_at < SNAPSHOT_MTIME_CHECK_INTERVAL_SEC
+    ):
+        return snapshot
+
+    with _snapshot_lock:
+        config_path = Path(DEFAULT_CONFIG_PATH)
+        if not config_path.exists():
+            raise FileNotFoundError(f"Configuration file not found: {config_path}")
+
+        stat = config_path.stat()
+        snapshot = _snapshot
+        if not force_reload and snapshot is not None and snapshot.matches(config_path, stat.st_mtime_ns, stat.st_size):
+            _snapshot_checked_at = now
+            return snapshot
+
+        snapshot = ConfigSnapshot(config_path, stat.st_mtime_ns, stat.st_size, load_app_config(config_path))
+        _snapshot = snapshot
+        _snapshot_checked_at = now
+        return snapshot
+
+
+def _invalidate_snapshot() -> None:
+    """Drop the cached snapshot held by this module instance."""
+    global _snapshot, _snapshot_checked_at
+    with _snapshot_lock:
+        _snapshot = None
+        _snapshot_checked_at = 0.0
+
+
+def reload_config() -> ConfigSnapshot:
+    """
+    Explicitly reload settings.yaml and replace the cached snapshot.
+
+    This module is reachable both as ``config.loader`` and, through sys.path
+    manipulation, as a top-level ``loader``; every imported copy is invalidated
+    so all callers see the new configuration.
+
+    Returns:
+        Freshly loaded ConfigSnapshot
+    """
+    this_file = os.path.realpath(__file__)
+    for module_name in ("loader", "config.loader"):
+        module = sys.modules.get(module_name)
+        if not isinstance(module, types.ModuleType) or module is sys.modules.get(__name__):
+            continue
+        module_file = getattr(module, "__file__", None)
+        if module_file and os.path.realpath(module_file) == this_file:
+            module._invalidate_snapshot()
+
+    return get_config_snapshot(force_reload=True)
+
+
 def get_config_value(key_path: str, default=None):
     """
     Get a nested configuration value using dot notation.
+
+    Served from the cached ConfigSnapshot (O(1) lookup); settings.yaml is only
+    re-read when its mtime changes or reload_config() is called.
     
     Args:
         key_path: Dot-separated path to the configuration value (e.g., "scraper.handles")
@@ -524,17 +697,7 @@ def get_config_value(key_path: str, default=None):
     Returns:
         Configuration value or default
     """
-    config = load_app_config()
-    keys = key_path.split('.')
-    value = config
-    
-    for key in keys:
-        if isinstance(value, dict) and key in value:
-            value = value[key]
-        else:
-            return default
-    
-    return value
+    return get_config_snapshot().get(key_path, default)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,275 @@
+"""
+Cached YouTube handle → channel resolution for Autopiloot Agency.
+
+Resolving a handle through search().list costs 100 quota units plus a
+channels().list per candidate. resolve_handles() avoids that for known
+handles:
+- In-process cache of resolved handles
+- Firestore `channels` documents written by SaveChannelMapping, looked up
+  for all handles at once by their lowercased handle_keys (or exact handles
+  for documents saved before handle_keys existed)
+- Mappings older than the TTL are revalidated together with one
+  channels().list(id=...) call per 50 channels; a channel whose customUrl
+  no longer matches the handle is reported as a stale mapping
+- Remaining handles use channels().list(forHandle=...) (1 unit) before the
+  caller's search-based fallback
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Firebase Admin SDK for the channels mapping
+try:
+    from firebase_admin import firestore
+    FIREBASE_AVAILABLE = True
+except ImportError:
+    FIREBASE_AVAILABLE = False
+
+from youtube_discovery import CHANNELS_COLLECTION, MAX_IDS_PER_REQUEST, QUOTA_COSTS, QuotaUsage
+
+
+# Cheapest cost of the search path per handle: search().list + one channels().list
+SEARCH_RESOLUTION_COST = QUOTA_COSTS["search.list"] + QUOTA_COSTS["channels.list"]
+MAX_ARRAY_CONTAINS_ANY = 30  # Firestore limit on array_contains_any values
+DEFAULT_TTL_DAYS = 30
+
+_handle_cache: Dict[str, Dict[str, Any]] = {}
+_handle_cache_lock = threading.Lock()
+
+
+def handle_key(handle: str) -> str:
+    """Case-insensitive cache key for a handle ("AlexHormozi" -> "@alexhormozi")."""
+    return f"@{handle.strip().lstrip('@').lower()}"
+
+
+def clear_handle_cache() -> None:
+    """Drop the in-process handle cache (Firestore mappings are kept)."""
+    with _handle_cache_lock:
+        _handle_cache.clear()
+
+
+def _firestore_client():
+    if not FIREBASE_AVAILABLE:
+        return None
+    try:
+        return firestore.client()
+    except Exception:
+        return None
+
+
+def _parse_resolved_at(value: Any) -> float:
+    """last_resolved_at (ISO 8601 string or datetime) as epoch seconds; 0 if unknown."""
+    try:
+        if isinstance(value, str):
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        if isinstance(value, datetime):
+            return value.timestamp()
+    except ValueError:
+        pass
+    return 0.0
+
+
+def _channel_data(channel_id: str, snippet: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'channel_id': channel_id,
+        'title': snippet.get('title'),
+        'custom_url': snippet.get('customUrl'),
+        'thumbnails': snippet.get('thumbnails', {})
+    }
+
+
+def _load_stored_mappings(db, handles: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Find channels documents for handles; keyed by handle_key."""
+    if db is None or not handles:
+        return {}
+
+    keys = {handle_key(handle) for handle in handles}
+    found = {}
+    try:
+        collection = db.collection(CHANNELS_COLLECTION)
+        queries = [('handle_keys', sorted(keys)), ('handles', sorted(set(handles)))]
+        for field, values in queries:
+            for i in range(0, len(values), MAX_ARRAY_CONTAINS_ANY):
+                chunk = values[i:i + MAX_ARRAY_CONTAINS_ANY]
+                for doc in collection.where(field, 'array_contains_any', chunk).stream():
+                    data = doc.to_dict() or {}
+                    entry = _channel_data(data.get('channel_id') or doc.id, data)
+                    entry['resolved_at'] = _parse_resolved_at(data.get('last_resolved_at'))
+                    for stored_handle in data.get('handles', []):
+                        key = handle_key(stored_handle)
+                        if key in keys:
+                            found.setdefault(key, entry)
+            if keys <= set(found):
+                break
+    except Exception as e:
+        # Mapping read failures fall back to the API
+        print(f"Warning: Failed to read channel mappings from Firestore: {str(e)}")
+    return found
+
+
+def _revalidate(youtube, entries: Dict[str, Dict[str, Any]], quota: QuotaUsage):
+    """
+    Check stored mappings against channels().list(id=...), 50 channels per call.
+
+    Returns:
+        (still valid entries keyed by handle_key, stale mappings list)
+    """
+    by_channel: Dict[str, List[str]] = {}
+    for key, entry in entries.items():
+        by_channel.setdefault(entry['channel_id'], []).append(key)
+
+    channel_ids = list(by_channel)
+    current = {}
+    for i in range(0, len(channel_ids), MAX_IDS_PER_REQUEST):
+        batch = channel_ids[i:i + MAX_IDS_PER_REQUEST]
+        try:
+            response = youtube.channels().list(
+                part='snippet',
+                id=','.join(batch),
+                maxResults=MAX_IDS_PER_REQUEST
+            ).execute()
+        except Exception as e:
+            print(f"Warning: Failed to revalidate channel mappings: {str(e)}")
+            response = {}
+            for channel_id in batch:
+                current[channel_id] = None  # Unknown: keep the stored mapping
+        finally:
+            quota.record("channels.list")
+        for item in response.get('items', []):
+            current[item['id']] = item.get('snippet', {})
+
+    valid, stale = {}, []
+    for channel_id, keys in by_channel.items():
+        snippet = current.get(channel_id, {})
+        for key in keys:
+            if snippet is None:
+                valid[key] = entries[key]
+            elif (snippet.get('customUrl') or '').lower() == key:
+                valid[key] = _channel_data(channel_id, snippet)
+            else:
+                stale.append({
+                    'handle': key,
+                    'channel_id': channel_id,
+                    'reason': 'handle_changed' if snippet else 'channel_not_found'
+                })
+    return valid, stale
+
+
+def lookup_by_handle(youtube, handle: str, quota: QuotaUsage) -> Optional[Dict[str, Any]]:
+    """Resolve a handle with channels().list(forHandle=...); None if not found."""
+    try:
+        response = youtube.channels().list(
+            part='snippet',
+            forHandle=handle_key(handle)
+        ).execute()
+    finally:
+        quota.record("channels.list")
+
+    items = response.get('items', [])
+    if not items:
+        return None
+    return _channel_data(items[0]['id'], items[0].get('snippet', {}))
+
+
+def resolve_handles(
+    youtube,
+    handles: List[str],
+    search_fallback: Callable[[Any, str], Dict[str, Any]],
+    ttl_days: float = DEFAULT_TTL_DAYS,
+    db: Any = None
+) -> Dict[str, Any]:
+    """
+    Resolve handles to channel metadata, cheapest source first.
+
+    Args:
+        youtube: YouTube Data API client
+        handles: Channel handles (e.g. "@AlexHormozi")
+        search_fallback: Called as search_fallback(youtube, handle) for handles
+            no cheaper source resolved; may raise
+        ttl_days: Age after which stored mappings are revalidated
+        db: Optional Firestore client (defaults to firebase_admin's client)
+
+    Returns:
+        {'mappings': {handle: channel data or {"error": ...}},
+         'stats': {sources, stale_mappings, quota_units_used, quota_calls,
+                   quota_units_saved}} where quota_units_saved is relative
+        to resolving every handle through search
+    """
+    quota = QuotaUsage()
+    ttl_seconds = float(ttl_days) * 86400
+    now = time.time()
+    sources = {'memory': 0, 'firestore': 0, 'for_handle': 0, 'search': 0}
+    resolved: Dict[str, Dict[str, Any]] = {}
+    mappings: Dict[str, Any] = {}
+
+    # Tier 1: in-process cache
+    with _handle_cache_lock:
+        for handle in handles:
+            entry = _handle_cache.get(handle_key(handle))
+            if entry and now - entry['resolved_at'] <= ttl_seconds:
+                resolved[handle] = entry
+                sources['memory'] += 1
+
+    # Tier 2: Firestore channels mapping (stale entries revalidated together)
+    missing = [handle for handle in handles if handle not in resolved]
+    stale = []
+    if missing:
+        db = db if db is not None else _firestore_client()
+        stored = _load_stored_mappings(db, missing)
+        fresh = {key: entry for key, entry in stored.items() if now - entry['resolved_at'] <= ttl_seconds}
+        expired = {key: entry for key, entry in stored.items() if key not in fresh}
+        if expired:
+            revalidated, stale = _revalidate(youtube, expired, quota)
+            for entry in revalidated.values():
+                entry['resolved_at'] = now
+            fresh.update(revalidated)
+        for handle in missing:
+            if handle_key(handle) in fresh:
+                resolved[handle] = fresh[handle_key(handle)]
+                sources['firestore'] += 1
+
+    # Tier 3: channels().list(forHandle=...), then search
+    for handle in handles:
+        if handle in resolved:
+            continue
+        try:
+            entry = lookup_by_handle(youtube, handle, quota)
+            source = 'for_handle'
+        except Exception as e:
+            print(f"Warning: forHandle lookup failed for {handle}: {str(e)}")
+            entry = None
+        if entry is None:
+            try:
+                entry = search_fallback(youtube, handle)
+                source = 'search'
+            except Exception as e:
+                mappings[handle] = {"error": str(e)}
+                continue
+            finally:
+                quota.record("search.list")
+                quota.record("channels.list")
+        entry = dict(entry, resolved_at=now)
+        resolved[handle] = entry
+        sources[source] += 1
+
+    with _handle_cache_lock:
+        for handle, entry in resolved.items():
+            _handle_cache[handle_key(handle)] = entry
+
+    for handle in handles:
+        if handle in resolved:
+            mappings[handle] = {k: v for k, v in resolved[handle].items() if k != 'resolved_at'}
+
+    usage = quota.to_dict()
+    return {
+        'mappings': mappings,
+        'stats': {
+            'sources': sources,
+            'stale_mappings': stale,
+            'quota_units_used': usage['units'],
+            'quota_calls': usage['calls'],
+            'quota_units_saved': max(0, len(resolved) * SEARCH_RESOLUTION_COST - usage['units'])
+        }
+    }
@@ -0,0 +1,163 @@
+"""
+Polite concurrent page fetching for Autopiloot Agency.
+
+PoliteFetcher lets many threads fetch web pages at once while limiting each
+host to a few concurrent requests and a minimum interval between request
+starts, instead of one global sleep after every page. PageCache keeps what
+was extracted from each page together with its ETag / Last-Modified
+validators, so a page is re-fetched with If-None-Match / If-Modified-Since
+and a 304 reuses the cached extraction.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+
+DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+
+
+@dataclass
+class FetchResult:
+    """Outcome of one page request."""
+    url: str
+    status: int
+    text: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+
+
+class PageCache:
+    """Thread-safe LRU of per-URL extraction results with validators and a TTL."""
+
+    def __init__(self, max_entries: int = 5000, ttl_seconds: float = 86400):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            if time.time() - entry["stored_at"] > self.ttl_seconds:
+                del self._entries[url]
+                return None
+            self._entries.move_to_end(url)
+            return entry
+
+    def set(self, url: str, value: Any, etag: Optional[str], last_modified: Optional[str]) -> None:
+        if not etag and not last_modified:
+            return  # Nothing to revalidate with
+        with self._lock:
+            self._entries[url] = {
+                "value": value,
+                "etag": etag,
+                "last_modified": last_modified,
+                "stored_at": time.time()
+            }
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def touch(self, url: str) -> None:
+        """Restart an entry's TTL after a 304."""
+        with self._lock:
+            if url in self._entries:
+                self._entries[url]["stored_at"] = time.time()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class PoliteFetcher:
+    """
+    Fetch pages from many threads with per-host concurrency and rate limits.
+
+    Args:
+        per_host_concurrency: Maximum in-flight requests per host
+        per_host_interval_sec: Minimum time between request starts to one host
+        timeout_sec: Per-request timeout
+        user_agent: User-Agent header sent with every request
+    """
+
+    def __init__(
+        self,
+        per_host_concurrency: int = 2,
+        per_host_interval_sec: float = 0.5,
+        timeout_sec: float = 10,
+        user_agent: str = DEFAULT_USER_AGENT
+    ):
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self.per_host_interval_sec = max(0.0, per_host_interval_sec)
+        self.timeout_sec = timeout_sec
+        self.user_agent = user_agent
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host_concurrency)
+            return self._semaphores[host]
+
+    def _wait_turn(self, host: str) -> None:
+        """Reserve the host's next start time and sleep until it arrives."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.per_host_interval_sec
+        if start > now:
+            time.sleep(start - now)
+
+    def fetch(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> FetchResult:
+        """
+        GET a page, conditionally if validators are given.
+
+        Returns:
+            FetchResult; not_modified is True for a 304
+
+        Raises:
+            requests.RequestException: On connection errors or 4xx/5xx responses
+        """
+        import requests
+
+        headers = {'User-Agent': self.user_agent}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        host = (urlparse(url).hostname or "").lower()
+        with self._host_slot(host):
+            self._wait_turn(host)
+            response = requests.get(url, headers=headers, timeout=self.timeout_sec)
+
+        if response.status_code == 304:
+            return FetchResult(url=url, status=304, etag=etag, last_modified=last_modified, not_modified=True)
+
+        response.raise_for_status()
+        response_headers = getattr(response, 'headers', None) or {}
+        new_etag = response_headers.get('ETag')
+        new_last_modified = response_headers.get('Last-Modified')
+        return FetchResult(
+            url=url,
+            status=response.status_code,
+            text=response.text,
+            etag=new_etag if isinstance(new_etag, str) else None,
+            last_modified=new_last_modified if isinstance(new_last_modified, str) else None
+        )
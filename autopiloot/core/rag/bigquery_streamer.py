@@ -15,6 +15,11 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'config'))
 
 from env_loader import get_optional_env_var
 
+# Add core directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from rag.bigquery_writer import resolve_write_mode, schema_fields, write_rows
+
 
 def stream_transcript_chunks(rows: List[dict]) -> dict:
     """
@@ -41,20 +46,29 @@ def stream_transcript_chunks(rows: List[dict]) -> dict:
         - skipped_count: Number of rows skipped (already exist)
         - error_count: Number of errors
         - errors: List of error details (if any)
+        - error_chunk_ids: chunk_ids of rejected rows (partial inserts only)
         - message: Human-readable status message
 
     Feature Flags:
         - rag.bigquery.enabled: Enable/disable BigQuery streaming
         - Returns {"status": "skipped"} if disabled or misconfigured
 
+    Write Modes (rag.bigquery.write_mode, see rag.bigquery_writer):
+        - streaming: insert_rows_json streaming inserts
+        - storage_write: Storage Write API committed stream (exactly-once offsets)
+        - load_job: batched load jobs of rag.bigquery.batch_size rows (backfills)
+
     Idempotency:
-        - Queries existing chunk_ids before insertion
-        - Only inserts new chunks (skips existing)
+        - Queries existing chunk_ids before insertion and only inserts new
+          chunks (skips existing), in every write mode: storage_write offsets
+          only deduplicate retries within one write, not re-ingests
 
     Table Management:
         - Creates dataset/table automatically if missing
         - Schema: video_id, chunk_id, title, channel_id, published_at,
                   duration_sec, content_sha256, tokens, text_snippet
+        - Partitioned on published_at, clustered on channel_id/video_id
+        - Search index on title/text_snippet for SEARCH() retrieval
 
     Example:
         >>> rows = [
@@ -111,7 +125,8 @@ def stream_transcript_chunks(rows: List[dict]) -> dict:
                 "error_count": len(rows)
             }
 
-        client = bigquery.Client(project=gcp_project)
+        from rag.clients import get_bigquery_client
+        client = get_bigquery_client(gcp_project)
 
         # Ensure dataset exists
         dataset_id = f"{gcp_project}.{dataset_name}"
@@ -132,7 +147,9 @@ def stream_transcript_chunks(rows: List[dict]) -> dict:
                 "error_count": len(rows)
             }
 
-        # Check for existing chunks (idempotency)
+        write_mode = resolve_write_mode(get_rag_value("bigquery.write_mode", "streaming"))
+
+        # Check for existing chunks (idempotency across re-ingests)
         video_ids = list(set(row.get("video_id") for row in rows if row.get("video_id")))
         existing_chunk_ids = _get_existing_chunk_ids(client, table_id, video_ids)
 
@@ -149,29 +166,44 @@ def stream_transcript_chunks(rows: List[dict]) -> dict:
                 "message": f"All {len(rows)} chunks already exist in BigQuery"
             }
 
-        # Insert new rows
-        errors = client.insert_rows_json(table_id, new_rows)
-
-        if errors:
+        # Insert new rows with the configured writer (rag.bigquery.write_mode)
+        written = write_rows(
+            client,
+            table_id,
+            new_rows,
+            bigquery,
+            mode=write_mode,
+            batch_size=get_rag_value("bigquery.batch_size", 500),
+            write_disposition=get_rag_value("bigquery.write_disposition", "WRITE_APPEND"),
+            max_attempts=get_rag_value("bigquery.storage_write.max_attempts", 3)
+        )
+
+        if written["error_count"]:
             return {
                 "status": "partial",
                 "dataset": dataset_name,
                 "table": table_name,
-                "inserted_count": len(new_rows) - len(errors),
+                "write_mode": write_mode,
+                "inserted_count": written["inserted_count"],
                 "skipped_count": len(existing_chunk_ids),
-                "error_count": len(errors),
-                "errors": errors[:10],  # Limit error details
-                "message": f"Inserted {len(new_rows) - len(errors)}/{len(new_rows)} new chunks with {len(errors)} errors"
+                "error_count": written["error_count"],
+                "errors": written["errors"],
+                "error_chunk_ids": written["error_chunk_ids"],
+                "message": f"Inserted {written['inserted_count']}/{len(new_rows)} new chunks with {written['error_count']} errors"
             }
 
-        return {
+        result = {
             "status": "streamed",
             "dataset": dataset_name,
             "table": table_name,
-            "inserted_count": len(new_rows),
+            "write_mode": write_mode,
+            "inserted_count": written["inserted_count"],
             "skipped_count": len(existing_chunk_ids),
-            "message": f"Streamed {len(new_rows)} new chunks to BigQuery (skipped {len(existing_chunk_ids)} existing)"
+            "message": f"Wrote {written['inserted_count']} new chunks to BigQuery via {write_mode} (skipped {len(existing_chunk_ids)} existing)"
         }
+        if written.get("warnings"):
+            result["warnings"] = written["warnings"]
+        return result
 
     except Exception as e:
         return {
@@ -183,60 +215,114 @@ def stream_transcript_chunks(rows: List[dict]) -> dict:
 
 
 def _ensure_table_exists(client, table_id: str, bigquery_module) -> dict:
-    """Create table if not exists with proper schema."""
+    """
+    Create table if not exists with proper schema, then ensure its search index.
+
+    New tables are partitioned on rag.bigquery.partitioning.field and
+    clustered on rag.bigquery.clustering_fields so date, channel and video
+    filters prune the data a query reads. Existing tables keep their layout
+    (BigQuery cannot re-partition in place) but still get the search index.
+    """
     try:
+        from rag.config import get_rag_value
+
         # Check if table exists
         try:
             client.get_table(table_id)
-            return {"success": True, "status": "exists"}
+            status = "exists"
         except:
-            pass
-
-        # Define schema (metadata only, no full text)
-        schema = [
-            bigquery_module.SchemaField("video_id", "STRING", mode="REQUIRED"),
-            bigquery_module.SchemaField("chunk_id", "STRING", mode="REQUIRED"),
-            bigquery_module.SchemaField("title", "STRING", mode="NULLABLE"),
-            bigquery_module.SchemaField("channel_id", "STRING", mode="NULLABLE"),
-            bigquery_module.SchemaField("published_at", "TIMESTAMP", mode="NULLABLE"),
-            bigquery_module.SchemaField("duration_sec", "INT64", mode="NULLABLE"),
-            bigquery_module.SchemaField("content_sha256", "STRING", mode="NULLABLE"),
-            bigquery_module.SchemaField("tokens", "INT64", mode="NULLABLE"),
-            bigquery_module.SchemaField("text_snippet", "STRING", mode="NULLABLE"),
-        ]
-
-        table = bigquery_module.Table(table_id, schema=schema)
-        table = client.create_table(table)
-        return {"success": True, "status": "created"}
+            status = None
+
+        if status is None:
+            # Schema shared with every writer (metadata only, no full text)
+            schema = schema_fields(bigquery_module)
+
+            table = bigquery_module.Table(table_id, schema=schema)
+
+            partitioning = get_rag_value("bigquery.partitioning", {}) or {}
+            if partitioning.get("field"):
+                table.time_partitioning = bigquery_module.TimePartitioning(
+                    type_=getattr(bigquery_module.TimePartitioningType, str(partitioning.get("type", "MONTH")).upper()),
+                    field=partitioning["field"]
+                )
+            clustering_fields = get_rag_value("bigquery.clustering_fields", ["channel_id", "video_id"])
+            if clustering_fields:
+                table.clustering_fields = list(clustering_fields)[:4]  # BigQuery allows up to 4
+
+            table = client.create_table(table)
+            status = "created"
+
+        index_result = _ensure_search_index(client, table_id, get_rag_value("bigquery.search", {}) or {})
+        return {"success": True, "status": status, "search_index": index_result}
 
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+# Tables whose search index was ensured by this process (DDL runs once per table)
+_search_indexes_ensured = set()
+
+
+def _search_index_ddl(table_id: str, search_config: dict) -> str:
+    """CREATE SEARCH INDEX statement for rag.bigquery.search."""
+    index_name = search_config.get("index_name", "transcript_chunks_search")
+    columns = ", ".join(search_config.get("columns", ["title", "text_snippet"]))
+    analyzer = search_config.get("analyzer", "LOG_ANALYZER")
+    return (
+        f"CREATE SEARCH INDEX IF NOT EXISTS `{index_name}` "
+        f"ON `{table_id}`({columns}) "
+        f"OPTIONS (analyzer = '{analyzer}')"
+    )
+
+
+def _ensure_search_index(client, table_id: str, search_config: dict) -> str:
+    """
+    Create the SEARCH() index used by HybridRetrieval if it does not exist.
+
+    Returns:
+        "disabled" (search mode is not search_index), "ensured" (DDL ran),
+        "cached" (already ensured by this process), or "error" (SEARCH()
+        still works without the index, scanning the table instead)
+    """
+    if search_config.get("mode", "search_index") != "search_index":
+        return "disabled"
+    if table_id in _search_indexes_ensured:
+        return "cached"
+    try:
+        client.query(_search_index_ddl(table_id, search_config)).result()
+        _search_indexes_ensured.add(table_id)
+        return "ensured"
+    except Exception as e:
+        print(f"Warning: Failed to create BigQuery search index on {table_id}: {str(e)}")
+        return "error"
+
+
 def _get_existing_chunk_ids(client, table_id: str, video_ids: List[str]) -> set:
     """Query existing chunk_ids for videos to prevent duplicates."""
     try:
         if not video_ids:
             return set()
 
+        from google.cloud import bigquery
+
         query = f"""
             SELECT chunk_id
             FROM `{table_id}`
             WHERE video_id IN UNNEST(@video_ids)
         """
 
-        job_config = client.query_job_config()
-        job_config.query_parameters = [
-            client.query_parameter_from_value("video_ids", video_ids, "ARRAY<STRING>")
-        ]
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[bigquery.ArrayQueryParameter("video_ids", "STRING", video_ids)]
+        )
 
         query_job = client.query(query, job_config=job_config)
         results = query_job.result()
 
         return {row.chunk_id for row in results}
 
-    except Exception:
-        # If query fails, return empty set
+    except Exception as e:
+        # If query fails, write everything (the table may be new or not yet queryable)
+        print(f"Warning: Failed to query existing chunk_ids in {table_id}: {str(e)}")
         return set()
 
 
@@ -0,0 +1,776 @@
+"""
+Retrieval Cache Module
+
+Caches hybrid retrieval responses and per-source results as configured by
+the rag.cache block in settings.yaml. Two backends are supported:
+- memory: In-process store with LRU/LFU eviction bounded by
+  limits.max_entries and limits.max_memory_mb
+- redis: Shared store using native key expiry (eviction is left to the
+  Redis server's maxmemory policy)
+
+Keys are normalized over (query, filters, top_k) and namespaced per scope
+("search" for fused responses, or a source name such as "zep") so each scope
+gets its own TTL and can be invalidated independently.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+# Add config and core directories to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'config'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from env_loader import get_optional_env_var
+
+
+CACHE_KEY_PREFIX = "rag_cache"
+SEARCH_SCOPE = "search"
+
+# Filters that make results time-bounded (strict_filters bypass rule)
+TIME_BOUNDED_FILTER_KEYS = ("date_from", "date_to", "published_after", "published_before", "timestamp")
+
+# TTL setting used for each cache scope (falls back to ttl.default_seconds)
+SCOPE_TTL_KEYS = {
+    "zep": "zep_results_seconds",
+    "opensearch": "opensearch_results_seconds",
+    "bigquery": "bigquery_results_seconds",
+    "embeddings": "query_embeddings_seconds",
+}
+
+# Approximate per-entry bookkeeping cost for the memory size limit
+_ENTRY_OVERHEAD_BYTES = 128
+
+_config: Optional[dict] = None
+_backend: Any = None
+_warm_started = False
+_state_lock = threading.Lock()
+_stats_lock = threading.Lock()
+
+
+def _new_stats() -> dict:
+    return {
+        "hits": 0,
+        "misses": 0,
+        "sets": 0,
+        "bypasses": 0,
+        "invalidations": 0,
+        "errors": 0,
+        "bypass_reasons": {},
+        "per_source": {},
+        "per_query_type": {},
+        "started_at": time.time()
+    }
+
+
+_stats = _new_stats()
+
+
+class _MemoryBackend:
+    """In-process cache store with TTL, entry/byte limits and LRU or LFU eviction."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, max_bytes: int, eviction_policy: str = "lru"):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.eviction_policy = "lfu" if eviction_policy == "lfu" else "lru"
+        self.evictions = 0
+        # key -> [payload, expires_at, size_bytes, frequency]; insertion order is LRU order
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+        # LFU buckets: frequency -> keys in least-recently-used order
+        self._frequencies: Dict[int, "OrderedDict[str, None]"] = {}
+        self._min_frequency = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                self._remove(key)
+                return None
+            self._touch(key, entry)
+            return entry[0]
+
+    def set(self, key: str, payload: str, ttl_seconds: int) -> bool:
+        size = len(key) + len(payload) + _ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while self._entries and (
+                len(self._entries) >= self.max_entries or self._bytes + size > self.max_bytes
+            ):
+                self._evict_one()
+
+            self._entries[key] = [payload, time.time() + ttl_seconds, size, 1]
+            self._bytes += size
+            if self.eviction_policy == "lfu":
+                self._frequencies.setdefault(1, OrderedDict())[key] = None
+                self._min_frequency = 1
+        return True
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def delete_prefix(self, prefix: str) -> int:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def memory_bytes(self) -> int:
+        return self._bytes
+
+    def _touch(self, key: str, entry: list) -> None:
+        if self.eviction_policy == "lru":
+            self._entries.move_to_end(key)
+            return
+
+        frequency = entry[3]
+        bucket = self._frequencies[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._frequencies[frequency]
+            if self._min_frequency == frequency:
+                self._min_frequency = frequency + 1
+        entry[3] = frequency + 1
+        self._frequencies.setdefault(frequency + 1, OrderedDict())[key] = None
+
+    def _evict_one(self) -> None:
+        if self.eviction_policy == "lfu":
+            if self._min_frequency not in self._frequencies:
+                # Deletes can empty the lowest bucket without bumping the minimum
+                self._min_frequency = min(self._frequencies)
+            key = next(iter(self._frequencies[self._min_frequency]))
+        else:
+            key = next(iter(self._entries))
+        self._remove(key)
+        self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry[2]
+        if self.eviction_policy == "lfu":
+            bucket = self._frequencies[entry[3]]
+            del bucket[key]
+            if not bucket:
+                del self._frequencies[entry[3]]
+
+
+class _RedisBackend:
+    """Redis cache store; TTLs use native key expiry."""
+
+    name = "redis"
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(key)
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return value
+
+    def set(self, key: str, payload: str, ttl_seconds: int) -> bool:
+        return bool(self.client.set(key, payload, ex=max(1, int(ttl_seconds))))
+
+    def delete(self, key: str) -> bool:
+        return self.client.delete(key) > 0
+
+    def delete_prefix(self, prefix: str) -> int:
+        deleted = 0
+        batch = []
+        for key in self.client.scan_iter(match=f"{prefix}*", count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                deleted += self.client.delete(*batch)
+                batch = []
+        if batch:
+            deleted += self.client.delete(*batch)
+        return deleted
+
+    def size(self) -> int:
+        return sum(1 for _ in self.client.scan_iter(match=f"{CACHE_KEY_PREFIX}:*", count=500))
+
+    def memory_bytes(self) -> Optional[int]:
+        return None
+
+
+def _as_number(value: Any, default: float) -> float:
+    """Return value if it is a real number, otherwise default."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return default
+    return value
+
+
+def _section(config: dict, name: str) -> dict:
+    value = config.get(name)
+    return value if isinstance(value, dict) else {}
+
+
+def _create_redis_backend(config: dict) -> Optional[_RedisBackend]:
+    """Connect to Redis per rag.cache.redis, or return None if unavailable."""
+    redis_config = _section(config, "redis")
+    host = get_optional_env_var("REDIS_HOST") or redis_config.get("host")
+    if not host:
+        print("Warning: Redis cache backend selected but REDIS_HOST is not set; using memory backend")
+        return None
+
+    try:
+        import redis
+
+        timeout_s = _as_number(redis_config.get("connection_timeout_ms"), 1000) / 1000.0
+        client = redis.Redis(
+            host=host,
+            port=int(_as_number(redis_config.get("port"), 6379)),
+            db=int(_as_number(redis_config.get("db"), 0)),
+            password=get_optional_env_var("REDIS_PASSWORD") or redis_config.get("password") or None,
+            socket_connect_timeout=timeout_s,
+            socket_timeout=timeout_s,
+            decode_responses=True
+        )
+        client.ping()
+        return _RedisBackend(client)
+    except ImportError:
+        print("Warning: redis package not installed; using memory backend")
+    except Exception as e:
+        print(f"Warning: Redis cache unavailable ({str(e)}); using memory backend")
+    return None
+
+
+def configure_cache(config: Optional[dict] = None, redis_client: Any = None) -> dict:
+    """
+    (Re)initialize the cache from configuration.
+
+    Called lazily on first use with rag.cache from settings.yaml; call it
+    explicitly to apply a different configuration or inject a Redis client.
+
+    Args:
+        config: Cache configuration (defaults to rag.config.get_cache_config())
+        redis_client: Optional pre-built Redis client (e.g. fakeredis in tests)
+
+    Returns:
+        Dictionary with status, enabled flag and active backend name
+    """
+    global _config, _backend, _warm_started
+
+    if config is None:
+        from rag.config import get_cache_config
+        config = get_cache_config()
+
+    limits = _section(config, "limits")
+    backend = None
+    if config.get("enabled") is True:
+        if redis_client is not None:
+            backend = _RedisBackend(redis_client)
+        elif config.get("backend") == "redis":
+            backend = _create_redis_backend(config)
+
+        if backend is None:
+            backend = _MemoryBackend(
+                max_entries=int(_as_number(limits.get("max_entries"), 10000)),
+                max_bytes=int(_as_number(limits.get("max_memory_mb"), 500) * 1024 * 1024),
+                eviction_policy=limits.get("eviction_policy", "lru")
+            )
+
+    with _state_lock:
+        _config = config
+        _backend = backend
+        _warm_started = False
+
+    return {
+        "status": "configured",
+        "enabled": backend is not None,
+        "backend": backend.name if backend else None
+    }
+
+
+def reset_cache() -> None:
+    """Drop the backend, configuration and statistics (next use re-reads settings)."""
+    global _config, _backend, _stats, _warm_started
+    with _state_lock:
+        _config = None
+        _backend = None
+        _warm_started = False
+    with _stats_lock:
+        _stats = _new_stats()
+
+
+def _get_backend() -> Any:
+    if _config is None:
+        configure_cache()
+    return _backend
+
+
+def is_cache_enabled() -> bool:
+    """Return True if rag.cache is enabled and a backend is available."""
+    return _get_backend() is not None
+
+
+def _log(event: str, message: str) -> None:
+    logging_config = _section(_config or {}, "logging")
+    if logging_config.get("enabled", True) is True and logging_config.get(event) is True:
+        print(message)
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace in a query string."""
+    return " ".join(query.lower().split())
+
+
+def build_cache_key(scope: str, query: str, filters: Optional[dict] = None, top_k: Optional[int] = None) -> str:
+    """
+    Build a normalized cache key for a query.
+
+    Honours rag.cache.cache_keys (normalization, include_filters,
+    include_top_k, hash_algorithm). Empty filter values are dropped and
+    filter keys are sorted, so equivalent requests share one key.
+
+    Args:
+        scope: "search" for fused responses, or a source name
+        query: Search query string
+        filters: Optional query filters
+        top_k: Result count the cached value was produced for
+
+    Returns:
+        Key of the form "rag_cache:<scope>:<digest>"
+
+    Example:
+        >>> build_cache_key("search", "  How to GROW ", {"channel_id": "UC1"}, 10) == \\
+        ...     build_cache_key("search", "how to grow", {"channel_id": "UC1", "video_id": None}, 10)
+        True
+    """
+    key_config = _section(_config or {}, "cache_keys")
+
+    parts = {"query": normalize_query(query) if key_config.get("normalization", True) else query}
+    if key_config.get("include_filters", True) and filters:
+        parts["filters"] = {k: v for k, v in filters.items() if v not in (None, "", [], {})}
+    if key_config.get("include_top_k", True) and top_k is not None:
+        parts["top_k"] = top_k
+
+    material = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    algorithm = key_config.get("hash_algorithm", "sha256")
+    try:
+        digest = hashlib.new(algorithm, material).hexdigest()
+    except (TypeError, ValueError):
+        digest = hashlib.sha256(material).hexdigest()
+
+    return f"{CACHE_KEY_PREFIX}:{scope}:{digest}"
+
+
+def get_bypass_reason(filters: Optional[dict], top_k: Optional[int], bypass: bool = False) -> Optional[str]:
+    """
+    Apply rag.cache.bypass rules to a request.
+
+    Args:
+        filters: Optional query filters
+        top_k: Requested result count
+        bypass: Explicit caller bypass flag
+
+    Returns:
+        Reason string if the cache must be bypassed, otherwise None
+    """
+    bypass_config = _section(_config or {}, "bypass")
+    if bypass_config.get("enabled", True) is not True:
+        return None
+
+    if bypass and bypass_config.get("explicit_bypass_flag", True) is True:
+        return "explicit_flag"
+
+    if filters and bypass_config.get("strict_filters", True) is True:
+        if any(filters.get(key) for key in TIME_BOUNDED_FILTER_KEYS):
+            return "time_bounded_filters"
+
+    threshold = _as_number(bypass_config.get("small_top_k_threshold"), 0)
+    if top_k is not None and top_k < threshold:
+        return "small_top_k"
+
+    return None
+
+
+def get_ttl_seconds(scope: str) -> int:
+    """Return the configured TTL for a cache scope."""
+    ttl_config = _section(_config or {}, "ttl")
+    default = _as_number(ttl_config.get("default_seconds"), 3600)
+    setting = SCOPE_TTL_KEYS.get(scope)
+    return int(_as_number(ttl_config.get(setting), default) if setting else default)
+
+
+def _classify_query(filters: Optional[dict]) -> str:
+    if not filters:
+        return "open"
+    if filters.get("video_id"):
+        return "video"
+    if any(filters.get(key) for key in TIME_BOUNDED_FILTER_KEYS):
+        return "time_bounded"
+    if filters.get("channel_id"):
+        return "channel"
+    return "filtered"
+
+
+def _record(outcome: str, scope: Optional[str] = None, filters: Optional[dict] = None, reason: Optional[str] = None) -> None:
+    metrics_config = _section(_config or {}, "metrics")
+    if metrics_config.get("enabled", True) is not True:
+        return
+
+    with _stats_lock:
+        _stats[outcome] += 1
+        if reason:
+            _stats["bypass_reasons"][reason] = _stats["bypass_reasons"].get(reason, 0) + 1
+        if outcome not in ("hits", "misses"):
+            return
+        if scope and metrics_config.get("track_per_source", True) is True:
+            counts = _stats["per_source"].setdefault(scope, {"hits": 0, "misses": 0})
+            counts[outcome] += 1
+        if metrics_config.get("track_per_query_type", True) is True:
+            counts = _stats["per_query_type"].setdefault(_classify_query(filters), {"hits": 0, "misses": 0})
+            counts[outcome] += 1
+
+
+def record_bypass(reason: str) -> None:
+    """Count a request that skipped the cache because of a bypass rule."""
+    _record("bypasses", reason=reason)
+
+
+def get_cached(scope: str, query: str, filters: Optional[dict] = None, top_k: Optional[int] = None) -> Optional[dict]:
+    """
+    Look up a cached value.
+
+    Args:
+        scope: "search" or a source name
+        query: Search query string
+        filters: Optional query filters
+        top_k: Result count the value was produced for
+
+    Returns:
+        A fresh copy of the cached dictionary, or None on miss/disabled cache
+    """
+    backend = _get_backend()
+    if backend is None:
+        return None
+
+    key = build_cache_key(scope, query, filters, top_k)
+    try:
+        payload = backend.get(key)
+    except Exception as e:
+        _record("errors")
+        print(f"Warning: Cache lookup failed: {str(e)}")
+        return None
+
+    if payload is None:
+        _record("misses", scope, filters)
+        _log("log_misses", f"Cache miss [{scope}]: {key}")
+        return None
+
+    _record("hits", scope, filters)
+    _log("log_hits", f"Cache hit [{scope}]: {key}")
+    return json.loads(payload)
+
+
+def set_cached(
+    scope: str,
+    query: str,
+    filters: Optional[dict],
+    top_k: Optional[int],
+    value: dict,
+    ttl_seconds: Optional[int] = None
+) -> bool:
+    """
+    Store a value under the scope's TTL (or an explicit one).
+
+    Returns:
+        True if the value was stored
+    """
+    backend = _get_backend()
+    if backend is None:
+        return False
+
+    key = build_cache_key(scope, query, filters, top_k)
+    ttl = ttl_seconds if ttl_seconds is not None else get_ttl_seconds(scope)
+    try:
+        stored = backend.set(key, json.dumps(value, default=str), ttl)
+    except Exception as e:
+        _record("errors")
+        print(f"Warning: Cache write failed: {str(e)}")
+        return False
+
+    if stored:
+        _record("sets")
+        _log("log_sets", f"Cache set [{scope}] ttl={ttl}s: {key}")
+    return stored
+
+
+def cached_source_query(scope: str, query_fn: Callable[..., dict]) -> Callable[..., dict]:
+    """
+    Wrap a hybrid_retrieve _query_* function with a per-source cache.
+
+    Only successful outcomes are cached, under the source's own TTL.
+
+    Args:
+        scope: Source name ("zep", "opensearch", "bigquery")
+        query_fn: Function with signature (query, filters, top_k, timeout) -> dict
+
+    Returns:
+        Function with the same signature
+    """
+    def query_with_cache(query: str, filters: Optional[dict], top_k: int, timeout: float) -> dict:
+        cached = get_cached(scope, query, filters, top_k)
+        if cached is not None:
+            cached["cached"] = True
+            return cached
+
+        outcome = query_fn(query, filters, top_k, timeout)
+        if outcome.get("status") == "success":
+            set_cached(scope, query, filters, top_k, outcome)
+        return outcome
+
+    return query_with_cache
+
+
+def invalidate_cache(scope: Optional[str] = None) -> int:
+    """
+    Remove cached entries for one scope, or all cache entries.
+
+    Args:
+        scope: Scope to clear ("search", source name); None clears everything
+
+    Returns:
+        Number of entries removed
+    """
+    backend = _get_backend()
+    if backend is None:
+        return 0
+
+    prefix = f"{CACHE_KEY_PREFIX}:{scope}:" if scope else f"{CACHE_KEY_PREFIX}:"
+    try:
+        removed = backend.delete_prefix(prefix)
+    except Exception as e:
+        _record("errors")
+        print(f"Warning: Cache invalidation failed: {str(e)}")
+        return 0
+
+    _record("invalidations")
+    _log("log_invalidations", f"Cache invalidated [{scope or 'all'}]: {removed} entries")
+    return removed
+
+
+def invalidate_on_new_content() -> int:
+    """
+    Drop cached retrieval results after new content is indexed.
+
+    Honours invalidation.enabled and invalidation.on_new_content. Query
+    embedding entries are kept since they do not depend on indexed content.
+    An in-process memory cache that was never used is left untouched.
+
+    Returns:
+        Number of entries removed
+    """
+    if _config is None:
+        from rag.config import get_cache_config
+        config = get_cache_config()
+        if config.get("enabled") is not True or config.get("backend") != "redis":
+            return 0
+
+    invalidation = _section(_config or {}, "invalidation")
+    if invalidation.get("enabled", True) is not True or invalidation.get("on_new_content", True) is not True:
+        return 0
+
+    removed = 0
+    for scope in (SEARCH_SCOPE, "zep", "opensearch", "bigquery"):
+        removed += invalidate_cache(scope)
+    return removed
+
+
+def warm_cache(
+    search_fn: Optional[Callable[..., dict]] = None,
+    queries: Optional[List[str]] = None,
+    filters: Optional[dict] = None,
+    limit: int = 20
+) -> dict:
+    """
+    Pre-populate the cache by running queries through hybrid search.
+
+    Args:
+        search_fn: Search function (defaults to hybrid_retrieve.search)
+        queries: Queries to run (defaults to warming.preload_queries; an
+            explicit list runs even when warming.enabled is false)
+        filters: Optional filters applied to every query
+        limit: Result limit per query
+
+    Returns:
+        Dictionary with status, warmed/failed counts and elapsed time
+    """
+    if not is_cache_enabled():
+        return {"status": "skipped", "message": "Cache disabled"}
+
+    if queries is None:
+        warming = _section(_config, "warming")
+        if warming.get("enabled") is not True:
+            return {"status": "skipped", "message": "Cache warming disabled"}
+        queries = warming.get("preload_queries") or []
+
+    if not queries:
+        return {"status": "skipped", "message": "No queries to preload"}
+
+    if search_fn is None:
+        from rag.hybrid_retrieve import search as search_fn
+
+    started = time.time()
+    warmed = 0
+    failed = []
+    for query in queries:
+        result = search_fn(query, filters=filters, limit=limit)
+        if result.get("total_results", 0) > 0:
+            warmed += 1
+        else:
+            failed.append(query)
+
+    return {
+        "status": "warmed" if warmed else "error",
+        "warmed_count": warmed,
+        "failed_queries": failed,
+        "latency_ms": int((time.time() - started) * 1000),
+        "message": f"Warmed {warmed}/{len(queries)} queries"
+    }
+
+
+def warm_cache_once(search_fn: Optional[Callable[..., dict]] = None) -> Optional[dict]:
+    """
+    Run warm_cache() with warming.preload_queries the first time it is called
+    after (re)configuration; later calls return None immediately.
+
+    hybrid_retrieve.search calls this before serving its first request, so
+    warming.enabled takes effect without a separate startup hook. Queries run
+    while warming are themselves searches and do not trigger warming again.
+    """
+    global _warm_started
+    with _state_lock:
+        if _warm_started:
+            return None
+        _warm_started = True
+
+    try:
+        return warm_cache(search_fn)
+    except Exception as e:
+        print(f"Warning: Cache warming failed: {str(e)}")
+        return None
+
+
+def _hit_ratio(hits: int, misses: int) -> float:
+    total = hits + misses
+    return round(hits / total * 100, 2) if total else 0.0
+
+
+def get_cache_stats() -> dict:
+    """
+    Get cache statistics and hit ratios.
+
+    Returns:
+        Dictionary containing:
+        - enabled, backend: Cache state
+        - hits, misses, sets, bypasses, invalidations, errors: Counters
+        - total_requests, hit_ratio_percent: Overall lookup hit ratio
+        - per_source, per_query_type: Hit/miss counts with hit ratios
+        - bypass_reasons: Bypass counts per rule
+        - entries, evictions, memory_mb: Backend size (memory_mb is None for Redis)
+        - low_hit_ratio_alert: True if hit ratio is below performance.miss_rate_threshold
+        - timestamp: ISO 8601 time of the snapshot
+
+    Example:
+        >>> stats = get_cache_stats()
+        >>> stats["hit_ratio_percent"]
+        62.5
+    """
+    backend = _get_backend()
+
+    with _stats_lock:
+        stats = json.loads(json.dumps(_stats))
+
+    hits, misses = stats["hits"], stats["misses"]
+    for breakdown in (stats["per_source"], stats["per_query_type"]):
+        for counts in breakdown.values():
+            counts["hit_ratio_percent"] = _hit_ratio(counts["hits"], counts["misses"])
+
+    entries = evictions = 0
+    memory_mb = None
+    if backend is not None:
+        try:
+            entries = backend.size()
+            evictions = backend.evictions
+            memory_bytes = backend.memory_bytes()
+            memory_mb = round(memory_bytes / (1024 * 1024), 3) if memory_bytes is not None else None
+        except Exception as e:
+            print(f"Warning: Failed to read cache size: {str(e)}")
+
+    performance = _section(_config or {}, "performance")
+    threshold = _as_number(performance.get("miss_rate_threshold"), 50)
+    hit_ratio = _hit_ratio(hits, misses)
+
+    stats.pop("started_at")
+    stats.update({
+        "enabled": backend is not None,
+        "backend": backend.name if backend is not None else None,
+        "total_requests": hits + misses,
+        "hit_ratio_percent": hit_ratio,
+        "entries": entries,
+        "evictions": evictions,
+        "memory_mb": memory_mb,
+        "low_hit_ratio_alert": (
+            performance.get("alert_on_high_miss_rate", True) is True
+            and hits + misses > 0
+            and hit_ratio < threshold
+        ),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    })
+    return stats
+
+
+if __name__ == "__main__":
+    print("="*80)
+    print("TEST: Retrieval Cache Module")
+    print("="*80)
+
+    print("\n1. Configuring memory cache:")
+    print(f"   {configure_cache({'enabled': True, 'backend': 'memory', 'bypass': {'small_top_k_threshold': 5}})}")
+
+    print("\n2. Testing key normalization:")
+    key_a = build_cache_key("search", "  How to GROW revenue ", {"channel_id": "UC123"}, 10)
+    key_b = build_cache_key("search", "how to grow revenue", {"channel_id": "UC123", "video_id": None}, 10)
+    print(f"   Keys match: {key_a == key_b}")
+
+    print("\n3. Testing set/get:")
+    set_cached("search", "how to grow revenue", {"channel_id": "UC123"}, 10, {"results": [{"chunk_id": "c1"}]})
+    print(f"   Hit: {get_cached('search', 'How to grow revenue', {'channel_id': 'UC123'}, 10)}")
+    print(f"   Miss: {get_cached('search', 'pricing strategy', None, 10)}")
+
+    print("\n4. Testing bypass rules:")
+    print(f"   date filter: {get_bypass_reason({'date_from': '2025-01-01'}, 10)}")
+    print(f"   small top_k: {get_bypass_reason(None, 3)}")
+
+    print("\n5. Cache stats:")
+    stats = get_cache_stats()
+    print(f"   Hit ratio: {stats['hit_ratio_percent']}%  entries: {stats['entries']}")
+
+    print("\n" + "="*80)
+    print("✅ Test completed")
@@ -3,12 +3,196 @@ Text Chunking Module
 
 Provides token-aware text chunking with configurable overlap for RAG ingest.
 Uses tiktoken for accurate token counting with OpenAI models.
+
+Text is tokenized exactly once: chunk boundaries, token counts, token IDs and
+character offsets are all derived from the single token stream, and chunk
+text is sliced from the original string rather than re-decoded. The tiktoken
+Encoding is loaded once per process and shared.
 """
 
-from typing import List
+import threading
+from typing import Iterable, Iterator, List, Optional
 import tiktoken
 
 
+ENCODING_NAME = "cl100k_base"
+
+# Compact the streaming buffers once this many consumed tokens pile up
+_COMPACT_TOKENS = 8192
+
+# UTF-8 continuation bytes (0b10xxxxxx) never start a character
+_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+
+_encoding = None
+_char_tables = None
+_encoding_lock = threading.Lock()
+
+
+def get_encoding():
+    """
+    Get the shared tiktoken Encoding, loading it on first use.
+
+    Returns:
+        tiktoken.Encoding for ENCODING_NAME
+    """
+    global _encoding
+
+    if _encoding is None:
+        with _encoding_lock:
+            if _encoding is None:
+                _encoding = tiktoken.get_encoding(ENCODING_NAME)
+    return _encoding
+
+
+def _get_char_tables(encoding):
+    """
+    Per-token character tables used to turn token positions into char offsets.
+
+    Returns (chars, mid) where chars[t] is the number of characters that start
+    inside token t and mid[t] is 1 when token t begins partway through a
+    multi-byte character. Built once per encoding (one pass over the vocab).
+    """
+    global _char_tables
+
+    tables = _char_tables
+    if tables is not None and tables[0] is encoding:
+        return tables[1], tables[2]
+
+    size = encoding.max_token_value + 1
+    chars = bytearray(size)
+    mid = bytearray(size)
+    for token in range(size):
+        try:
+            data = encoding.decode_single_token_bytes(token)
+        except KeyError:
+            continue
+        chars[token] = min(255, len(data.translate(None, _CONTINUATION_BYTES)))
+        mid[token] = 1 if data and 0x80 <= data[0] < 0xC0 else 0
+
+    _char_tables = (encoding, bytes(chars), bytes(mid))
+    return _char_tables[1], _char_tables[2]
+
+
+def stream_chunks(
+    segments: Iterable[str],
+    max_tokens: int = 1000,
+    overlap_tokens: int = 100,
+    doc_id: Optional[str] = None
+) -> Iterator[dict]:
+    """
+    Chunk a stream of text segments, yielding chunks as soon as they are complete.
+
+    Each segment is tokenized once as it arrives; only the tokens and text of
+    the current window are buffered, so memory stays bounded for very long
+    documents. Segments are tokenized independently, so split them at
+    whitespace or sentence boundaries (e.g. transcript lines) to get the same
+    tokens as tokenizing the joined text.
+
+    Args:
+        segments: Iterable of text pieces that concatenate to the full document
+        max_tokens: Maximum tokens per chunk (default: 1000)
+        overlap_tokens: Token overlap between consecutive chunks (default: 100)
+        doc_id: Optional document identifier for chunk IDs
+
+    Yields:
+        Dictionaries containing:
+        - text: Chunk text (a slice of the original text)
+        - tokens: Token count (window length)
+        - chunk_index: 0-based index
+        - chunk_id: Unique chunk identifier (if doc_id provided)
+        - token_ids: Token IDs of the chunk
+        - token_start / token_end: Token offsets in the document
+        - char_start / char_end: Character offsets in the document
+
+    Example:
+        >>> for chunk in stream_chunks(transcript_lines, max_tokens=500, doc_id="video_123"):
+        ...     index(chunk)
+    """
+    encoding = get_encoding()
+    chars_table, mid_table = _get_char_tables(encoding)
+    count_chars = chars_table.__getitem__
+    step = max(1, max_tokens - overlap_tokens)
+
+    tokens: List[int] = []
+    pos = 0                 # buffer index of the current window start
+    token_base = 0          # document token index of tokens[0]
+    chars_before = 0        # characters starting before tokens[pos]
+    text = ""
+    text_base = 0           # document char index of text[0]
+    has_content = False
+    chunk_index = 0
+
+    def build(end: int, char_end: int) -> dict:
+        char_start = chars_before - mid_table[tokens[pos]]
+        chunk = {
+            "text": text[char_start - text_base:char_end - text_base],
+            "tokens": end - pos,
+            "chunk_index": chunk_index
+        }
+        if doc_id:
+            chunk["chunk_id"] = f"{doc_id}_chunk_{chunk_index}"
+        chunk["token_ids"] = tokens[pos:end]
+        chunk["token_start"] = token_base + pos
+        chunk["token_end"] = token_base + end
+        chunk["char_start"] = char_start
+        chunk["char_end"] = char_end
+        return chunk
+
+    for segment in segments:
+        if not segment:
+            continue
+        tokens.extend(encoding.encode(segment))
+        text += segment
+        has_content = has_content or not segment.isspace()
+        if not has_content:
+            continue
+
+        # Emit every window that is known not to be the last one
+        while len(tokens) - pos > max_tokens:
+            end = pos + max_tokens
+            step_chars = sum(map(count_chars, tokens[pos:pos + step]))
+            window_chars = step_chars + sum(map(count_chars, tokens[pos + step:end]))
+            yield build(end, chars_before + window_chars - mid_table[tokens[end]])
+            chunk_index += 1
+
+            chars_before += step_chars
+            pos += step
+
+            if pos >= _COMPACT_TOKENS:
+                keep_from = chars_before - mid_table[tokens[pos]]
+                text = text[keep_from - text_base:]
+                text_base = keep_from
+                del tokens[:pos]
+                token_base += pos
+                pos = 0
+
+    if has_content and pos < len(tokens):
+        yield build(len(tokens), text_base + len(text))
+
+
+def iter_chunks(
+    text: str,
+    max_tokens: int = 1000,
+    overlap_tokens: int = 100,
+    doc_id: Optional[str] = None
+) -> Iterator[dict]:
+    """
+    Lazily chunk a single text with a single tokenization pass.
+
+    Args:
+        text: Input text to chunk
+        max_tokens: Maximum tokens per chunk (default: 1000)
+        overlap_tokens: Token overlap between chunks (default: 100)
+        doc_id: Optional document identifier for chunk IDs
+
+    Yields:
+        Chunk dictionaries as described in stream_chunks()
+    """
+    if not text or not text.strip():
+        return iter(())
+    return stream_chunks([text], max_tokens, overlap_tokens, doc_id)
+
+
 def chunk_text(text: str, max_tokens: int = 1000, overlap_tokens: int = 100) -> List[str]:
     """
     Chunk text into segments with token-aware boundaries and overlap.
@@ -34,40 +218,7 @@ def chunk_text(text: str, max_tokens: int = 1000, overlap_tokens: int = 100) ->
         10
         >>> # Each chunk has ≤500 tokens with 50-token overlap
     """
-    if not text or not text.strip():
-        return []
-
-    # Get tiktoken encoding
-    encoding = tiktoken.get_encoding("cl100k_base")
-    tokens = encoding.encode(text)
-
-    # If text is shorter than max_tokens, return as single chunk
-    if len(tokens) <= max_tokens:
-        return [text]
-
-    chunks = []
-    start_idx = 0
-
-    while start_idx < len(tokens):
-        # Calculate end index (don't exceed token list)
-        end_idx = min(start_idx + max_tokens, len(tokens))
-
-        # Extract chunk tokens
-        chunk_tokens = tokens[start_idx:end_idx]
-
-        # Decode tokens back to text
-        chunk_text = encoding.decode(chunk_tokens)
-        chunks.append(chunk_text)
-
-        # Move start index forward, accounting for overlap
-        if end_idx < len(tokens):
-            # Not at end: move forward with overlap
-            start_idx = end_idx - overlap_tokens
-        else:
-            # Reached end: break
-            break
-
-    return chunks
+    return [chunk["text"] for chunk in iter_chunks(text, max_tokens, overlap_tokens)]
 
 
 def count_tokens(text: str) -> int:
@@ -89,8 +240,7 @@ def count_tokens(text: str) -> int:
     if not text:
         return 0
 
-    encoding = tiktoken.get_encoding("cl100k_base")
-    return len(encoding.encode(text))
+    return len(get_encoding().encode(text))
 
 
 def chunk_with_metadata(
@@ -102,6 +252,8 @@ def chunk_with_metadata(
     """
     Chunk text and return chunks with metadata.
 
+    The text is tokenized once; token counts are the window lengths.
+
     Args:
         text: Input text to chunk
         max_tokens: Maximum tokens per chunk (default: 1000)
@@ -115,6 +267,7 @@ def chunk_with_metadata(
         - chunk_index: 0-based index
         - total_chunks: Total number of chunks
         - chunk_id: Unique chunk identifier (if doc_id provided)
+        - token_ids, token_start, token_end, char_start, char_end (see stream_chunks)
 
     Example:
         >>> chunks = chunk_with_metadata(text, doc_id="video_123")
@@ -124,29 +277,15 @@ def chunk_with_metadata(
             "tokens": 487,
             "chunk_index": 0,
             "total_chunks": 5,
-            "chunk_id": "video_123_chunk_0"
+            "chunk_id": "video_123_chunk_0",
+            ...
         }
     """
-    # Get text chunks
-    text_chunks = chunk_text(text, max_tokens, overlap_tokens)
-
-    # Build metadata for each chunk
-    chunks_with_metadata = []
-    total_chunks = len(text_chunks)
-
-    for i, chunk_text in enumerate(text_chunks):
-        chunk_data = {
-            "text": chunk_text,
-            "tokens": count_tokens(chunk_text),
-            "chunk_index": i,
-            "total_chunks": total_chunks
-        }
-
-        # Add chunk ID if doc_id provided
-        if doc_id:
-            chunk_data["chunk_id"] = f"{doc_id}_chunk_{i}"
+    chunks_with_metadata = list(iter_chunks(text, max_tokens, overlap_tokens, doc_id))
 
-        chunks_with_metadata.append(chunk_data)
+    total_chunks = len(chunks_with_metadata)
+    for chunk_data in chunks_with_metadata:
+        chunk_data["total_chunks"] = total_chunks
 
     return chunks_with_metadata
 
@@ -226,5 +365,14 @@ if __name__ == "__main__":
         overlap_detected = any(word in chunk2_start for word in chunk1_end.split()[-10:])
         print(f"   Overlap detected: {overlap_detected}")
 
+    # Test 6: Streaming over transcript lines
+    print("\n6. Testing stream_chunks() over lines:")
+    lines = sample_text.splitlines(keepends=True)
+    streamed = list(stream_chunks(lines, max_tokens=500, overlap_tokens=50, doc_id="video_abc123"))
+    print(f"   Streamed chunks: {len(streamed)}")
+    print(f"   First chunk offsets: chars {streamed[0]['char_start']}-{streamed[0]['char_end']}, "
+          f"tokens {streamed[0]['token_start']}-{streamed[0]['token_end']}")
+    print(f"   Offsets slice the source: {streamed[1]['text'] == ''.join(lines)[streamed[1]['char_start']:streamed[1]['char_end']]}")
+
     print("\n" + "="*80)
     print("✅ All tests completed successfully")
@@ -0,0 +1,283 @@
+"""
+RAG Client Registry
+
+Process-wide, lazily created clients for the Hybrid RAG sinks and sources:
+- OpenSearch: one client per (host, credentials) with a pooled
+  urllib3 connection pool sized by rag.opensearch.connection.pool_maxsize
+- BigQuery: one google.cloud.bigquery.Client per project, plus one
+  Storage Write API BigQueryWriteClient per process
+- Firestore: one google.cloud.firestore.Client per project
+- HTTP (Zep): one keep-alive requests.Session per API base URL
+
+Reusing clients avoids a TLS handshake and connection setup on every query
+and every ingest call. Clients are not fork-safe: the registry resets itself
+in forked children (os.register_at_fork plus a PID check), and
+reset_clients() can be called explicitly from worker start-up hooks.
+"""
+
+import os
+import sys
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+# Add config and core directories to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'config'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+
+DEFAULT_POOL_MAXSIZE = 10
+
+_clients: Dict[Tuple, Any] = {}
+_registry_lock = threading.Lock()
+_owner_pid = os.getpid()
+
+
+def reset_clients() -> int:
+    """
+    Drop all cached clients so the next call creates fresh ones.
+
+    Call from post-fork / worker start-up hooks; sockets inherited from a
+    parent process must never be shared with the child.
+
+    Returns:
+        Number of clients dropped
+    """
+    global _clients, _registry_lock, _owner_pid
+
+    dropped = len(_clients)
+    stale = list(_clients.values())
+
+    # The lock may have been held by another thread at fork time
+    _registry_lock = threading.Lock()
+    _clients = {}
+    _owner_pid = os.getpid()
+
+    for client in stale:
+        close = getattr(client, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+
+    return dropped
+
+
+def _reset_after_fork() -> None:
+    global _clients, _registry_lock, _owner_pid
+    # Don't close inherited clients here: that would shut the parent's sockets
+    _registry_lock = threading.Lock()
+    _clients = {}
+    _owner_pid = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _get_or_create(key: Tuple, factory) -> Any:
+    if os.getpid() != _owner_pid:
+        _reset_after_fork()
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _registry_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = factory()
+            _clients[key] = client
+        return client
+
+
+def _pool_maxsize() -> int:
+    from rag.config import get_rag_value
+
+    value = get_rag_value("opensearch.connection.pool_maxsize", DEFAULT_POOL_MAXSIZE)
+    return value if isinstance(value, int) and value > 0 else DEFAULT_POOL_MAXSIZE
+
+
+def _parse_host(host: str) -> Tuple[str, int, bool]:
+    """Split an OpenSearch host string into (hostname, port, use_ssl)."""
+    if host.startswith("http://") or host.startswith("https://"):
+        use_ssl = host.startswith("https://")
+        host_without_protocol = host.replace("https://", "").replace("http://", "")
+    else:
+        use_ssl = True
+        host_without_protocol = host
+
+    if ":" in host_without_protocol:
+        hostname, port = host_without_protocol.rsplit(":", 1)
+        return hostname, int(port), use_ssl
+
+    return host_without_protocol, 443 if use_ssl else 9200, use_ssl
+
+
+def get_opensearch_client(
+    host: str,
+    api_key: Optional[str] = None,
+    username: Optional[str] = None,
+    password: Optional[str] = None
+):
+    """
+    Get the shared OpenSearch client for a host and credential set.
+
+    Args:
+        host: OpenSearch host (with or without http(s):// and port)
+        api_key: API key (preferred over basic auth)
+        username: Basic auth username
+        password: Basic auth password
+
+    Returns:
+        opensearchpy.OpenSearch client. Per-request timeouts should be passed
+        as request_timeout since the client is shared.
+
+    Example:
+        >>> client = get_opensearch_client("https://search.example.com", api_key="key")
+        >>> client is get_opensearch_client("https://search.example.com", api_key="key")
+        True
+    """
+    if api_key:
+        auth = ("api_key", api_key)
+    elif username and password:
+        auth = (username, password)
+    else:
+        auth = None
+
+    def create():
+        from opensearchpy import OpenSearch
+        from rag.config import get_rag_value
+
+        hostname, port, use_ssl = _parse_host(host)
+        return OpenSearch(
+            hosts=[{"host": hostname, "port": port}],
+            http_auth=auth,
+            use_ssl=use_ssl,
+            verify_certs=get_rag_value("opensearch.connection.verify_certs", True),
+            ssl_assert_hostname=False,
+            ssl_show_warn=False,
+            timeout=get_rag_value("opensearch.timeout_ms", 1500) / 1000.0,
+            max_retries=get_rag_value("opensearch.connection.max_retries", 3),
+            retry_on_timeout=get_rag_value("opensearch.connection.retry_on_timeout", True),
+            pool_maxsize=_pool_maxsize()
+        )
+
+    return _get_or_create(("opensearch", host, auth), create)
+
+
+def get_bigquery_client(project_id: str):
+    """
+    Get the shared BigQuery client for a project.
+
+    Args:
+        project_id: GCP project ID
+
+    Returns:
+        google.cloud.bigquery.Client
+    """
+    def create():
+        from google.cloud import bigquery
+        return bigquery.Client(project=project_id)
+
+    return _get_or_create(("bigquery", project_id), create)
+
+
+def get_bigquery_write_client():
+    """
+    Get the shared BigQuery Storage Write API client.
+
+    Returns:
+        google.cloud.bigquery_storage_v1.BigQueryWriteClient
+    """
+    def create():
+        from google.cloud import bigquery_storage_v1
+        return bigquery_storage_v1.BigQueryWriteClient()
+
+    return _get_or_create(("bigquery_write",), create)
+
+
+def get_firestore_client(project_id: str):
+    """
+    Get the shared Firestore client for a project.
+
+    Args:
+        project_id: GCP project ID
+
+    Returns:
+        google.cloud.firestore.Client
+    """
+    def create():
+        from google.cloud import firestore
+        return firestore.Client(project=project_id)
+
+    return _get_or_create(("firestore", project_id), create)
+
+
+def get_http_session(base_url: str):
+    """
+    Get a keep-alive requests.Session for an HTTP API (e.g. Zep).
+
+    The session's connection pool is sized by
+    rag.opensearch.connection.pool_maxsize so concurrent ingest and search
+    threads can each hold a warm connection.
+
+    Args:
+        base_url: API base URL; sessions are shared per base URL
+
+    Returns:
+        requests.Session
+    """
+    def create():
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        pool_size = _pool_maxsize()
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    return _get_or_create(("http", base_url.rstrip("/")), create)
+
+
+def get_registry_stats() -> dict:
+    """
+    Describe the clients currently held by this process.
+
+    Returns:
+        Dictionary with pid, total client count and counts per client type
+    """
+    by_type: Dict[str, int] = {}
+    for key in list(_clients):
+        by_type[key[0]] = by_type.get(key[0], 0) + 1
+    return {"pid": _owner_pid, "total_clients": sum(by_type.values()), "by_type": by_type}
+
+
+if __name__ == "__main__":
+    print("="*80)
+    print("TEST: RAG Client Registry")
+    print("="*80)
+
+    print("\n1. Testing get_http_session() reuse:")
+    session_a = get_http_session("https://api.getzep.com")
+    session_b = get_http_session("https://api.getzep.com/")
+    print(f"   Same session: {session_a is session_b}")
+
+    print("\n2. Testing get_opensearch_client() reuse:")
+    try:
+        client_a = get_opensearch_client("http://localhost:9200", username="admin", password="admin")
+        client_b = get_opensearch_client("http://localhost:9200", username="admin", password="admin")
+        print(f"   Same client: {client_a is client_b}")
+    except ImportError:
+        print("   opensearch-py not installed")
+
+    print("\n3. Registry stats:")
+    print(f"   {get_registry_stats()}")
+
+    print("\n4. Testing reset_clients():")
+    print(f"   Dropped: {reset_clients()}")
+
+    print("\n" + "="*80)
+    print("✅ Test completed")
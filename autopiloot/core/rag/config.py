@@ -213,6 +213,77 @@ def get_policy_config() -> dict:
     }
 
 
+def get_evidence_alignment_config() -> dict:
+    """
+    Get evidence alignment configuration.
+
+    Returns:
+        Dictionary containing alignment settings:
+        - enabled: Whether post-fusion near-duplicate alignment runs
+        - similarity_threshold: Similarity at which results are merged
+        - trust_hierarchy: Trust score per source ("multi_source" for 2+)
+        - conflict_detection: Conflict thresholds
+        - signature: Shingle signature settings (max_chars, dimensions, sample_rate)
+        - candidate_pool_factor: Fused candidates per requested result
+        - logging: Alignment logging settings
+
+    Example:
+        >>> config = get_evidence_alignment_config()
+        >>> config["similarity_threshold"]
+        0.85
+        >>> config["trust_hierarchy"]["multi_source"]
+        3
+    """
+    return {
+        "enabled": get_rag_flag("evidence_alignment.enabled", True),
+        "similarity_threshold": get_rag_value("evidence_alignment.similarity_threshold", 0.85),
+        "trust_hierarchy": get_rag_value("evidence_alignment.trust_hierarchy", {
+            "multi_source": 3,
+            "zep": 2,
+            "bigquery": 2,
+            "opensearch": 1
+        }),
+        "conflict_detection": get_rag_value("evidence_alignment.conflict_detection", {}) or {},
+        "signature": get_rag_value("evidence_alignment.signature", {}) or {},
+        "candidate_pool_factor": get_rag_value("evidence_alignment.candidate_pool_factor", 2),
+        "logging": get_rag_value("evidence_alignment.logging", {}) or {}
+    }
+
+
+def get_cache_config() -> dict:
+    """
+    Get retrieval cache configuration.
+
+    Returns:
+        Dictionary containing cache settings:
+        - enabled: Whether retrieval caching is enabled
+        - backend: "memory" or "redis"
+        - redis, cache_keys, ttl, bypass, limits, metrics, warming,
+          invalidation, performance, logging: Raw sub-blocks of rag.cache
+
+    Example:
+        >>> config = get_cache_config()
+        >>> config["backend"]
+        "memory"
+        >>> config["ttl"]["default_seconds"]
+        3600
+    """
+    return {
+        "enabled": get_rag_flag("cache.enabled", False),
+        "backend": get_rag_value("cache.backend", "memory"),
+        "redis": get_rag_value("cache.redis", {}) or {},
+        "cache_keys": get_rag_value("cache.cache_keys", {}) or {},
+        "ttl": get_rag_value("cache.ttl", {}) or {},
+        "bypass": get_rag_value("cache.bypass", {}) or {},
+        "limits": get_rag_value("cache.limits", {}) or {},
+        "metrics": get_rag_value("cache.metrics", {}) or {},
+        "warming": get_rag_value("cache.warming", {}) or {},
+        "invalidation": get_rag_value("cache.invalidation", {}) or {},
+        "performance": get_rag_value("cache.performance", {}) or {},
+        "logging": get_rag_value("cache.logging", {}) or {}
+    }
+
+
 if __name__ == "__main__":
     print("="*80)
     print("TEST: RAG Configuration Module")
@@ -0,0 +1,425 @@
+"""
+Embedding Cache Module
+
+Content-addressed store for text embeddings keyed by (model, sha256(text)),
+configured by rag.cache.embeddings (off unless enabled is true):
+- memory: in-process LRU of memory_entries vectors, each kept for
+  rag.cache.ttl.query_embeddings_seconds
+- disk (opt-in with disk.enabled): one directory per model under
+  disk.path holding a float32 matrix (vectors.f32, read through np.memmap)
+  and an index (index.json) mapping text hash to row. Embeddings are
+  deterministic per model, so disk rows never expire; appends take an
+  exclusive file lock so workers can share the directory. If the directory
+  cannot be created the cache runs memory-only for that model
+
+get_embeddings() looks every text up in both tiers and fills the misses
+with one embed call per max_batch_size unique texts (kept small enough that
+a request of long texts stays under the embeddings API per-request token
+limit), then reports hits, misses and the hit ratio.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are serialized per process only
+    fcntl = None
+
+# Add core directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from rag.hashing import sha256_hex
+
+
+DEFAULT_DISK_PATH = ".cache/embeddings"
+DEFAULT_MEMORY_ENTRIES = 5000
+DEFAULT_TTL_SECONDS = 7200
+DEFAULT_MAX_BATCH_SIZE = 100
+
+# Project root (autopiloot/) for resolving a relative disk.path
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+_config: Optional[dict] = None
+_memory: Optional["_MemoryTier"] = None
+_disk_root: Optional[str] = None
+_disk_tiers: Dict[str, Optional["_DiskTier"]] = {}
+_state_lock = threading.Lock()
+_stats_lock = threading.Lock()
+
+
+def _new_stats() -> dict:
+    return {"lookups": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "api_calls": 0, "errors": 0}
+
+
+_stats = _new_stats()
+
+
+class _MemoryTier:
+    """LRU of (model, text hash) -> float32 vector with a TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[np.ndarray]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: tuple, vector: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = (vector, time.time() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _DiskTier:
+    """Append-only float32 matrix plus a text hash -> row index for one model."""
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.index_path = os.path.join(directory, "index.json")
+        self.lock_path = os.path.join(directory, ".lock")
+        self.dimensions = 0
+        self.rows: Dict[str, int] = {}
+        self._index_mtime = None
+        self._matrix: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def _load_index(self) -> None:
+        try:
+            mtime = os.path.getmtime(self.index_path)
+        except OSError:
+            return
+        if mtime == self._index_mtime:
+            return
+        with open(self.index_path, "r") as f:
+            index = json.load(f)
+        self.dimensions = index.get("dimensions", 0)
+        self.rows = index.get("rows", {})
+        self._index_mtime = mtime
+
+    def _view(self, row: int) -> Optional[np.ndarray]:
+        """Memory-mapped matrix covering row (remapped after the file grows)."""
+        if self._matrix is None or row >= self._matrix.shape[0]:
+            count = os.path.getsize(self.vectors_path) // (self.dimensions * 4)
+            if row >= count:
+                return None
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(count, self.dimensions))
+        return self._matrix
+
+    def get_many(self, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        with self._lock:
+            if any(h not in self.rows for h in hashes):
+                self._load_index()  # Another worker may have appended
+            found = {}
+            for text_hash in hashes:
+                row = self.rows.get(text_hash)
+                if row is None:
+                    continue
+                matrix = self._view(row)
+                if matrix is not None:
+                    found[text_hash] = np.array(matrix[row])
+            return found
+
+    def add_many(self, vectors: Dict[str, np.ndarray]) -> None:
+        with self._lock, open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._load_index()
+                new = {h: v for h, v in vectors.items() if h not in self.rows}
+                if not new:
+                    return
+                dimensions = len(next(iter(new.values())))
+                if self.dimensions and dimensions != self.dimensions:
+                    raise ValueError(f"embedding has {dimensions} dimensions, store has {self.dimensions}")
+
+                # A write interrupted mid-row leaves a partial row that no index entry
+                # points to; drop it so the new rows start on a row boundary
+                row_bytes = dimensions * 4
+                size = os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0
+                start, partial = divmod(size, row_bytes)
+                if partial:
+                    os.truncate(self.vectors_path, start * row_bytes)
+                    self._matrix = None
+                with open(self.vectors_path, "ab") as f:
+                    f.write(np.asarray(list(new.values()), dtype=np.float32).tobytes())
+                for offset, text_hash in enumerate(new):
+                    self.rows[text_hash] = start + offset
+                self.dimensions = dimensions
+
+                temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+                with open(temp_path, "w") as f:
+                    json.dump({"dimensions": self.dimensions, "rows": self.rows}, f)
+                os.replace(temp_path, self.index_path)
+                self._index_mtime = os.path.getmtime(self.index_path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def configure_embedding_cache(config: Optional[dict] = None, ttl_seconds: Optional[float] = None) -> dict:
+    """
+    (Re)initialize the embedding cache from configuration.
+
+    Called lazily on first use with rag.cache.embeddings from settings.yaml;
+    call it explicitly to apply a different configuration.
+
+    Args:
+        config: Embedding cache configuration (defaults to rag.cache.embeddings)
+        ttl_seconds: Memory tier TTL (defaults to rag.cache.ttl.query_embeddings_seconds)
+
+    Returns:
+        Dictionary with status, enabled flag and active tiers
+    """
+    global _config, _memory, _disk_root, _disk_tiers
+
+    if config is None or ttl_seconds is None:
+        from rag.config import get_rag_value
+        if config is None:
+            config = get_rag_value("cache.embeddings", {})
+            if not isinstance(config, dict):
+                config = {}
+        if ttl_seconds is None:
+            ttl_seconds = get_rag_value("cache.ttl.query_embeddings_seconds", DEFAULT_TTL_SECONDS)
+
+    if not isinstance(ttl_seconds, (int, float)) or ttl_seconds <= 0:
+        ttl_seconds = DEFAULT_TTL_SECONDS
+
+    memory = None
+    disk_root = None
+    if config.get("enabled") is True:
+        memory = _MemoryTier(config.get("memory_entries", DEFAULT_MEMORY_ENTRIES), ttl_seconds)
+        disk_config = config.get("disk", {}) or {}
+        if disk_config.get("enabled") is True:
+            disk_root = disk_config.get("path") or DEFAULT_DISK_PATH
+            if not os.path.isabs(disk_root):
+                disk_root = os.path.join(_PROJECT_ROOT, disk_root)
+
+    with _state_lock:
+        _config = config
+        _memory = memory
+        _disk_root = disk_root
+        _disk_tiers = {}
+
+    return {
+        "status": "configured",
+        "enabled": memory is not None,
+        "tiers": (["memory"] + (["disk"] if disk_root else [])) if memory is not None else []
+    }
+
+
+def reset_embedding_cache() -> None:
+    """Drop both tiers' handles, the configuration and the counters (disk files are kept)."""
+    global _config, _memory, _disk_root, _disk_tiers, _stats
+    with _state_lock:
+        _config = None
+        _memory = None
+        _disk_root = None
+        _disk_tiers = {}
+    with _stats_lock:
+        _stats = _new_stats()
+
+
+def _disk_tier(model: str) -> Optional[_DiskTier]:
+    """Disk tier for a model; None (memory-only) if disabled or it cannot be opened."""
+    if _disk_root is None:
+        return None
+    with _state_lock:
+        if model in _disk_tiers:
+            return _disk_tiers[model]
+        directory = os.path.join(_disk_root, "".join(c if c.isalnum() or c in "-_." else "_" for c in model))
+        try:
+            tier = _DiskTier(directory)
+        except Exception as e:
+            print(f"Warning: Embedding cache disk tier unavailable for {model} ({str(e)}); using memory only")
+            _count("errors")
+            tier = None
+        _disk_tiers[model] = tier
+        return tier
+
+
+def get_embeddings(
+    texts: List[str],
+    model: str,
+    embed_fn: Callable[[List[str]], List[List[float]]]
+) -> dict:
+    """
+    Embeddings for texts, served from the cache where possible.
+
+    Args:
+        texts: Texts to embed (duplicates are embedded once)
+        model: Embedding model name (part of the cache key)
+        embed_fn: Embeds a batch of texts in one API call, returning one
+            vector per text in order
+
+    Returns:
+        Dictionary containing:
+        - embeddings: len(texts) x dimensions float32 array
+        - hits: Texts served from memory or disk
+        - memory_hits / disk_hits: Hits per tier
+        - misses: Unique texts sent to embed_fn
+        - api_calls: embed_fn calls made
+        - hit_ratio: hits / len(texts)
+
+    Raises:
+        Whatever embed_fn raises, or ValueError if it returns the wrong
+        number of vectors (nothing is cached in either case)
+
+    Example:
+        >>> result = get_embeddings(posts, "text-embedding-3-small", embed_batch)
+        >>> result["embeddings"].shape, result["hit_ratio"]
+        ((120, 1536), 0.95)
+    """
+    if _config is None:
+        configure_embedding_cache()
+    memory = _memory
+    batch_size = max(1, int((_config or {}).get("max_batch_size", DEFAULT_MAX_BATCH_SIZE)))
+
+    hashes = [sha256_hex(text) for text in texts]
+    vectors: Dict[str, np.ndarray] = {}
+    memory_hits = disk_hits = 0
+
+    if memory is not None:
+        for text_hash in hashes:
+            vector = vectors.get(text_hash)
+            if vector is None:
+                vector = memory.get((model, text_hash))
+                if vector is not None:
+                    vectors[text_hash] = vector
+            if vector is not None:
+                memory_hits += 1
+
+    disk = _disk_tier(model) if memory is not None else None
+    if disk is not None:
+        try:
+            found = disk.get_many([h for h in dict.fromkeys(hashes) if h not in vectors])
+            for text_hash, vector in found.items():
+                vectors[text_hash] = vector
+                memory.set((model, text_hash), vector)
+            disk_hits = sum(1 for h in hashes if h in found)
+        except Exception as e:
+            print(f"Warning: Embedding cache disk read failed: {str(e)}")
+            _count("errors")
+
+    # One embed call per batch of unique misses
+    missing = {}
+    for text, text_hash in zip(texts, hashes):
+        if text_hash not in vectors:
+            missing.setdefault(text_hash, text)
+    missing_hashes = list(missing)
+    api_calls = 0
+    fresh: Dict[str, np.ndarray] = {}
+    for start in range(0, len(missing_hashes), batch_size):
+        batch = missing_hashes[start:start + batch_size]
+        embedded = embed_fn([missing[h] for h in batch])
+        api_calls += 1
+        if len(embedded) != len(batch):
+            raise ValueError(f"embed_fn returned {len(embedded)} vectors for {len(batch)} texts")
+        for text_hash, vector in zip(batch, embedded):
+            fresh[text_hash] = np.asarray(vector, dtype=np.float32)
+
+    if fresh:
+        vectors.update(fresh)
+        if memory is not None:
+            for text_hash, vector in fresh.items():
+                memory.set((model, text_hash), vector)
+        if disk is not None:
+            try:
+                disk.add_many(fresh)
+            except Exception as e:
+                print(f"Warning: Embedding cache disk write failed: {str(e)}")
+                _count("errors")
+
+    hits = memory_hits + disk_hits
+    with _stats_lock:
+        _stats["lookups"] += len(texts)
+        _stats["memory_hits"] += memory_hits
+        _stats["disk_hits"] += disk_hits
+        _stats["misses"] += len(missing_hashes)
+        _stats["api_calls"] += api_calls
+
+    embeddings = np.stack([vectors[h] for h in hashes]) if texts else np.zeros((0, 0), dtype=np.float32)
+    return {
+        "embeddings": embeddings,
+        "hits": hits,
+        "memory_hits": memory_hits,
+        "disk_hits": disk_hits,
+        "misses": len(missing_hashes),
+        "api_calls": api_calls,
+        "hit_ratio": round(hits / len(texts), 4) if texts else 0.0
+    }
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def get_embedding_cache_stats() -> dict:
+    """Process-wide lookup counters and hit ratio since the last reset."""
+    with _stats_lock:
+        stats = dict(_stats)
+    hits = stats["memory_hits"] + stats["disk_hits"]
+    stats["hit_ratio"] = round(hits / stats["lookups"], 4) if stats["lookups"] else 0.0
+    stats["enabled"] = _memory is not None
+    stats["memory_entries"] = len(_memory) if _memory is not None else 0
+    return stats
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    print("="*80)
+    print("TEST: Embedding Cache Module")
+    print("="*80)
+
+    calls = []
+
+    def fake_embed(batch):
+        calls.append(len(batch))
+        return [[float(len(text)), 1.0, 0.5] for text in batch]
+
+    with tempfile.TemporaryDirectory() as directory:
+        print("\n1. Configuring memory + disk tiers:")
+        print(f"   {configure_embedding_cache({'enabled': True, 'disk': {'path': directory}}, ttl_seconds=60)}")
+
+        print("\n2. Testing get_embeddings() (cold, then warm):")
+        texts = ["pricing", "hiring closers", "pricing", "churn"]
+        cold = get_embeddings(texts, "demo-model", fake_embed)
+        warm = get_embeddings(texts, "demo-model", fake_embed)
+        print(f"   cold: misses={cold['misses']} api_calls={cold['api_calls']} hit_ratio={cold['hit_ratio']}")
+        print(f"   warm: hits={warm['hits']} api_calls={warm['api_calls']} hit_ratio={warm['hit_ratio']}")
+
+        print("\n3. Testing disk tier after a process restart:")
+        configure_embedding_cache({'enabled': True, 'disk': {'path': directory}}, ttl_seconds=60)
+        restarted = get_embeddings(texts, "demo-model", fake_embed)
+        print(f"   disk_hits={restarted['disk_hits']} api_calls={restarted['api_calls']} shape={restarted['embeddings'].shape}")
+        print(f"   Stats: {get_embedding_cache_stats()}")
+        reset_embedding_cache()
+
+    print("\n" + "="*80)
+    print("✅ Test completed")
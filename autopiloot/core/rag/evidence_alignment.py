@@ -0,0 +1,416 @@
+"""
+Evidence Alignment Module
+
+Post-fusion stage for hybrid retrieval (rag.evidence_alignment):
+- Finds near-duplicate results that exact content_sha256 dedup misses
+  (the same passage returned by different sinks with different chunk
+  boundaries, casing or whitespace)
+- Merges each near-duplicate group into one result carrying the combined
+  sources and provenance, keeping the member the trust hierarchy prefers
+- Flags numerical and temporal (year) conflicts between similar results
+
+Similarity is cosine over cheap binary vectors: 8-byte shingles of the
+first signature.max_chars characters, mod-sampled (1 in sample_rate) and
+hashed into signature.dimensions buckets. All texts are shingled in one
+NumPy pass and compared with a single matrix product, which keeps the
+stage under a millisecond for k <= 100.
+"""
+
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Add core directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+
+SHINGLE_BYTES = 8
+DEFAULT_MAX_CHARS = 1024
+DEFAULT_DIMENSIONS = 512
+DEFAULT_SAMPLE_RATE = 16
+# Sampling is relaxed per call so a median-length text keeps at least this many shingles
+MIN_SAMPLED_SHINGLES = 32
+
+# 64-bit golden-ratio multiplier: the high bits of shingle * multiplier are a hash
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_SEPARATOR = b"\0" * SHINGLE_BYTES
+
+# Byte values used when extracting numbers from the signature buffer
+_DIGIT_0, _DIGIT_9, _DOT, _COMMA, _DOLLAR, _PERCENT = 48, 57, 46, 44, 36, 37
+
+
+def _encode(texts: List[str], max_chars: int) -> Tuple[bytes, np.ndarray]:
+    """
+    Lowercased UTF-8 of each text's first max_chars characters, joined.
+
+    Each text is followed by SHINGLE_BYTES NUL bytes; ends[i] is the offset
+    just past text i's separator.
+    """
+    pieces = [(text or "")[:max_chars].encode("utf-8") for text in texts]
+    ends = np.cumsum(np.fromiter((len(p) + SHINGLE_BYTES for p in pieces), dtype=np.int64, count=len(pieces)))
+    return _SEPARATOR.join(pieces).lower() + _SEPARATOR, ends
+
+
+def similarity_matrix(
+    texts: List[str],
+    max_chars: int = DEFAULT_MAX_CHARS,
+    dimensions: int = DEFAULT_DIMENSIONS,
+    sample_rate: int = DEFAULT_SAMPLE_RATE
+) -> np.ndarray:
+    """
+    Pairwise cosine similarity of shingle signatures.
+
+    Args:
+        texts: Result texts
+        max_chars: Leading characters of each text that are shingled
+        dimensions: Signature width (power of two)
+        sample_rate: Keep shingles whose hash falls in the lowest 1/sample_rate
+            (power of two); the same shingle is kept or dropped in every text.
+            Lowered for the call when texts are too short to keep
+            MIN_SAMPLED_SHINGLES at that rate
+
+    Returns:
+        len(texts) x len(texts) float32 matrix (0 for empty texts)
+
+    Example:
+        >>> sims = similarity_matrix(["Retention beats acquisition.", "retention beats acquisition"])
+        >>> float(sims[0, 1]) > 0.85
+        True
+    """
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    data, ends = _encode(texts, max_chars)
+    return _similarity(data, ends, dimensions, sample_rate)
+
+
+def _similarity(data: bytes, ends: np.ndarray, dimensions: int, sample_rate: int) -> np.ndarray:
+    count = len(ends)
+    mean_bytes = int(ends[-1]) // count - SHINGLE_BYTES
+    sample_rate = min(int(sample_rate), max(1, mean_bytes // MIN_SAMPLED_SHINGLES))
+    sample_bits = max(0, sample_rate.bit_length() - 1)
+    dimension_bits = max(1, int(dimensions).bit_length() - 1)
+
+    # Every 8-byte window as one little-endian uint64 (1-byte stride view, no copy)
+    windows = np.ndarray((len(data) - SHINGLE_BYTES + 1,), dtype="<u8", buffer=data, strides=(1,))
+    hashes = windows * _HASH_MULTIPLIER
+    # Windows that reach into a separator never get sampled
+    crossing = (ends[:, None] - np.arange(1, 2 * SHINGLE_BYTES)).ravel()
+    hashes[crossing[crossing < len(hashes)]] = np.iinfo(np.uint64).max
+
+    if sample_bits:
+        positions = np.flatnonzero(hashes < np.uint64(1 << (64 - sample_bits)))
+    else:
+        positions = np.flatnonzero(hashes != np.iinfo(np.uint64).max)
+    docs = np.searchsorted(ends, positions, side="right")
+    buckets = (hashes[positions] >> np.uint64(64 - sample_bits - dimension_bits)).astype(np.intp)
+    buckets &= (1 << dimension_bits) - 1
+
+    vectors = np.zeros((count, 1 << dimension_bits), dtype=np.float32)
+    vectors[docs, buckets] = 1.0
+
+    # Binary vectors: the Gram diagonal holds each squared norm
+    gram = vectors @ vectors.T
+    norms = np.sqrt(np.diagonal(gram)).copy()
+    norms[norms == 0] = 1.0
+    return gram / norms[:, None] / norms[None, :]
+
+
+def _numeric_tokens(data: bytes, ends: np.ndarray, wanted: List[int]) -> Dict[int, Tuple[set, set]]:
+    """
+    (numbers, years) found in the signature window of each wanted text.
+
+    Numbers are digit runs, including "." or "," between digits, a leading
+    "$" and a trailing "%"; four-digit 19xx/20xx runs count as years.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    digit = (buf >= _DIGIT_0) & (buf <= _DIGIT_9)
+    part = digit.copy()
+    part[1:-1] |= ((buf[1:-1] == _DOT) | (buf[1:-1] == _COMMA)) & digit[:-2] & digit[2:]
+    changes = np.flatnonzero(np.diff(np.concatenate(([False], part, [False])).view(np.int8)))
+    starts, stops = changes[0::2], changes[1::2]
+    docs = np.searchsorted(ends, starts, side="right")
+    keep = np.isin(docs, wanted)
+
+    tokens = {index: (set(), set()) for index in wanted}
+    for start, stop, doc in zip(starts[keep].tolist(), stops[keep].tolist(), docs[keep].tolist()):
+        token = data[start:stop].decode("ascii")
+        numbers, years = tokens[doc]
+        if stop - start == 4 and token[:2] in ("19", "20"):
+            years.add(token)
+            continue
+        if start and data[start - 1] == _DOLLAR:
+            token = "$" + token
+        if data[stop] == _PERCENT:
+            token += "%"
+        numbers.add(token)
+    return tokens
+
+
+def trust_score(sources: List[str], trust_hierarchy: Dict[str, int]) -> int:
+    """
+    Trust of a result from the sources that returned it.
+
+    Args:
+        sources: Source names that returned the result
+        trust_hierarchy: rag.evidence_alignment.trust_hierarchy
+
+    Returns:
+        trust_hierarchy["multi_source"] for 2+ sources, otherwise the
+        highest single-source trust (0 for unknown sources)
+    """
+    if len(sources) >= 2:
+        return trust_hierarchy.get("multi_source", 3)
+    return max((trust_hierarchy.get(source, 0) for source in sources), default=0)
+
+
+def align_evidence(
+    results: List[dict],
+    config: Optional[dict] = None,
+    trace_id: Optional[str] = None
+) -> dict:
+    """
+    Merge near-duplicate fused results and flag conflicts.
+
+    Results are grouped greedily in rank order: each result not yet grouped
+    absorbs every later result at or above similarity_threshold. A group
+    takes the position and best score of its top-ranked member and the
+    content of its most trusted member (rank breaks ties); sources and
+    provenance of all members are merged into it. Pairs flagged as
+    conflicting are never merged, so both claims stay visible.
+
+    Args:
+        results: Fused results, best first (not modified)
+        config: rag.evidence_alignment settings (default: from rag.config)
+        trace_id: Trace ID for alignment logging
+
+    Returns:
+        Dictionary containing:
+        - results: Aligned results, best first
+        - duplicates_merged: Number of results merged into another
+        - groups: [{"kept", "merged", "min_similarity"}] for each merge
+        - conflicts: [{"type", "chunk_ids", "similarity", "values", "preferred"}]
+        - latency_us: Time spent aligning
+
+    Example:
+        >>> aligned = align_evidence(fused_results)
+        >>> aligned["duplicates_merged"]
+        2
+    """
+    start = time.perf_counter()
+    if config is None:
+        from rag.config import get_evidence_alignment_config
+        config = get_evidence_alignment_config()
+
+    threshold = config.get("similarity_threshold", 0.85)
+    hierarchy = config.get("trust_hierarchy", {})
+    signature = config.get("signature", {})
+    conflict_config = config.get("conflict_detection", {})
+
+    if len(results) < 2:
+        return _alignment_result(list(results), [], [], start)
+
+    data, ends = _encode([result.get("text", "") for result in results],
+                         signature.get("max_chars", DEFAULT_MAX_CHARS))
+    sims = _similarity(
+        data, ends,
+        signature.get("dimensions", DEFAULT_DIMENSIONS),
+        signature.get("sample_rate", DEFAULT_SAMPLE_RATE)
+    )
+
+    # Every pair similar enough to merge or to check for conflicts, in rank order
+    conflict_thresholds = {
+        "numerical": conflict_config.get("numerical_threshold", 0.5),
+        "temporal": conflict_config.get("temporal_threshold", 0.5)
+    }
+    upper = np.triu(sims, 1)
+    rows, cols = np.nonzero(upper >= min(threshold, *conflict_thresholds.values()))
+    pairs = list(zip(rows.tolist(), cols.tolist(), upper[rows, cols].tolist()))
+
+    conflicts = _detect_conflicts(results, pairs, data, ends, hierarchy, conflict_thresholds)
+    conflicting = {conflict["indexes"] for conflict in conflicts}
+
+    # Greedy grouping: a result not yet grouped absorbs later ungrouped results
+    group_of = [-1] * len(results)
+    groups: List[List[int]] = []
+    group_min: List[float] = []
+    for i, j, similarity in pairs:
+        if similarity < threshold or (i, j) in conflicting:
+            continue
+        if group_of[i] == -1:
+            group_of[i] = len(groups)
+            groups.append([i])
+            group_min.append(1.0)
+        group_id = group_of[i]
+        if group_of[j] == -1 and groups[group_id][0] == i:
+            group_of[j] = group_id
+            groups[group_id].append(j)
+            group_min[group_id] = min(group_min[group_id], similarity)
+
+    aligned = []
+    merges = []
+    for index, result in enumerate(results):
+        group_id = group_of[index]
+        if group_id == -1 or len(groups[group_id]) == 1:
+            aligned.append(result)
+            continue
+        members = groups[group_id]
+        if members[0] != index:
+            continue
+        merged, merge = _merge_group([results[m] for m in members], hierarchy)
+        merge["min_similarity"] = round(group_min[group_id], 3)
+        aligned.append(merged)
+        merges.append(merge)
+
+    outcome = _alignment_result(aligned, merges, conflicts, start)
+    _log_alignment(outcome, trace_id, config.get("logging", {}))
+    return outcome
+
+
+def _merge_group(members: List[dict], hierarchy: Dict[str, int]) -> Tuple[dict, dict]:
+    """One result for a near-duplicate group (members in rank order)."""
+    best = max(
+        range(len(members)),
+        key=lambda m: (trust_score(members[m].get("sources", []), hierarchy), -m)
+    )
+    kept = members[best]
+
+    merged = dict(kept)
+    merged["score"] = max(member.get("score", 0.0) for member in members)
+    sources = []
+    provenance = {}
+    for member in [kept] + members:
+        for source in member.get("sources", []):
+            if source not in sources:
+                sources.append(source)
+        for source, entry in member.get("provenance", {}).items():
+            provenance.setdefault(source, entry)
+    merged["sources"] = sources
+    merged["provenance"] = provenance
+    merged["trust_score"] = trust_score(sources, hierarchy)
+    merged["aligned_chunk_ids"] = [m.get("chunk_id") for m in members if m is not kept]
+
+    merge = {"kept": kept.get("chunk_id"), "merged": merged["aligned_chunk_ids"]}
+    return merged, merge
+
+
+def _detect_conflicts(
+    results: List[dict],
+    pairs: List[Tuple[int, int, float]],
+    data: bytes,
+    ends: np.ndarray,
+    hierarchy: Dict[str, int],
+    thresholds: Dict[str, float]
+) -> List[dict]:
+    """
+    Similar result pairs whose numbers or years (within the signature window) disagree.
+
+    Values only one side mentions are extra detail, not a disagreement: a pair
+    conflicts when each side has a value the other lacks and at least one of
+    those values on each side has the same unit ("$", "%" or none), e.g.
+    "$40" vs "$45" but not "40 clients" added to an otherwise identical passage.
+    """
+    checks = [(kind, thresholds[kind], slot) for slot, kind in enumerate(("numerical", "temporal"))]
+    lowest = min(thresholds.values())
+    candidates = [(i, j, similarity) for i, j, similarity in pairs if similarity >= lowest]
+    if not candidates:
+        return []
+
+    tokens = _numeric_tokens(data, ends, sorted({index for i, j, _ in candidates for index in (i, j)}))
+    conflicts = []
+    for i, j, similarity in candidates:
+        for kind, threshold, slot in checks:
+            first, second = tokens[i][slot], tokens[j][slot]
+            if similarity < threshold:
+                continue
+            only_first, only_second = first - second, second - first
+            if not {_unit(token) for token in only_first} & {_unit(token) for token in only_second}:
+                continue
+            trust = [trust_score(results[index].get("sources", []), hierarchy) for index in (i, j)]
+            conflicts.append({
+                "type": kind,
+                "indexes": (i, j),
+                "chunk_ids": [results[i].get("chunk_id"), results[j].get("chunk_id")],
+                "similarity": round(similarity, 3),
+                "values": [sorted(only_first), sorted(only_second)],
+                "preferred": results[j if trust[1] > trust[0] else i].get("chunk_id")
+            })
+    return conflicts
+
+
+def _unit(token: str) -> str:
+    """Unit of a numeric token: "$", "%" or "" for a bare number."""
+    if token.startswith("$"):
+        return "$"
+    if token.endswith("%"):
+        return "%"
+    return ""
+
+
+def _alignment_result(results: List[dict], merges: List[dict], conflicts: List[dict], start: float) -> dict:
+    return {
+        "results": results,
+        "duplicates_merged": sum(len(merge["merged"]) for merge in merges),
+        "groups": merges,
+        "conflicts": [{k: v for k, v in conflict.items() if k != "indexes"} for conflict in conflicts],
+        "latency_us": int((time.perf_counter() - start) * 1_000_000)
+    }
+
+
+def _log_alignment(outcome: dict, trace_id: Optional[str], logging_config: dict) -> None:
+    """Print merges and conflicts per rag.evidence_alignment.logging."""
+    if not logging_config.get("enabled", True):
+        return
+    if not outcome["groups"] and not outcome["conflicts"]:
+        return
+    if logging_config.get("log_level", "info") not in ("debug", "info"):
+        return
+
+    prefix = f"[RAG Align {trace_id}]" if trace_id else "[RAG Align]"
+    print(f"{prefix} merged={outcome['duplicates_merged']} conflicts={len(outcome['conflicts'])} "
+          f"latency={outcome['latency_us']}us")
+    if logging_config.get("include_rationale", True):
+        for merge in outcome["groups"]:
+            print(f"{prefix} kept {merge['kept']} over {merge['merged']} (similarity >= {merge['min_similarity']})")
+        for conflict in outcome["conflicts"]:
+            print(f"{prefix} {conflict['type']} conflict {conflict['chunk_ids']}: {conflict['values']} "
+                  f"→ prefer {conflict['preferred']}")
+
+
+if __name__ == "__main__":
+    print("="*80)
+    print("TEST: Evidence Alignment Module")
+    print("="*80)
+
+    passage = ("Customer retention costs five times less than acquisition, so the first hire "
+               "after product-market fit should own onboarding and churn, not outbound sales.")
+    fused = [
+        {"chunk_id": "v1_chunk_3", "text": passage, "score": 0.031, "sources": ["opensearch"],
+         "provenance": {"opensearch": {"score": 12.4, "rank": 1}}},
+        {"chunk_id": "v1_chunk_3b", "text": passage.upper() + " Next,", "score": 0.030, "sources": ["zep"],
+         "provenance": {"zep": {"score": 0.91, "rank": 1}}},
+        {"chunk_id": "v2_chunk_0", "text": "Pricing in 2023 moved from $99 to $149 per seat.", "score": 0.016,
+         "sources": ["zep"], "provenance": {"zep": {"score": 0.72, "rank": 2}}},
+        {"chunk_id": "v3_chunk_1", "text": "Pricing in 2023 moved from $99 to $199 per seat.", "score": 0.015,
+         "sources": ["opensearch"], "provenance": {"opensearch": {"score": 8.1, "rank": 2}}},
+    ]
+
+    print("\n1. Testing similarity_matrix():")
+    print(np.round(similarity_matrix([r["text"] for r in fused]), 2))
+
+    print("\n2. Testing align_evidence():")
+    aligned = align_evidence(fused, config={
+        "similarity_threshold": 0.85,
+        "trust_hierarchy": {"multi_source": 3, "zep": 2, "bigquery": 2, "opensearch": 1},
+        "conflict_detection": {"numerical_threshold": 0.5, "temporal_threshold": 0.5},
+        "logging": {"enabled": True}
+    })
+    for result in aligned["results"]:
+        print(f"   {result['chunk_id']}: sources={result['sources']} merged={result.get('aligned_chunk_ids', [])}")
+    print(f"   Conflicts: {aligned['conflicts']}")
+    print(f"   Latency: {aligned['latency_us']}us")
+
+    print("\n" + "="*80)
+    print("✅ Test completed")
@@ -0,0 +1,166 @@
+"""
+Result Fusion Module
+
+Merges per-source result lists from hybrid retrieval into one ranking:
+- rrf: Reciprocal Rank Fusion, score = Σ 1 / (k + rank)
+- weighted: Σ weight × raw source score
+- minmax: Σ weight × score min-max normalized within each source
+- zscore: Σ weight × z-score of the score within each source
+- simple: first-seen order, no rescoring (fallback)
+
+Results are deduplicated on content_sha256 (hashed from the text only when
+a source did not supply it). Each unique result gets a compact accumulator
+that references the source dict instead of copying it; the top `limit`
+accumulators are selected with a heap and only those are materialized
+as output dicts.
+"""
+
+import heapq
+import math
+import os
+import sys
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Add core directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from rag.hashing import sha256_hex
+
+
+FUSION_METHODS = ("rrf", "weighted", "minmax", "zscore", "simple")
+
+
+class _Accumulator:
+    """Running score, provenance and first-seen result for one unique chunk."""
+
+    __slots__ = ("result", "score", "hits")
+
+    def __init__(self, result: dict):
+        self.result = result
+        self.score = 0.0
+        # (source, raw score, rank); provenance dicts are built only for the top results
+        self.hits: List[Tuple[str, float, int]] = []
+
+
+def _contribution(method: str, weight: float, scores: List[float], rrf_k: int) -> Callable[[float, int], float]:
+    """Score contribution of (raw score, rank) for one source."""
+    if method == "rrf":
+        return lambda score, rank: 1.0 / (rrf_k + rank)
+    if method == "weighted":
+        return lambda score, rank: score * weight
+    if method == "minmax":
+        low, high = min(scores), max(scores)
+        span = high - low
+        if not span:
+            return lambda score, rank: weight
+        return lambda score, rank: (score - low) / span * weight
+    if method == "zscore":
+        mean = sum(scores) / len(scores)
+        std = math.sqrt(sum((s - mean) ** 2 for s in scores) / len(scores))
+        if not std:
+            return lambda score, rank: 0.0
+        return lambda score, rank: (score - mean) / std * weight
+    return lambda score, rank: 0.0
+
+
+def fuse(
+    source_results: Dict[str, List[dict]],
+    method: str = "rrf",
+    limit: Optional[int] = None,
+    weights: Optional[Dict[str, float]] = None,
+    rrf_k: int = 60
+) -> List[dict]:
+    """
+    Fuse per-source results and return the top `limit` by fused score.
+
+    Args:
+        source_results: Results per source name, each list in source rank order
+        method: One of FUSION_METHODS; unknown methods fall back to "simple"
+        limit: Number of results to return (None returns all)
+        weights: Per-source weights for weighted/minmax/zscore (default 1.0)
+        rrf_k: RRF rank discount constant
+
+    Returns:
+        New result dicts (inputs are not modified), best first, each with
+        fused "score", "sources" and "provenance" ({source: {"score", "rank"}})
+        and without content_sha256. Ties keep first-seen order.
+
+    Example:
+        >>> fused = fuse({"zep": zep_results, "opensearch": os_results}, "rrf", limit=10)
+        >>> fused[0]["sources"]
+        ['zep', 'opensearch']
+    """
+    if method not in FUSION_METHODS:
+        method = "simple"
+    weights = weights or {}
+
+    accumulators: Dict[str, _Accumulator] = {}
+    text_hashes: Dict[str, str] = {}
+
+    for source_name, results in source_results.items():
+        if not results:
+            continue
+        scores = [r.get("score", 0.0) for r in results]
+        contribution = _contribution(method, weights.get(source_name, 1.0), scores, rrf_k)
+
+        for rank, (result, raw_score) in enumerate(zip(results, scores), start=1):
+            key = result.get("content_sha256")
+            if not key:
+                text = result.get("text", "")
+                key = text_hashes.get(text)
+                if key is None:
+                    key = text_hashes[text] = sha256_hex(text)
+
+            acc = accumulators.get(key)
+            if acc is None:
+                acc = accumulators[key] = _Accumulator(result)
+
+            acc.score += contribution(raw_score, rank)
+            acc.hits.append((source_name, raw_score, rank))
+
+    if method == "simple":
+        selected = list(accumulators.values())
+        if limit is not None:
+            selected = selected[:limit]
+    else:
+        count = len(accumulators) if limit is None else limit
+        # nlargest is stable like sorted(reverse=True): ties keep first-seen order
+        selected = heapq.nlargest(count, accumulators.values(), key=lambda a: a.score)
+
+    return [_materialize(acc, keep_score=(method == "simple")) for acc in selected]
+
+
+def _materialize(acc: _Accumulator, keep_score: bool) -> dict:
+    """Output dict for a selected accumulator."""
+    fused = {k: v for k, v in acc.result.items() if k != "content_sha256"}
+    if not keep_score:
+        fused["score"] = acc.score
+    provenance = {source: {"score": score, "rank": rank} for source, score, rank in acc.hits}
+    fused["sources"] = list(provenance)
+    fused["provenance"] = provenance
+    return fused
+
+
+if __name__ == "__main__":
+    print("="*80)
+    print("TEST: Result Fusion Module")
+    print("="*80)
+
+    sample = {
+        "zep": [
+            {"chunk_id": "a", "text": "Pricing your offer", "score": 0.92, "content_sha256": "h_a"},
+            {"chunk_id": "b", "text": "Hiring closers", "score": 0.81, "content_sha256": "h_b"},
+        ],
+        "opensearch": [
+            {"chunk_id": "b", "text": "Hiring closers", "score": 14.2, "content_sha256": "h_b"},
+            {"chunk_id": "c", "text": "Reducing churn", "score": 9.7, "content_sha256": "h_c"},
+        ],
+    }
+
+    for i, method in enumerate(FUSION_METHODS, start=1):
+        print(f"\n{i}. Testing fuse(method={method!r}):")
+        for result in fuse(sample, method, limit=3, weights={"zep": 0.6, "opensearch": 0.4}):
+            print(f"   {result['chunk_id']}: score={result['score']:.4f} sources={result['sources']}")
+
+    print("\n" + "="*80)
+    print("✅ Test completed")
@@ -6,9 +6,11 @@ with Reciprocal Rank Fusion (RRF) for optimal result ranking.
 """
 
 import os
+import re
 import sys
 import time
-from typing import List, Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Optional, Any, Callable, Tuple
 from datetime import datetime
 
 # Add config and core directories to path
@@ -18,7 +20,12 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from env_loader import get_optional_env_var
 
 
-def search(query: str, filters: Optional[Dict[str, Any]] = None, limit: int = 20) -> dict:
+def search(
+    query: str,
+    filters: Optional[Dict[str, Any]] = None,
+    limit: int = 20,
+    bypass_cache: bool = False
+) -> dict:
     """
     Perform hybrid retrieval combining semantic, keyword, and SQL search.
 
@@ -32,23 +39,52 @@ def search(query: str, filters: Optional[Dict[str, Any]] = None, limit: int = 20
             - min_duration_sec: Minimum video duration
             - max_duration_sec: Maximum video duration
         limit: Maximum number of results to return (default: 20)
+        bypass_cache: Skip the retrieval cache for this request (default: False)
 
     Returns:
         Dictionary containing:
         - results: List of ranked results with scores and provenance
         - total_results: Total number of results after fusion
         - sources_used: List of sources that contributed results
-        - fusion_method: Fusion algorithm used ("rrf", "weighted", etc.)
+        - fusion_method: Fusion algorithm used ("rrf", "weighted", "minmax",
+          "zscore"; anything else is first-seen concatenation)
         - latency_ms: Total retrieval latency in milliseconds
         - source_latencies: Per-source latency breakdown
-        - coverage: Percentage of sources that returned results
+        - coverage: Percentage of queried sources that returned results
+        - timed_out_sources: Sources dropped for missing the search deadline
+        - routing: Routing decision (selected_sources, skipped_sources,
+          routing_strategy, confidence, fallback; None if routing failed)
+        - alignment: Evidence alignment summary (duplicates_merged,
+          conflicts, latency_us; None if disabled or failed)
+        - cache_hit: True if the fused response was served from rag.cache
         - trace_id: Unique trace identifier for observability
 
+    Routing:
+        - With rag.routing.mode "adaptive", rag.routing picks the enabled
+          sources worth calling from the query intent and filters (see
+          routing.route_query); low-confidence decisions use all sources
+        - If the routed sources return nothing, the skipped sources are
+          queried within the remaining search budget
+
+    Concurrency:
+        - Selected sources are queried in parallel
+        - rag.timeouts.search_ms is the total wall-clock budget for all sources
+        - Sources that miss the deadline are dropped from fusion; their latency
+          is recorded as the budget and they count against coverage
+
+    Caching:
+        - With rag.cache enabled, fused responses are cached per
+          (query, filters, limit) and each source's results per
+          (query, filters, top_k) under that source's TTL
+        - Responses with timed-out sources are never cached
+        - Bypass rules (explicit flag, date filters, small limit) skip both layers
+
     Fusion Algorithm:
         - Uses Reciprocal Rank Fusion (RRF) by default
         - RRF formula: score = Σ(1 / (k + rank)) for each source
         - k parameter (default: 60) controls rank discount
         - Deduplicates by content_sha256 hash
+        - rag.evidence_alignment then merges near-duplicates across sources
         - Preserves provenance (which sources contributed each result)
 
     Example:
@@ -76,49 +112,102 @@ def search(query: str, filters: Optional[Dict[str, Any]] = None, limit: int = 20
     try:
         from rag.config import get_retrieval_config, is_sink_enabled, get_rag_value
         from rag.tracing import create_trace_id, emit_retrieval_event
+        from rag.fusion import fuse
+        from rag.cache import (
+            SEARCH_SCOPE, is_cache_enabled, get_bypass_reason, record_bypass,
+            get_cached, set_cached, cached_source_query, warm_cache_once
+        )
 
         # Generate trace ID for observability
         trace_id = create_trace_id()
         start_time = time.time()
 
+        use_cache = is_cache_enabled()
+        if use_cache:
+            warm_cache_once(search)  # rag.cache.warming, first request only
+            bypass_reason = get_bypass_reason(filters, limit, bypass_cache)
+            if bypass_reason:
+                record_bypass(bypass_reason)
+                use_cache = False
+
+        if use_cache:
+            cached = get_cached(SEARCH_SCOPE, query, filters, limit)
+            if cached is not None:
+                cached.update({
+                    "latency_ms": int((time.time() - start_time) * 1000),
+                    "cache_hit": True,
+                    "trace_id": trace_id
+                })
+                try:
+                    emit_retrieval_event(
+                        trace_id=trace_id,
+                        query=query,
+                        filters=filters,
+                        total_results=cached["total_results"],
+                        sources_used=cached["sources_used"],
+                        latency_ms=cached["latency_ms"],
+                        source_latencies={},
+                        coverage=cached["coverage"]
+                    )
+                except Exception as e:
+                    print(f"Warning: Failed to emit retrieval event: {str(e)}")
+                return cached
+
         # Get retrieval configuration
         config = get_retrieval_config()
         top_k = config.get("top_k", limit)
         timeout_ms = config.get("timeout_ms", 2000)
         weights = config.get("weights", {})
 
-        # Track which sources are available
-        available_sources = []
-        source_results = {}
-        source_latencies = {}
-
-        # Query each enabled source
-        # 1. Zep (semantic search)
-        if is_sink_enabled("zep"):
-            available_sources.append("zep")
-            zep_start = time.time()
-            zep_results = _query_zep(query, filters, top_k, timeout_ms / 1000.0)
-            source_latencies["zep"] = int((time.time() - zep_start) * 1000)
-            if zep_results.get("status") == "success":
-                source_results["zep"] = zep_results.get("results", [])
-
-        # 2. OpenSearch (keyword search)
-        if is_sink_enabled("opensearch"):
-            available_sources.append("opensearch")
-            os_start = time.time()
-            os_results = _query_opensearch(query, filters, top_k, timeout_ms / 1000.0)
-            source_latencies["opensearch"] = int((time.time() - os_start) * 1000)
-            if os_results.get("status") == "success":
-                source_results["opensearch"] = os_results.get("results", [])
-
-        # 3. BigQuery (SQL/structured search)
-        if is_sink_enabled("bigquery"):
-            available_sources.append("bigquery")
-            bq_start = time.time()
-            bq_results = _query_bigquery(query, filters, top_k, timeout_ms / 1000.0)
-            source_latencies["bigquery"] = int((time.time() - bq_start) * 1000)
-            if bq_results.get("status") == "success":
-                source_results["bigquery"] = bq_results.get("results", [])
+        # search_ms is the end-to-end wall-clock budget for the whole fan-out;
+        # no single source may hold its client open longer than that either
+        search_budget_ms = get_rag_value("timeouts.search_ms", 2000)
+        source_timeout_s = min(timeout_ms, search_budget_ms) / 1000.0
+
+        # Query enabled sources concurrently:
+        # zep (semantic), opensearch (keyword), bigquery (SQL/structured)
+        source_queries = {
+            "zep": _query_zep,
+            "opensearch": _query_opensearch,
+            "bigquery": _query_bigquery,
+        }
+        available_sources = [name for name in source_queries if is_sink_enabled(name)]
+        if use_cache:
+            source_queries = {name: cached_source_query(name, fn) for name, fn in source_queries.items()}
+
+        # rag.routing: only call the sources this query needs
+        routing = _route(query, filters, available_sources, trace_id)
+        queried_sources = routing["selected_sources"] if routing else available_sources
+
+        source_outcomes, source_latencies, timed_out_sources = _fan_out(
+            {name: source_queries[name] for name in queried_sources},
+            query,
+            filters,
+            top_k,
+            source_timeout_s,
+            search_budget_ms / 1000.0
+        )
+
+        source_results = _successful_results(source_outcomes, queried_sources)
+
+        # Routed sources found nothing: spend the remaining budget on the skipped ones
+        remaining_s = search_budget_ms / 1000.0 - (time.time() - start_time)
+        if routing and routing["skipped_sources"] and not any(source_results.values()) and remaining_s > 0:
+            skipped = routing["skipped_sources"]
+            outcomes, latencies, timed_out = _fan_out(
+                {name: source_queries[name] for name in skipped},
+                query,
+                filters,
+                top_k,
+                min(source_timeout_s, remaining_s),
+                remaining_s
+            )
+            source_results.update(_successful_results(outcomes, skipped))
+            source_latencies.update(latencies)
+            timed_out_sources.extend(timed_out)
+            queried_sources = queried_sources + skipped
+            routing["fallback"] = True
+            routing["reasoning"].append("No results from routed sources → queried skipped sources")
 
         # Check if any sources returned results
         if not source_results:
@@ -130,6 +219,9 @@ def search(query: str, filters: Optional[Dict[str, Any]] = None, limit: int = 20
                 "latency_ms": int((time.time() - start_time) * 1000),
                 "source_latencies": source_latencies,
                 "coverage": 0.0,
+                "timed_out_sources": timed_out_sources,
+                "routing": _routing_summary(routing),
+                "cache_hit": False,
                 "trace_id": trace_id,
                 "message": "No results from any source"
             }
@@ -138,19 +230,16 @@ def search(query: str, filters: Optional[Dict[str, Any]] = None, limit: int = 20
         fusion_method = get_rag_value("experiments.default_parameters.fusion.algorithm", "rrf")
         rrf_k = get_rag_value("experiments.default_parameters.fusion.rrf_k", 60)
 
-        if fusion_method == "rrf":
-            fused_results = _rrf_fusion(source_results, rrf_k)
-        elif fusion_method == "weighted":
-            fused_results = _weighted_fusion(source_results, weights)
-        else:
-            # Fallback: simple concatenation
-            fused_results = _simple_fusion(source_results)
-
-        # Limit results
+        # Dedup, score and heap-select the top candidates (rag.fusion); with
+        # evidence alignment on, extra candidates backfill merged near-duplicates
+        alignment_config = _alignment_config()
+        pool = limit * max(1, int(alignment_config.get("candidate_pool_factor", 2))) if alignment_config else limit
+        fused_results = fuse(source_results, fusion_method, limit=pool, weights=weights, rrf_k=rrf_k)
+        fused_results, alignment = _align(fused_results, alignment_config, trace_id)
         fused_results = fused_results[:limit]
 
         # Calculate coverage
-        coverage = (len(source_results) / len(available_sources) * 100) if available_sources else 0
+        coverage = (len(source_results) / len(queried_sources) * 100) if queried_sources else 0
 
         # Emit observability event
         total_latency = int((time.time() - start_time) * 1000)
@@ -169,7 +258,7 @@ def search(query: str, filters: Optional[Dict[str, Any]] = None, limit: int = 20
             # Don't fail retrieval if observability fails
             print(f"Warning: Failed to emit retrieval event: {str(e)}")
 
-        return {
+        response = {
             "results": fused_results,
             "total_results": len(fused_results),
             "sources_used": list(source_results.keys()),
@@ -177,9 +266,19 @@ def search(query: str, filters: Optional[Dict[str, Any]] = None, limit: int = 20
             "latency_ms": total_latency,
             "source_latencies": source_latencies,
             "coverage": coverage,
+            "timed_out_sources": timed_out_sources,
+            "routing": _routing_summary(routing),
+            "alignment": alignment,
+            "cache_hit": False,
             "trace_id": trace_id
         }
 
+        # Partial responses (sources cut off by the deadline) are not cached
+        if use_cache and not timed_out_sources:
+            set_cached(SEARCH_SCOPE, query, filters, limit, response)
+
+        return response
+
     except Exception as e:
         return {
             "results": [],
@@ -191,12 +290,131 @@ def search(query: str, filters: Optional[Dict[str, Any]] = None, limit: int = 20
         }
 
 
+def _route(query: str, filters: Optional[dict], available_sources: List[str], trace_id: str) -> Optional[dict]:
+    """Routing decision for this search, or None to query every available source."""
+    try:
+        from rag.routing import route_query
+        return route_query(query, filters, available_sources, trace_id=trace_id)
+    except Exception as e:
+        print(f"Warning: Query routing failed, using all sources: {str(e)}")
+        return None
+
+
+def _alignment_config() -> Optional[dict]:
+    """rag.evidence_alignment settings when enabled, else None."""
+    try:
+        from rag.config import get_evidence_alignment_config
+        config = get_evidence_alignment_config()
+        return config if config.get("enabled") else None
+    except Exception as e:
+        print(f"Warning: Failed to load evidence alignment config: {str(e)}")
+        return None
+
+
+def _align(results: List[dict], config: Optional[dict], trace_id: str) -> Tuple[List[dict], Optional[dict]]:
+    """Merge near-duplicates (best-effort); returns (results, alignment summary or None)."""
+    if config is None:
+        return results, None
+    try:
+        from rag.evidence_alignment import align_evidence
+        outcome = align_evidence(results, config, trace_id)
+    except Exception as e:
+        print(f"Warning: Evidence alignment failed, using fused results: {str(e)}")
+        return results, None
+    return outcome["results"], {
+        "duplicates_merged": outcome["duplicates_merged"],
+        "conflicts": outcome["conflicts"],
+        "latency_us": outcome["latency_us"]
+    }
+
+
+def _routing_summary(routing: Optional[dict]) -> Optional[dict]:
+    if routing is None:
+        return None
+    return {
+        key: routing[key]
+        for key in ("selected_sources", "skipped_sources", "routing_strategy", "confidence", "fallback")
+    }
+
+
+def _successful_results(source_outcomes: Dict[str, dict], sources: List[str]) -> Dict[str, List[dict]]:
+    """Results of the sources that answered successfully, in fan-out order."""
+    source_results = {}
+    for source_name in sources:
+        outcome = source_outcomes.get(source_name)
+        if outcome and outcome.get("status") == "success":
+            source_results[source_name] = outcome.get("results", [])
+    return source_results
+
+
+def _fan_out(
+    source_queries: Dict[str, Callable[..., dict]],
+    query: str,
+    filters: Optional[dict],
+    top_k: int,
+    source_timeout: float,
+    deadline: float
+) -> Tuple[Dict[str, dict], Dict[str, int], List[str]]:
+    """
+    Query all sources concurrently under a single overall deadline.
+
+    Args:
+        source_queries: Mapping of source name to its _query_* function
+        query: Search query string
+        filters: Optional query filters
+        top_k: Results to request per source
+        source_timeout: Client timeout passed to each source (seconds)
+        deadline: Total wall-clock budget for the fan-out (seconds)
+
+    Returns:
+        Tuple of (outcomes per finished source, latency per source in ms,
+        names of sources that missed the deadline)
+    """
+    if not source_queries:
+        return {}, {}, []
+
+    def _timed(query_fn: Callable[..., dict]) -> Tuple[dict, int]:
+        started = time.time()
+        try:
+            outcome = query_fn(query, filters, top_k, source_timeout)
+        except Exception as e:
+            outcome = {"status": "error", "message": str(e)}
+        return outcome, int((time.time() - started) * 1000)
+
+    executor = ThreadPoolExecutor(max_workers=len(source_queries), thread_name_prefix="rag-search")
+    try:
+        futures = {executor.submit(_timed, fn): name for name, fn in source_queries.items()}
+        done, not_done = wait(futures, timeout=deadline)
+    finally:
+        # Never block on stragglers; they finish (or time out) in the background
+        executor.shutdown(wait=False)
+
+    outcomes = {}
+    latencies = {}
+    for future in done:
+        name = futures[future]
+        outcomes[name], latencies[name] = future.result()
+
+    timed_out = []
+    for future in not_done:
+        name = futures[future]
+        future.cancel()
+        latencies[name] = int(deadline * 1000)
+        timed_out.append(name)
+
+    # Keep source order stable for callers and traces
+    order = list(source_queries)
+    latencies = {name: latencies[name] for name in order if name in latencies}
+    timed_out.sort(key=order.index)
+
+    return outcomes, latencies, timed_out
+
+
 def _query_zep(query: str, filters: Optional[dict], top_k: int, timeout: float) -> dict:
     """Query Zep for semantic search results."""
     try:
-        # Import Zep client
-        import requests
         from rag.config import get_rag_value
+        from rag.clients import get_http_session
 
         api_key = get_optional_env_var("ZEP_API_KEY")
         if not api_key:
@@ -209,7 +427,8 @@ def _query_zep(query: str, filters: Optional[dict], top_k: int, timeout: float)
         # Using memory search endpoint with collection filter
         collection_name = get_rag_value("zep.namespace.drive", "autopiloot-dev")
 
-        response = requests.post(
+        # Keep-alive session shared with other Zep calls in this process
+        response = get_http_session(base_url).post(
             f"{base_url}/memory/search",
             headers={
                 "Authorization": f"Bearer {api_key}",
@@ -249,8 +468,8 @@ def _query_zep(query: str, filters: Optional[dict], top_k: int, timeout: float)
 def _query_opensearch(query: str, filters: Optional[dict], top_k: int, timeout: float) -> dict:
     """Query OpenSearch for keyword search results."""
     try:
-        from opensearchpy import OpenSearch
         from rag.config import get_rag_value
+        from rag.clients import get_opensearch_client
 
         host = get_optional_env_var("OPENSEARCH_HOST")
         if not host:
@@ -260,37 +479,11 @@ def _query_opensearch(query: str, filters: Optional[dict], top_k: int, timeout:
         username = get_optional_env_var("OPENSEARCH_USERNAME")
         password = get_optional_env_var("OPENSEARCH_PASSWORD")
 
-        # Initialize client
-        if host.startswith("http://") or host.startswith("https://"):
-            use_ssl = host.startswith("https://")
-            host_without_protocol = host.replace("https://", "").replace("http://", "")
-        else:
-            use_ssl = True
-            host_without_protocol = host
-
-        if ":" in host_without_protocol:
-            hostname, port = host_without_protocol.rsplit(":", 1)
-            port = int(port)
-        else:
-            hostname = host_without_protocol
-            port = 443 if use_ssl else 9200
-
-        if api_key:
-            auth = ("api_key", api_key)
-        elif username and password:
-            auth = (username, password)
-        else:
+        if not api_key and not (username and password):
             return {"status": "error", "message": "OpenSearch authentication not configured"}
 
-        client = OpenSearch(
-            hosts=[{"host": hostname, "port": port}],
-            http_auth=auth,
-            use_ssl=use_ssl,
-            verify_certs=get_rag_value("opensearch.connection.verify_certs", True),
-            ssl_assert_hostname=False,
-            ssl_show_warn=False,
-            timeout=timeout
-        )
+        # Shared, pooled client; the timeout applies per request
+        client = get_opensearch_client(host, api_key, username, password)
 
         # Build query
         index_name = get_rag_value("opensearch.index_transcripts", "autopiloot_transcripts")
@@ -317,7 +510,7 @@ def _query_opensearch(query: str, filters: Optional[dict], top_k: int, timeout:
                 query_body["query"]["bool"]["filter"] = filter_clauses
 
         # Execute search
-        response = client.search(index=index_name, body=query_body)
+        response = client.search(index=index_name, body=query_body, request_timeout=timeout)
 
         results = []
         for hit in response["hits"]["hits"]:
@@ -339,48 +532,70 @@ def _query_opensearch(query: str, filters: Optional[dict], top_k: int, timeout:
 
 
 def _query_bigquery(query: str, filters: Optional[dict], top_k: int, timeout: float) -> dict:
-    """Query BigQuery for SQL-based search results."""
+    """
+    Query BigQuery for structured search results.
+
+    rag.bigquery.search.mode "search_index" (default) matches query terms
+    with SEARCH(), which the streamer's search index serves without a full
+    scan, and ranks rows by relevance: the weighted share of query terms
+    found in each searched column. "like" keeps the substring scan over
+    text_snippet (every hit scores 1.0). Date filters prune published_at
+    partitions; channel_id/video_id filters prune clustered blocks.
+
+    Returns:
+        Source result with results, search_mode and bytes_scanned
+        (total_bytes_processed of the query job)
+    """
     try:
         from google.cloud import bigquery
         from rag.config import get_rag_value
+        from rag.clients import get_bigquery_client
 
         project_id = get_optional_env_var("GCP_PROJECT_ID")
         if not project_id:
             return {"status": "skipped", "message": "BigQuery not configured"}
 
-        client = bigquery.Client(project=project_id)
-
         dataset = get_rag_value("bigquery.dataset", "autopiloot")
         table = get_rag_value("bigquery.tables.transcript_chunks", "transcript_chunks")
         table_id = f"{project_id}.{dataset}.{table}"
 
-        # Build SQL query with text search
-        where_clauses = []
-        params = []
-
-        # Text search on snippet
-        where_clauses.append("LOWER(text_snippet) LIKE LOWER(@query_pattern)")
-        params.append(bigquery.ScalarQueryParameter("query_pattern", "STRING", f"%{query}%"))
+        search_config = get_rag_value("bigquery.search", {}) or {}
+        mode = search_config.get("mode", "search_index")
 
-        # Add filters
-        if filters:
-            if filters.get("channel_id"):
-                where_clauses.append("channel_id = @channel_id")
-                params.append(bigquery.ScalarQueryParameter("channel_id", "STRING", filters["channel_id"]))
-            if filters.get("video_id"):
-                where_clauses.append("video_id = @video_id")
-                params.append(bigquery.ScalarQueryParameter("video_id", "STRING", filters["video_id"]))
+        where_clauses, params = _bigquery_filter_clauses(filters, bigquery)
 
-        where_clause = " AND ".join(where_clauses) if where_clauses else "TRUE"
+        if mode == "like":
+            # Substring scan on snippet
+            where_clauses.insert(0, "LOWER(text_snippet) LIKE LOWER(@query_pattern)")
+            params.append(bigquery.ScalarQueryParameter("query_pattern", "STRING", f"%{query}%"))
+            score_sql = "1.0"
+        else:
+            mode = "search_index"
+            terms = _search_terms(query, search_config.get("max_terms", 8))
+            if not terms:
+                return {"status": "success", "results": [], "search_mode": mode, "bytes_scanned": 0}
+            match_sql, score_sql = _search_sql(
+                len(terms),
+                search_config.get("columns", ["title", "text_snippet"]),
+                search_config.get("analyzer", "LOG_ANALYZER"),
+                float(search_config.get("title_weight", 0.5))
+            )
+            where_clauses.insert(0, match_sql)
+            params.extend(
+                bigquery.ScalarQueryParameter(f"term_{i}", "STRING", term) for i, term in enumerate(terms)
+            )
 
         sql = f"""
-            SELECT video_id, chunk_id, title, text_snippet as text, content_sha256
+            SELECT video_id, chunk_id, title, text_snippet as text, content_sha256,
+                   {score_sql} AS score
             FROM `{table_id}`
-            WHERE {where_clause}
+            WHERE {" AND ".join(where_clauses)}
+            ORDER BY score DESC, published_at DESC
             LIMIT @top_k
         """
         params.append(bigquery.ScalarQueryParameter("top_k", "INT64", top_k))
 
+        client = get_bigquery_client(project_id)
         job_config = bigquery.QueryJobConfig(query_parameters=params)
         query_job = client.query(sql, job_config=job_config, timeout=timeout)
         rows = query_job.result()
@@ -392,128 +607,114 @@ def _query_bigquery(query: str, filters: Optional[dict], top_k: int, timeout: fl
                 "video_id": row.video_id,
                 "title": row.title,
                 "text": row.text,
-                "score": 1.0,  # BigQuery doesn't provide relevance scores
+                "score": float(row.score),
                 "content_sha256": row.content_sha256,
                 "source": "bigquery"
             })
 
-        return {"status": "success", "results": results}
+        return {
+            "status": "success",
+            "results": results,
+            "search_mode": mode,
+            "bytes_scanned": query_job.total_bytes_processed or 0
+        }
 
     except Exception as e:
         return {"status": "error", "message": f"BigQuery query error: {str(e)}"}
 
 
-def _rrf_fusion(source_results: Dict[str, List[dict]], k: int = 60) -> List[dict]:
+def _search_terms(query: str, max_terms: int) -> List[str]:
     """
-    Perform Reciprocal Rank Fusion across multiple result sets.
+    Distinct lowercase word tokens of the query, first max_terms.
 
-    RRF formula: score = Σ(1 / (k + rank)) for each source
+    Tokens are Unicode letter/digit runs split on everything else (including
+    "_"), like LOG_ANALYZER, so "café" and "привет" stay whole words.
+    Single ASCII characters are dropped; single non-ASCII characters
+    (e.g. a CJK ideograph) are kept.
     """
-    from rag.hashing import sha256_hex
-
-    # Build unified result set with provenance
-    unified = {}
-
-    for source_name, results in source_results.items():
-        for rank, result in enumerate(results, start=1):
-            # Use content hash as deduplication key
-            key = result.get("content_sha256") or sha256_hex(result.get("text", ""))
-
-            if key not in unified:
-                unified[key] = {
-                    **result,
-                    "rrf_score": 0.0,
-                    "sources": [],
-                    "provenance": {}
-                }
+    terms = []
+    for term in re.findall(r"[^\W_]+", query.lower()):
+        if (len(term) > 1 or not term.isascii()) and term not in terms:
+            terms.append(term)
+    return terms[:max_terms]
 
-            # Add RRF score contribution
-            rrf_score = 1.0 / (k + rank)
-            unified[key]["rrf_score"] += rrf_score
-
-            # Track provenance
-            if source_name not in unified[key]["sources"]:
-                unified[key]["sources"].append(source_name)
-            unified[key]["provenance"][source_name] = {
-                "score": result.get("score", 0.0),
-                "rank": rank
-            }
 
-    # Sort by RRF score descending
-    ranked_results = sorted(unified.values(), key=lambda x: x["rrf_score"], reverse=True)
+def _search_sql(term_count: int, columns: List[str], analyzer: str, title_weight: float) -> Tuple[str, str]:
+    """
+    WHERE predicate and score expression for SEARCH() over @term_0..@term_n.
 
-    # Clean up internal fields and rename rrf_score to score
-    for result in ranked_results:
-        result["score"] = result.pop("rrf_score")
-        result.pop("content_sha256", None)
+    A row matches if any term is found in any column. Its score is the sum
+    of column weights (title: title_weight, others: 1.0) over matched
+    (term, column) pairs, normalized to 0..1.
+    """
+    matches = []
+    weighted = []
+    for i in range(term_count):
+        for column in columns:
+            found = f"SEARCH({column}, @term_{i}, analyzer => '{analyzer}')"
+            weight = title_weight if column == "title" else 1.0
+            matches.append(found)
+            weighted.append(f"IF({found}, {weight}, 0)")
+
+    total = term_count * sum(title_weight if column == "title" else 1.0 for column in columns)
+    match_sql = "(" + " OR ".join(matches) + ")"
+    score_sql = f"({' + '.join(weighted)}) / {total or 1.0}"
+    return match_sql, score_sql
+
+
+def _bigquery_filter_clauses(filters: Optional[dict], bigquery_module) -> Tuple[List[str], list]:
+    """WHERE clauses and query parameters for search() filters."""
+    clauses = []
+    params = []
+    if not filters:
+        return clauses, params
+
+    if filters.get("channel_id"):
+        clauses.append("channel_id = @channel_id")
+        params.append(bigquery_module.ScalarQueryParameter("channel_id", "STRING", filters["channel_id"]))
+    if filters.get("video_id"):
+        clauses.append("video_id = @video_id")
+        params.append(bigquery_module.ScalarQueryParameter("video_id", "STRING", filters["video_id"]))
+    # Compared against the partitioning column directly so BigQuery prunes partitions
+    if filters.get("date_from"):
+        clauses.append("published_at >= TIMESTAMP(@date_from)")
+        params.append(bigquery_module.ScalarQueryParameter("date_from", "STRING", filters["date_from"]))
+    if filters.get("date_to"):
+        clauses.append("published_at <= TIMESTAMP(@date_to)")
+        params.append(bigquery_module.ScalarQueryParameter("date_to", "STRING", filters["date_to"]))
+    if filters.get("min_duration_sec") is not None:
+        clauses.append("duration_sec >= @min_duration_sec")
+        params.append(bigquery_module.ScalarQueryParameter("min_duration_sec", "INT64", filters["min_duration_sec"]))
+    if filters.get("max_duration_sec") is not None:
+        clauses.append("duration_sec <= @max_duration_sec")
+        params.append(bigquery_module.ScalarQueryParameter("max_duration_sec", "INT64", filters["max_duration_sec"]))
+    return clauses, params
+
+
+def _rrf_fusion(source_results: Dict[str, List[dict]], k: int = 60, limit: Optional[int] = None) -> List[dict]:
+    """
+    Perform Reciprocal Rank Fusion across multiple result sets.
 
-    return ranked_results
+    RRF formula: score = Σ(1 / (k + rank)) for each source
+    """
+    from rag.fusion import fuse
+    return fuse(source_results, "rrf", limit=limit, rrf_k=k)
 
 
-def _weighted_fusion(source_results: Dict[str, List[dict]], weights: Dict[str, float]) -> List[dict]:
+def _weighted_fusion(
+    source_results: Dict[str, List[dict]],
+    weights: Dict[str, float],
+    limit: Optional[int] = None
+) -> List[dict]:
     """Perform weighted fusion based on source weights."""
-    from rag.hashing import sha256_hex
-
-    unified = {}
-
-    for source_name, results in source_results.items():
-        weight = weights.get(source_name, 1.0)
-
-        for result in results:
-            key = result.get("content_sha256") or sha256_hex(result.get("text", ""))
-
-            if key not in unified:
-                unified[key] = {
-                    **result,
-                    "weighted_score": 0.0,
-                    "sources": [],
-                    "provenance": {}
-                }
+    from rag.fusion import fuse
+    return fuse(source_results, "weighted", limit=limit, weights=weights)
 
-            # Add weighted score
-            score = result.get("score", 0.0) * weight
-            unified[key]["weighted_score"] += score
 
-            if source_name not in unified[key]["sources"]:
-                unified[key]["sources"].append(source_name)
-            unified[key]["provenance"][source_name] = {"score": result.get("score", 0.0)}
-
-    # Sort by weighted score
-    ranked_results = sorted(unified.values(), key=lambda x: x["weighted_score"], reverse=True)
-
-    for result in ranked_results:
-        result["score"] = result.pop("weighted_score")
-        result.pop("content_sha256", None)
-
-    return ranked_results
-
-
-def _simple_fusion(source_results: Dict[str, List[dict]]) -> List[dict]:
+def _simple_fusion(source_results: Dict[str, List[dict]], limit: Optional[int] = None) -> List[dict]:
     """Simple concatenation fusion (fallback)."""
-    from rag.hashing import sha256_hex
-
-    unified = {}
-
-    for source_name, results in source_results.items():
-        for result in results:
-            key = result.get("content_sha256") or sha256_hex(result.get("text", ""))
-
-            if key not in unified:
-                unified[key] = {
-                    **result,
-                    "sources": [source_name],
-                    "provenance": {source_name: {"score": result.get("score", 0.0)}}
-                }
-            else:
-                if source_name not in unified[key]["sources"]:
-                    unified[key]["sources"].append(source_name)
-                unified[key]["provenance"][source_name] = {"score": result.get("score", 0.0)}
-
-    results = list(unified.values())
-    for result in results:
-        result.pop("content_sha256", None)
-
-    return results
+    from rag.fusion import fuse
+    return fuse(source_results, "simple", limit=limit)
 
 
 if __name__ == "__main__":
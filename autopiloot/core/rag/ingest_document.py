@@ -7,6 +7,7 @@ Similar to transcript ingest but with document-specific metadata.
 
 import os
 import sys
+import time
 from typing import Dict
 
 # Add module directories to path
@@ -17,6 +18,7 @@ from hashing import sha256_hex
 from opensearch_indexer import index_transcript_chunks as index_documents
 from bigquery_streamer import stream_transcript_chunks as stream_documents
 from zep_upsert import upsert_transcript as upsert_document
+from sinks import write_to_sinks, summarize_sink_results
 
 
 def ingest(payload: dict) -> dict:
@@ -37,6 +39,8 @@ def ingest(payload: dict) -> dict:
         - status: "success", "partial", or "error"
         - chunk_count: Total chunks created
         - sinks: Dictionary of sink results
+        - sink_latencies: Write latency per sink in milliseconds
+        - timed_out_sinks: Sinks that exceeded rag.timeouts.index_ms
         - message: Human-readable status message
 
     Example:
@@ -54,6 +58,8 @@ def ingest(payload: dict) -> dict:
     try:
         from rag.config import get_chunking_config
 
+        start_time = time.time()
+
         # Extract payload
         document_id = payload.get("document_id")
         document_text = payload.get("document_text")
@@ -111,23 +117,47 @@ def ingest(payload: dict) -> dict:
                 "text_snippet": chunk_text[:256]
             })
 
-        # Send to sinks
-        sink_results = {
-            "opensearch": index_documents(opensearch_docs),
-            "bigquery": stream_documents(bigquery_rows)
-        }
+        # Send to sinks concurrently, each under rag.timeouts.index_ms
+        sink_results, sink_latencies, timed_out_sinks = write_to_sinks({
+            "opensearch": lambda: index_documents(opensearch_docs),
+            "bigquery": lambda: stream_documents(bigquery_rows)
+        })
 
         # Determine status
-        any_success = any(r.get("status") in ["indexed", "streamed"] for r in sink_results.values())
-        all_success = all(r.get("status") in ["indexed", "streamed", "skipped"] for r in sink_results.values())
-
-        overall_status = "success" if all_success else "partial" if any_success else "error"
+        summary = summarize_sink_results(sink_results, chunk_count)
+        overall_status = summary["status"]
+        any_success = summary["any_success"]
+
+        try:
+            from rag.tracing import emit_ingest_event
+            emit_ingest_event(
+                operation="document",
+                video_id=document_id,
+                chunk_count=chunk_count,
+                sinks_used=summary["sinks_used"],
+                success_count=summary["success_count"],
+                error_count=summary["error_count"],
+                latency_ms=int((time.time() - start_time) * 1000),
+                sink_latencies=sink_latencies
+            )
+        except Exception as e:
+            print(f"Warning: Failed to emit ingest event: {str(e)}")
+
+        # New content makes cached retrieval results stale
+        if any_success:
+            try:
+                from rag.cache import invalidate_on_new_content
+                invalidate_on_new_content()
+            except Exception as e:
+                print(f"Warning: Failed to invalidate retrieval cache: {str(e)}")
 
         return {
             "status": overall_status,
             "document_id": document_id,
             "chunk_count": chunk_count,
             "sinks": sink_results,
+            "sink_latencies": sink_latencies,
+            "timed_out_sinks": timed_out_sinks,
             "message": f"Ingested {chunk_count} document chunks (status: {overall_status})"
         }
 
@@ -2,12 +2,17 @@
 Transcript Ingest Flow
 
 Coordinates chunking and ingestion across all enabled RAG sinks (OpenSearch, BigQuery, Zep).
-Provides unified interface for transcript indexing with parallel sink processing.
+Provides unified interface for transcript indexing with parallel sink processing,
+plus ingest_many() for backfills that share sink requests across videos.
 """
 
 import os
 import sys
-from typing import Dict, List
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from typing import Dict, Iterator, List, Optional, Tuple
 
 # Add module directories to path
 sys.path.append(os.path.join(os.path.dirname(__file__)))
@@ -16,7 +21,19 @@ from chunker import chunk_with_metadata
 from hashing import sha256_hex
 from opensearch_indexer import index_transcript_chunks
 from bigquery_streamer import stream_transcript_chunks
-from zep_upsert import upsert_transcript
+from zep_upsert import upsert_transcript_batch
+from sinks import write_to_sinks, summarize_sink_results, get_enabled_sinks, written_chunk_ids
+
+
+DEFAULT_BATCH_MAX_WORKERS = 4
+DEFAULT_VIDEOS_PER_BATCH = 25
+DEFAULT_BATCH_SINK_TIMEOUT_MS = 120000
+DEFAULT_BATCH_ZEP_CONCURRENCY = 4
+
+TRANSCRIPT_SINKS = ("opensearch", "bigquery", "zep")
+
+# Prepared payload list holding each sink's documents
+_SINK_PAYLOAD_KEYS = {"opensearch": "opensearch_docs", "bigquery": "bigquery_rows", "zep": "zep_messages"}
 
 
 def ingest(payload: dict) -> dict:
@@ -38,6 +55,10 @@ def ingest(payload: dict) -> dict:
         - status: "success", "partial", or "error"
         - chunk_count: Total chunks created
         - sinks: Dictionary of sink results (opensearch, bigquery, zep)
+        - sink_latencies: Write latency per sink in milliseconds
+        - timed_out_sinks: Sinks that exceeded rag.timeouts.index_ms
+        - ledger: skipped_count/changed_count/removed_count and chunks sent
+          per sink (only when rag.ledger is enabled)
         - message: Human-readable status message
 
     Process:
@@ -45,9 +66,11 @@ def ingest(payload: dict) -> dict:
         2. Chunk transcript with token-aware boundaries
         3. Generate content hashes for each chunk
         4. Prepare sink-specific payloads
-        5. Send to enabled sinks in parallel (OpenSearch, BigQuery, Zep)
-        6. Collect and aggregate results
-        7. Return unified status
+        5. Consult the ingest ledger and drop chunks each sink already holds
+        6. Send to enabled sinks in parallel (OpenSearch, BigQuery, Zep),
+           each under its own rag.timeouts.index_ms timeout
+        7. Record stored chunks in the ledger, aggregate results
+        8. Return unified status
 
     Example:
         >>> payload = {
@@ -68,145 +91,586 @@ def ingest(payload: dict) -> dict:
         # Import config
         from rag.config import get_chunking_config
 
-        # Extract payload
-        video_id = payload.get("video_id")
-        transcript_text = payload.get("transcript_text")
-        channel_id = payload.get("channel_id")
+        start_time = time.time()
 
-        if not video_id or not transcript_text or not channel_id:
-            return {
-                "status": "error",
-                "message": "Missing required fields: video_id, transcript_text, channel_id"
-            }
+        video_id = payload.get("video_id")
 
         # Get chunking configuration
         chunking_config = get_chunking_config()
         max_tokens = chunking_config["max_tokens_per_chunk"]
         overlap_tokens = chunking_config["overlap_tokens"]
 
-        # Step 1: Chunk transcript
+        # Steps 1-2: Chunk, hash and prepare documents for each sink
+        prepared = _prepare_video(payload, max_tokens, overlap_tokens)
+        if "error" in prepared:
+            return {
+                "status": "error",
+                "message": prepared["error"]
+            }
+
+        chunk_count = prepared["chunk_count"]
+
+        # Step 3: Skip chunks the ledger shows every sink already holds
+        sink_payloads, ledger_plan = _plan_sink_payloads(prepared)
+
+        # Step 4: Send to sinks concurrently so one slow sink doesn't gate the others
+        sink_writers = {
+            # OpenSearch (keyword search)
+            "opensearch": lambda: index_transcript_chunks(sink_payloads["opensearch"]),
+            # BigQuery (SQL analytics)
+            "bigquery": lambda: stream_transcript_chunks(sink_payloads["bigquery"]),
+            # Zep (semantic search): one thread check, batched messages
+            "zep": lambda: upsert_transcript_batch(video_id, sink_payloads["zep"])
+        }
+        results, sink_latencies, timed_out_sinks = write_to_sinks({
+            sink: writer for sink, writer in sink_writers.items()
+            if ledger_plan is None or sink_payloads[sink]
+        })
+        sink_results = {sink: results.get(sink) or _unchanged_result(chunk_count) for sink in sink_writers}
+        _record_ledger(prepared, ledger_plan, sink_payloads, sink_results)
+
+        # Step 5: Determine overall status
+        summary = summarize_sink_results(sink_results, chunk_count)
+        overall_status = summary["status"]
+        any_success = summary["any_success"]
+
+        try:
+            from rag.tracing import emit_ingest_event
+            emit_ingest_event(
+                operation="transcript",
+                video_id=video_id,
+                chunk_count=chunk_count,
+                sinks_used=summary["sinks_used"],
+                success_count=summary["success_count"],
+                error_count=summary["error_count"],
+                latency_ms=int((time.time() - start_time) * 1000),
+                sink_latencies=sink_latencies
+            )
+        except Exception as e:
+            print(f"Warning: Failed to emit ingest event: {str(e)}")
+
+        # New content makes cached retrieval results stale
+        if any_success:
+            try:
+                from rag.cache import invalidate_on_new_content
+                invalidate_on_new_content()
+            except Exception as e:
+                print(f"Warning: Failed to invalidate retrieval cache: {str(e)}")
+
+        _flush_queued_refs()
+
+        response = {
+            "status": overall_status,
+            "video_id": video_id,
+            "chunk_count": chunk_count,
+            "sinks": sink_results,
+            "sink_latencies": sink_latencies,
+            "timed_out_sinks": timed_out_sinks,
+            "message": f"Ingested {chunk_count} chunks to RAG sinks (status: {overall_status})"
+        }
+        if ledger_plan is not None:
+            from rag.ledger import summarize_plan
+            response["ledger"] = summarize_plan(ledger_plan)
+            response["message"] += (f"; {ledger_plan['skipped_count']} unchanged chunks skipped, "
+                                    f"{ledger_plan['changed_count']} changed")
+        return response
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"Transcript ingest failed: {str(e)}"
+        }
+
+
+def _prepare_video(payload: dict, max_tokens: int, overlap_tokens: int) -> dict:
+    """
+    Validate, chunk and hash one transcript and build its per-sink payloads.
+
+    Module-level and side-effect free so ingest_many() can run it in a worker
+    process.
+
+    Returns:
+        Dictionary with video_id, chunk_count, opensearch_docs, bigquery_rows
+        and zep_messages, or with video_id and error when the payload is invalid
+    """
+    video_id = payload.get("video_id")
+    transcript_text = payload.get("transcript_text")
+    channel_id = payload.get("channel_id")
+
+    if not video_id or not transcript_text or not channel_id:
+        return {
+            "video_id": video_id,
+            "error": "Missing required fields: video_id, transcript_text, channel_id"
+        }
+
+    try:
         chunks = chunk_with_metadata(
             text=transcript_text,
             max_tokens=max_tokens,
             overlap_tokens=overlap_tokens,
             doc_id=video_id
         )
+    except Exception as e:
+        return {"video_id": video_id, "error": f"Chunking failed: {str(e)}"}
 
-        chunk_count = len(chunks)
-
-        # Step 2: Prepare documents for each sink
-        opensearch_docs = []
-        bigquery_rows = []
-        zep_messages = []
+    opensearch_docs = []
+    bigquery_rows = []
+    zep_messages = []
 
-        for chunk in chunks:
-            chunk_id = chunk["chunk_id"]
-            chunk_text = chunk["text"]
-            chunk_hash = sha256_hex(chunk_text)
+    for chunk in chunks:
+        chunk_id = chunk["chunk_id"]
+        chunk_text = chunk["text"]
+        chunk_hash = sha256_hex(chunk_text)
 
-            # OpenSearch document
-            opensearch_docs.append({
+        # OpenSearch document
+        opensearch_docs.append({
+            "video_id": video_id,
+            "chunk_id": chunk_id,
+            "chunk_index": chunk["chunk_index"],
+            "total_chunks": chunk["total_chunks"],
+            "title": payload.get("title"),
+            "channel_id": channel_id,
+            "channel_handle": payload.get("channel_handle"),
+            "published_at": payload.get("published_at"),
+            "duration_sec": payload.get("duration_sec"),
+            "content_sha256": chunk_hash,
+            "tokens": chunk["tokens"],
+            "text": chunk_text
+        })
+
+        # BigQuery row (metadata only, truncated preview)
+        bigquery_rows.append({
+            "video_id": video_id,
+            "chunk_id": chunk_id,
+            "title": payload.get("title"),
+            "channel_id": channel_id,
+            "published_at": payload.get("published_at"),
+            "duration_sec": payload.get("duration_sec"),
+            "content_sha256": chunk_hash,
+            "tokens": chunk["tokens"],
+            "text_snippet": chunk_text[:256] if len(chunk_text) > 256 else chunk_text
+        })
+
+        # Zep message
+        zep_messages.append({
+            "text": chunk_text,
+            "metadata": {
                 "video_id": video_id,
                 "chunk_id": chunk_id,
-                "chunk_index": chunk["chunk_index"],
-                "total_chunks": chunk["total_chunks"],
-                "title": payload.get("title"),
                 "channel_id": channel_id,
-                "channel_handle": payload.get("channel_handle"),
-                "published_at": payload.get("published_at"),
-                "duration_sec": payload.get("duration_sec"),
-                "content_sha256": chunk_hash,
-                "tokens": chunk["tokens"],
-                "text": chunk_text
-            })
-
-            # BigQuery row (metadata only, truncated preview)
-            bigquery_rows.append({
-                "video_id": video_id,
-                "chunk_id": chunk_id,
                 "title": payload.get("title"),
-                "channel_id": channel_id,
-                "published_at": payload.get("published_at"),
-                "duration_sec": payload.get("duration_sec"),
                 "content_sha256": chunk_hash,
-                "tokens": chunk["tokens"],
-                "text_snippet": chunk_text[:256] if len(chunk_text) > 256 else chunk_text
-            })
-
-            # Zep message
-            zep_messages.append({
-                "text": chunk_text,
-                "metadata": {
-                    "video_id": video_id,
-                    "chunk_id": chunk_id,
-                    "channel_id": channel_id,
-                    "title": payload.get("title"),
-                    "content_sha256": chunk_hash,
-                    "tokens": chunk["tokens"]
-                }
-            })
-
-        # Step 3: Send to enabled sinks
-        sink_results = {}
-
-        # OpenSearch (keyword search)
-        opensearch_result = index_transcript_chunks(opensearch_docs)
-        sink_results["opensearch"] = opensearch_result
-
-        # BigQuery (SQL analytics)
-        bigquery_result = stream_transcript_chunks(bigquery_rows)
-        sink_results["bigquery"] = bigquery_result
-
-        # Zep (semantic search)
-        zep_results = []
-        for msg in zep_messages:
-            zep_result = upsert_transcript(msg["text"], msg["metadata"])
-            zep_results.append(zep_result)
-
-        # Aggregate Zep results
-        zep_success = sum(1 for r in zep_results if r.get("status") == "upserted")
-        zep_skipped = sum(1 for r in zep_results if r.get("status") == "skipped")
-        zep_errors = sum(1 for r in zep_results if r.get("status") == "error")
-
-        sink_results["zep"] = {
-            "status": "upserted" if zep_success == len(zep_messages) else "partial" if zep_success > 0 else "error",
-            "upserted_count": zep_success,
-            "skipped_count": zep_skipped,
-            "error_count": zep_errors,
-            "message": f"Upserted {zep_success}/{len(zep_messages)} chunks to Zep"
-        }
+                "tokens": chunk["tokens"]
+            }
+        })
+
+    return {
+        "video_id": video_id,
+        "chunk_count": len(chunks),
+        "opensearch_docs": opensearch_docs,
+        "bigquery_rows": bigquery_rows,
+        "zep_messages": zep_messages
+    }
 
-        # Step 4: Determine overall status
-        any_success = any(
-            result.get("status") in ["indexed", "streamed", "upserted"]
-            for result in sink_results.values()
-        )
-        all_success = all(
-            result.get("status") in ["indexed", "streamed", "upserted", "skipped"]
-            for result in sink_results.values()
-        )
 
-        if all_success:
-            overall_status = "success"
-        elif any_success:
-            overall_status = "partial"
-        else:
-            overall_status = "error"
+def _plan_sink_payloads(prepared: dict) -> Tuple[Dict[str, list], Optional[dict]]:
+    """
+    Per-sink payloads after consulting the ingest ledger.
+
+    Returns:
+        Tuple of (documents to send per sink, ledger plan or None when the
+        ledger is disabled). Sinks disabled by their flag keep the full list;
+        they skip without network calls.
+    """
+    sink_payloads = {sink: prepared[key] for sink, key in _SINK_PAYLOAD_KEYS.items()}
+
+    try:
+        from rag.ledger import plan_chunks
+        hashes = [doc["content_sha256"] for doc in prepared["opensearch_docs"]]
+        plan = plan_chunks(prepared["video_id"], hashes, get_enabled_sinks(TRANSCRIPT_SINKS))
+    except Exception as e:
+        print(f"Warning: Ingest ledger unavailable, sending all chunks: {str(e)}")
+        plan = None
+
+    if plan is not None:
+        for sink, indexes in plan["pending"].items():
+            sink_payloads[sink] = [sink_payloads[sink][i] for i in indexes]
+
+    return sink_payloads, plan
+
 
+def _record_ledger(prepared: dict, plan: Optional[dict], sink_payloads: Dict[str, list], sink_results: Dict[str, dict]) -> None:
+    """Record the chunks each sink stored (no-op when the ledger is disabled)."""
+    if plan is None:
+        return
+
+    try:
+        from rag.ledger import record_chunks
+
+        index_by_chunk_id = {doc["chunk_id"]: i for i, doc in enumerate(prepared["opensearch_docs"])}
+        written = {}
+        for sink in plan["pending"]:
+            sent_ids = [
+                item["metadata"]["chunk_id"] if sink == "zep" else item["chunk_id"]
+                for item in sink_payloads[sink]
+            ]
+            stored = written_chunk_ids(sink, sink_results.get(sink) or {}, sent_ids)
+            written[sink] = {index_by_chunk_id[chunk_id] for chunk_id in stored if chunk_id in index_by_chunk_id}
+
+        record_chunks(plan, written)
+    except Exception as e:
+        print(f"Warning: Failed to update ingest ledger for {prepared['video_id']}: {str(e)}")
+
+
+def _unchanged_result(chunk_count: int) -> dict:
+    return {
+        "status": "skipped",
+        "skipped_count": chunk_count,
+        "message": "No new or changed chunks for this sink (ingest ledger)"
+    }
+
+
+def ingest_many(
+    payloads: List[dict],
+    max_workers: Optional[int] = None,
+    videos_per_batch: Optional[int] = None
+) -> dict:
+    """
+    Ingest many transcripts with shared sink requests across videos.
+
+    Chunking and hashing run in a process pool. Each video is checked
+    against the ingest ledger so unchanged chunks are dropped, then prepared
+    videos are grouped and each group's sink writes are merged: one OpenSearch _bulk
+    stream and one BigQuery multi-row insert per group, with the group's Zep
+    threads upserted concurrently (Zep messages belong to one thread per
+    video, so they are batched per video rather than merged). When
+    rag.features.write_firestore_refs is on, one ref per ingested video is
+    queued and all of them are committed in WriteBatch groups at the end.
+
+    Args:
+        payloads: List of ingest() payloads
+        max_workers: Processes for chunking/hashing
+            (default: rag.ingest.batch.max_workers; 1 runs in-process)
+        videos_per_batch: Videos merged into one set of sink requests; the
+            throughput knob (default: rag.ingest.batch.videos_per_batch)
+
+    Returns:
+        Dictionary containing:
+        - status: "success", "partial", or "error"
+        - video_count, succeeded_count, failed_count, chunk_count
+        - videos: Per-video results in input order ({"video_id", "status",
+          "chunk_count", "sinks", "message", and "ledger" when enabled})
+        - batches: Per-group sink latencies and timed-out sinks
+        - elapsed_sec, videos_per_sec, chunks_per_sec
+        - message: Human-readable status message
+
+    Example:
+        >>> result = ingest_many(payloads, videos_per_batch=50)
+        >>> result["succeeded_count"], result["videos_per_sec"]
+        (500, 41.7)
+    """
+    from rag.config import get_chunking_config, get_rag_value
+
+    start_time = time.time()
+
+    if max_workers is None:
+        max_workers = get_rag_value("ingest.batch.max_workers", DEFAULT_BATCH_MAX_WORKERS)
+    if videos_per_batch is None:
+        videos_per_batch = get_rag_value("ingest.batch.videos_per_batch", DEFAULT_VIDEOS_PER_BATCH)
+    max_workers = max(1, int(max_workers))
+    videos_per_batch = max(1, int(videos_per_batch))
+    sink_timeout_ms = get_rag_value("ingest.batch.sink_timeout_ms", DEFAULT_BATCH_SINK_TIMEOUT_MS)
+    zep_concurrency = max(1, int(get_rag_value("ingest.batch.zep_concurrency", DEFAULT_BATCH_ZEP_CONCURRENCY)))
+
+    chunking_config = get_chunking_config()
+    max_tokens = chunking_config["max_tokens_per_chunk"]
+    overlap_tokens = chunking_config["overlap_tokens"]
+
+    video_results: List[Optional[dict]] = [None] * len(payloads)
+    batch_reports = []
+    group: List[Tuple[int, dict]] = []
+
+    def flush_group():
+        batch_index = len(batch_reports)
+        report = _write_video_group(group, video_results, sink_timeout_ms, zep_concurrency, batch_index)
+        batch_reports.append(report)
+        group.clear()
+
+    # Writes for a full group start while the pool keeps chunking later videos
+    for position, prepared in enumerate(_prepare_many(payloads, max_tokens, overlap_tokens, max_workers)):
+        if "error" in prepared:
+            video_results[position] = {
+                "video_id": prepared.get("video_id"),
+                "status": "error",
+                "chunk_count": 0,
+                "sinks": {},
+                "message": prepared["error"]
+            }
+            continue
+        group.append((position, prepared))
+        if len(group) >= videos_per_batch:
+            flush_group()
+
+    if group:
+        flush_group()
+
+    succeeded = sum(1 for r in video_results if r and r["status"] == "success")
+    any_success = any(r and r["status"] in ("success", "partial") for r in video_results)
+    chunk_count = sum(r["chunk_count"] for r in video_results if r)
+
+    if any_success:
+        try:
+            from rag.cache import invalidate_on_new_content
+            invalidate_on_new_content()
+        except Exception as e:
+            print(f"Warning: Failed to invalidate retrieval cache: {str(e)}")
+
+    # Commit the Firestore refs queued for this run in WriteBatch groups
+    _flush_queued_refs()
+
+    if payloads and succeeded == len(payloads):
+        overall_status = "success"
+    elif any_success:
+        overall_status = "partial"
+    else:
+        overall_status = "error"
+
+    elapsed = time.time() - start_time
+    return {
+        "status": overall_status,
+        "video_count": len(payloads),
+        "succeeded_count": succeeded,
+        "failed_count": len(payloads) - succeeded,
+        "chunk_count": chunk_count,
+        "videos": video_results,
+        "batches": batch_reports,
+        "elapsed_sec": round(elapsed, 3),
+        "videos_per_sec": round(len(payloads) / elapsed, 2) if elapsed > 0 else None,
+        "chunks_per_sec": round(chunk_count / elapsed, 2) if elapsed > 0 else None,
+        "message": f"Ingested {succeeded}/{len(payloads)} transcripts ({chunk_count} chunks) in {len(batch_reports)} batches"
+    }
+
+
+def _prepare_many(payloads: List[dict], max_tokens: int, overlap_tokens: int, max_workers: int) -> Iterator[dict]:
+    """
+    Yield _prepare_video() results in input order, using a process pool when useful.
+
+    If the pool breaks (a worker dies) or a worker raises, the payloads not
+    yet yielded are prepared in-process instead.
+    """
+    if max_workers <= 1 or len(payloads) <= 1:
+        yield from _prepare_in_process(payloads, max_tokens, overlap_tokens)
+        return
+
+    try:
+        executor = ProcessPoolExecutor(max_workers=min(max_workers, len(payloads)))
+    except (OSError, ValueError, NotImplementedError) as e:
+        print(f"Warning: Process pool unavailable, chunking in-process: {str(e)}")
+        yield from _prepare_in_process(payloads, max_tokens, overlap_tokens)
+        return
+
+    produced = 0
+    try:
+        with executor:
+            chunksize = max(1, len(payloads) // (max_workers * 4))
+            results = executor.map(
+                _prepare_video,
+                payloads,
+                repeat(max_tokens, len(payloads)),
+                repeat(overlap_tokens, len(payloads)),
+                chunksize=chunksize
+            )
+            for prepared in results:
+                yield prepared
+                produced += 1
+        return
+    except BrokenProcessPool as e:
+        print(f"Warning: Process pool broke after {produced}/{len(payloads)} transcripts, "
+              f"chunking the rest in-process: {str(e)}")
+    except Exception as e:
+        print(f"Warning: Chunking worker failed after {produced}/{len(payloads)} transcripts, "
+              f"chunking the rest in-process: {str(e)}")
+
+    yield from _prepare_in_process(payloads[produced:], max_tokens, overlap_tokens)
+
+
+def _prepare_in_process(payloads: List[dict], max_tokens: int, overlap_tokens: int) -> Iterator[dict]:
+    """Yield _prepare_video() results, turning unexpected failures into per-video errors."""
+    for payload in payloads:
+        try:
+            prepared = _prepare_video(payload, max_tokens, overlap_tokens)
+        except Exception as e:
+            prepared = {"video_id": payload.get("video_id"), "error": f"Preparation failed: {str(e)}"}
+        yield prepared
+
+
+def _write_video_group(
+    group: List[Tuple[int, dict]],
+    video_results: List[Optional[dict]],
+    sink_timeout_ms: int,
+    zep_concurrency: int,
+    batch_index: int
+) -> dict:
+    """Write one group of prepared videos with merged sink requests and split results per video."""
+    batch_start = time.time()
+    prepared_videos = [prepared for _, prepared in group]
+    planned = [_plan_sink_payloads(prepared) for prepared in prepared_videos]
+    ledger_enabled = any(plan is not None for _, plan in planned)
+
+    merged = {
+        sink: [item for sink_payloads, _ in planned for item in sink_payloads[sink]]
+        for sink in _SINK_PAYLOAD_KEYS
+    }
+
+    def upsert_zep_group() -> dict:
+        def upsert(position: int) -> dict:
+            messages = planned[position][0]["zep"]
+            if planned[position][1] is not None and not messages:
+                return _unchanged_result(prepared_videos[position]["chunk_count"])
+            return upsert_transcript_batch(prepared_videos[position]["video_id"], messages)
+
+        workers = min(zep_concurrency, len(prepared_videos))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zep-ingest-many") as executor:
+            per_video = dict(zip(
+                (p["video_id"] for p in prepared_videos),
+                executor.map(upsert, range(len(prepared_videos)))
+            ))
+
+        summary = summarize_sink_results(per_video, 0)
+        status = {"success": "upserted", "partial": "partial"}.get(summary["status"], "error")
+        if all(r.get("status") == "skipped" for r in per_video.values()):
+            status = "skipped"
         return {
-            "status": overall_status,
+            "status": status,
+            "upserted_count": sum(r.get("upserted_count", 0) for r in per_video.values()),
+            "videos": per_video
+        }
+
+    sink_writers = {
+        "opensearch": lambda: index_transcript_chunks(merged["opensearch"]),
+        "bigquery": lambda: stream_transcript_chunks(merged["bigquery"]),
+        "zep": upsert_zep_group
+    }
+    results, sink_latencies, timed_out_sinks = write_to_sinks({
+        sink: writer for sink, writer in sink_writers.items()
+        if not ledger_enabled or merged[sink]
+    }, timeout_ms=sink_timeout_ms)
+
+    chunk_total = sum(p["chunk_count"] for p in prepared_videos)
+    sink_results = {sink: results.get(sink) or _unchanged_result(len(merged[sink])) for sink in sink_writers}
+
+    for (position, prepared), (sink_payloads, plan) in zip(group, planned):
+        video_id = prepared["video_id"]
+        zep_result = sink_results["zep"].get("videos", {}).get(video_id, sink_results["zep"])
+        _record_ledger(prepared, plan, sink_payloads, {**sink_results, "zep": zep_result})
+
+        video_sinks = {
+            sink: _split_sink_result(sink, result, prepared, sink_payloads[sink], plan is not None)
+            for sink, result in sink_results.items()
+        }
+        summary = summarize_sink_results(video_sinks, prepared["chunk_count"])
+        video_results[position] = {
             "video_id": video_id,
-            "chunk_count": chunk_count,
-            "sinks": sink_results,
-            "message": f"Ingested {chunk_count} chunks to RAG sinks (status: {overall_status})"
+            "status": summary["status"],
+            "chunk_count": prepared["chunk_count"],
+            "sinks": video_sinks,
+            "message": f"Ingested {prepared['chunk_count']} chunks to RAG sinks (status: {summary['status']})"
         }
+        if plan is not None:
+            from rag.ledger import summarize_plan
+            video_results[position]["ledger"] = summarize_plan(plan)
+        if summary["status"] in ("success", "partial"):
+            _queue_ref(prepared, summary["status"], video_sinks, batch_start)
+
+    group_summary = summarize_sink_results(sink_results, chunk_total)
+    try:
+        from rag.tracing import emit_ingest_event
+        emit_ingest_event(
+            operation="transcript_batch",
+            video_id=f"batch_{batch_index}",
+            chunk_count=chunk_total,
+            sinks_used=group_summary["sinks_used"],
+            success_count=group_summary["success_count"],
+            error_count=group_summary["error_count"],
+            latency_ms=int((time.time() - batch_start) * 1000),
+            sink_latencies=sink_latencies
+        )
+    except Exception as e:
+        print(f"Warning: Failed to emit ingest event: {str(e)}")
+
+    return {
+        "batch_index": batch_index,
+        "video_count": len(group),
+        "chunk_count": chunk_total,
+        "sink_latencies": sink_latencies,
+        "timed_out_sinks": timed_out_sinks
+    }
+
 
+def _flush_queued_refs() -> None:
+    """Commit queued Firestore refs (best-effort)."""
+    try:
+        from rag.refs import flush_refs
+        flush_refs(reason="ingest")
+    except Exception as e:
+        print(f"Warning: Failed to flush RAG refs: {str(e)}")
+
+
+def _queue_ref(prepared: dict, status: str, video_sinks: Dict[str, dict], batch_start: float) -> None:
+    """Queue a Firestore ref for an ingested video; ingest_many() flushes them together."""
+    try:
+        from rag.refs import upsert_ref
+
+        docs = prepared["opensearch_docs"]
+        ref = {
+            "type": "transcript",
+            "source_ref": prepared["video_id"],
+            "created_by_agent": "ingest_many",
+            "content_hashes": [doc["content_sha256"] for doc in docs],
+            "chunk_count": prepared["chunk_count"],
+            "total_tokens": sum(doc["tokens"] for doc in docs),
+            "indexing_status": status,
+            "sink_statuses": {sink: result.get("status") for sink, result in video_sinks.items()},
+            "indexing_duration_ms": int((time.time() - batch_start) * 1000)
+        }
+        for field in ("title", "channel_id", "published_at"):
+            if docs and docs[0].get(field):
+                ref[field] = docs[0][field]
+        upsert_ref(ref)
     except Exception as e:
+        print(f"Warning: Failed to queue RAG ref for {prepared.get('video_id')}: {str(e)}")
+
+
+def _split_sink_result(sink: str, result: dict, prepared: dict, sent: list, ledger_enabled: bool) -> dict:
+    """Derive one video's view of a merged sink result."""
+    if ledger_enabled and not sent:
+        return _unchanged_result(prepared["chunk_count"])
+
+    status = result.get("status")
+
+    if sink == "zep":
+        per_video = result.get("videos", {}).get(prepared["video_id"])
+        if per_video is not None:
+            return {k: v for k, v in per_video.items() if k != "chunks"}
+        return {"status": status, "message": result.get("message")}
+
+    chunk_ids = {item["chunk_id"] for item in sent}
+
+    if sink == "opensearch" and status in ("indexed", "error") and "errors" in result:
+        failed = sum(1 for e in (result.get("errors") or []) if e.get("chunk_id") in chunk_ids)
+        indexed = len(chunk_ids) - failed
         return {
-            "status": "error",
-            "message": f"Transcript ingest failed: {str(e)}"
+            "status": "indexed" if indexed > 0 else "error",
+            "indexed_count": indexed,
+            "error_count": failed
         }
 
+    if sink == "bigquery" and status == "partial":
+        failed = sum(1 for chunk_id in result.get("error_chunk_ids", []) if chunk_id in chunk_ids)
+        return {"status": "partial" if failed else "streamed", "error_count": failed}
+
+    return {"status": status, "message": result.get("message")}
+
 
 if __name__ == "__main__":
     print("="*80)
@@ -250,6 +714,7 @@ if __name__ == "__main__":
             print(f"   {sink_name}:")
             print(f"     Status: {sink_result.get('status')}")
             print(f"     Message: {sink_result.get('message')}")
+            print(f"     Latency: {result.get('sink_latencies', {}).get(sink_name)}ms")
 
     print("\n" + "="*80)
     print("✅ Test completed")
@@ -0,0 +1,482 @@
+"""
+RAG Ingest Ledger
+
+Content-hash ledger consulted by ingest before any sink is touched, so
+re-ingesting an unchanged transcript ships nothing and a changed one ships
+only the diff. Entries are keyed by (video_id, chunk_index, content_sha256)
+and remember which sinks stored that exact content:
+- local: SQLite file (rag.ledger.local_path), checked first. The file is
+  per worker, so with a Firestore tier it is only a cache: entries older
+  than rag.ledger.local_ttl_sec are re-read from Firestore so writes made by
+  other workers are picked up
+- firestore: one document per video in rag.ledger.firestore.collection,
+  shared across workers and used to warm the local tier on a local miss
+
+A chunk is sent to a sink only when its hash is new or changed, or when that
+sink has not stored it yet (e.g. a sink enabled after the first ingest).
+Either tier may be unavailable: Firestore failures are logged and the local
+tier keeps working, and if the SQLite file cannot be opened the ledger runs
+Firestore-only.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+# Add config and core directories to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'config'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from env_loader import get_optional_env_var
+
+
+DEFAULT_LOCAL_PATH = ".cache/rag_ingest_ledger.sqlite3"
+DEFAULT_COLLECTION = "rag_ingest_ledger"
+DEFAULT_LOCAL_TTL_SEC = 3600
+
+# Project root (autopiloot/) for resolving a relative local_path
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+_config: Optional[dict] = None
+_ledger: Any = None
+_state_lock = threading.Lock()
+
+
+class _LocalLedger:
+    """SQLite store of (video_id, chunk_index) -> content hash and sinks."""
+
+    name = "local"
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ingest_ledger ("
+                " video_id TEXT NOT NULL,"
+                " chunk_index INTEGER NOT NULL,"
+                " content_sha256 TEXT NOT NULL,"
+                " sinks TEXT NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " PRIMARY KEY (video_id, chunk_index))"
+            )
+
+    def get(self, video_id: str, max_age_sec: Optional[float] = None) -> Optional[Dict[int, dict]]:
+        """Recorded chunks of a video; None if unknown or written more than max_age_sec ago."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chunk_index, content_sha256, sinks, updated_at FROM ingest_ledger WHERE video_id = ?",
+                (video_id,)
+            ).fetchall()
+        if not rows:
+            return None
+        if max_age_sec is not None and time.time() - min(row[3] for row in rows) > max_age_sec:
+            return None
+        return {
+            index: {"content_sha256": sha, "sinks": sinks.split(",") if sinks else []}
+            for index, sha, sinks, _ in rows
+        }
+
+    def put(self, video_id: str, entries: Dict[int, dict]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM ingest_ledger WHERE video_id = ?", (video_id,))
+                self._conn.executemany(
+                    "INSERT INTO ingest_ledger VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (video_id, index, entry["content_sha256"], ",".join(entry["sinks"]), now)
+                        for index, entry in entries.items()
+                    ]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, video_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM ingest_ledger WHERE video_id = ?", (video_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class _FirestoreLedger:
+    """One Firestore document per video holding its chunk hashes and sinks."""
+
+    name = "firestore"
+
+    def __init__(self, client: Any, collection: str):
+        self._client = client
+        self._collection = collection
+
+    def _document(self, video_id: str):
+        return self._client.collection(self._collection).document(video_id)
+
+    def get(self, video_id: str) -> Optional[Dict[int, dict]]:
+        snapshot = self._document(video_id).get()
+        if not snapshot.exists:
+            return None
+        chunks = (snapshot.to_dict() or {}).get("chunks", {})
+        return {
+            int(index): {"content_sha256": entry["content_sha256"], "sinks": list(entry.get("sinks", []))}
+            for index, entry in chunks.items()
+        }
+
+    def put(self, video_id: str, entries: Dict[int, dict]) -> None:
+        self._document(video_id).set({
+            "video_id": video_id,
+            "chunk_count": len(entries),
+            "chunks": {str(index): entry for index, entry in entries.items()},
+            "updated_at": datetime.now(timezone.utc).isoformat()
+        })
+
+    def delete(self, video_id: str) -> None:
+        self._document(video_id).delete()
+
+
+class IngestLedger:
+    """
+    Local-first ledger with an optional shared Firestore tier.
+
+    At least one tier is required. With both tiers, local entries older than
+    local_ttl_sec are ignored so Firestore confirms them again.
+    """
+
+    def __init__(
+        self,
+        local: Optional[_LocalLedger],
+        remote: Optional[_FirestoreLedger] = None,
+        local_ttl_sec: Optional[float] = DEFAULT_LOCAL_TTL_SEC
+    ):
+        if local is None and remote is None:
+            raise ValueError("Ingest ledger needs a local or Firestore tier")
+        self.local = local
+        self.remote = remote
+        self.local_ttl_sec = local_ttl_sec if remote is not None else None
+        self._stats_lock = threading.Lock()
+        self.stats = {"local_hits": 0, "remote_hits": 0, "misses": 0, "writes": 0, "remote_errors": 0}
+
+    @property
+    def tiers(self) -> List[str]:
+        return (["local"] if self.local is not None else []) + (["firestore"] if self.remote is not None else [])
+
+    def close(self) -> None:
+        if self.local is not None:
+            self.local.close()
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def lookup(self, video_id: str) -> Dict[int, dict]:
+        """
+        Get the recorded chunks of a video.
+
+        Returns:
+            Mapping of chunk_index to {"content_sha256", "sinks"} (empty if unknown)
+        """
+        if self.local is not None:
+            entries = self.local.get(video_id, self.local_ttl_sec)
+            if entries is not None:
+                self._count("local_hits")
+                return entries
+
+        if self.remote is not None:
+            try:
+                entries = self.remote.get(video_id)
+            except Exception as e:
+                self._count("remote_errors")
+                print(f"Warning: Ingest ledger Firestore read failed for {video_id}: {str(e)}")
+                entries = None
+            if entries:
+                self._count("remote_hits")
+                if self.local is not None:
+                    self.local.put(video_id, entries)
+                return entries
+
+        self._count("misses")
+        return {}
+
+    def record(self, video_id: str, entries: Dict[int, dict]) -> None:
+        """Replace the recorded chunks of a video in both tiers."""
+        if self.local is not None:
+            self.local.put(video_id, entries)
+        self._count("writes")
+        if self.remote is not None:
+            try:
+                self.remote.put(video_id, entries)
+            except Exception as e:
+                self._count("remote_errors")
+                print(f"Warning: Ingest ledger Firestore write failed for {video_id}: {str(e)}")
+
+    def forget(self, video_id: str) -> None:
+        """Drop a video so its next ingest ships every chunk."""
+        if self.local is not None:
+            self.local.delete(video_id)
+        if self.remote is not None:
+            try:
+                self.remote.delete(video_id)
+            except Exception as e:
+                self._count("remote_errors")
+                print(f"Warning: Ingest ledger Firestore delete failed for {video_id}: {str(e)}")
+
+
+def _create_firestore_tier(config: dict, firestore_client: Any) -> Optional[_FirestoreLedger]:
+    firestore_config = config.get("firestore") if isinstance(config.get("firestore"), dict) else {}
+    if firestore_config.get("enabled", True) is not True:
+        return None
+
+    collection = firestore_config.get("collection", DEFAULT_COLLECTION)
+    if firestore_client is not None:
+        return _FirestoreLedger(firestore_client, collection)
+
+    project_id = get_optional_env_var("GCP_PROJECT_ID")
+    if not project_id:
+        return None
+    try:
+        from rag.clients import get_firestore_client
+        return _FirestoreLedger(get_firestore_client(project_id), collection)
+    except ImportError:
+        print("Warning: google-cloud-firestore not installed; ingest ledger is local only")
+    except Exception as e:
+        print(f"Warning: Ingest ledger Firestore tier unavailable ({str(e)}); using local only")
+    return None
+
+
+def configure_ledger(config: Optional[dict] = None, firestore_client: Any = None) -> dict:
+    """
+    (Re)initialize the ledger from configuration.
+
+    Called lazily on first use with rag.ledger from settings.yaml; call it
+    explicitly to apply a different configuration or inject a Firestore client.
+
+    Args:
+        config: Ledger configuration (defaults to rag.ledger)
+        firestore_client: Optional pre-built Firestore client
+
+    Returns:
+        Dictionary with status, enabled flag and active tiers
+    """
+    global _config, _ledger
+
+    if config is None:
+        from rag.config import get_rag_value
+        config = get_rag_value("ledger", {})
+        if not isinstance(config, dict):
+            config = {}
+
+    ledger = None
+    if config.get("enabled") is True:
+        local_path = config.get("local_path") or DEFAULT_LOCAL_PATH
+        if local_path != ":memory:" and not os.path.isabs(local_path):
+            local_path = os.path.join(_PROJECT_ROOT, local_path)
+        remote = _create_firestore_tier(config, firestore_client)
+        try:
+            local = _LocalLedger(local_path)
+        except Exception as e:
+            local = None
+            if remote is not None:
+                print(f"Warning: Ingest ledger local tier unavailable ({str(e)}); using Firestore only")
+            else:
+                print(f"Warning: Ingest ledger unavailable ({str(e)}); all chunks will be shipped")
+        if local is not None or remote is not None:
+            ledger = IngestLedger(local, remote, config.get("local_ttl_sec", DEFAULT_LOCAL_TTL_SEC))
+
+    with _state_lock:
+        previous = _ledger
+        _config = config
+        _ledger = ledger
+    if previous is not None:
+        previous.close()
+
+    return {
+        "status": "configured",
+        "enabled": ledger is not None,
+        "tiers": ledger.tiers if ledger else []
+    }
+
+
+def reset_ledger() -> None:
+    """Drop the ledger and configuration (next use re-reads settings)."""
+    global _config, _ledger
+    with _state_lock:
+        previous = _ledger
+        _config = None
+        _ledger = None
+    if previous is not None:
+        previous.close()
+
+
+def get_ledger() -> Optional[IngestLedger]:
+    """Return the active ledger, or None when rag.ledger is disabled."""
+    if _config is None:
+        configure_ledger()
+    return _ledger
+
+
+def is_ledger_enabled() -> bool:
+    """Return True if rag.ledger is enabled and at least one tier is available."""
+    return get_ledger() is not None
+
+
+def plan_chunks(video_id: str, content_hashes: List[str], sinks: List[str]) -> Optional[dict]:
+    """
+    Decide which chunks each sink still needs.
+
+    Args:
+        video_id: Video (or document) identifier
+        content_hashes: content_sha256 per chunk, in chunk_index order
+        sinks: Sinks that will be written (enabled sinks only)
+
+    Returns:
+        None when the ledger is disabled, otherwise a plan containing:
+        - pending: Mapping of sink to the chunk indexes it must receive
+        - skipped_count: Chunks no sink needs (unchanged everywhere)
+        - changed_count: Chunks that are new or whose hash changed
+        - removed_count: Recorded chunks beyond the current chunk count
+
+    Example:
+        >>> plan = plan_chunks("abc123", hashes, ["opensearch", "zep"])
+        >>> plan["skipped_count"], plan["pending"]["zep"]
+        (9, [4])
+    """
+    ledger = get_ledger()
+    if ledger is None:
+        return None
+
+    try:
+        known = ledger.lookup(video_id)
+    except Exception as e:
+        print(f"Warning: Ingest ledger lookup failed for {video_id}: {str(e)}")
+        return None
+
+    pending: Dict[str, List[int]] = {sink: [] for sink in sinks}
+    skipped_count = 0
+    changed_count = 0
+
+    for index, content_hash in enumerate(content_hashes):
+        entry = known.get(index)
+        if entry and entry["content_sha256"] == content_hash:
+            stored = set(entry["sinks"])
+        else:
+            stored = set()
+            changed_count += 1
+
+        missing = [sink for sink in sinks if sink not in stored]
+        if not missing:
+            skipped_count += 1
+        for sink in missing:
+            pending[sink].append(index)
+
+    return {
+        "video_id": video_id,
+        "content_hashes": list(content_hashes),
+        "known": known,
+        "pending": pending,
+        "skipped_count": skipped_count,
+        "changed_count": changed_count,
+        "removed_count": sum(1 for index in known if index >= len(content_hashes))
+    }
+
+
+def record_chunks(plan: dict, written: Dict[str, Iterable[int]]) -> bool:
+    """
+    Record the chunks each sink stored during this ingest.
+
+    Args:
+        plan: Plan returned by plan_chunks()
+        written: Mapping of sink to chunk indexes it stored successfully
+
+    Returns:
+        True if the ledger changed and was written
+    """
+    ledger = get_ledger()
+    if ledger is None or plan is None:
+        return False
+
+    written_sets = {sink: set(indexes) for sink, indexes in written.items()}
+    entries: Dict[int, dict] = {}
+    for index, content_hash in enumerate(plan["content_hashes"]):
+        entry = plan["known"].get(index)
+        stored = set(entry["sinks"]) if entry and entry["content_sha256"] == content_hash else set()
+        for sink, indexes in written_sets.items():
+            if index in indexes:
+                stored.add(sink)
+        if stored:
+            entries[index] = {"content_sha256": content_hash, "sinks": sorted(stored)}
+
+    if entries == plan["known"]:
+        return False
+
+    try:
+        ledger.record(plan["video_id"], entries)
+        return True
+    except Exception as e:
+        print(f"Warning: Ingest ledger write failed for {plan['video_id']}: {str(e)}")
+        return False
+
+
+def summarize_plan(plan: Optional[dict]) -> Optional[dict]:
+    """Skipped/changed counts for an ingest result (None when the ledger is off)."""
+    if plan is None:
+        return None
+    return {
+        "skipped_count": plan["skipped_count"],
+        "changed_count": plan["changed_count"],
+        "removed_count": plan["removed_count"],
+        "sent": {sink: len(indexes) for sink, indexes in plan["pending"].items()}
+    }
+
+
+def get_ledger_stats() -> dict:
+    """Lookup/write counters for the active ledger."""
+    ledger = _ledger
+    if ledger is None:
+        return {"enabled": False}
+    with ledger._stats_lock:
+        stats = dict(ledger.stats)
+    stats["enabled"] = True
+    stats["tiers"] = ledger.tiers
+    return stats
+
+
+if __name__ == "__main__":
+    print("="*80)
+    print("TEST: RAG Ingest Ledger")
+    print("="*80)
+
+    print("\n1. Configuring an in-memory ledger:")
+    print(f"   {configure_ledger({'enabled': True, 'local_path': ':memory:', 'firestore': {'enabled': False}})}")
+
+    hashes = ["a" * 64, "b" * 64, "c" * 64]
+    sinks = ["opensearch", "bigquery", "zep"]
+
+    print("\n2. First ingest (everything pending):")
+    plan = plan_chunks("demo_video", hashes, sinks)
+    print(f"   {summarize_plan(plan)}")
+    record_chunks(plan, {sink: range(3) for sink in sinks})
+
+    print("\n3. Re-ingest unchanged transcript:")
+    print(f"   {summarize_plan(plan_chunks('demo_video', hashes, sinks))}")
+
+    print("\n4. Re-ingest with one edited chunk:")
+    print(f"   {summarize_plan(plan_chunks('demo_video', [hashes[0], 'd' * 64, hashes[2]], sinks))}")
+
+    print("\n5. Ledger stats:")
+    print(f"   {get_ledger_stats()}")
+
+    reset_ledger()
+    print("\n" + "="*80)
+    print("✅ Test completed")
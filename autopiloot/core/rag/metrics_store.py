@@ -0,0 +1,319 @@
+"""
+Bounded RAG Metrics Store
+
+Fixed-memory storage behind core/rag/tracing.py:
+- QuantileSketch: mergeable streaming quantiles with bounded relative error
+  (log-spaced bins, as in DDSketch); p50/p95/p99 without keeping samples
+- MetricsBucket: counters and per-source sketches for one time interval
+- BucketedMetricsStore: ring buffer of buckets, one per
+  observability.metrics.aggregation_interval_minutes, covering
+  observability.metrics.window_minutes
+
+Summaries cost O(buckets), independent of traffic. Buckets export to plain
+dicts so the stores of several workers can be merged.
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BINS = 2048
+DEFAULT_INTERVAL_MINUTES = 5
+DEFAULT_WINDOW_MINUTES = 1440
+
+
+class QuantileSketch:
+    """
+    Log-binned quantile sketch.
+
+    Every positive value v lands in bin ceil(log_gamma(v)) with
+    gamma = (1 + a) / (1 - a), so any quantile is returned within relative
+    error a of a true sample. Merging two sketches adds their bin counts,
+    which is exact. When more than max_bins bins are used, the lowest bins
+    collapse (low quantiles lose accuracy first).
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, max_bins: int = DEFAULT_MAX_BINS):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a sample (negative values count as zero)."""
+        self.count += count
+        self.total += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= 0:
+            self.zero_count += count
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        keys = sorted(self.bins)
+        overflow = keys[:len(keys) - self.max_bins + 1]
+        target = overflow[-1]
+        self.bins[target] = sum(self.bins.pop(key) for key in overflow[:-1]) + self.bins[target]
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Merge another sketch with the same relative accuracy into this one."""
+        if not math.isclose(other.relative_accuracy, self.relative_accuracy):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile in [0, 1] (0.95 for p95)
+
+        Returns:
+            Estimated value (0 for an empty sketch)
+        """
+        if self.count == 0:
+            return 0
+        # Nearest-rank: the ceil(q * count)-th smallest sample (0-based below)
+        rank = max(0, math.ceil(q * self.count) - 1)
+        if rank < self.zero_count:
+            return 0
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                estimate = 2 * self._gamma ** key / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    def to_dict(self) -> dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "bins": {str(key): count for key, count in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(data.get("relative_accuracy", DEFAULT_RELATIVE_ACCURACY))
+        sketch.bins = {int(key): count for key, count in data.get("bins", {}).items()}
+        sketch.zero_count = data.get("zero_count", 0)
+        sketch.count = data.get("count", 0)
+        sketch.total = data.get("total", 0.0)
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+
+class MetricsBucket:
+    """Counters and latency sketches for one aggregation interval."""
+
+    def __init__(self, start: int, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.start = start
+        self.relative_accuracy = relative_accuracy
+        self.retrievals = 0
+        self.ingests = 0
+        self.coverage_sum = 0.0
+        self.coverage_count = 0
+        self.error_counts: Dict[str, int] = {}
+        self.source_availability: Dict[str, int] = {}
+        self.latency: Dict[str, QuantileSketch] = {}
+
+    def add_latency(self, key: str, value: float) -> None:
+        sketch = self.latency.get(key)
+        if sketch is None:
+            sketch = self.latency[key] = QuantileSketch(self.relative_accuracy)
+        sketch.add(value)
+
+    def merge(self, other: "MetricsBucket") -> None:
+        self.retrievals += other.retrievals
+        self.ingests += other.ingests
+        self.coverage_sum += other.coverage_sum
+        self.coverage_count += other.coverage_count
+        for name, count in other.error_counts.items():
+            self.error_counts[name] = self.error_counts.get(name, 0) + count
+        for name, count in other.source_availability.items():
+            self.source_availability[name] = self.source_availability.get(name, 0) + count
+        for key, sketch in other.latency.items():
+            if key in self.latency:
+                self.latency[key].merge(sketch)
+            else:
+                self.latency[key] = QuantileSketch.from_dict(sketch.to_dict())
+
+    def to_dict(self) -> dict:
+        return {
+            "start": self.start,
+            "retrievals": self.retrievals,
+            "ingests": self.ingests,
+            "coverage_sum": self.coverage_sum,
+            "coverage_count": self.coverage_count,
+            "error_counts": dict(self.error_counts),
+            "source_availability": dict(self.source_availability),
+            "latency": {key: sketch.to_dict() for key, sketch in self.latency.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MetricsBucket":
+        bucket = cls(int(data["start"]))
+        bucket.retrievals = data.get("retrievals", 0)
+        bucket.ingests = data.get("ingests", 0)
+        bucket.coverage_sum = data.get("coverage_sum", 0.0)
+        bucket.coverage_count = data.get("coverage_count", 0)
+        bucket.error_counts = dict(data.get("error_counts", {}))
+        bucket.source_availability = dict(data.get("source_availability", {}))
+        bucket.latency = {key: QuantileSketch.from_dict(s) for key, s in data.get("latency", {}).items()}
+        return bucket
+
+
+class BucketedMetricsStore:
+    """
+    Ring buffer of MetricsBuckets.
+
+    Slot i holds the bucket starting at a multiple of interval_seconds; a slot
+    is reset when time wraps around to it, so memory stays fixed at
+    window / interval buckets.
+    """
+
+    def __init__(
+        self,
+        interval_minutes: float = DEFAULT_INTERVAL_MINUTES,
+        window_minutes: float = DEFAULT_WINDOW_MINUTES,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY
+    ):
+        self.interval_seconds = max(1, int(interval_minutes * 60))
+        self.slot_count = max(1, math.ceil(window_minutes * 60 / self.interval_seconds))
+        self.relative_accuracy = relative_accuracy
+        self._slots: List[Optional[MetricsBucket]] = [None] * self.slot_count
+        self._lock = threading.Lock()
+
+    def _bucket_start(self, timestamp: float) -> int:
+        return int(timestamp // self.interval_seconds) * self.interval_seconds
+
+    def _bucket_for(self, timestamp: float) -> Optional[MetricsBucket]:
+        """Bucket for a timestamp (caller holds the lock); None if older than the ring."""
+        start = self._bucket_start(timestamp)
+        slot = (start // self.interval_seconds) % self.slot_count
+        bucket = self._slots[slot]
+        if bucket is None or bucket.start < start:
+            bucket = self._slots[slot] = MetricsBucket(start, self.relative_accuracy)
+        elif bucket.start > start:
+            return None
+        return bucket
+
+    def record_retrieval(
+        self,
+        latency_ms: float,
+        source_latencies: Dict[str, float],
+        coverage: float,
+        sources_used: Iterable[str],
+        timestamp: Optional[float] = None
+    ) -> None:
+        with self._lock:
+            bucket = self._bucket_for(time.time() if timestamp is None else timestamp)
+            if bucket is None:
+                return
+            bucket.retrievals += 1
+            bucket.coverage_sum += coverage
+            bucket.coverage_count += 1
+            bucket.add_latency("total", latency_ms)
+            for source, latency in source_latencies.items():
+                bucket.add_latency(source, latency)
+            for source in sources_used:
+                bucket.source_availability[source] = bucket.source_availability.get(source, 0) + 1
+
+    def record_ingest(
+        self,
+        operation: str,
+        error_count: int,
+        sink_latencies: Dict[str, float],
+        timestamp: Optional[float] = None
+    ) -> None:
+        with self._lock:
+            bucket = self._bucket_for(time.time() if timestamp is None else timestamp)
+            if bucket is None:
+                return
+            bucket.ingests += 1
+            for sink, latency in sink_latencies.items():
+                bucket.add_latency(f"ingest_{sink}", latency)
+            if error_count > 0:
+                bucket.error_counts[operation] = bucket.error_counts.get(operation, 0) + error_count
+
+    def _live_buckets(self, time_window_minutes: Optional[float], now: Optional[float]) -> List[MetricsBucket]:
+        """Buckets inside the ring (and the optional window), oldest first; caller holds the lock."""
+        now = time.time() if now is None else now
+        oldest = self._bucket_start(now) - (self.slot_count - 1) * self.interval_seconds
+        if time_window_minutes is not None:
+            oldest = max(oldest, self._bucket_start(now - time_window_minutes * 60))
+        return sorted((b for b in self._slots if b is not None and b.start >= oldest), key=lambda b: b.start)
+
+    def bucket_count(self, time_window_minutes: Optional[float] = None, now: Optional[float] = None) -> int:
+        with self._lock:
+            return len(self._live_buckets(time_window_minutes, now))
+
+    def aggregate(self, time_window_minutes: Optional[float] = None, now: Optional[float] = None) -> MetricsBucket:
+        """Merge the buckets of a window into a new bucket (O(buckets))."""
+        merged = MetricsBucket(0, self.relative_accuracy)
+        with self._lock:
+            for bucket in self._live_buckets(time_window_minutes, now):
+                merged.merge(bucket)
+        return merged
+
+    def export(self, time_window_minutes: Optional[float] = None, now: Optional[float] = None) -> dict:
+        """JSON-serializable snapshot of the buckets for merging elsewhere."""
+        with self._lock:
+            return {
+                "interval_seconds": self.interval_seconds,
+                "relative_accuracy": self.relative_accuracy,
+                "buckets": [b.to_dict() for b in self._live_buckets(time_window_minutes, now)]
+            }
+
+    def merge_export(self, exported: dict) -> int:
+        """
+        Merge buckets exported by another store with the same interval.
+
+        Returns:
+            Number of buckets merged (buckets older than this ring are dropped)
+        """
+        if exported.get("interval_seconds") != self.interval_seconds:
+            raise ValueError(
+                f"Cannot merge metrics with interval {exported.get('interval_seconds')}s "
+                f"into a store with interval {self.interval_seconds}s"
+            )
+        merged = 0
+        with self._lock:
+            for data in exported.get("buckets", []):
+                bucket = self._bucket_for(data["start"])
+                if bucket is None:
+                    continue
+                bucket.merge(MetricsBucket.from_dict(data))
+                merged += 1
+        return merged
@@ -7,7 +7,9 @@ Handles idempotent document indexing with automatic index creation.
 
 import os
 import sys
-from typing import List, Dict, Optional
+import json
+import time
+from typing import List, Dict, Optional, Tuple, Iterator
 from datetime import datetime
 
 # Add config and core directories to path
@@ -17,7 +19,13 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from env_loader import get_optional_env_var
 
 
-def index_transcript_chunks(docs: List[dict]) -> dict:
+# Bulk item statuses worth retrying (throttling / transient node errors)
+RETRYABLE_BULK_STATUSES = {429, 502, 503, 504}
+
+DEFAULT_BULK_MAX_BATCH_BYTES = 5 * 1024 * 1024
+
+
+def index_transcript_chunks(docs: List[dict], bulk: Optional[bool] = None) -> dict:
     """
     Index transcript chunks to OpenSearch with idempotent behavior.
 
@@ -35,6 +43,7 @@ def index_transcript_chunks(docs: List[dict]) -> dict:
             - content_sha256 (str): Content hash for deduplication
             - tokens (int): Token count
             - text (str): Full chunk text
+        bulk: Use the _bulk API (default: rag.opensearch.bulk.enabled)
 
     Returns:
         Dictionary containing:
@@ -54,6 +63,12 @@ def index_transcript_chunks(docs: List[dict]) -> dict:
         - Uses document ID = chunk_id for idempotent indexing
         - Duplicate chunk_ids will update existing documents
 
+    Bulk Mode (rag.opensearch.bulk):
+        - Documents are sent through bulk_index() in _bulk requests sized by
+          max_batch_bytes instead of one request per chunk
+        - Only items that fail with a retryable status (429/5xx) are retried
+        - disable_refresh pauses index refresh for the run and restores it
+
     Index Management:
         - Creates index automatically if missing
         - Uses proper mappings for efficient search:
@@ -131,12 +146,13 @@ def index_transcript_chunks(docs: List[dict]) -> dict:
                 "error_count": len(docs)
             }
 
-        # Index documents
-        indexed_count = 0
-        errors = []
+        if bulk is None:
+            bulk = get_rag_value("opensearch.bulk.enabled", True) is True
 
+        # Prepare documents, reporting those without an ID
+        errors = []
+        prepared = []
         for doc in docs:
-            # Extract doc ID
             doc_id = doc.get("chunk_id")
             if not doc_id:
                 errors.append({
@@ -144,33 +160,23 @@ def index_transcript_chunks(docs: List[dict]) -> dict:
                     "doc": doc.get("video_id", "unknown")
                 })
                 continue
-
-            # Prepare document for indexing
-            index_doc = {
-                "video_id": doc.get("video_id"),
-                "chunk_id": doc_id,
-                "chunk_index": doc.get("chunk_index"),
-                "total_chunks": doc.get("total_chunks"),
-                "title": doc.get("title"),
-                "channel_id": doc.get("channel_id"),
-                "channel_handle": doc.get("channel_handle"),
-                "published_at": doc.get("published_at"),
-                "duration_sec": doc.get("duration_sec"),
-                "content_sha256": doc.get("content_sha256"),
-                "tokens": doc.get("tokens"),
-                "text": doc.get("text"),
-                "indexed_at": datetime.utcnow().isoformat() + "Z"
-            }
-
-            # Index document
-            result = _index_document(client, index_name, doc_id, index_doc)
-            if result["success"]:
-                indexed_count += 1
-            else:
-                errors.append({
-                    "chunk_id": doc_id,
-                    "error": result["error"]
-                })
+            prepared.append((doc_id, _prepare_document(doc)))
+
+        if bulk:
+            bulk_result = bulk_index(client, index_name, prepared)
+            indexed_count = bulk_result["indexed_count"]
+            errors.extend(bulk_result["errors"])
+        else:
+            indexed_count = 0
+            for doc_id, index_doc in prepared:
+                result = _index_document(client, index_name, doc_id, index_doc)
+                if result["success"]:
+                    indexed_count += 1
+                else:
+                    errors.append({
+                        "chunk_id": doc_id,
+                        "error": result["error"]
+                    })
 
         # Build response
         return {
@@ -192,48 +198,218 @@ def index_transcript_chunks(docs: List[dict]) -> dict:
 
 
 def _initialize_client(host: str, api_key: Optional[str], username: Optional[str], password: Optional[str]):
-    """Initialize OpenSearch client with authentication."""
-    from opensearchpy import OpenSearch
+    """Get the shared, pooled OpenSearch client for these credentials."""
+    from rag.clients import get_opensearch_client
+
+    return get_opensearch_client(host, api_key, username, password)
+
+
+def _prepare_document(doc: dict) -> dict:
+    """Build the OpenSearch document body for a transcript chunk."""
+    return {
+        "video_id": doc.get("video_id"),
+        "chunk_id": doc.get("chunk_id"),
+        "chunk_index": doc.get("chunk_index"),
+        "total_chunks": doc.get("total_chunks"),
+        "title": doc.get("title"),
+        "channel_id": doc.get("channel_id"),
+        "channel_handle": doc.get("channel_handle"),
+        "published_at": doc.get("published_at"),
+        "duration_sec": doc.get("duration_sec"),
+        "content_sha256": doc.get("content_sha256"),
+        "tokens": doc.get("tokens"),
+        "text": doc.get("text"),
+        "indexed_at": datetime.utcnow().isoformat() + "Z"
+    }
+
+
+def bulk_index(
+    client,
+    index_name: str,
+    documents: List[Tuple[str, dict]],
+    max_batch_bytes: Optional[int] = None,
+    max_retries: Optional[int] = None,
+    retry_backoff_ms: Optional[int] = None,
+    disable_refresh: Optional[bool] = None,
+    request_timeout: Optional[float] = None
+) -> dict:
+    """
+    Index documents through the _bulk API.
+
+    Each document is serialized once into NDJSON and packed into requests
+    that stay within a byte budget. Per-item failures are collected from the
+    bulk response; only items with a retryable status (429/502/503/504), or
+    every item of a request that failed outright, are resent with
+    exponential backoff.
+
+    Args:
+        client: OpenSearch client
+        index_name: Target index
+        documents: List of (doc_id, document body) tuples
+        max_batch_bytes: Byte budget per request (default: rag.opensearch.bulk.max_batch_bytes)
+        max_retries: Retry rounds for failed items (default: rag.opensearch.bulk.max_retries)
+        retry_backoff_ms: Base backoff between rounds (default: rag.opensearch.bulk.retry_backoff_ms)
+        disable_refresh: Set refresh_interval=-1 for the run and restore it
+            afterwards (default: rag.opensearch.bulk.disable_refresh)
+        request_timeout: Per-request timeout in seconds (default: rag.timeouts.index_ms)
+
+    Returns:
+        Dictionary containing:
+        - indexed_count: Documents indexed
+        - error_count: Documents that failed permanently
+        - errors: List of {"chunk_id", "status", "error"} per failed document
+        - retried_count: Item resends across all retry rounds
+        - batches: Number of _bulk requests sent
+        - bytes_sent: Total request payload size
+        - latency_ms: Wall-clock time for the run
+        - docs_per_sec: Indexing throughput
+
+    Example:
+        >>> result = bulk_index(client, "autopiloot_transcripts", [("abc123_chunk_0", {"text": "..."})])
+        >>> result["indexed_count"]
+        1
+    """
     from rag.config import get_rag_value
 
-    # Parse host
-    if host.startswith("http://") or host.startswith("https://"):
-        use_ssl = host.startswith("https://")
-        host_without_protocol = host.replace("https://", "").replace("http://", "")
-    else:
-        use_ssl = True
-        host_without_protocol = host
-
-    # Split host and port
-    if ":" in host_without_protocol:
-        hostname, port = host_without_protocol.rsplit(":", 1)
-        port = int(port)
-    else:
-        hostname = host_without_protocol
-        port = 443 if use_ssl else 9200
-
-    # Configure authentication
-    if api_key:
-        auth = ("api_key", api_key)
-    elif username and password:
-        auth = (username, password)
-    else:
-        auth = None
-
-    # Create client
-    client = OpenSearch(
-        hosts=[{"host": hostname, "port": port}],
-        http_auth=auth,
-        use_ssl=use_ssl,
-        verify_certs=get_rag_value("opensearch.connection.verify_certs", True),
-        ssl_assert_hostname=False,
-        ssl_show_warn=False,
-        timeout=get_rag_value("opensearch.timeout_ms", 1500) / 1000.0,
-        max_retries=get_rag_value("opensearch.connection.max_retries", 3),
-        retry_on_timeout=get_rag_value("opensearch.connection.retry_on_timeout", True)
-    )
-
-    return client
+    if max_batch_bytes is None:
+        max_batch_bytes = get_rag_value("opensearch.bulk.max_batch_bytes", DEFAULT_BULK_MAX_BATCH_BYTES)
+    if max_retries is None:
+        max_retries = get_rag_value("opensearch.bulk.max_retries", 3)
+    if retry_backoff_ms is None:
+        retry_backoff_ms = get_rag_value("opensearch.bulk.retry_backoff_ms", 200)
+    if disable_refresh is None:
+        disable_refresh = get_rag_value("opensearch.bulk.disable_refresh", False) is True
+    if request_timeout is None:
+        request_timeout = get_rag_value("timeouts.index_ms", 5000) / 1000.0
+
+    start_time = time.time()
+    stats = {"indexed_count": 0, "retried_count": 0, "batches": 0, "bytes_sent": 0}
+
+    # Serialize every document once: doc_id -> NDJSON action + source lines
+    pending: Dict[str, str] = {}
+    for doc_id, body in documents:
+        action = json.dumps({"index": {"_index": index_name, "_id": doc_id}})
+        pending[doc_id] = f"{action}\n{json.dumps(body, default=str)}\n"
+
+    failures: Dict[str, dict] = {}
+    previous_refresh = pause_refresh(client, index_name) if disable_refresh and pending else None
+
+    try:
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                stats["retried_count"] += len(pending)
+                time.sleep(retry_backoff_ms * (2 ** (attempt - 1)) / 1000.0)
+
+            retry = {}
+            for batch_ids, payload in _iter_bulk_batches(pending, max_batch_bytes):
+                stats["batches"] += 1
+                stats["bytes_sent"] += len(payload)
+                for doc_id, outcome in _send_bulk(client, batch_ids, payload, request_timeout).items():
+                    if outcome is None:
+                        stats["indexed_count"] += 1
+                        failures.pop(doc_id, None)
+                    else:
+                        failures[doc_id] = outcome
+                        if outcome["retryable"]:
+                            retry[doc_id] = pending[doc_id]
+
+            pending = retry
+            if not pending:
+                break
+    finally:
+        if previous_refresh is not None:
+            restore_refresh(client, index_name, previous_refresh)
+
+    errors = [
+        {"chunk_id": doc_id, "status": failure["status"], "error": failure["error"]}
+        for doc_id, failure in failures.items()
+    ]
+    elapsed = time.time() - start_time
+
+    return {
+        **stats,
+        "error_count": len(errors),
+        "errors": errors,
+        "latency_ms": int(elapsed * 1000),
+        "docs_per_sec": round(stats["indexed_count"] / elapsed, 1) if elapsed > 0 else None
+    }
+
+
+def _iter_bulk_batches(pending: Dict[str, str], max_batch_bytes: int) -> Iterator[Tuple[List[str], str]]:
+    """Pack serialized documents into payloads within the byte budget."""
+    batch_ids: List[str] = []
+    lines: List[str] = []
+    size = 0
+
+    for doc_id, line in pending.items():
+        line_size = len(line.encode("utf-8"))
+        # A single oversized document still goes out, alone
+        if batch_ids and size + line_size > max_batch_bytes:
+            yield batch_ids, "".join(lines)
+            batch_ids, lines, size = [], [], 0
+        batch_ids.append(doc_id)
+        lines.append(line)
+        size += line_size
+
+    if batch_ids:
+        yield batch_ids, "".join(lines)
+
+
+def _send_bulk(client, batch_ids: List[str], payload: str, request_timeout: float) -> Dict[str, Optional[dict]]:
+    """
+    Send one _bulk request.
+
+    Returns:
+        doc_id -> None on success, or {"status", "error", "retryable"} on failure
+    """
+    try:
+        response = client.bulk(body=payload, request_timeout=request_timeout)
+    except Exception as e:
+        # Transport-level failure: every item in the request is retryable
+        failure = {"status": None, "error": str(e), "retryable": True}
+        return {doc_id: failure for doc_id in batch_ids}
+
+    outcomes: Dict[str, Optional[dict]] = {}
+    items = response.get("items", [])
+    for doc_id, item in zip(batch_ids, items):
+        result = item.get("index", {})
+        status = result.get("status", 500)
+        if status < 300:
+            outcomes[doc_id] = None
+        else:
+            error = result.get("error")
+            outcomes[doc_id] = {
+                "status": status,
+                "error": json.dumps(error) if isinstance(error, dict) else str(error),
+                "retryable": status in RETRYABLE_BULK_STATUSES
+            }
+
+    # Items missing from a truncated response are treated as transient failures
+    for doc_id in batch_ids[len(items):]:
+        outcomes[doc_id] = {"status": None, "error": "missing_bulk_item", "retryable": True}
+
+    return outcomes
+
+
+def pause_refresh(client, index_name: str) -> Optional[dict]:
+    """Disable refresh on the index; returns the setting to restore (or None on failure)."""
+    try:
+        settings = client.indices.get_settings(index=index_name, name="index.refresh_interval")
+        current = settings.get(index_name, {}).get("settings", {}).get("index", {}).get("refresh_interval")
+        client.indices.put_settings(index=index_name, body={"index": {"refresh_interval": "-1"}})
+        # None restores the cluster default
+        return {"refresh_interval": current}
+    except Exception as e:
+        print(f"Warning: Failed to disable refresh on {index_name}: {str(e)}")
+        return None
+
+
+def restore_refresh(client, index_name: str, previous: dict) -> None:
+    """Restore the refresh setting returned by pause_refresh()."""
+    try:
+        client.indices.put_settings(index=index_name, body={"index": previous})
+    except Exception as e:
+        print(f"Warning: Failed to restore refresh_interval on {index_name}: {str(e)}")
 
 
 def _ensure_index_exists(client, index_name: str) -> dict:
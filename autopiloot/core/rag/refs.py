@@ -9,25 +9,257 @@ Architecture:
 - Feature-flagged: Controlled by rag.features.write_firestore_refs
 - No hard dependency: RAG works perfectly without Firestore
 - Audit trail: Helps operations team locate indexed artifacts
+- Buffered: upsert_ref() queues refs on one shared Firestore client and
+  flush_refs() commits them in WriteBatch groups of up to 500 documents,
+  when rag.refs.buffer.max_buffered refs are queued, when the oldest has
+  waited flush_interval_seconds, after ingest(), ingest_many() and each
+  rag_index_* tool run, and at exit. Import it as rag.refs (core/ on
+  sys.path) so every caller shares one buffer
 """
 
 import os
 import sys
-from typing import Dict, Any, Optional
+import time
+import atexit
+import threading
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 
 # Add parent directories to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'config'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from loader import get_config_value
 
 
+REFS_COLLECTION = "rag_refs"
+MAX_BATCH_WRITES = 500  # Firestore limit per WriteBatch commit
+DEFAULT_MAX_BUFFERED = 500
+DEFAULT_FLUSH_INTERVAL_SECONDS = 5.0
+
+_config: Optional[dict] = None
+_buffer: Dict[str, Tuple[Any, Any, dict]] = {}
+_oldest_at: Optional[float] = None
+_timer: Optional[threading.Timer] = None
+_state_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_stats = {
+    "enqueued": 0,
+    "coalesced": 0,
+    "written": 0,
+    "failed": 0,
+    "flushes": 0,
+    "batches": 0,
+    "flush_ms_total": 0,
+    "last_flush_ms": 0,
+    "flush_reasons": {}
+}
+
+
+def configure_ref_writer(config: Optional[dict] = None) -> dict:
+    """
+    (Re)initialize the ref buffer from configuration.
+
+    Called lazily on first use with rag.refs.buffer from settings.yaml.
+    Refs still queued under the previous configuration are kept.
+
+    Args:
+        config: Buffer configuration (defaults to rag.refs.buffer)
+
+    Returns:
+        Dictionary with status, max_buffered, batch_size and flush_interval_seconds
+    """
+    global _config
+
+    if config is None:
+        config = get_config_value("rag.refs.buffer", {})
+        if not isinstance(config, dict):
+            config = {}
+
+    max_buffered = config.get("max_buffered", DEFAULT_MAX_BUFFERED)
+    if config.get("enabled", True) is not True:
+        max_buffered = 1  # Every ref is committed as soon as it is queued
+    elif not isinstance(max_buffered, int) or max_buffered < 1:
+        max_buffered = DEFAULT_MAX_BUFFERED
+
+    batch_size = config.get("batch_size", MAX_BATCH_WRITES)
+    if not isinstance(batch_size, int) or batch_size < 1:
+        batch_size = MAX_BATCH_WRITES
+
+    interval = config.get("flush_interval_seconds", DEFAULT_FLUSH_INTERVAL_SECONDS)
+    if not isinstance(interval, (int, float)) or isinstance(interval, bool) or interval < 0:
+        interval = DEFAULT_FLUSH_INTERVAL_SECONDS
+
+    resolved = {
+        "max_buffered": max_buffered,
+        "batch_size": min(batch_size, MAX_BATCH_WRITES),
+        "flush_interval_seconds": float(interval)
+    }
+    with _state_lock:
+        _config = resolved
+
+    return dict(resolved, status="configured")
+
+
+def _get_config() -> dict:
+    if _config is None:
+        configure_ref_writer()
+    return _config
+
+
+def reset_ref_writer() -> None:
+    """Drop queued refs, metrics and configuration (next use re-reads settings)."""
+    global _config, _buffer, _oldest_at, _timer
+    with _state_lock:
+        if _timer is not None:
+            _timer.cancel()
+        _config = None
+        _buffer = {}
+        _oldest_at = None
+        _timer = None
+        _stats.update({
+            "enqueued": 0, "coalesced": 0, "written": 0, "failed": 0, "flushes": 0,
+            "batches": 0, "flush_ms_total": 0, "last_flush_ms": 0, "flush_reasons": {}
+        })
+
+
+def _enqueue(client: Any, doc_ref: Any, doc_id: str, doc_data: dict) -> None:
+    """Queue one document, then flush if a size or age threshold is reached."""
+    global _oldest_at, _timer
+
+    config = _get_config()
+    now = time.monotonic()
+
+    with _state_lock:
+        _stats["enqueued"] += 1
+        queued = _buffer.get(doc_id)
+        if queued is not None:
+            # Same document twice before a flush: merge like set(merge=True) would
+            _stats["coalesced"] += 1
+            queued[2].update(doc_data)
+        else:
+            _buffer[doc_id] = (client, doc_ref, doc_data)
+        if _oldest_at is None:
+            _oldest_at = now
+        buffered = len(_buffer)
+        expired = now - _oldest_at >= config["flush_interval_seconds"]
+
+        interval = config["flush_interval_seconds"]
+        if _timer is None and buffered < config["max_buffered"] and interval > 0:
+            _timer = threading.Timer(interval, flush_refs, kwargs={"reason": "interval"})
+            _timer.daemon = True
+            _timer.start()
+
+    if buffered >= config["max_buffered"]:
+        flush_refs(reason="size")
+    elif expired:
+        flush_refs(reason="interval")
+
+
+def flush_refs(reason: str = "manual") -> dict:
+    """
+    Commit all queued refs in WriteBatch groups.
+
+    Best-effort: a failed batch is logged and its refs are dropped, never
+    retried or raised.
+
+    Args:
+        reason: Flush trigger recorded in metrics ("size", "interval",
+            "ingest", "exit" or "manual")
+
+    Returns:
+        Dictionary containing:
+        - flushed: Refs committed
+        - failed: Refs in batches that failed to commit
+        - batches: WriteBatch commits attempted
+        - duration_ms: Time spent committing
+        - reason: Flush trigger
+
+    Example:
+        >>> flush_refs()
+        {'flushed': 12, 'failed': 0, 'batches': 1, 'duration_ms': 84, 'reason': 'manual'}
+    """
+    global _buffer, _oldest_at, _timer
+
+    result = {"flushed": 0, "failed": 0, "batches": 0, "duration_ms": 0, "reason": reason}
+
+    try:
+        with _flush_lock:
+            with _state_lock:
+                pending = list(_buffer.values())
+                _buffer = {}
+                _oldest_at = None
+                if _timer is not None:
+                    _timer.cancel()
+                    _timer = None
+            if not pending:
+                return result
+
+            # A WriteBatch belongs to one client (one per GCP project)
+            by_client: Dict[int, list] = {}
+            for client, doc_ref, doc_data in pending:
+                by_client.setdefault(id(client), [client]).append((doc_ref, doc_data))
+
+            batch_size = _get_config()["batch_size"]
+            start = time.perf_counter()
+            for client, *writes in by_client.values():
+                for offset in range(0, len(writes), batch_size):
+                    group = writes[offset:offset + batch_size]
+                    result["batches"] += 1
+                    try:
+                        batch = client.batch()
+                        for doc_ref, doc_data in group:
+                            batch.set(doc_ref, doc_data, merge=True)
+                        batch.commit()
+                        result["flushed"] += len(group)
+                    except Exception as e:
+                        result["failed"] += len(group)
+                        print(f"Warning: Failed to write {len(group)} RAG refs to Firestore: {str(e)}")
+            result["duration_ms"] = int((time.perf_counter() - start) * 1000)
+
+            with _state_lock:
+                _stats["written"] += result["flushed"]
+                _stats["failed"] += result["failed"]
+                _stats["flushes"] += 1
+                _stats["batches"] += result["batches"]
+                _stats["flush_ms_total"] += result["duration_ms"]
+                _stats["last_flush_ms"] = result["duration_ms"]
+                _stats["flush_reasons"][reason] = _stats["flush_reasons"].get(reason, 0) + 1
+
+            if result["flushed"]:
+                print(f"   ✓ {result['flushed']} RAG refs written to Firestore: {REFS_COLLECTION} "
+                      f"({result['batches']} batches, {result['duration_ms']}ms)")
+    except Exception as e:
+        print(f"Warning: RAG ref flush failed: {str(e)}")
+
+    return result
+
+
+def get_ref_writer_stats() -> dict:
+    """
+    Get ref buffer and flush metrics for this process.
+
+    Returns:
+        Dictionary with buffered, enqueued, coalesced, written, failed,
+        flushes, batches, flush_ms_total, last_flush_ms, avg_batch_size
+        and flush_reasons
+    """
+    with _state_lock:
+        stats = dict(_stats, flush_reasons=dict(_stats["flush_reasons"]), buffered=len(_buffer))
+    stats["avg_batch_size"] = round(stats["written"] / stats["batches"], 1) if stats["batches"] else 0.0
+    return stats
+
+
+atexit.register(flush_refs, reason="exit")
+
+
 def upsert_ref(ref: Dict[str, Any]) -> None:
     """
     Best-effort upsert of RAG reference to Firestore.
 
     This function NEVER raises exceptions and NEVER blocks indexing operations.
-    All errors are caught and logged as warnings only.
+    All errors are caught and logged as warnings only. The ref is queued and
+    committed by the next flush_refs() (size, age, ingest, tool run or exit).
 
     Args:
         ref: Dictionary containing reference fields:
@@ -101,9 +333,10 @@ def upsert_ref(ref: Dict[str, Any]) -> None:
             print(f"Warning: Failed to get GCP_PROJECT_ID: {str(e)}")
             return
 
-        # Create Firestore client
+        # Shared Firestore client (one per project and process)
         try:
-            db = firestore.Client(project=project_id)
+            from rag.clients import get_firestore_client
+            db = get_firestore_client(project_id)
         except Exception as e:
             print(f"Warning: Failed to create Firestore client: {str(e)}")
             return
@@ -145,13 +378,12 @@ def upsert_ref(ref: Dict[str, Any]) -> None:
         if "tags" in ref:
             doc_data["tags"] = ref["tags"]
 
-        # Upsert to Firestore (best-effort)
+        # Queue for a batched upsert (best-effort)
         try:
-            doc_ref = db.collection("rag_refs").document(doc_id)
-            doc_ref.set(doc_data, merge=True)
-            print(f"   ✓ RAG ref written to Firestore: rag_refs/{doc_id}")
+            doc_ref = db.collection(REFS_COLLECTION).document(doc_id)
+            _enqueue(db, doc_ref, doc_id, doc_data)
         except Exception as e:
-            print(f"Warning: Failed to write RAG ref to Firestore: {str(e)}")
+            print(f"Warning: Failed to queue RAG ref for Firestore: {str(e)}")
             return
 
     except Exception as e:
@@ -328,5 +560,10 @@ if __name__ == "__main__":
     refs = query_refs(ref_type="transcript", limit=10)
     print(f"   Found {len(refs)} transcript refs")
 
+    # Test 5: Flush queued refs and show metrics
+    print("\n5. Testing flush_refs:")
+    print(f"   Flush: {flush_refs()}")
+    print(f"   Stats: {get_ref_writer_stats()}")
+
     print("\n" + "=" * 80)
     print("✅ Test completed (best-effort - no exceptions raised)")
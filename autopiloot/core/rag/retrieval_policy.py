@@ -8,11 +8,226 @@ for retrieval results. Applied after hybrid fusion but before LLM reasoning.
 import os
 import sys
 import re
-from typing import List, Dict, Optional, Any
+import threading
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
 
-# Add config directory to path
+# Add config and core directories to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'config'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+
+# Numbered backreferences (\1) cannot survive being combined into one alternation
+_NUMBERED_BACKREF = re.compile(r"\\[1-9]")
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """True if pattern contains "|" outside groups and character classes."""
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            if pattern[i + 1:i + 2] == "]":
+                i += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def _combine_patterns(groups: List[str], sources: List[str]) -> str:
+    """
+    One alternation with a named group per pattern.
+
+    When every pattern starts with a word boundary (typical for PII), the
+    boundary is hoisted in front of the alternation: CPython's re then tries
+    the alternatives only at word boundaries instead of at every position,
+    which is what makes a single pass cheaper than one re.sub per pattern.
+    """
+    if all(source.startswith(r"\b") and not _has_top_level_alternation(source) for source in sources):
+        return r"\b(?:" + "|".join(f"(?P<{g}>{source[2:]})" for g, source in zip(groups, sources)) + ")"
+    return "|".join(f"(?P<{g}>{source})" for g, source in zip(groups, sources))
+
+
+class RedactionEngine:
+    """
+    Precompiled PII redaction over rag.policy.sensitive_patterns.
+
+    All patterns are combined into one alternation with a named group per
+    pattern, so each text is scanned once and every match knows which pattern
+    produced it. Overlaps resolve like any alternation: the leftmost match
+    wins, and the earlier pattern in the config only wins among matches
+    starting at the same position. Replaced text is never scanned again, so a
+    pattern cannot match inside another pattern's replacement.
+
+    Patterns that cannot be combined (numbered backreferences, inline global
+    flags) and replacements that are re.sub templates (containing a
+    backslash, e.g. "\\1" or "\\g<name>") fall back to one re.sub per
+    pattern in config order, where templates expand as usual.
+
+    Hit counters per pattern name accumulate across calls for the audit log.
+    """
+
+    def __init__(self, sensitive_patterns: List[dict]):
+        self.names: List[str] = []
+        self.replacements: List[str] = []
+        self.severities: List[str] = []
+        sources = []
+        for i, pattern_config in enumerate(sensitive_patterns or []):
+            pattern = pattern_config.get("pattern")
+            if not pattern:
+                continue
+            re.compile(pattern)  # Surface invalid patterns with their own error
+            self.names.append(pattern_config.get("name") or f"pattern_{i}")
+            self.replacements.append(pattern_config.get("replacement", "[REDACTED]"))
+            self.severities.append(pattern_config.get("severity", "medium"))
+            sources.append(pattern)
+
+        self._group_names = [f"p{i}" for i in range(len(sources))]
+        self._combined = None
+        self._separate: List["re.Pattern"] = []
+        templated = any("\\" in replacement for replacement in self.replacements)
+        if sources and not templated and not any(_NUMBERED_BACKREF.search(source) for source in sources):
+            try:
+                self._combined = re.compile(_combine_patterns(self._group_names, sources))
+            except re.error:
+                self._combined = None
+        if self._combined is None:
+            self._separate = [re.compile(source) for source in sources]
+
+        self._group_index = {group: i for i, group in enumerate(self._group_names)}
+        self._lock = threading.Lock()
+        self.hit_counts: Dict[str, int] = {name: 0 for name in self.names}
+        self.texts_scanned = 0
+        self.texts_redacted = 0
+
+    @property
+    def mode(self) -> str:
+        return "single_pass" if self._combined is not None else "per_pattern"
+
+    def redact(self, text: str) -> Tuple[str, Dict[str, int]]:
+        """
+        Redact one text.
+
+        Returns:
+            Tuple of (redacted text, hits per pattern name for this text)
+        """
+        hits: Dict[str, int] = {}
+        if not text or not self.names:
+            return text, hits
+
+        if self._combined is not None:
+            def replace(match):
+                index = self._group_index[match.lastgroup]
+                name = self.names[index]
+                hits[name] = hits.get(name, 0) + 1
+                return self.replacements[index]
+
+            redacted = self._combined.sub(replace, text)
+        else:
+            redacted = text
+            for name, regex, replacement in zip(self.names, self._separate, self.replacements):
+                redacted, count = regex.subn(replacement, redacted)
+                if count:
+                    hits[name] = hits.get(name, 0) + count
+
+        self._record(1, hits)
+        return redacted, hits
+
+    def redact_results(self, results: List[dict]) -> Tuple[List[dict], List[Dict[str, int]]]:
+        """
+        Redact the "text" of every result.
+
+        Returns shallow copies (inputs are never modified); redacted results
+        get the new text and metadata.redacted = True.
+
+        Returns:
+            Tuple of (results in input order, hits per result)
+        """
+        redacted_results = []
+        per_result_hits = []
+        for result in results:
+            text = result.get("text", "")
+            redacted, hits = self.redact(text) if text else (text, {})
+            result = dict(result)
+            if hits:
+                result["text"] = redacted
+                result["metadata"] = {**(result.get("metadata") or {}), "redacted": True}
+            redacted_results.append(result)
+            per_result_hits.append(hits)
+        return redacted_results, per_result_hits
+
+    def _record(self, texts: int, hits: Dict[str, int]) -> None:
+        with self._lock:
+            self.texts_scanned += texts
+            if hits:
+                self.texts_redacted += texts
+            for name, count in hits.items():
+                self.hit_counts[name] += count
+
+    def get_stats(self) -> dict:
+        """Cumulative hit counters per pattern name."""
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "patterns": list(self.names),
+                "texts_scanned": self.texts_scanned,
+                "texts_redacted": self.texts_redacted,
+                "hit_counts": dict(self.hit_counts)
+            }
+
+
+_engines: Dict[tuple, RedactionEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_redaction_engine(sensitive_patterns: List[dict]) -> RedactionEngine:
+    """
+    Engine for a pattern list, compiled once per distinct configuration.
+
+    Args:
+        sensitive_patterns: rag.policy.sensitive_patterns entries
+            ({"name", "pattern", "replacement", "severity"})
+
+    Returns:
+        Cached RedactionEngine (rebuilt only when the patterns change)
+    """
+    key = tuple(
+        (p.get("name"), p.get("pattern"), p.get("replacement", "[REDACTED]"), p.get("severity"))
+        for p in sensitive_patterns or []
+    )
+    engine = _engines.get(key)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(key)
+            if engine is None:
+                engine = _engines[key] = RedactionEngine(sensitive_patterns)
+    return engine
+
+
+def get_redaction_stats() -> dict:
+    """Cumulative per-pattern hit counters of the engine for the current config."""
+    from rag.config import get_policy_config
+
+    return get_redaction_engine(get_policy_config().get("sensitive_patterns", [])).get_stats()
+
+
+def reset_redaction_engines() -> None:
+    """Drop compiled engines and their counters (useful for testing)."""
+    with _engines_lock:
+        _engines.clear()
 
 
 def enforce_policy(results: List[dict], policy_context: Optional[Dict[str, Any]] = None) -> dict:
@@ -35,6 +250,7 @@ def enforce_policy(results: List[dict], policy_context: Optional[Dict[str, Any]]
         - filtered_count: Number of results removed by filtering
         - redacted_count: Number of results with redactions
         - violations: List of policy violations detected
+        - redaction_hits: Redactions per sensitive pattern name
         - policy_mode: Enforcement mode used
 
     Enforcement Modes:
@@ -45,7 +261,8 @@ def enforce_policy(results: List[dict], policy_context: Optional[Dict[str, Any]]
     Policy Rules:
         1. Channel-based authorization: Filter by allowed_channels
         2. Source-based authorization: Filter by allowed_sources
-        3. PII redaction: Detect and redact sensitive patterns
+        3. PII redaction: Detect and redact sensitive patterns (one
+           precompiled RedactionEngine pass per result text)
         4. Content filtering: Remove results with prohibited content
 
     Example:
@@ -87,6 +304,7 @@ def enforce_policy(results: List[dict], policy_context: Optional[Dict[str, Any]]
         filtered_count = 0
         redacted_count = 0
         violations = []
+        redaction_hits: Dict[str, int] = {}
 
         # Process each result
         for result in results:
@@ -112,19 +330,26 @@ def enforce_policy(results: List[dict], policy_context: Optional[Dict[str, Any]]
                 if mode != "audit_only":
                     continue
 
-            # Apply redaction if enabled
-            redacted_result = result.copy()
-            if (policy_context or {}).get("redact_pii", True):
-                redaction_applied = _apply_redaction(redacted_result, config)
-                if redaction_applied:
-                    redacted_count += 1
-                    violations.append({
-                        "chunk_id": result.get("chunk_id"),
-                        "violation": "pii_detected",
-                        "reason": "PII redacted from result"
-                    })
+            filtered_results.append(result)
 
-            filtered_results.append(redacted_result)
+        # Apply redaction if enabled: one pass per text over all patterns
+        if (policy_context or {}).get("redact_pii", True):
+            engine = get_redaction_engine(config.get("sensitive_patterns", []))
+            filtered_results, per_result_hits = engine.redact_results(filtered_results)
+            for result, hits in zip(filtered_results, per_result_hits):
+                if not hits:
+                    continue
+                redacted_count += 1
+                for name, count in hits.items():
+                    redaction_hits[name] = redaction_hits.get(name, 0) + count
+                violations.append({
+                    "chunk_id": result.get("chunk_id"),
+                    "violation": "pii_detected",
+                    "reason": "PII redacted from result",
+                    "patterns": sorted(hits)
+                })
+        else:
+            filtered_results = [result.copy() for result in filtered_results]
 
         # Log policy enforcement
         try:
@@ -134,7 +359,8 @@ def enforce_policy(results: List[dict], policy_context: Optional[Dict[str, Any]]
                 filtered_count=filtered_count,
                 redacted_count=redacted_count,
                 violations=violations,
-                mode=mode
+                mode=mode,
+                redaction_hits=redaction_hits
             )
         except Exception as e:
             print(f"Warning: Failed to log policy enforcement: {str(e)}")
@@ -145,6 +371,7 @@ def enforce_policy(results: List[dict], policy_context: Optional[Dict[str, Any]]
             "filtered_count": filtered_count,
             "redacted_count": redacted_count,
             "violations": violations if config.get("audit", {}).get("log_violations", True) else [],
+            "redaction_hits": redaction_hits,
             "policy_mode": mode
         }
 
@@ -204,37 +431,21 @@ def _check_content_filter(result: dict, config: dict) -> bool:
 
 
 def _apply_redaction(result: dict, config: dict) -> bool:
-    """Apply PII redaction to result text. Returns True if redaction was applied."""
-    sensitive_patterns = config.get("sensitive_patterns", [])
-    if not sensitive_patterns:
-        return False
-
+    """Apply PII redaction to result text in place. Returns True if redaction was applied."""
     text = result.get("text", "")
     if not text:
         return False
 
-    redacted_text = text
-    redaction_applied = False
-
-    # Apply each sensitive pattern
-    for pattern_config in sensitive_patterns:
-        pattern = pattern_config.get("pattern")
-        replacement = pattern_config.get("replacement", "[REDACTED]")
-
-        if pattern:
-            new_text = re.sub(pattern, replacement, redacted_text)
-            if new_text != redacted_text:
-                redacted_text = new_text
-                redaction_applied = True
-
-    if redaction_applied:
-        result["text"] = redacted_text
-        # Mark that redaction was applied
-        if "metadata" not in result:
-            result["metadata"] = {}
-        result["metadata"]["redacted"] = True
+    redacted_text, hits = get_redaction_engine(config.get("sensitive_patterns", [])).redact(text)
+    if not hits:
+        return False
 
-    return redaction_applied
+    result["text"] = redacted_text
+    # Mark that redaction was applied
+    if "metadata" not in result:
+        result["metadata"] = {}
+    result["metadata"]["redacted"] = True
+    return True
 
 
 def _log_policy_enforcement(
@@ -243,14 +454,16 @@ def _log_policy_enforcement(
     filtered_count: int,
     redacted_count: int,
     violations: List[dict],
-    mode: str
+    mode: str,
+    redaction_hits: Optional[Dict[str, int]] = None
 ) -> None:
-    """Log policy enforcement metrics."""
+    """Log policy enforcement metrics, including redactions per pattern."""
     # This would integrate with the observability agent
     # For now, just print summary
     if filtered_count > 0 or redacted_count > 0:
+        hits = f" hits={redaction_hits}" if redaction_hits else ""
         print(f"Policy enforcement: {total_input} input → {total_output} output "
-              f"({filtered_count} filtered, {redacted_count} redacted) [mode: {mode}]")
+              f"({filtered_count} filtered, {redacted_count} redacted) [mode: {mode}]{hits}")
 
 
 def validate_policy_config() -> dict:
@@ -291,6 +504,11 @@ def validate_policy_config() -> dict:
             for i, pattern in enumerate(sensitive_patterns):
                 if not pattern.get("pattern"):
                     errors.append(f"Sensitive pattern {i} missing 'pattern' field")
+                else:
+                    try:
+                        re.compile(pattern["pattern"])
+                    except re.error as e:
+                        errors.append(f"Sensitive pattern {i} is not a valid regex: {str(e)}")
                 if not pattern.get("replacement"):
                     warnings.append(f"Sensitive pattern {i} missing 'replacement' field")
 
@@ -407,5 +625,9 @@ if __name__ == "__main__":
     print(f"   Mode: {result['policy_mode']}")
     print(f"   Note: In audit_only mode, violations logged but results not filtered")
 
+    # Test 4: Redaction hit counters
+    print("\n4. Testing get_redaction_stats():")
+    print(f"   {get_redaction_stats()}")
+
     print("\n" + "="*80)
     print("✅ Test completed")
@@ -0,0 +1,376 @@
+"""
+Adaptive Query Routing
+
+Classifies a query and its filters before the hybrid_retrieve fan-out and
+picks the sources worth calling (rag.routing in settings.yaml):
+- Strong filters (2+ filters, or a video_id) → OpenSearch + BigQuery
+- Conceptual queries without filters → Zep
+- Factual queries with a filter → OpenSearch + BigQuery
+- Mixed intent → all available sources
+- Anything else, or a decision below rag.routing.min_confidence → all
+  available sources
+
+Routing only narrows the set of enabled sources; mode "always_on" or
+always_use_all_sources: true disables it.
+"""
+
+import os
+import re
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+
+# Add config and core directories to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'config'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+
+DEFAULT_MIN_CONFIDENCE = 0.6
+
+ALL_SOURCES = ("zep", "opensearch", "bigquery")
+FILTER_SOURCES = ("opensearch", "bigquery")
+SEMANTIC_SOURCES = ("zep",)
+
+# Signals of "understand a topic" queries (semantic search excels)
+CONCEPTUAL_SIGNALS = (
+    "how to", "how do", "how can", "why", "what is", "what are", "explain",
+    "strategy", "strategies", "approach", "framework", "principle", "principles",
+    "best practice", "best practices", "mindset", "improve"
+)
+
+# Signals of "find a specific fact" queries (keyword/structured search excels)
+FACTUAL_SIGNALS = (
+    "who", "when", "where", "which", "how many", "how much", "date", "price",
+    "cost", "specific", "exact", "number", "list", "published", "episode"
+)
+
+# Filters that narrow retrieval (search() filter keys)
+FILTER_KEYS = ("channel_id", "video_id", "date_from", "date_to", "min_duration_sec", "max_duration_sec")
+
+# Words at which a query counts as fully complex for the confidence penalty
+_COMPLEX_QUERY_WORDS = 20
+
+
+def _signal_pattern(signals) -> "re.Pattern":
+    # Longest first so "how many" wins over a shorter overlapping signal
+    alternatives = sorted(signals, key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(re.escape(s) for s in alternatives) + r")\b")
+
+
+_CONCEPTUAL_RE = _signal_pattern(CONCEPTUAL_SIGNALS)
+_FACTUAL_RE = _signal_pattern(FACTUAL_SIGNALS)
+
+_stats_lock = threading.Lock()
+_routing_stats = {
+    "decisions": 0,
+    "by_strategy": {},
+    "source_calls": 0,
+    "source_calls_saved": 0,
+    "low_confidence_fallbacks": 0
+}
+
+
+def get_routing_config() -> dict:
+    """
+    Get routing configuration from rag.routing.
+
+    Returns:
+        Dictionary with mode, always_use_all_sources, min_confidence and logging
+    """
+    from rag.config import get_rag_value
+
+    config = get_rag_value("routing", {})
+    if not isinstance(config, dict):
+        config = {}
+
+    logging_config = config.get("logging") if isinstance(config.get("logging"), dict) else {}
+    min_confidence = config.get("min_confidence", DEFAULT_MIN_CONFIDENCE)
+    if not isinstance(min_confidence, (int, float)):
+        min_confidence = DEFAULT_MIN_CONFIDENCE
+
+    return {
+        "mode": config.get("mode", "adaptive"),
+        "always_use_all_sources": config.get("always_use_all_sources", False) is True,
+        "min_confidence": float(min_confidence),
+        "logging": {
+            "enabled": logging_config.get("enabled", True),
+            "log_level": logging_config.get("log_level", "info")
+        }
+    }
+
+
+def classify_query(query: str, filters: Optional[Dict[str, Any]] = None) -> dict:
+    """
+    Classify query intent and filter strength.
+
+    Args:
+        query: Search query string
+        filters: search() filters (channel_id, video_id, date_from, ...)
+
+    Returns:
+        Dictionary containing:
+        - intent_type: "conceptual", "factual", "mixed" or "unknown"
+        - conceptual_signals / factual_signals: Matched signal phrases
+        - complexity_score: 0.0-1.0 from word count and signal count
+        - word_count: Words in the query
+        - filter_strength: "strong", "moderate" or "none"
+        - filters_present: Filter keys with a value
+
+    Example:
+        >>> classify_query("How to build a sales team")["intent_type"]
+        'conceptual'
+    """
+    text = (query or "").lower()
+    conceptual = list(dict.fromkeys(_CONCEPTUAL_RE.findall(text)))
+    factual = list(dict.fromkeys(_FACTUAL_RE.findall(text)))
+
+    if conceptual and factual:
+        intent_type = "mixed"
+    elif conceptual:
+        intent_type = "conceptual"
+    elif factual:
+        intent_type = "factual"
+    else:
+        intent_type = "unknown"
+
+    word_count = len(text.split())
+    complexity = min(1.0, word_count / _COMPLEX_QUERY_WORDS + 0.1 * (len(conceptual) + len(factual)))
+
+    filters_present = [key for key in FILTER_KEYS if (filters or {}).get(key) not in (None, "", [])]
+    if len(filters_present) >= 2 or "video_id" in filters_present:
+        filter_strength = "strong"
+    elif filters_present:
+        filter_strength = "moderate"
+    else:
+        filter_strength = "none"
+
+    return {
+        "intent_type": intent_type,
+        "conceptual_signals": conceptual,
+        "factual_signals": factual,
+        "complexity_score": round(complexity, 2),
+        "word_count": word_count,
+        "filter_strength": filter_strength,
+        "filters_present": filters_present
+    }
+
+
+def _apply_rules(analysis: dict) -> dict:
+    """Pick sources, strategy and a confidence from the query analysis."""
+    intent = analysis["intent_type"]
+    strength = analysis["filter_strength"]
+    penalty = 0.2 * analysis["complexity_score"]
+
+    if strength == "strong":
+        return {
+            "sources": FILTER_SOURCES,
+            "strategy": "filter_optimized",
+            "confidence": 0.9,
+            "reason": "Strong filters → OpenSearch + BigQuery for precise filtering"
+        }
+    if intent == "conceptual" and strength == "none":
+        signals = min(len(analysis["conceptual_signals"]), 3)
+        return {
+            "sources": SEMANTIC_SOURCES,
+            "strategy": "semantic_optimized",
+            "confidence": 0.65 + 0.1 * signals - penalty,
+            "reason": "Conceptual query without filters → Zep for semantic understanding"
+        }
+    if intent == "factual" and strength == "moderate":
+        signals = min(len(analysis["factual_signals"]), 3)
+        return {
+            "sources": FILTER_SOURCES,
+            "strategy": "keyword_optimized",
+            "confidence": 0.6 + 0.1 * signals - penalty,
+            "reason": "Factual query with filters → OpenSearch + BigQuery for keyword and structured search"
+        }
+    if intent == "mixed":
+        return {
+            "sources": ALL_SOURCES,
+            "strategy": "comprehensive",
+            "confidence": 1.0,
+            "reason": "Mixed intent → all available sources for comprehensive coverage"
+        }
+    return {
+        "sources": ALL_SOURCES,
+        "strategy": "fallback",
+        "confidence": 1.0,
+        "reason": "No routing rule matched → all available sources"
+    }
+
+
+def route_query(
+    query: str,
+    filters: Optional[Dict[str, Any]],
+    available_sources: List[str],
+    trace_id: Optional[str] = None,
+    config: Optional[dict] = None
+) -> dict:
+    """
+    Choose which of the available sources to query.
+
+    Args:
+        query: Search query string
+        filters: search() filters
+        available_sources: Enabled sources, in fan-out order
+        trace_id: Optional trace ID for the routing log line
+        config: Routing configuration (default: get_routing_config())
+
+    Returns:
+        Dictionary containing:
+        - selected_sources: Sources to query (subset of available_sources)
+        - skipped_sources: Available sources not queried
+        - routing_strategy: filter_optimized, semantic_optimized,
+          keyword_optimized, comprehensive, fallback, low_confidence or always_on
+        - confidence: Confidence of the matched rule (0.0-1.0)
+        - fallback: True when all sources are used because no rule matched,
+          confidence was low or the routed sources are unavailable
+        - reasoning: Human-readable explanation
+        - mode: Routing mode
+        - analysis: classify_query() output
+
+    Example:
+        >>> decision = route_query("How to build a sales team", None, ["zep", "opensearch", "bigquery"])
+        >>> decision["selected_sources"]
+        ['zep']
+    """
+    if config is None:
+        config = get_routing_config()
+
+    analysis = classify_query(query, filters)
+    available = list(available_sources)
+
+    if config["mode"] != "adaptive" or config["always_use_all_sources"]:
+        decision = {
+            "selected_sources": available,
+            "routing_strategy": "always_on",
+            "confidence": 1.0,
+            "fallback": False,
+            "reasoning": [f"Routing mode '{config['mode']}' → all available sources"]
+        }
+    else:
+        rule = _apply_rules(analysis)
+        selected = [name for name in available if name in rule["sources"]]
+        reasoning = [rule["reason"]]
+        strategy = rule["strategy"]
+        fallback = strategy == "fallback"
+
+        if rule["confidence"] < config["min_confidence"]:
+            reasoning.append(
+                f"Confidence {rule['confidence']:.2f} below {config['min_confidence']:.2f} → all available sources"
+            )
+            selected = available
+            strategy = "low_confidence"
+            fallback = True
+        elif not selected:
+            reasoning.append("Routed sources unavailable → all available sources")
+            selected = available
+            fallback = True
+
+        if not available:
+            reasoning.append("No sources available")
+
+        decision = {
+            "selected_sources": selected,
+            "routing_strategy": strategy,
+            "confidence": round(rule["confidence"], 2),
+            "fallback": fallback,
+            "reasoning": reasoning
+        }
+
+    decision["skipped_sources"] = [name for name in available if name not in decision["selected_sources"]]
+    decision["mode"] = config["mode"]
+    decision["analysis"] = analysis
+
+    _record_decision(decision)
+    _log_decision(decision, query, trace_id, config["logging"])
+    return decision
+
+
+def _record_decision(decision: dict) -> None:
+    with _stats_lock:
+        _routing_stats["decisions"] += 1
+        strategy = decision["routing_strategy"]
+        _routing_stats["by_strategy"][strategy] = _routing_stats["by_strategy"].get(strategy, 0) + 1
+        _routing_stats["source_calls"] += len(decision["selected_sources"])
+        _routing_stats["source_calls_saved"] += len(decision["skipped_sources"])
+        if strategy == "low_confidence":
+            _routing_stats["low_confidence_fallbacks"] += 1
+
+
+def _log_decision(decision: dict, query: str, trace_id: Optional[str], logging_config: dict) -> None:
+    """Print the decision per rag.routing.logging (info: one line, debug: with reasoning)."""
+    if not logging_config.get("enabled", True):
+        return
+    log_level = logging_config.get("log_level", "info")
+    if log_level not in ("debug", "info"):
+        return
+
+    prefix = f"[RAG Route {trace_id}]" if trace_id else "[RAG Route]"
+    print(f"{prefix} query='{query[:50]}' strategy={decision['routing_strategy']} "
+          f"sources={decision['selected_sources']} skipped={decision['skipped_sources']} "
+          f"confidence={decision['confidence']:.2f}")
+    if log_level == "debug":
+        analysis = decision["analysis"]
+        print(f"{prefix} intent={analysis['intent_type']} filters={analysis['filter_strength']} "
+              f"signals={analysis['conceptual_signals'] + analysis['factual_signals']} "
+              f"reasoning={decision['reasoning']}")
+
+
+def get_routing_stats() -> dict:
+    """
+    Routing counters since start (or the last reset).
+
+    Returns:
+        Dictionary with decisions, by_strategy, source_calls,
+        source_calls_saved, low_confidence_fallbacks and saved_ratio
+    """
+    with _stats_lock:
+        stats = dict(_routing_stats)
+        stats["by_strategy"] = dict(_routing_stats["by_strategy"])
+    total = stats["source_calls"] + stats["source_calls_saved"]
+    stats["saved_ratio"] = round(stats["source_calls_saved"] / total, 3) if total else 0.0
+    return stats
+
+
+def reset_routing_stats() -> None:
+    """Reset routing counters (useful for testing and benchmarks)."""
+    with _stats_lock:
+        _routing_stats.update({
+            "decisions": 0,
+            "by_strategy": {},
+            "source_calls": 0,
+            "source_calls_saved": 0,
+            "low_confidence_fallbacks": 0
+        })
+
+
+if __name__ == "__main__":
+    print("="*80)
+    print("TEST: Adaptive Query Routing")
+    print("="*80)
+
+    demo_config = {
+        "mode": "adaptive",
+        "always_use_all_sources": False,
+        "min_confidence": DEFAULT_MIN_CONFIDENCE,
+        "logging": {"enabled": True, "log_level": "info"}
+    }
+    samples = [
+        ("How to build a high-performance sales team", None),
+        ("pricing episode", {"channel_id": "UC123"}),
+        ("revenue", {"channel_id": "UC123", "date_from": "2025-01-01"}),
+        ("How to price SaaS products when launching", None),
+        ("revenue", None),
+    ]
+
+    for i, (query, filters) in enumerate(samples, 1):
+        print(f"\n{i}. route_query({query!r}, {filters}):")
+        decision = route_query(query, filters, list(ALL_SOURCES), config=demo_config)
+        print(f"   Reasoning: {decision['reasoning']}")
+
+    print(f"\n{len(samples) + 1}. Routing stats:")
+    print(f"   {get_routing_stats()}")
+
+    print("\n" + "="*80)
+    print("✅ Test completed")
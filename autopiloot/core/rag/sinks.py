@@ -0,0 +1,242 @@
+"""
+RAG Sink Fan-out
+
+Runs the per-sink writes of an ingest (OpenSearch, BigQuery, Zep) concurrently,
+each under its own timeout from rag.timeouts.index_ms, so one slow sink no
+longer gates the others. Per-sink latency is captured for the ingest result
+and for tracing.emit_ingest_event.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Add config and core directories to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'config'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+
+DEFAULT_INDEX_TIMEOUT_MS = 5000
+
+SUCCESS_STATUSES = ("indexed", "streamed", "upserted")
+
+# Count fields reported by each sink result for successful chunk writes
+_SUCCESS_COUNT_FIELDS = ("indexed_count", "inserted_count", "upserted_count")
+
+# Feature flag that makes each sink write (and therefore need) chunks
+SINK_FLAGS = {
+    "opensearch": "opensearch.enabled",
+    "bigquery": "bigquery.enabled",
+    "zep": "zep.transcripts.enabled"
+}
+
+
+def get_index_timeout_ms() -> int:
+    """
+    Per-sink write timeout from rag.timeouts.index_ms.
+
+    Returns:
+        Timeout in milliseconds (defaults to 5000 when unset or invalid)
+    """
+    from rag.config import get_rag_value
+
+    value = get_rag_value("timeouts.index_ms", DEFAULT_INDEX_TIMEOUT_MS)
+    return value if isinstance(value, (int, float)) and value > 0 else DEFAULT_INDEX_TIMEOUT_MS
+
+
+def get_enabled_sinks(sink_names: Iterable[str]) -> List[str]:
+    """
+    Filter sink names down to those enabled by their feature flag.
+
+    Args:
+        sink_names: Candidate sinks ("opensearch", "bigquery", "zep")
+
+    Returns:
+        Enabled sinks in the given order
+    """
+    from rag.config import get_rag_flag
+
+    return [name for name in sink_names if get_rag_flag(SINK_FLAGS.get(name, f"{name}.enabled"), False)]
+
+
+def write_to_sinks(
+    sink_writes: Dict[str, Callable[[], dict]],
+    timeout_ms: Optional[int] = None
+) -> Tuple[Dict[str, dict], Dict[str, int], List[str]]:
+    """
+    Run sink writes concurrently, each under its own timeout.
+
+    Args:
+        sink_writes: Mapping of sink name to a zero-argument write function
+            returning the sink's status dict
+        timeout_ms: Per-sink timeout (default: rag.timeouts.index_ms)
+
+    Returns:
+        Tuple of (result per sink, latency per sink in ms, names of sinks that
+        timed out). A timed-out sink gets {"status": "timeout"}; its write is
+        not cancelled and finishes in the background.
+
+    Example:
+        >>> results, latencies, timed_out = write_to_sinks({
+        ...     "opensearch": lambda: index_transcript_chunks(docs),
+        ...     "bigquery": lambda: stream_transcript_chunks(rows)
+        ... })
+        >>> latencies
+        {"opensearch": 182, "bigquery": 240}
+    """
+    if not sink_writes:
+        return {}, {}, []
+
+    if timeout_ms is None:
+        timeout_ms = get_index_timeout_ms()
+
+    def _timed(write_fn: Callable[[], dict]) -> Tuple[dict, int]:
+        started = time.time()
+        try:
+            outcome = write_fn()
+        except Exception as e:
+            outcome = {"status": "error", "message": str(e)}
+        return outcome, int((time.time() - started) * 1000)
+
+    executor = ThreadPoolExecutor(max_workers=len(sink_writes), thread_name_prefix="rag-ingest")
+    try:
+        submitted_at = time.time()
+        futures = {executor.submit(_timed, fn): name for name, fn in sink_writes.items()}
+        deadline = submitted_at + timeout_ms / 1000.0
+
+        pending = set(futures)
+        while pending:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            _, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+    finally:
+        # Never block on a stuck sink; it finishes (or fails) in the background
+        executor.shutdown(wait=False)
+
+    results = {}
+    latencies = {}
+    timed_out = []
+    for future, name in futures.items():
+        if future in pending:
+            future.cancel()
+            results[name] = {
+                "status": "timeout",
+                "message": f"Sink write exceeded {int(timeout_ms)}ms (rag.timeouts.index_ms)"
+            }
+            latencies[name] = int(timeout_ms)
+            timed_out.append(name)
+        else:
+            results[name], latencies[name] = future.result()
+
+    return results, latencies, timed_out
+
+
+def written_chunk_ids(sink: str, result: dict, chunk_ids: Iterable[str]) -> Set[str]:
+    """
+    Chunk IDs a sink result shows as stored.
+
+    Args:
+        sink: Sink name
+        result: The sink's result dict for a write of chunk_ids
+        chunk_ids: chunk_ids sent to the sink
+
+    Returns:
+        Set of chunk_ids the sink stored (empty when the write failed,
+        timed out or was skipped)
+    """
+    status = result.get("status")
+
+    if sink == "zep":
+        return {c.get("chunk_id") for c in result.get("chunks") or [] if c.get("status") == "upserted"}
+
+    if status == "skipped" and sink == "bigquery" and "dataset" in result:
+        # Every row already existed in the table
+        return set(chunk_ids)
+
+    if status not in SUCCESS_STATUSES + ("partial",):
+        return set()
+
+    failed = {e.get("chunk_id") for e in result.get("errors") or [] if isinstance(e, dict)}
+    failed.update(result.get("error_chunk_ids") or [])
+    return {chunk_id for chunk_id in chunk_ids if chunk_id not in failed}
+
+
+def summarize_sink_results(sink_results: Dict[str, dict], chunk_count: int) -> dict:
+    """
+    Aggregate sink results into an overall ingest status and chunk counts.
+
+    Args:
+        sink_results: Result dict per sink
+        chunk_count: Chunks sent to each sink
+
+    Returns:
+        Dictionary containing:
+        - status: "success", "partial" or "error"
+        - any_success: True when at least one sink stored the chunks
+        - sinks_used: Sinks that were not skipped
+        - success_count: Successful chunk writes across sinks
+        - error_count: Failed chunk writes across sinks (a sink that errored
+          or timed out without counts contributes chunk_count)
+    """
+    any_success = any(r.get("status") in SUCCESS_STATUSES for r in sink_results.values())
+    all_success = all(r.get("status") in SUCCESS_STATUSES + ("skipped",) for r in sink_results.values())
+
+    success_count = 0
+    error_count = 0
+    sinks_used = []
+    for name, result in sink_results.items():
+        status = result.get("status")
+        if status == "skipped":
+            continue
+        sinks_used.append(name)
+
+        reported = [result[field] for field in _SUCCESS_COUNT_FIELDS if isinstance(result.get(field), int)]
+        if reported:
+            success_count += reported[0]
+        elif status in SUCCESS_STATUSES:
+            success_count += chunk_count
+
+        if isinstance(result.get("error_count"), int):
+            error_count += result["error_count"]
+        elif status not in SUCCESS_STATUSES:
+            error_count += chunk_count
+
+    return {
+        "status": "success" if all_success else "partial" if any_success else "error",
+        "any_success": any_success,
+        "sinks_used": sinks_used,
+        "success_count": success_count,
+        "error_count": error_count
+    }
+
+
+if __name__ == "__main__":
+    print("="*80)
+    print("TEST: RAG Sink Fan-out")
+    print("="*80)
+
+    def _slow_sink():
+        time.sleep(0.3)
+        return {"status": "indexed", "indexed_count": 3}
+
+    def _fast_sink():
+        time.sleep(0.05)
+        return {"status": "streamed", "inserted_count": 3}
+
+    print("\n1. Testing write_to_sinks() with a 200ms timeout:")
+    results, latencies, timed_out = write_to_sinks(
+        {"opensearch": _slow_sink, "bigquery": _fast_sink},
+        timeout_ms=200
+    )
+    print(f"   Results: {results}")
+    print(f"   Latencies: {latencies}")
+    print(f"   Timed out: {timed_out}")
+
+    print("\n2. Testing summarize_sink_results():")
+    print(f"   {summarize_sink_results(results, chunk_count=3)}")
+
+    print("\n" + "="*80)
+    print("✅ Test completed")
@@ -3,27 +3,58 @@ Tracing and Observability Module
 
 Provides comprehensive instrumentation for Hybrid RAG pipeline monitoring.
 Tracks per-source latency, error rates, coverage, and fusion performance.
+
+Metrics live in a fixed-memory store (metrics_store.BucketedMetricsStore):
+one bucket per observability.metrics.aggregation_interval_minutes with
+mergeable per-source latency sketches, so memory does not grow with traffic
+and summaries cost O(buckets). Only the most recent events are kept verbatim.
 """
 
 import os
 import sys
 import uuid
 import time
+import threading
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-from collections import defaultdict
+from collections import deque
 
-# Add config directory to path
+# Add config and core directories to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'config'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from rag.metrics_store import BucketedMetricsStore, DEFAULT_INTERVAL_MINUTES, DEFAULT_WINDOW_MINUTES
+
+
+# Raw events kept for debugging (bounded; counters and latencies live in buckets)
+RECENT_EVENTS_LIMIT = 200
 
+# In-memory metrics store, created from configuration on first use
+_metrics_store: Optional[BucketedMetricsStore] = None
+_recent_events = deque(maxlen=RECENT_EVENTS_LIMIT)
+_store_lock = threading.Lock()
 
-# In-memory metrics store (could be replaced with Firestore/Redis in production)
-_metrics_store = {
-    "retrieval_events": [],
-    "latency_samples": defaultdict(list),
-    "error_counts": defaultdict(int),
-    "source_availability": defaultdict(list)
-}
+
+def _get_store() -> BucketedMetricsStore:
+    """Return the metrics store, creating it from observability.metrics on first use."""
+    global _metrics_store
+
+    if _metrics_store is None:
+        with _store_lock:
+            if _metrics_store is None:
+                interval, window = DEFAULT_INTERVAL_MINUTES, DEFAULT_WINDOW_MINUTES
+                try:
+                    from rag.config import get_rag_value
+                    interval = get_rag_value("observability.metrics.aggregation_interval_minutes", interval)
+                    window = get_rag_value("observability.metrics.window_minutes", window)
+                except Exception as e:
+                    print(f"Warning: Failed to load metrics configuration, using defaults: {str(e)}")
+                if not isinstance(interval, (int, float)) or interval <= 0:
+                    interval = DEFAULT_INTERVAL_MINUTES
+                if not isinstance(window, (int, float)) or window < interval:
+                    window = max(DEFAULT_WINDOW_MINUTES, interval)
+                _metrics_store = BucketedMetricsStore(interval_minutes=interval, window_minutes=window)
+    return _metrics_store
 
 
 def create_trace_id() -> str:
@@ -104,16 +135,10 @@ def emit_retrieval_event(
             "coverage": coverage
         }
 
-        _metrics_store["retrieval_events"].append(event)
-
-        # Update latency samples
-        _metrics_store["latency_samples"]["total"].append(latency_ms)
-        for source, lat in source_latencies.items():
-            _metrics_store["latency_samples"][source].append(lat)
+        _recent_events.append(event)
 
-        # Update source availability
-        for source in sources_used:
-            _metrics_store["source_availability"][source].append(True)
+        # Update latency sketches, coverage and source availability
+        _get_store().record_retrieval(latency_ms, source_latencies, coverage, sources_used)
 
         # Check thresholds and alert if needed
         _check_thresholds(latency_ms, source_latencies, coverage, obs_config)
@@ -137,7 +162,8 @@ def emit_ingest_event(
     sinks_used: List[str],
     success_count: int,
     error_count: int,
-    latency_ms: int
+    latency_ms: int,
+    sink_latencies: Optional[Dict[str, int]] = None
 ) -> None:
     """
     Emit ingest event for observability tracking.
@@ -150,6 +176,7 @@ def emit_ingest_event(
         success_count: Number of successful chunk ingests
         error_count: Number of failed chunk ingests
         latency_ms: Total ingest latency in milliseconds
+        sink_latencies: Optional per-sink write latency breakdown
 
     Example:
         >>> emit_ingest_event(
@@ -159,7 +186,8 @@ def emit_ingest_event(
         ...     sinks_used=["zep", "opensearch", "bigquery"],
         ...     success_count=10,
         ...     error_count=0,
-        ...     latency_ms=2345
+        ...     latency_ms=2345,
+        ...     sink_latencies={"zep": 2101, "opensearch": 412, "bigquery": 690}
         ... )
     """
     try:
@@ -179,20 +207,22 @@ def emit_ingest_event(
             "sinks_used": sinks_used,
             "success_count": success_count,
             "error_count": error_count,
-            "latency_ms": latency_ms
+            "latency_ms": latency_ms,
+            "sink_latencies": sink_latencies or {}
         }
 
-        _metrics_store["retrieval_events"].append(event)
+        _recent_events.append(event)
 
-        # Track error rate
-        if error_count > 0:
-            _metrics_store["error_counts"][operation] += error_count
+        # Per-sink write latency (kept apart from retrieval source latency) and error counts
+        _get_store().record_ingest(operation, error_count, sink_latencies or {})
 
         # Log ingest event
         if obs_config.get("logging", {}).get("enabled", True):
             status = "✅" if error_count == 0 else "⚠️"
+            sink_breakdown = f" sink_latencies={sink_latencies}" if sink_latencies else ""
             print(f"{status} [RAG Ingest] op={operation} video={video_id} chunks={chunk_count} "
-                  f"sinks={sinks_used} success={success_count} errors={error_count} latency={latency_ms}ms")
+                  f"sinks={sinks_used} success={success_count} errors={error_count} latency={latency_ms}ms"
+                  f"{sink_breakdown}")
 
     except Exception as e:
         print(f"Warning: Failed to emit ingest event: {str(e)}")
@@ -271,6 +301,10 @@ def get_metrics_summary(time_window_minutes: int = 60) -> dict:
     """
     Get summary of RAG metrics for the specified time window.
 
+    Merges the buckets overlapping the window, so the cost depends on the
+    number of buckets, not the number of events. Windows are rounded out to
+    whole aggregation intervals.
+
     Args:
         time_window_minutes: Time window in minutes (default: 60)
 
@@ -278,57 +312,48 @@ def get_metrics_summary(time_window_minutes: int = 60) -> dict:
         Dictionary containing:
         - total_retrievals: Total number of retrieval requests
         - avg_latency_ms: Average total latency
-        - p95_latency_ms: 95th percentile latency
+        - p50_latency_ms / p95_latency_ms / p99_latency_ms: Total latency percentiles
         - avg_coverage: Average source coverage
         - per_source_latency: Average latency per source
-        - error_rate: Overall error rate percentage
+        - per_source_percentiles: p50/p95/p99 and count per source
+        - error_counts: Failed chunk ingests per operation
         - total_ingests: Total number of ingest operations
+        - bucket_count: Buckets merged for this summary
 
     Example:
         >>> summary = get_metrics_summary(time_window_minutes=60)
         >>> summary["total_retrievals"]
         125
-        >>> summary["avg_latency_ms"]
-        1234
+        >>> summary["p95_latency_ms"]
+        1870
     """
     try:
-        # Filter events within time window
-        cutoff_time = datetime.utcnow().timestamp() - (time_window_minutes * 60)
-
-        retrieval_events = [
-            e for e in _metrics_store["retrieval_events"]
-            if e.get("timestamp") and _parse_timestamp(e["timestamp"]) > cutoff_time
-        ]
-
-        # Calculate latency metrics
-        latencies = _metrics_store["latency_samples"]["total"]
-        if latencies:
-            avg_latency = sum(latencies) / len(latencies)
-            p95_latency = _calculate_percentile(latencies, 95)
-        else:
-            avg_latency = 0
-            p95_latency = 0
-
-        # Calculate per-source latency
-        per_source_latency = {}
-        for source, lats in _metrics_store["latency_samples"].items():
-            if source != "total" and lats:
-                per_source_latency[source] = sum(lats) / len(lats)
-
-        # Calculate coverage
-        coverage_values = [e.get("coverage", 0) for e in retrieval_events if "coverage" in e]
-        avg_coverage = sum(coverage_values) / len(coverage_values) if coverage_values else 0
-
-        # Count ingests
-        ingest_events = [e for e in _metrics_store["retrieval_events"] if e.get("type") == "ingest"]
+        store = _get_store()
+        merged = store.aggregate(time_window_minutes)
+        total = merged.latency.get("total")
+
+        per_source = {key: sketch for key, sketch in merged.latency.items() if key != "total"}
 
         return {
-            "total_retrievals": len(retrieval_events),
-            "avg_latency_ms": int(avg_latency),
-            "p95_latency_ms": int(p95_latency),
-            "avg_coverage": round(avg_coverage, 1),
-            "per_source_latency": {k: int(v) for k, v in per_source_latency.items()},
-            "total_ingests": len(ingest_events),
+            "total_retrievals": merged.retrievals,
+            "avg_latency_ms": int(total.mean) if total else 0,
+            "p50_latency_ms": int(total.quantile(0.50)) if total else 0,
+            "p95_latency_ms": int(total.quantile(0.95)) if total else 0,
+            "p99_latency_ms": int(total.quantile(0.99)) if total else 0,
+            "avg_coverage": round(merged.coverage_sum / merged.coverage_count, 1) if merged.coverage_count else 0,
+            "per_source_latency": {key: int(sketch.mean) for key, sketch in per_source.items()},
+            "per_source_percentiles": {
+                key: {
+                    "p50": int(sketch.quantile(0.50)),
+                    "p95": int(sketch.quantile(0.95)),
+                    "p99": int(sketch.quantile(0.99)),
+                    "count": sketch.count
+                }
+                for key, sketch in per_source.items()
+            },
+            "error_counts": dict(merged.error_counts),
+            "total_ingests": merged.ingests,
+            "bucket_count": store.bucket_count(time_window_minutes),
             "time_window_minutes": time_window_minutes
         }
 
@@ -339,33 +364,53 @@ def get_metrics_summary(time_window_minutes: int = 60) -> dict:
         }
 
 
-def _parse_timestamp(iso_timestamp: str) -> float:
-    """Parse ISO 8601 timestamp to Unix timestamp."""
-    try:
-        dt = datetime.fromisoformat(iso_timestamp.replace('Z', '+00:00'))
-        return dt.timestamp()
-    except:
-        return 0
+def export_metrics(time_window_minutes: Optional[int] = None) -> dict:
+    """
+    Export metric buckets so another process can merge them.
 
+    Args:
+        time_window_minutes: Only export buckets overlapping this window
+            (default: every bucket in the store)
 
-def _calculate_percentile(values: List[float], percentile: int) -> float:
-    """Calculate percentile of values list."""
-    if not values:
-        return 0
-    sorted_values = sorted(values)
-    index = int(len(sorted_values) * (percentile / 100.0))
-    return sorted_values[min(index, len(sorted_values) - 1)]
+    Returns:
+        JSON-serializable dict with interval_seconds and buckets
+
+    Example:
+        >>> payload = export_metrics(time_window_minutes=60)
+        >>> merge_metrics(payload)  # in the aggregating process
+        12
+    """
+    return _get_store().export(time_window_minutes)
+
+
+def merge_metrics(exported: dict) -> int:
+    """
+    Merge buckets exported by another worker into this process's store.
+
+    Args:
+        exported: Output of export_metrics() from a store with the same
+            aggregation interval
+
+    Returns:
+        Number of buckets merged
+
+    Raises:
+        ValueError: If the aggregation intervals differ
+    """
+    return _get_store().merge_export(exported)
+
+
+def get_recent_events(limit: int = 20) -> List[dict]:
+    """Most recent retrieval/ingest events (at most RECENT_EVENTS_LIMIT are kept)."""
+    return list(_recent_events)[-limit:]
 
 
 def reset_metrics() -> None:
-    """Reset all metrics (useful for testing)."""
+    """Reset all metrics (useful for testing); configuration is re-read on next use."""
     global _metrics_store
-    _metrics_store = {
-        "retrieval_events": [],
-        "latency_samples": defaultdict(list),
-        "error_counts": defaultdict(int),
-        "source_availability": defaultdict(list)
-    }
+    with _store_lock:
+        _metrics_store = None
+    _recent_events.clear()
 
 
 if __name__ == "__main__":
@@ -428,12 +473,18 @@ if __name__ == "__main__":
     print(f"   Total retrievals: {summary['total_retrievals']}")
     print(f"   Avg latency: {summary['avg_latency_ms']}ms")
     print(f"   P95 latency: {summary['p95_latency_ms']}ms")
+    print(f"   P99 latency: {summary['p99_latency_ms']}ms")
     print(f"   Avg coverage: {summary['avg_coverage']}%")
     print(f"   Per-source latency: {summary['per_source_latency']}")
     print(f"   Total ingests: {summary['total_ingests']}")
 
-    # Test 6: Reset metrics
-    print("\n6. Testing reset_metrics():")
+    # Test 6: Export buckets for merging in another worker
+    print("\n6. Testing export_metrics():")
+    exported = export_metrics()
+    print(f"   Buckets exported: {len(exported['buckets'])} (interval {exported['interval_seconds']}s)")
+
+    # Test 7: Reset metrics
+    print("\n7. Testing reset_metrics():")
     reset_metrics()
     summary_after = get_metrics_summary()
     print(f"   Total retrievals after reset: {summary_after['total_retrievals']}")
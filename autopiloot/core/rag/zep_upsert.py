@@ -8,15 +8,20 @@ Handles thread/message creation with automatic embedding generation.
 import os
 import sys
 import json
-import requests
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
-# Add config directory to path
+# Add config and core directories to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'config'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from env_loader import get_required_env_var, get_optional_env_var
 
 
+DEFAULT_MESSAGES_PER_REQUEST = 30
+DEFAULT_MAX_CONCURRENCY = 4
+
+
 def upsert_transcript(text: str, metadata: dict) -> dict:
     """
     Upsert transcript chunk to Zep for semantic search.
@@ -129,15 +134,161 @@ def upsert_transcript(text: str, metadata: dict) -> dict:
         }
 
 
+def upsert_transcript_batch(video_id: str, chunks: List[dict]) -> dict:
+    """
+    Upsert all transcript chunks of one video to Zep in batched requests.
+
+    Ensures the video's thread exists once, then posts the chunks as
+    multi-message requests with bounded concurrency, so a video costs
+    O(chunks / messages_per_request) HTTP calls instead of up to 3 per chunk.
+
+    Args:
+        video_id: YouTube video ID (all chunks belong to this video's thread)
+        chunks: List of chunks, each containing:
+            - text (str): Chunk text content
+            - metadata (dict): Same fields as upsert_transcript() metadata
+
+    Returns:
+        Dictionary containing:
+        - status: "upserted", "partial", "skipped", or "error"
+        - thread_id: Zep thread ID
+        - upserted_count, skipped_count, error_count: Per-chunk totals
+        - chunks: Per-chunk results ({"chunk_id", "status", "message_id"/"error"})
+        - request_count: HTTP calls made for this video
+        - message: Human-readable status message
+
+    Batching (rag.zep.transcripts.batch):
+        - messages_per_request: Chunks per add-messages request (default: 30)
+        - max_concurrency: Parallel add-messages requests (default: 4);
+          chunk order across requests is not guaranteed, chunk_id and
+          chunk_index metadata carry position
+
+    Example:
+        >>> result = upsert_transcript_batch("abc123", [
+        ...     {"text": "Chunk text...", "metadata": {"video_id": "abc123", "chunk_id": "abc123_chunk_0", "channel_id": "UC123"}}
+        ... ])
+        >>> result["upserted_count"]
+        1
+    """
+    def _all(status: str, message: str, thread_id: Optional[str] = None, request_count: int = 0) -> dict:
+        chunk_results = [
+            {"chunk_id": chunk.get("metadata", {}).get("chunk_id"), "status": status}
+            for chunk in chunks
+        ]
+        return {
+            "status": status,
+            "thread_id": thread_id,
+            "upserted_count": 0,
+            "skipped_count": len(chunks) if status == "skipped" else 0,
+            "error_count": len(chunks) if status == "error" else 0,
+            "chunks": chunk_results,
+            "request_count": request_count,
+            "message": message
+        }
+
+    try:
+        from rag.config import get_rag_flag, get_rag_value
+
+        if not chunks:
+            return _all("skipped", "No chunks to upsert")
+
+        if not get_rag_flag("zep.transcripts.enabled", False):
+            return _all("skipped", "Zep transcripts storage is disabled in configuration")
+
+        zep_api_key = get_optional_env_var("ZEP_API_KEY")
+        if not zep_api_key:
+            return _all("skipped", "Zep not configured (ZEP_API_KEY not set)")
+
+        zep_api_url = get_optional_env_var("ZEP_API_URL", "https://api.getzep.com")
+
+        # Thread-level metadata comes from the first chunk that has a channel
+        thread_metadata = next(
+            (chunk.get("metadata", {}) for chunk in chunks if chunk.get("metadata", {}).get("channel_id")),
+            None
+        )
+        if not video_id or not thread_metadata:
+            return _all("error", "Missing required metadata: video_id and channel_id")
+
+        thread_id_format = get_rag_value("zep.transcripts.thread_id_format", "transcript_{video_id}")
+        user_id_format = get_rag_value("zep.transcripts.user_id_format", "youtube_{channel_id}")
+        thread_id = thread_id_format.replace("{video_id}", video_id)
+        user_id = user_id_format.replace("{channel_id}", thread_metadata["channel_id"])
+
+        # Ensure the thread once for the whole video
+        thread_result = _ensure_thread_exists(
+            zep_api_url, zep_api_key, thread_id, user_id, {**thread_metadata, "video_id": video_id}
+        )
+        request_count = thread_result.get("request_count", 1)
+        if not thread_result["success"]:
+            return _all(
+                "error",
+                f"Failed to create/get thread: {thread_result['error']}",
+                thread_id,
+                request_count
+            )
+
+        per_request = max(1, int(get_rag_value("zep.transcripts.batch.messages_per_request", DEFAULT_MESSAGES_PER_REQUEST)))
+        concurrency = max(1, int(get_rag_value("zep.transcripts.batch.max_concurrency", DEFAULT_MAX_CONCURRENCY)))
+
+        batches = [chunks[i:i + per_request] for i in range(0, len(chunks), per_request)]
+
+        def post(batch: List[dict]) -> dict:
+            return _add_messages(zep_api_url, zep_api_key, thread_id, batch)
+
+        if len(batches) == 1 or concurrency == 1:
+            batch_results = [post(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(batches)), thread_name_prefix="zep-upsert") as executor:
+                batch_results = list(executor.map(post, batches))
+
+        request_count += len(batches)
+
+        # Per-chunk status in input order
+        chunk_results = []
+        for batch, batch_result in zip(batches, batch_results):
+            message_ids = batch_result.get("message_ids") or []
+            for position, chunk in enumerate(batch):
+                chunk_id = chunk.get("metadata", {}).get("chunk_id")
+                if batch_result["success"]:
+                    chunk_results.append({
+                        "chunk_id": chunk_id,
+                        "status": "upserted",
+                        "message_id": message_ids[position] if position < len(message_ids) else None
+                    })
+                else:
+                    chunk_results.append({"chunk_id": chunk_id, "status": "error", "error": batch_result["error"]})
+
+        upserted = sum(1 for r in chunk_results if r["status"] == "upserted")
+        errors = len(chunk_results) - upserted
+
+        return {
+            "status": "upserted" if errors == 0 else "partial" if upserted > 0 else "error",
+            "thread_id": thread_id,
+            "upserted_count": upserted,
+            "skipped_count": 0,
+            "error_count": errors,
+            "chunks": chunk_results,
+            "request_count": request_count,
+            "message": f"Upserted {upserted}/{len(chunks)} chunks to Zep thread '{thread_id}' in {len(batches)} batches"
+        }
+
+    except Exception as e:
+        return _all("error", f"Zep batch upsert failed: {str(e)}")
+
+
 def _ensure_thread_exists(api_url: str, api_key: str, thread_id: str, user_id: str, metadata: dict) -> dict:
     """Create thread if not exists."""
     try:
+        from rag.clients import get_http_session
+
+        session = get_http_session(api_url)
+
         # Check if thread exists
         headers = {"Authorization": f"Bearer {api_key}"}
-        response = requests.get(f"{api_url}/v3/threads/{thread_id}", headers=headers, timeout=5)
+        response = session.get(f"{api_url}/v3/threads/{thread_id}", headers=headers, timeout=5)
 
         if response.status_code == 200:
-            return {"success": True, "status": "exists"}
+            return {"success": True, "status": "exists", "request_count": 1}
 
         # Create thread
         thread_data = {
@@ -151,10 +302,10 @@ def _ensure_thread_exists(api_url: str, api_key: str, thread_id: str, user_id: s
             }
         }
 
-        response = requests.post(f"{api_url}/v3/threads", json=thread_data, headers=headers, timeout=5)
+        response = session.post(f"{api_url}/v3/threads", json=thread_data, headers=headers, timeout=5)
         response.raise_for_status()
 
-        return {"success": True, "status": "created"}
+        return {"success": True, "status": "created", "request_count": 2}
 
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -163,21 +314,12 @@ def _ensure_thread_exists(api_url: str, api_key: str, thread_id: str, user_id: s
 def _add_message(api_url: str, api_key: str, thread_id: str, text: str, metadata: dict) -> dict:
     """Add message to thread."""
     try:
-        headers = {"Authorization": f"Bearer {api_key}"}
+        from rag.clients import get_http_session
 
-        message_data = {
-            "role": "user",
-            "content": text,
-            "metadata": {
-                "chunk_id": metadata.get("chunk_id"),
-                "video_id": metadata.get("video_id"),
-                "channel_id": metadata.get("channel_id"),
-                "content_sha256": metadata.get("content_sha256"),
-                "tokens": metadata.get("tokens")
-            }
-        }
+        headers = {"Authorization": f"Bearer {api_key}"}
+        message_data = _build_message(text, metadata)
 
-        response = requests.post(
+        response = get_http_session(api_url).post(
             f"{api_url}/v3/threads/{thread_id}/messages",
             json=message_data,
             headers=headers,
@@ -192,6 +334,44 @@ def _add_message(api_url: str, api_key: str, thread_id: str, text: str, metadata
         return {"success": False, "error": str(e)}
 
 
+def _add_messages(api_url: str, api_key: str, thread_id: str, chunks: List[dict]) -> dict:
+    """Add several chunk messages to a thread in one request."""
+    try:
+        from rag.clients import get_http_session
+
+        headers = {"Authorization": f"Bearer {api_key}"}
+        messages = [_build_message(chunk["text"], chunk.get("metadata", {})) for chunk in chunks]
+
+        response = get_http_session(api_url).post(
+            f"{api_url}/v3/threads/{thread_id}/messages",
+            json={"messages": messages},
+            headers=headers,
+            timeout=30
+        )
+        response.raise_for_status()
+
+        result = response.json()
+        return {"success": True, "message_ids": result.get("message_uuids") or result.get("message_ids")}
+
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def _build_message(text: str, metadata: dict) -> dict:
+    """Build a Zep thread message for a transcript chunk."""
+    return {
+        "role": "user",
+        "content": text,
+        "metadata": {
+            "chunk_id": metadata.get("chunk_id"),
+            "video_id": metadata.get("video_id"),
+            "channel_id": metadata.get("channel_id"),
+            "content_sha256": metadata.get("content_sha256"),
+            "tokens": metadata.get("tokens")
+        }
+    }
+
+
 if __name__ == "__main__":
     print("="*80)
     print("TEST: Zep Upsert Module")
@@ -217,5 +397,14 @@ if __name__ == "__main__":
     if result.get("message_id"):
         print(f"   Message ID: {result['message_id']}")
 
+    print("\n2. Testing upsert_transcript_batch():")
+    batch_result = upsert_transcript_batch("abc123", [
+        {"text": sample_text, "metadata": {**sample_metadata, "chunk_id": f"abc123_chunk_{i}"}}
+        for i in range(3)
+    ])
+    print(f"   Status: {batch_result['status']}")
+    print(f"   Message: {batch_result['message']}")
+    print(f"   HTTP requests: {batch_result['request_count']}")
+
     print("\n" + "="*80)
     print("✅ Test completed")
@@ -512,6 +512,77 @@ def get_update_range(sheet_name: str, row_index: int, column: str = "D") -> str:
     return f"{sheet_name}!{column}{row_index}"
 
 
+def coalesce_row_indices(row_indices: List[int]) -> List[Tuple[int, int]]:
+    """Group 1-based row indices into ascending (first, last) blocks of adjacent rows.
+
+    Example: [8, 2, 3, 5, 4] -> [(2, 5), (8, 8)]
+    """
+    blocks = []
+    for row_index in sorted(set(row_indices)):
+        if blocks and row_index == blocks[-1][1] + 1:
+            blocks[-1] = (blocks[-1][0], row_index)
+        else:
+            blocks.append((row_index, row_index))
+    return blocks
+
+
+def get_row_block_ranges(sheet_name: str, row_indices: List[int], last_column: str = "Z") -> List[str]:
+    """Get one A1 range per block of adjacent rows (e.g. "Sheet1!A2:Z5")."""
+    return [
+        f"{sheet_name}!A{first}:{last_column}{last}"
+        for first, last in coalesce_row_indices(row_indices)
+    ]
+
+
+def batch_read_rows(service, sheet_id: str, sheet_name: str, row_indices: List[int],
+                    last_column: str = "Z") -> Dict[int, List[Any]]:
+    """Read the given rows with a single values().batchGet call.
+
+    Returns:
+        Mapping of each requested row index to its values ([] for empty rows)
+    """
+    blocks = coalesce_row_indices(row_indices)
+    if not blocks:
+        return {}
+
+    result = service.spreadsheets().values().batchGet(
+        spreadsheetId=sheet_id,
+        ranges=get_row_block_ranges(sheet_name, row_indices, last_column)
+    ).execute()
+    value_ranges = result.get('valueRanges', [])
+
+    rows = {}
+    for i, (first, last) in enumerate(blocks):
+        # Trailing empty rows are omitted from each block's values
+        values = value_ranges[i].get('values', []) if i < len(value_ranges) else []
+        for offset, row_index in enumerate(range(first, last + 1)):
+            rows[row_index] = values[offset] if offset < len(values) else []
+    return rows
+
+
+def build_row_delete_requests(sheet_gid: int, row_indices: List[int],
+                              end_column_index: int = 26) -> List[Dict[str, Any]]:
+    """Build batchUpdate deleteRange requests, one per block of adjacent rows.
+
+    Blocks are ordered bottom-up so earlier deletes don't shift later ones.
+    """
+    return [
+        {
+            'deleteRange': {
+                'range': {
+                    'sheetId': sheet_gid,
+                    'startRowIndex': first - 1,  # Convert to 0-based
+                    'endRowIndex': last,
+                    'startColumnIndex': 0,
+                    'endColumnIndex': end_column_index
+                },
+                'shiftDimension': 'ROWS'
+            }
+        }
+        for first, last in reversed(coalesce_row_indices(row_indices))
+    ]
+
+
 def validate_youtube_urls_in_sheet(sheet_id: str, 
                                   sheet_name: str = "Sheet1",
                                   url_column: str = "A") -> Dict[str, Any]:
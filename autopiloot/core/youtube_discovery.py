@@ -0,0 +1,388 @@
+"""
+Multi-channel YouTube upload discovery for Autopiloot Agency.
+
+Discovers recent uploads for many channels with as few YouTube Data API
+calls as possible:
+- Uploads playlist IDs are resolved for up to 50 channels per
+  channels().list call and cached permanently (in-process and on the
+  Firestore `channels/{channel_id}` document as uploads_playlist_id)
+- Uploads playlists are paginated concurrently, one API client per worker
+  thread (googleapiclient clients are not thread-safe)
+- Video IDs from all channels are merged into shared 50-ID videos().list
+  batches
+- Quota units spent are tracked per run with QuotaUsage
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Firebase Admin SDK for the uploads playlist cache
+try:
+    from firebase_admin import firestore
+    FIREBASE_AVAILABLE = True
+except ImportError:
+    FIREBASE_AVAILABLE = False
+
+
+# YouTube Data API v3 quota cost per request
+QUOTA_COSTS = {
+    "channels.list": 1,
+    "playlistItems.list": 1,
+    "videos.list": 1,
+    "search.list": 100,
+}
+MAX_IDS_PER_REQUEST = 50  # API limit for id= on channels().list and videos().list
+CHANNELS_COLLECTION = "channels"
+
+_playlist_cache: Dict[str, str] = {}
+_playlist_cache_lock = threading.Lock()
+
+
+class QuotaUsage:
+    """Thread-safe tally of YouTube Data API requests and quota units for one run."""
+
+    def __init__(self):
+        self._calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, calls: int = 1) -> None:
+        """Record `calls` requests to an API method (e.g. "videos.list")."""
+        with self._lock:
+            self._calls[method] = self._calls.get(method, 0) + calls
+
+    @property
+    def units(self) -> int:
+        with self._lock:
+            return sum(QUOTA_COSTS.get(method, 1) * count for method, count in self._calls.items())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return {"units": total quota units, "calls": requests per method}."""
+        with self._lock:
+            calls = dict(self._calls)
+        return {"units": sum(QUOTA_COSTS.get(method, 1) * count for method, count in calls.items()), "calls": calls}
+
+
+def clear_playlist_cache() -> None:
+    """Drop the in-process uploads playlist cache (Firestore entries are kept)."""
+    with _playlist_cache_lock:
+        _playlist_cache.clear()
+
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _firestore_client():
+    if not FIREBASE_AVAILABLE:
+        return None
+    try:
+        return firestore.client()
+    except Exception:
+        return None
+
+
+def _load_cached_playlists(db, channel_ids: List[str]) -> Dict[str, str]:
+    """Read uploads_playlist_id for channels from Firestore in one get_all()."""
+    if db is None or not channel_ids:
+        return {}
+    try:
+        refs = [db.collection(CHANNELS_COLLECTION).document(channel_id) for channel_id in channel_ids]
+        found = {}
+        for doc in db.get_all(refs):
+            if doc.exists:
+                playlist_id = (doc.to_dict() or {}).get('uploads_playlist_id')
+                if playlist_id:
+                    found[doc.id] = playlist_id
+        return found
+    except Exception:
+        # Cache read failures fall back to the API
+        return {}
+
+
+def _store_cached_playlists(db, playlists: Dict[str, str]) -> None:
+    """Persist newly resolved uploads playlist IDs in one WriteBatch."""
+    if db is None or not playlists:
+        return
+    try:
+        batch = db.batch()
+        for channel_id, playlist_id in playlists.items():
+            batch.set(db.collection(CHANNELS_COLLECTION).document(channel_id), {
+                'channel_id': channel_id,
+                'uploads_playlist_id': playlist_id,
+                'uploads_playlist_resolved_at': firestore.SERVER_TIMESTAMP
+            }, merge=True)
+        batch.commit()
+    except Exception:
+        # Cache write failures only cost a channels().list on the next run
+        pass
+
+
+def get_uploads_playlist_ids(
+    youtube,
+    channel_ids: List[str],
+    quota: Optional[QuotaUsage] = None,
+    db: Any = None
+) -> Dict[str, Optional[str]]:
+    """
+    Resolve uploads playlist IDs for many channels.
+
+    Lookup order: in-process cache, Firestore channels/{channel_id}, then
+    channels().list with up to 50 IDs per request. Uploads playlist IDs
+    never change, so resolved IDs are cached without expiry.
+
+    Args:
+        youtube: YouTube Data API client
+        channel_ids: Channel IDs (duplicates are ignored)
+        quota: Optional QuotaUsage to record API requests in
+        db: Optional Firestore client (defaults to firebase_admin's client)
+
+    Returns:
+        Mapping of channel_id to uploads playlist ID (None if the channel
+        was not found)
+
+    Raises:
+        RuntimeError: If a channels().list request fails
+    """
+    channel_ids = list(dict.fromkeys(channel_ids))
+    with _playlist_cache_lock:
+        resolved: Dict[str, Optional[str]] = {cid: _playlist_cache[cid] for cid in channel_ids if cid in _playlist_cache}
+
+    missing = [cid for cid in channel_ids if cid not in resolved]
+    if missing:
+        db = db if db is not None else _firestore_client()
+        stored = _load_cached_playlists(db, missing)
+        resolved.update(stored)
+        missing = [cid for cid in missing if cid not in stored]
+    else:
+        stored = {}
+
+    fetched = {}
+    for i in range(0, len(missing), MAX_IDS_PER_REQUEST):
+        batch = missing[i:i + MAX_IDS_PER_REQUEST]
+        try:
+            response = youtube.channels().list(
+                part='contentDetails',
+                id=','.join(batch),
+                maxResults=MAX_IDS_PER_REQUEST
+            ).execute()
+        except Exception as e:
+            raise RuntimeError(f"Failed to get uploads playlists: {str(e)}")
+        finally:
+            if quota is not None:
+                quota.record("channels.list")
+
+        for item in response.get('items', []):
+            playlist_id = item.get('contentDetails', {}).get('relatedPlaylists', {}).get('uploads')
+            if playlist_id:
+                fetched[item['id']] = playlist_id
+
+    if missing:
+        _store_cached_playlists(db, fetched)
+
+    with _playlist_cache_lock:
+        _playlist_cache.update(stored)
+        _playlist_cache.update(fetched)
+
+    resolved.update(fetched)
+    return {cid: resolved.get(cid) for cid in channel_ids}
+
+
+def fetch_playlist_videos(
+    youtube,
+    playlist_id: str,
+    since_dt: datetime,
+    checkpoint_dt: Optional[datetime] = None,
+    max_items: int = 100,
+    quota: Optional[QuotaUsage] = None
+) -> List[Dict[str, Any]]:
+    """
+    Page through an uploads playlist, newest first, until since_dt.
+
+    Items at or before checkpoint_dt are skipped; pagination stops at the
+    first item older than since_dt or once max_items videos are collected.
+    A 429 response ends pagination with the videos collected so far.
+
+    Returns:
+        List of {video_id, title, published_at, channel_title}
+
+    Raises:
+        RuntimeError: On any other API error
+    """
+    videos = []
+    next_page_token = None
+
+    while len(videos) < max_items:
+        params = {
+            'part': 'snippet',
+            'playlistId': playlist_id,
+            'maxResults': min(MAX_IDS_PER_REQUEST, max_items - len(videos))
+        }
+        if next_page_token:
+            params['pageToken'] = next_page_token
+
+        try:
+            response = youtube.playlistItems().list(**params).execute()
+        except Exception as e:
+            if getattr(getattr(e, 'resp', None), 'status', None) == 429:  # Rate limit
+                break
+            raise RuntimeError(f"YouTube API error: {str(e)}")
+        finally:
+            if quota is not None:
+                quota.record("playlistItems.list")
+
+        for item in response.get('items', []):
+            published_at = item['snippet']['publishedAt']
+            published_dt = _parse_timestamp(published_at)
+
+            if checkpoint_dt and published_dt <= checkpoint_dt:
+                continue
+            if published_dt < since_dt:
+                return videos  # Uploads are ordered by date, so we can stop here
+
+            videos.append({
+                'video_id': item['snippet']['resourceId']['videoId'],
+                'title': item['snippet']['title'],
+                'published_at': published_at,
+                'channel_title': item['snippet'].get('channelTitle')
+            })
+
+        next_page_token = response.get('nextPageToken')
+        if not next_page_token:
+            break
+
+    return videos
+
+
+def fetch_video_details(
+    youtube,
+    video_ids: List[str],
+    quota: Optional[QuotaUsage] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch snippet and contentDetails for videos in shared 50-ID batches.
+
+    A 429 response stops fetching; videos in unfetched batches are missing
+    from the result.
+
+    Returns:
+        Mapping of video_id to the videos().list item
+
+    Raises:
+        RuntimeError: On any other API error
+    """
+    video_ids = list(dict.fromkeys(video_ids))
+    details = {}
+
+    for i in range(0, len(video_ids), MAX_IDS_PER_REQUEST):
+        batch = video_ids[i:i + MAX_IDS_PER_REQUEST]
+        try:
+            response = youtube.videos().list(
+                part='snippet,contentDetails',
+                id=','.join(batch)
+            ).execute()
+        except Exception as e:
+            if getattr(getattr(e, 'resp', None), 'status', None) == 429:  # Rate limit
+                break
+            raise RuntimeError(f"YouTube API error: {str(e)}")
+        finally:
+            if quota is not None:
+                quota.record("videos.list")
+
+        for item in response.get('items', []):
+            details[item['id']] = item
+
+    return details
+
+
+def discover_uploads(
+    channel_ids: List[str],
+    since_utc: str,
+    client_factory: Callable[[], Any],
+    max_items_per_channel: int = 100,
+    checkpoints: Optional[Dict[str, Optional[str]]] = None,
+    max_workers: int = 4,
+    db: Any = None
+) -> Dict[str, Any]:
+    """
+    Discover uploads since since_utc for many channels at once.
+
+    Args:
+        channel_ids: Channel IDs to scan (duplicates are ignored)
+        since_utc: Earliest publication time (ISO 8601)
+        client_factory: Builds a YouTube Data API client; called once on the
+            calling thread and once per playlist worker thread
+        max_items_per_channel: Playlist items collected per channel
+        checkpoints: Optional lastPublishedAt per channel; older uploads are skipped
+        max_workers: Concurrent playlist fetches
+        db: Optional Firestore client for the uploads playlist cache
+
+    Returns:
+        Dictionary containing:
+        - channels: Per channel_id {uploads_playlist_id, videos, error};
+          videos are videos().list items in playlist order
+        - quota: QuotaUsage.to_dict() for this run (units and calls per method)
+
+    Example:
+        >>> result = discover_uploads(["UC1", "UC2"], "2025-01-27T00:00:00Z", build_client)
+        >>> result["quota"]
+        {'units': 4, 'calls': {'channels.list': 1, 'playlistItems.list': 2, 'videos.list': 1}}
+    """
+    channel_ids = list(dict.fromkeys(channel_ids))
+    checkpoints = checkpoints or {}
+    quota = QuotaUsage()
+    since_dt = _parse_timestamp(since_utc)
+    youtube = client_factory()
+
+    channels: Dict[str, Dict[str, Any]] = {
+        cid: {'uploads_playlist_id': None, 'videos': [], 'error': None} for cid in channel_ids
+    }
+    if not channel_ids:
+        return {'channels': channels, 'quota': quota.to_dict()}
+
+    playlists = get_uploads_playlist_ids(youtube, channel_ids, quota, db)
+
+    local = threading.local()
+
+    def _client():
+        if max_workers <= 1:
+            return youtube
+        if not hasattr(local, 'youtube'):
+            local.youtube = client_factory()
+        return local.youtube
+
+    def _scan(channel_id: str) -> List[Dict[str, Any]]:
+        checkpoint = checkpoints.get(channel_id)
+        try:
+            checkpoint_dt = _parse_timestamp(checkpoint) if checkpoint else None
+        except (AttributeError, ValueError):
+            checkpoint_dt = None
+        return fetch_playlist_videos(
+            _client(), playlists[channel_id], since_dt, checkpoint_dt, max_items_per_channel, quota
+        )
+
+    scannable = []
+    for channel_id in channel_ids:
+        channels[channel_id]['uploads_playlist_id'] = playlists.get(channel_id)
+        if playlists.get(channel_id):
+            scannable.append(channel_id)
+        else:
+            channels[channel_id]['error'] = 'Could not find uploads playlist'
+
+    playlist_videos: Dict[str, List[Dict[str, Any]]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(scannable) or 1))) as pool:
+        futures = {channel_id: pool.submit(_scan, channel_id) for channel_id in scannable}
+        for channel_id, future in futures.items():
+            try:
+                playlist_videos[channel_id] = future.result()
+            except Exception as e:
+                channels[channel_id]['error'] = str(e)
+
+    all_ids = [video['video_id'] for videos in playlist_videos.values() for video in videos]
+    details = fetch_video_details(youtube, all_ids, quota)
+
+    for channel_id, videos in playlist_videos.items():
+        channels[channel_id]['videos'] = [details[v['video_id']] for v in videos if v['video_id'] in details]
+
+    return {'channels': channels, 'quota': quota.to_dict()}
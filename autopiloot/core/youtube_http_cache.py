@@ -0,0 +1,389 @@
+"""
+Persistent ETag cache for YouTube Data API requests.
+
+Wraps the httplib2 transport used by googleapiclient so every GET whose
+response carried an ETag is stored, and the next identical request is sent
+with If-None-Match. A 304 Not Modified is answered from the stored body, so
+unchanged playlistItems pages and channels().list responses are not
+downloaded again. Entries expire after scraper.http_cache.ttl_hours and are
+kept on local disk or in Firestore (scraper.http_cache.backend). The disk
+backend is local to one machine and does not survive Cloud Functions
+instances, so the default "auto" backend uses Firestore when running there
+(K_SERVICE or FUNCTION_TARGET set) and disk elsewhere.
+
+Usage:
+    http = build_youtube_http(credentials)  # credentials=None for API key auth
+    youtube = build('youtube', 'v3', http=http)
+    get_http_cache_stats()["quota_units_saved"]
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+# Add config directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'config'))
+
+import httplib2
+
+# Firebase Admin SDK for the firestore backend
+try:
+    from firebase_admin import firestore
+    FIREBASE_AVAILABLE = True
+except ImportError:
+    FIREBASE_AVAILABLE = False
+
+from youtube_discovery import QUOTA_COSTS
+
+
+DEFAULT_CONFIG = {
+    "enabled": True,
+    "backend": "auto",
+    "path": ".cache/youtube_http",
+    "collection": "youtube_http_cache",
+    "ttl_hours": 168
+}
+API_PATH_PREFIX = "/youtube/v3/"
+# Set by the Cloud Functions / Cloud Run runtime
+SERVERLESS_ENV_VARS = ("K_SERVICE", "FUNCTION_TARGET")
+
+# Project root (autopiloot/) for resolving a relative path
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+_store = None
+_config: Optional[dict] = None
+_state_lock = threading.Lock()
+_stats_lock = threading.Lock()
+
+
+def _new_stats() -> dict:
+    return {
+        "requests": 0,
+        "conditional_requests": 0,
+        "not_modified": 0,
+        "stored": 0,
+        "expired": 0,
+        "errors": 0,
+        "quota_units_saved": 0
+    }
+
+
+_stats = _new_stats()
+
+
+def _count(key: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] += amount
+
+
+class _DiskStore:
+    """One JSON file per entry under a directory; writes are atomic renames."""
+
+    name = "disk"
+
+    def __init__(self, path: str):
+        self.path = path if os.path.isabs(path) else os.path.join(_PROJECT_ROOT, path)
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        try:
+            with open(self._file(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, entry: dict) -> None:
+        tmp_path = f"{self._file(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._file(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._file(key))
+        except FileNotFoundError:
+            pass
+
+    def prune(self, now: float) -> int:
+        removed = 0
+        for filename in os.listdir(self.path):
+            if not filename.endswith(".json"):
+                continue
+            key = filename[:-len(".json")]
+            try:
+                entry = self.get(key)
+            except (OSError, ValueError):
+                entry = None
+            if entry is None or entry.get("expires_at", 0) <= now:
+                self.delete(key)
+                removed += 1
+        return removed
+
+
+class _FirestoreStore:
+    """Entries as documents in a Firestore collection (doc ID = cache key)."""
+
+    name = "firestore"
+
+    def __init__(self, db, collection: str):
+        self.db = db
+        self.collection = collection
+
+    def get(self, key: str) -> Optional[dict]:
+        doc = self.db.collection(self.collection).document(key).get()
+        return doc.to_dict() if doc.exists else None
+
+    def set(self, key: str, entry: dict) -> None:
+        self.db.collection(self.collection).document(key).set(entry)
+
+    def delete(self, key: str) -> None:
+        self.db.collection(self.collection).document(key).delete()
+
+    def prune(self, now: float) -> int:
+        removed = 0
+        expired = self.db.collection(self.collection).where("expires_at", "<=", now).limit(500).stream()
+        batch = self.db.batch()
+        for doc in expired:
+            batch.delete(doc.reference)
+            removed += 1
+        if removed:
+            batch.commit()
+        return removed
+
+
+def configure_http_cache(config: Optional[dict] = None, store: Any = None) -> dict:
+    """
+    (Re)initialize the cache from configuration.
+
+    Called lazily on first use with scraper.http_cache from settings.yaml.
+    Expired entries are pruned from the store when it is created.
+
+    Args:
+        config: Cache configuration (defaults to scraper.http_cache)
+        store: Optional pre-built store (get/set/delete/prune), e.g. in tests
+
+    Returns:
+        Dictionary with status, enabled flag, backend name and pruned count
+    """
+    global _store, _config
+
+    if config is None:
+        try:
+            from loader import get_config_value
+            config = get_config_value("scraper.http_cache", {}) or {}
+        except Exception:
+            config = {}
+    config = dict(DEFAULT_CONFIG, **config)
+
+    if config.get("enabled") is not True:
+        store = None
+    elif store is None:
+        if _resolve_backend(config.get("backend")) == "firestore":
+            try:
+                if not FIREBASE_AVAILABLE:
+                    raise ImportError("firebase_admin not installed")
+                store = _FirestoreStore(firestore.client(), config["collection"])
+            except Exception as e:
+                print(f"Warning: Firestore HTTP cache unavailable ({str(e)}); using disk backend")
+        if store is None:
+            try:
+                store = _DiskStore(config["path"])
+            except Exception as e:
+                print(f"Warning: YouTube HTTP cache disabled: {str(e)}")
+
+    pruned = 0
+    if store is not None:
+        try:
+            pruned = store.prune(time.time())
+        except Exception as e:
+            print(f"Warning: Failed to prune YouTube HTTP cache: {str(e)}")
+
+    with _state_lock:
+        _config = config
+        _store = store
+
+    return {
+        "status": "configured",
+        "enabled": store is not None,
+        "backend": getattr(store, "name", None),
+        "pruned": pruned
+    }
+
+
+def _resolve_backend(backend: Optional[str]) -> str:
+    """"auto" is Firestore on Cloud Functions (disk files there are per instance), else disk."""
+    if backend == "auto":
+        return "firestore" if any(os.environ.get(name) for name in SERVERLESS_ENV_VARS) else "disk"
+    return backend or "disk"
+
+
+def reset_http_cache() -> None:
+    """Drop the store, configuration and statistics (next use re-reads settings)."""
+    global _store, _config, _stats
+    with _state_lock:
+        _store = None
+        _config = None
+    with _stats_lock:
+        _stats = _new_stats()
+
+
+def _get_store() -> Tuple[Any, dict]:
+    if _config is None:
+        configure_http_cache()
+    return _store, _config
+
+
+def cache_key(uri: str) -> str:
+    """SHA-256 of the URI with sorted query parameters (API keys are never stored in clear)."""
+    parsed = urlparse(uri)
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return hashlib.sha256(f"{parsed.netloc}{parsed.path}?{query}".encode("utf-8")).hexdigest()
+
+
+def api_method(uri: str) -> str:
+    """Map a YouTube Data API GET URI to its method name (e.g. "playlistItems.list")."""
+    path = urlparse(uri).path
+    if API_PATH_PREFIX in path:
+        resource = path.split(API_PATH_PREFIX, 1)[1].strip("/").split("/")[0]
+        return f"{resource}.list"
+    return "other"
+
+
+class ETagCachingHttp:
+    """
+    httplib2.Http-compatible wrapper adding If-None-Match revalidation.
+
+    Only GET requests are cached. Store failures are logged and the request
+    proceeds uncached; other attributes are forwarded to the wrapped Http.
+    """
+
+    def __init__(self, http, store, ttl_seconds: float):
+        self.http = http
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+
+    def __getattr__(self, name):
+        if name == "http":
+            raise AttributeError(name)
+        return getattr(self.http, name)
+
+    def _lookup(self, key: str) -> Optional[dict]:
+        try:
+            entry = self.store.get(key)
+        except Exception as e:
+            _count("errors")
+            print(f"Warning: YouTube HTTP cache read failed: {str(e)}")
+            return None
+        if entry and entry.get("expires_at", 0) <= time.time():
+            _count("expired")
+            try:
+                self.store.delete(key)
+            except Exception:
+                pass
+            return None
+        return entry
+
+    def _save(self, key: str, entry: dict) -> None:
+        try:
+            self.store.set(key, entry)
+        except Exception as e:
+            _count("errors")
+            print(f"Warning: YouTube HTTP cache write failed: {str(e)}")
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=5, connection_type=None):
+        if method != "GET":
+            return self.http.request(uri, method=method, body=body, headers=headers,
+                                     redirections=redirections, connection_type=connection_type)
+
+        _count("requests")
+        key = cache_key(uri)
+        entry = self._lookup(key)
+        headers = dict(headers or {})
+        if entry:
+            headers["If-None-Match"] = entry["etag"]
+            _count("conditional_requests")
+
+        resp, content = self.http.request(uri, method=method, body=body, headers=headers,
+                                          redirections=redirections, connection_type=connection_type)
+
+        now = time.time()
+        if resp.status == 304 and entry:
+            _count("not_modified")
+            _count("quota_units_saved", QUOTA_COSTS.get(entry.get("method"), 1))
+            entry["expires_at"] = now + self.ttl_seconds
+            self._save(key, entry)
+            cached = httplib2.Response({
+                "status": "200",
+                "content-type": entry.get("content_type") or "application/json; charset=UTF-8",
+                "etag": entry["etag"]
+            })
+            return cached, entry["content"].encode("utf-8")
+
+        etag = resp.get("etag")
+        if resp.status == 200 and etag:
+            try:
+                text = content.decode("utf-8") if isinstance(content, bytes) else content
+            except UnicodeDecodeError:
+                return resp, content
+            self._save(key, {
+                "etag": etag,
+                "content": text,
+                "content_type": resp.get("content-type"),
+                "method": api_method(uri),
+                "stored_at": now,
+                "expires_at": now + self.ttl_seconds
+            })
+            _count("stored")
+
+        return resp, content
+
+
+def build_youtube_http(credentials: Any = None, http: Any = None):
+    """
+    Build the http object to pass to googleapiclient.discovery.build().
+
+    Args:
+        credentials: Optional google-auth credentials (service account);
+            None for API key authentication
+        http: Optional base transport (defaults to a new httplib2.Http)
+
+    Returns:
+        An ETagCachingHttp around the transport when scraper.http_cache is
+        enabled (the plain transport otherwise), wrapped in an AuthorizedHttp
+        when credentials are given
+    """
+    if http is None:
+        http = httplib2.Http()
+
+    store, config = _get_store()
+    if store is not None:
+        http = ETagCachingHttp(http, store, float(config.get("ttl_hours", 168)) * 3600)
+
+    if credentials is not None:
+        import google_auth_httplib2
+        return google_auth_httplib2.AuthorizedHttp(credentials, http=http)
+    return http
+
+
+def get_http_cache_stats() -> dict:
+    """
+    Get ETag cache statistics for this process.
+
+    Returns:
+        Dictionary with requests, conditional_requests, not_modified, stored,
+        expired, errors, quota_units_saved, hit_ratio_percent (304s per GET)
+        and backend
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["hit_ratio_percent"] = round(stats["not_modified"] / stats["requests"] * 100, 2) if stats["requests"] else 0.0
+    stats["backend"] = getattr(_store, "name", None)
+    return stats
@@ -15,6 +15,8 @@ from pydantic import Field
 
 # Add parent directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+# Core directory too, so rag.* modules load under one name (shared refs buffer)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
 
 from agency_swarm.tools import BaseTool
 from core.rag.ingest_document import ingest
@@ -111,7 +113,7 @@ class RagIndexDocument(BaseTool):
             # Optional: Write Firestore reference for audit/discovery (best-effort, never blocks)
             if result.get("status") in ["success", "partial"]:
                 try:
-                    from core.rag.refs import upsert_ref
+                    from rag.refs import flush_refs, upsert_ref
 
                     # Build reference document
                     ref = {
@@ -142,6 +144,8 @@ class RagIndexDocument(BaseTool):
 
                     # Write reference (best-effort, never raises)
                     upsert_ref(ref)
+                    # Commit now rather than waiting for the buffer's size/interval/exit flush
+                    flush_refs(reason="ingest")
                 except Exception:
                     # Silently ignore ref write failures (best-effort only)
                     pass
@@ -1,6 +1,7 @@
 """
 ListRecentUploads tool for fetching recent YouTube uploads using uploads playlist.
-Implements checkpoint-based processing with lastPublishedAt persistence.
+Implements checkpoint-based processing with lastPublishedAt persistence and
+multi-channel discovery through core/youtube_discovery.py.
 """
 
 import os
@@ -13,7 +14,6 @@ from agency_swarm.tools import BaseTool
 from pydantic import Field
 from googleapiclient.discovery import build
 from google.oauth2 import service_account
-from googleapiclient.errors import HttpError
 
 # Add core and config directories to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
@@ -21,6 +21,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'config'))
 
 from config.env_loader import get_required_env_var
 from config.loader import get_config_value
+from youtube_discovery import discover_uploads
+from youtube_http_cache import build_youtube_http, get_http_cache_stats
 
 # Firebase Admin SDK for checkpoint persistence
 try:
@@ -33,17 +35,24 @@ except ImportError:
 
 class ListRecentUploads(BaseTool):
     """
-    Lists recent video uploads from a YouTube channel using uploads playlist.
+    Lists recent video uploads from one or more YouTube channels using uploads playlists.
     
-    Uses the channel's uploads playlist to efficiently retrieve videos within
+    Uses each channel's uploads playlist to efficiently retrieve videos within
     a time window, implements checkpoint-based processing to skip already-seen
-    videos, and includes quota management for production reliability.
+    videos, and reports the YouTube quota units spent. Several channels are
+    discovered together: uploads playlists are resolved 50 channels per
+    request and cached, playlists are fetched concurrently, and video details
+    are fetched in shared 50-ID batches.
     """
     
-    channel_id: str = Field(
-        ..., 
+    channel_id: Optional[str] = Field(
+        default=None,
         description="YouTube channel ID (e.g., 'UCfV36TX5AejfAGIbtwTc7Zw')"
     )
+    channel_ids: Optional[List[str]] = Field(
+        default=None,
+        description="Several YouTube channel IDs to discover in one run (combined with channel_id if both are set)"
+    )
     since_utc: str = Field(
         ..., 
         description="Start time in ISO8601 UTC format (e.g., '2025-01-27T00:00:00Z')"
@@ -54,7 +63,7 @@ class ListRecentUploads(BaseTool):
     )
     page_size: Optional[int] = Field(
         default=None,
-        description="Maximum number of videos to return per page (1-50). If None, reads from settings.yaml",
+        description="Maximum number of videos to return per channel (1-50). If None, reads from settings.yaml",
         ge=1,
         le=50
     )
@@ -65,184 +74,113 @@ class ListRecentUploads(BaseTool):
     
     def run(self) -> str:
         """
-        Fetches recent uploads from the channel's uploads playlist.
+        Fetches recent uploads from the channels' uploads playlists.
         
         Returns:
-            str: JSON string containing array of video objects with keys:
-                 video_id, url, title, published_at, duration_sec
+            str: JSON string containing:
+                 - items: Video objects (video_id, url, title, published_at,
+                   duration_sec), newest first, up to page_size per channel
+                 - total_found, checkpoint_updated
+                 - quota_units_used, quota_calls: YouTube API cost of this run
+                 - http_cache: 304 Not Modified responses and quota units saved
+                   by the ETag cache during this run
+                 - channels: Per-channel items/total_found/error (multi-channel runs only)
                  
         Raises:
             ValueError: If inputs are invalid
             RuntimeError: If API call fails or quota exceeded
         """
         try:
+            channel_ids = list(dict.fromkeys(
+                ([self.channel_id] if self.channel_id else []) + list(self.channel_ids or [])
+            ))
+            if not channel_ids:
+                return json.dumps({'error': 'channel_id or channel_ids is required', 'items': []})
+
             # Load page_size from config if not provided
             if self.page_size is None:
                 self.page_size = get_config_value("scraper.page_size", 50)
 
-            # Initialize YouTube API client
-            youtube = self._initialize_youtube_client()
+            cache_before = get_http_cache_stats()
 
-            # Get channel's uploads playlist ID
-            uploads_playlist_id = self._get_uploads_playlist_id(youtube, self.channel_id)
-            
-            if not uploads_playlist_id:
-                return json.dumps({'error': 'Could not find uploads playlist', 'items': []})
-            
-            # Load checkpoint if enabled
-            checkpoint = None
+            # Load checkpoints if enabled
+            checkpoints = {}
             if self.use_checkpoint:
-                checkpoint = self._load_checkpoint(self.channel_id)
-            
-            # Fetch videos from uploads playlist
-            videos = self._fetch_playlist_videos(
-                youtube,
-                uploads_playlist_id,
-                checkpoint
+                checkpoints = {cid: self._load_checkpoint(cid) for cid in channel_ids}
+
+            discovery = discover_uploads(
+                channel_ids,
+                self.since_utc,
+                self._initialize_youtube_client,
+                max_items_per_channel=self.page_size * 2,  # Fetch extra to account for filtering
+                checkpoints=checkpoints,
+                max_workers=get_config_value("scraper.discovery.max_workers", 4)
             )
 
-            # Get detailed video information including durations
-            detailed_videos = self._get_video_details(youtube, videos)
-            
-            # Filter by time window and apply limits
-            filtered_videos = self._filter_videos_by_timeframe(detailed_videos)
-            
-            # Update checkpoint with latest video
-            if self.use_checkpoint and filtered_videos:
-                latest_video = max(filtered_videos, key=lambda v: v['published_at'])
-                self._save_checkpoint(self.channel_id, latest_video['published_at'])
+            channels = {}
+            for channel_id in channel_ids:
+                found = discovery['channels'][channel_id]
+                videos = self._filter_videos_by_timeframe([self._to_video(item) for item in found['videos']])
 
+                # Update checkpoint with latest video
+                checkpoint_updated = self.use_checkpoint and len(videos) > 0
+                if checkpoint_updated:
+                    latest_video = max(videos, key=lambda v: v['published_at'])
+                    self._save_checkpoint(channel_id, latest_video['published_at'])
+
+                channels[channel_id] = {
+                    'items': videos[:self.page_size],
+                    'total_found': len(videos),
+                    'checkpoint_updated': checkpoint_updated,
+                    'error': found['error']
+                }
+
+            quota = discovery['quota']
+            cache_after = get_http_cache_stats()
+            http_cache = {
+                'not_modified': cache_after['not_modified'] - cache_before['not_modified'],
+                'quota_units_saved': cache_after['quota_units_saved'] - cache_before['quota_units_saved']
+            }
+            if len(channel_ids) == 1:
+                channel = channels[channel_ids[0]]
+                if channel['error'] == 'Could not find uploads playlist':
+                    return json.dumps({'error': channel['error'], 'items': [], 'quota_units_used': quota['units']})
+                if channel['error']:
+                    raise RuntimeError(channel['error'])
+                return json.dumps({
+                    'items': channel['items'],
+                    'total_found': channel['total_found'],
+                    'checkpoint_updated': channel['checkpoint_updated'],
+                    'quota_units_used': quota['units'],
+                    'quota_calls': quota['calls'],
+                    'http_cache': http_cache
+                }, indent=2)
+
+            items = [video for channel in channels.values() for video in channel['items']]
+            items.sort(key=lambda v: v['published_at'], reverse=True)
             return json.dumps({
-                'items': filtered_videos[:self.page_size],
-                'total_found': len(filtered_videos),
-                'checkpoint_updated': self.use_checkpoint and len(filtered_videos) > 0
+                'items': items,
+                'total_found': sum(channel['total_found'] for channel in channels.values()),
+                'checkpoint_updated': any(channel['checkpoint_updated'] for channel in channels.values()),
+                'channels': channels,
+                'quota_units_used': quota['units'],
+                'quota_calls': quota['calls'],
+                'http_cache': http_cache
             }, indent=2)
             
         except Exception as e:
             return json.dumps({'error': f'Failed to list recent uploads: {str(e)}', 'items': []})
     
-    def _get_uploads_playlist_id(self, youtube, channel_id: str) -> Optional[str]:
-        """Get the uploads playlist ID for the channel."""
-        try:
-            channel_response = youtube.channels().list(
-                part='contentDetails',
-                id=channel_id
-            ).execute()
-            
-            if not channel_response.get('items'):
-                return None
-            
-            uploads_playlist_id = (
-                channel_response['items'][0]
-                ['contentDetails']
-                ['relatedPlaylists']
-                ['uploads']
-            )
-            
-            return uploads_playlist_id
-            
-        except Exception as e:
-            raise RuntimeError(f"Failed to get uploads playlist: {str(e)}")
-    
-    def _fetch_playlist_videos(self, youtube, playlist_id: str, checkpoint: Optional[str]) -> List[Dict[str, Any]]:
-        """Fetch videos from uploads playlist with checkpoint support."""
-        videos = []
-        next_page_token = None
-        checkpoint_dt = None
-        
-        if checkpoint:
-            try:
-                checkpoint_dt = datetime.fromisoformat(checkpoint.replace('Z', '+00:00'))
-            except:
-                checkpoint_dt = None
-        
-        while len(videos) < self.page_size * 2:  # Fetch extra to account for filtering
-            params = {
-                'part': 'snippet',
-                'playlistId': playlist_id,
-                'maxResults': min(50, self.page_size * 2 - len(videos))
-            }
-            
-            if next_page_token:
-                params['pageToken'] = next_page_token
-            
-            try:
-                response = youtube.playlistItems().list(**params).execute()
-
-                for item in response.get('items', []):
-                    published_at = item['snippet']['publishedAt']
-                    published_dt = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-                    
-                    # Skip if before checkpoint
-                    if checkpoint_dt and published_dt <= checkpoint_dt:
-                        continue
-                    
-                    # Skip if outside time window (early exit optimization)
-                    since_dt = datetime.fromisoformat(self.since_utc.replace('Z', '+00:00'))
-                    if published_dt < since_dt:
-                        return videos  # Videos are ordered by date, so we can stop here
-                    
-                    videos.append({
-                        'video_id': item['snippet']['resourceId']['videoId'],
-                        'title': item['snippet']['title'],
-                        'published_at': published_at,
-                        'channel_title': item['snippet']['channelTitle']
-                    })
-                
-                next_page_token = response.get('nextPageToken')
-                if not next_page_token:
-                    break
-
-            except HttpError as e:
-                if e.resp.status == 429:  # Rate limit
-                    break
-                else:
-                    raise RuntimeError(f"YouTube API error: {str(e)}")
-        
-        return videos
-    
-    def _get_video_details(self, youtube, videos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Get detailed video information including durations."""
-        if not videos:
-            return []
-        
-        detailed_videos = []
-        
-        # Process videos in batches of 50 (API limit)
-        for i in range(0, len(videos), 50):
-            batch = videos[i:i + 50]
-            video_ids = [video['video_id'] for video in batch]
-
-            try:
-                videos_response = youtube.videos().list(
-                    part='snippet,contentDetails',
-                    id=','.join(video_ids)
-                ).execute()
-
-                # Create lookup for video details
-                video_details = {item['id']: item for item in videos_response.get('items', [])}
-                
-                for video in batch:
-                    video_id = video['video_id']
-                    if video_id in video_details:
-                        details = video_details[video_id]
-                        duration_sec = self._parse_duration(details['contentDetails']['duration'])
-                        
-                        detailed_videos.append({
-                            'video_id': video_id,
-                            'url': f"https://www.youtube.com/watch?v={video_id}",
-                            'title': details['snippet']['title'],
-                            'published_at': details['snippet']['publishedAt'],
-                            'duration_sec': duration_sec
-                        })
-
-            except HttpError as e:
-                if e.resp.status == 429:  # Rate limit
-                    break
-                else:
-                    raise RuntimeError(f"YouTube API error: {str(e)}")
-        
-        return detailed_videos
+    def _to_video(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a videos().list item to the tool's video object."""
+        video_id = item['id']
+        return {
+            'video_id': video_id,
+            'url': f"https://www.youtube.com/watch?v={video_id}",
+            'title': item['snippet']['title'],
+            'published_at': item['snippet']['publishedAt'],
+            'duration_sec': self._parse_duration(item['contentDetails']['duration'])
+        }
     
     def _filter_videos_by_timeframe(self, videos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter videos by the specified time window."""
@@ -334,12 +272,12 @@ class ListRecentUploads(BaseTool):
                         service_account_path,
                         scopes=['https://www.googleapis.com/auth/youtube.readonly']
                     )
-                    return build('youtube', 'v3', credentials=credentials)
+                    return build('youtube', 'v3', http=build_youtube_http(credentials))
             except Exception:
                 pass  # Fall back to API key
             
-            # Use API key authentication
-            return build('youtube', 'v3', developerKey=api_key)
+            # Use API key authentication (ETag-cached transport, see core/youtube_http_cache.py)
+            return build('youtube', 'v3', developerKey=api_key, http=build_youtube_http())
                 
         except Exception as e:
             raise RuntimeError(f"Failed to initialize YouTube client: {str(e)}")
@@ -22,6 +22,8 @@ from scraper_agent.tools.remove_sheet_row import RemoveSheetRow
 
 load_dotenv()
 
+MAX_BATCH_WRITES = 500  # Firestore limit per WriteBatch commit
+
 
 class MarkSheetRowsProcessed(BaseTool):
     """
@@ -172,18 +174,23 @@ class MarkSheetRowsProcessed(BaseTool):
             return {"success": False, "error": str(e)}
 
     def _mark_videos_processed(self, db, rows_info: List[Dict]) -> None:
-        """Update Firestore to mark videos as processed."""
+        """Update Firestore to mark videos as processed, committed in WriteBatch groups."""
         current_time = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
 
-        for info in rows_info:
+        for start in range(0, len(rows_info), MAX_BATCH_WRITES):
+            chunk = rows_info[start:start + MAX_BATCH_WRITES]
             try:
-                doc_ref = db.collection('videos').document(info['video_id'])
-                doc_ref.update({
-                    'sheet_metadata.processed_at': current_time
-                })
+                batch = db.batch()
+                for info in chunk:
+                    doc_ref = db.collection('videos').document(info['video_id'])
+                    batch.update(doc_ref, {
+                        'sheet_metadata.processed_at': current_time
+                    })
+                batch.commit()
             except Exception as e:
                 # Log but don't fail the whole operation
-                print(f"Warning: Failed to mark video {info['video_id']} as processed: {str(e)}")
+                video_ids = ", ".join(info['video_id'] for info in chunk)
+                print(f"Warning: Failed to mark videos as processed ({video_ids}): {str(e)}")
 
     def _initialize_firestore(self):
         """Initialize Firestore client with proper authentication."""
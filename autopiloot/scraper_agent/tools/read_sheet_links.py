@@ -7,11 +7,11 @@ import os
 import sys
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, List, Dict, Any
 from agency_swarm.tools import BaseTool
 from pydantic import Field
 from dotenv import load_dotenv
-import time
 
 # Add core and config directories to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
@@ -19,6 +19,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'config'))
 
 from config.env_loader import get_required_env_var
 from config.loader import load_app_config
+from page_fetcher import PageCache, PoliteFetcher
 
 # Google Sheets API
 from googleapiclient.discovery import build
@@ -26,6 +27,15 @@ from google.oauth2.service_account import Credentials
 
 load_dotenv()
 
+# Video IDs in watch, youtu.be, embed and /v/ URLs found anywhere in raw HTML
+YOUTUBE_VIDEO_ID_PATTERN = re.compile(
+    r'(?:youtube(?:-nocookie)?\.com/(?:watch\?(?:[^"\'<>\s]*?&(?:amp;)?)?v=|embed/|v/)|youtu\.be/)'
+    r'([a-zA-Z0-9_-]{11})'
+)
+
+# Extracted YouTube URLs per page, revalidated by ETag / Last-Modified across runs
+_page_cache = PageCache()
+
 
 class ReadSheetLinks(BaseTool):
     """
@@ -106,9 +116,8 @@ class ReadSheetLinks(BaseTool):
                     }
                 })
             
-            # Process rows and extract YouTube URLs from pages
-            results = []
-            pages_processed = 0
+            # Classify rows; external pages are fetched concurrently below
+            rows = []
             pages_failed = 0
             processed_count = 0
 
@@ -129,7 +138,18 @@ class ReadSheetLinks(BaseTool):
                     pages_failed += 1
                     continue
 
-                # Check if the URL is already a direct YouTube URL
+                rows.append((row_index, page_url))
+
+            external_urls = list(dict.fromkeys(
+                page_url for _, page_url in rows if not self._is_youtube_url(page_url)
+            ))
+            page_results = self._fetch_pages(external_urls, config)
+
+            # Process rows and extract YouTube URLs from pages
+            results = []
+            pages_processed = 0
+
+            for row_index, page_url in rows:
                 try:
                     if self._is_youtube_url(page_url):
                         # Direct YouTube URL - just extract and return it
@@ -144,8 +164,10 @@ class ReadSheetLinks(BaseTool):
                             })
                             pages_processed += 1
                     else:
-                        # External page - fetch and extract embedded YouTube videos
-                        youtube_urls = self._extract_youtube_urls_from_page(page_url)
+                        # External page - embedded YouTube videos fetched above
+                        youtube_urls = page_results[page_url]
+                        if isinstance(youtube_urls, Exception):
+                            raise youtube_urls
                         pages_processed += 1
 
                         if not youtube_urls:
@@ -162,9 +184,6 @@ class ReadSheetLinks(BaseTool):
                             })
                             print(f"Found YouTube video: {video_url}")
 
-                        # Small delay to be respectful to servers
-                        time.sleep(0.5)
-
                 except Exception as e:
                     pages_failed += 1
                     print(f"Failed to process page {page_url}: {str(e)}")
@@ -213,12 +232,59 @@ class ReadSheetLinks(BaseTool):
                 "items": []
             })
     
-    def _extract_youtube_urls_from_page(self, page_url: str) -> List[str]:
+    def _fetch_pages(self, page_urls: List[str], config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fetch external pages concurrently with per-host politeness.
+
+        Concurrency and rate limits come from sheets.page_fetch in settings.yaml:
+        max_workers threads overall, at most per_host_concurrency in-flight
+        requests and per_host_interval_sec between request starts per host.
+
+        Args:
+            page_urls: Unique external page URLs
+            config: Loaded application configuration
+
+        Returns:
+            Dictionary mapping each URL to its list of YouTube URLs, or to the
+            Exception raised while fetching it
         """
-        Extract YouTube URLs from a web page using multiple methods.
+        if not page_urls:
+            return {}
+
+        fetch_config = (config.get("sheets") or {}).get("page_fetch") or {}
+        fetcher = PoliteFetcher(
+            per_host_concurrency=int(fetch_config.get("per_host_concurrency", 2)),
+            per_host_interval_sec=float(fetch_config.get("per_host_interval_sec", 0.5)),
+            timeout_sec=self.timeout_sec
+        )
+        max_workers = max(1, min(int(fetch_config.get("max_workers", 8)), len(page_urls)))
+
+        page_results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._extract_youtube_urls_from_page, page_url, fetcher): page_url
+                for page_url in page_urls
+            }
+            for future in as_completed(futures):
+                try:
+                    page_results[futures[future]] = future.result()
+                except Exception as e:
+                    page_results[futures[future]] = e
+
+        return page_results
+
+    def _extract_youtube_urls_from_page(self, page_url: str, fetcher: Optional[PoliteFetcher] = None) -> List[str]:
+        """
+        Extract YouTube URLs from a web page.
+
+        The page is revalidated with its cached ETag / Last-Modified when one
+        is known (a 304 reuses the cached URLs). Video IDs are taken from a
+        single regex scan of the raw HTML; the page is only parsed with
+        BeautifulSoup when that scan finds nothing.
 
         Args:
             page_url: URL of the page to fetch and parse
+            fetcher: PoliteFetcher shared by the run (a new one if omitted)
 
         Returns:
             List of YouTube URLs found on the page
@@ -227,63 +293,48 @@ class ReadSheetLinks(BaseTool):
         import requests
         from bs4 import BeautifulSoup
 
+        if fetcher is None:
+            fetcher = PoliteFetcher(timeout_sec=self.timeout_sec)
+
         try:
-            # Fetch page content
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
+            cached = _page_cache.get(page_url)
+            page = fetcher.fetch(
+                page_url,
+                etag=cached["etag"] if cached else None,
+                last_modified=cached["last_modified"] if cached else None
+            )
+            if page.not_modified and cached:
+                _page_cache.touch(page_url)
+                return list(cached["value"])
+
+            html_content = page.text
+
+            # Method 1: Regex scan of the raw HTML
+            youtube_urls = dict.fromkeys(
+                f"https://www.youtube.com/watch?v={match.group(1)}"
+                for match in YOUTUBE_VIDEO_ID_PATTERN.finditer(html_content)
+            )
+
+            # Method 2: Parse HTML with BeautifulSoup (entity-encoded or unusual markup)
+            if not youtube_urls:
+                try:
+                    soup = BeautifulSoup(html_content, 'html.parser')
+                    candidates = [iframe.get('src', '') for iframe in soup.find_all('iframe')]
+                    candidates += [link['href'] for link in soup.find_all('a', href=True)]
+                    candidates += [meta.get('content', '') for meta in soup.find_all('meta', property='og:video')]
+
+                    for candidate in candidates:
+                        if candidate and self._is_youtube_url(candidate):
+                            normalized = self._normalize_youtube_url(candidate)
+                            if normalized:
+                                youtube_urls[normalized] = None
+
+                except Exception as e:
+                    print(f"BeautifulSoup parsing failed for {page_url}: {str(e)}")
 
-            response = requests.get(page_url, headers=headers, timeout=self.timeout_sec)
-            response.raise_for_status()
-
-            html_content = response.text
-            youtube_urls = set()
-
-            # Method 1: Parse HTML with BeautifulSoup
-            try:
-                soup = BeautifulSoup(html_content, 'html.parser')
-
-                # Extract from iframe embeds
-                for iframe in soup.find_all('iframe'):
-                    src = iframe.get('src', '')
-                    if src and self._is_youtube_url(src):
-                        normalized = self._normalize_youtube_url(src)
-                        if normalized:
-                            youtube_urls.add(normalized)
-
-                # Extract from anchor links
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    if self._is_youtube_url(href):
-                        normalized = self._normalize_youtube_url(href)
-                        if normalized:
-                            youtube_urls.add(normalized)
-
-                # Extract from og:video meta tags
-                for meta in soup.find_all('meta', property='og:video'):
-                    content = meta.get('content', '')
-                    if content and self._is_youtube_url(content):
-                        normalized = self._normalize_youtube_url(content)
-                        if normalized:
-                            youtube_urls.add(normalized)
-
-            except Exception as e:
-                print(f"BeautifulSoup parsing failed for {page_url}: {str(e)}")
-
-            # Method 2: Regex extraction from raw HTML
-            youtube_patterns = [
-                r'(?:https?://)?(?:www\.)?youtube\.com/watch\?.*v=([a-zA-Z0-9_-]{11})',
-                r'(?:https?://)?(?:www\.)?youtu\.be/([a-zA-Z0-9_-]{11})',
-                r'(?:https?://)?(?:www\.)?youtube\.com/embed/([a-zA-Z0-9_-]{11})',
-            ]
-
-            for pattern in youtube_patterns:
-                matches = re.finditer(pattern, html_content)
-                for match in matches:
-                    video_id = match.group(1)
-                    youtube_urls.add(f"https://www.youtube.com/watch?v={video_id}")
-
-            return list(youtube_urls)
+            youtube_urls = list(youtube_urls)
+            _page_cache.set(page_url, youtube_urls, page.etag, page.last_modified)
+            return youtube_urls
             
         except requests.RequestException as e:
             raise Exception(f"Failed to fetch page {page_url}: {str(e)}")
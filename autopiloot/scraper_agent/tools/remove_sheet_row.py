@@ -20,6 +20,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'config'))
 
 from env_loader import get_required_env_var
 from loader import load_app_config
+from sheets import batch_read_rows, build_row_delete_requests, get_row_block_ranges
 
 load_dotenv()
 
@@ -119,27 +120,19 @@ class RemoveSheetRow(BaseTool):
             if not archive_sheet:
                 archive_sheet = self._create_archive_sheet(service, sheet_id)
             
-            # Read rows to be archived
+            # Read all rows to be archived in one batchGet (nothing is deleted if it fails)
+            rows = batch_read_rows(service, sheet_id, self.source_sheet_name, row_indices)
+
             rows_to_archive = []
+            archived_at = datetime.now(timezone.utc).isoformat()
             for row_index in row_indices:
-                range_name = f"{self.source_sheet_name}!A{row_index}:Z{row_index}"
-                try:
-                    result = service.spreadsheets().values().get(
-                        spreadsheetId=sheet_id,
-                        range=range_name
-                    ).execute()
-                    
-                    values = result.get('values', [])
-                    if values and values[0]:  # Only archive non-empty rows
-                        # Add timestamp and original row info
-                        archived_row = values[0] + [
-                            f"Archived on {datetime.now(timezone.utc).isoformat()}",
-                            f"Original row: {row_index}"
-                        ]
-                        rows_to_archive.append(archived_row)
-                except Exception as e:
-                    # Skip rows that can't be read
-                    continue
+                values = rows.get(row_index)
+                if values:  # Only archive non-empty rows
+                    # Add timestamp and original row info
+                    rows_to_archive.append(values + [
+                        f"Archived on {archived_at}",
+                        f"Original row: {row_index}"
+                    ])
             
             # Append archived rows to Archive sheet
             if rows_to_archive:
@@ -151,21 +144,8 @@ class RemoveSheetRow(BaseTool):
                     body={'values': rows_to_archive}
                 ).execute()
             
-            # Clear original rows (process in reverse order to maintain indices)
-            requests = []
-            for row_index in row_indices:
-                requests.append({
-                    'deleteRange': {
-                        'range': {
-                            'sheetId': source_sheet['properties']['sheetId'],
-                            'startRowIndex': row_index - 1,  # Convert to 0-based
-                            'endRowIndex': row_index,
-                            'startColumnIndex': 0,
-                            'endColumnIndex': 26  # Up to column Z
-                        },
-                        'shiftDimension': 'ROWS'
-                    }
-                })
+            # Delete original rows, one deleteRange per block of adjacent rows (bottom-up)
+            requests = build_row_delete_requests(source_sheet['properties']['sheetId'], row_indices)
             
             # Execute batch update
             if requests:
@@ -188,10 +168,8 @@ class RemoveSheetRow(BaseTool):
     def _clear_rows(self, service, sheet_id: str, row_indices: List[int]) -> dict:
         """Clear row contents without deleting the rows."""
         try:
-            # Build ranges to clear
-            ranges = []
-            for row_index in row_indices:
-                ranges.append(f"{self.source_sheet_name}!A{row_index}:Z{row_index}")
+            # Build one range per block of adjacent rows
+            ranges = get_row_block_ranges(self.source_sheet_name, row_indices)
             
             # Batch clear the ranges
             if ranges:
@@ -201,8 +179,8 @@ class RemoveSheetRow(BaseTool):
                 ).execute()
             
             return {
-                "message": f"Successfully cleared {len(ranges)} rows",
-                "processed_rows": len(ranges),
+                "message": f"Successfully cleared {len(row_indices)} rows",
+                "processed_rows": len(row_indices),
                 "skipped_rows": 0,
                 "operation": "clear"
             }
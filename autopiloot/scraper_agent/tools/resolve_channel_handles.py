@@ -1,6 +1,7 @@
 """
 ResolveChannelHandles tool for batch conversion of YouTube channel handles to channel IDs.
 Loads handles from settings.yaml and returns a mapping of handles to channel IDs.
+Known handles are served from the cached channels mapping (see core/channel_handles.py).
 """
 
 import os
@@ -19,6 +20,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'config'))
 
 from config.env_loader import get_required_env_var
 from config.loader import load_app_config, get_config_value
+from youtube_http_cache import build_youtube_http, get_http_cache_stats
+from channel_handles import resolve_handles
 
 
 class ResolveChannelHandles(BaseTool):
@@ -27,6 +30,9 @@ class ResolveChannelHandles(BaseTool):
     
     Loads the list of handles from settings.yaml (scraper.handles) and returns
     a mapping of each handle to its channel ID using YouTube Data API v3.
+    Handles are looked up in-process, then in the Firestore channels mapping
+    (revalidated once older than scraper.handle_cache.ttl_days), then with
+    channels().list(forHandle=...) before falling back to search.
     Includes retry logic for rate limits and transient failures.
     """
     
@@ -40,8 +46,10 @@ class ResolveChannelHandles(BaseTool):
         Resolves all configured channel handles to channel IDs.
 
         Returns:
-            str: JSON string containing mapping of handles to channel data
-                 Format: '{"@AlexHormozi": {"channel_id": "UCfV...", "title": "...", ...}, ...}'
+            str: JSON string with the handle mapping and resolution stats
+                 Format: '{"mappings": {"@AlexHormozi": {"channel_id": "UCfV...", "title": "...", ...}, ...},
+                           "resolution": {"sources": ..., "stale_mappings": [...], "quota_units_used": ...,
+                                          "quota_units_saved": ..., "http_cache": {...}}}'
 
         Note: This tool only resolves handles. Use SaveChannelMapping separately to persist results.
         """
@@ -54,21 +62,25 @@ class ResolveChannelHandles(BaseTool):
 
             # Initialize YouTube API client
             youtube = self._initialize_youtube_client()
-
-            # Resolve each handle to channel data
-            mapping = {}
-            for handle in handles:
-                try:
-                    channel_data = self._resolve_single_handle_with_metadata(youtube, handle)
-                    mapping[handle] = channel_data
-
-                except Exception as e:
-                    # Continue with other handles even if one fails
-                    mapping[handle] = {"error": str(e)}
+            cache_before = get_http_cache_stats()
+
+            # Resolve each handle to channel data (failed handles get {"error": ...})
+            result = resolve_handles(
+                youtube,
+                handles,
+                search_fallback=self._resolve_single_handle_with_metadata,
+                ttl_days=get_config_value("scraper.handle_cache.ttl_days", 30)
+            )
+
+            cache_after = get_http_cache_stats()
+            resolution = dict(result['stats'], http_cache={
+                'not_modified': cache_after['not_modified'] - cache_before['not_modified'],
+                'quota_units_saved': cache_after['quota_units_saved'] - cache_before['quota_units_saved']
+            })
 
             # Return as JSON string
             import json
-            return json.dumps(mapping, indent=2)
+            return json.dumps({'mappings': result['mappings'], 'resolution': resolution}, indent=2)
 
         except Exception as e:
             return f'{{"error": "Failed to resolve channel handles: {str(e)}"}}'
@@ -295,12 +307,12 @@ class ResolveChannelHandles(BaseTool):
                         service_account_path,
                         scopes=['https://www.googleapis.com/auth/youtube.readonly']
                     )
-                    return build('youtube', 'v3', credentials=credentials)
+                    return build('youtube', 'v3', http=build_youtube_http(credentials))
             except Exception:
                 pass  # Fall back to API key
 
-            # Use API key authentication
-            return build('youtube', 'v3', developerKey=api_key)
+            # Use API key authentication (ETag-cached transport, see core/youtube_http_cache.py)
+            return build('youtube', 'v3', developerKey=api_key, http=build_youtube_http())
 
         except Exception as e:
             raise RuntimeError(f"Failed to initialize YouTube client: {str(e)}")
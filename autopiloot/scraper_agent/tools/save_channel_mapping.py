@@ -36,6 +36,7 @@ class SaveChannelMapping(BaseTool):
       * channel_id: str
       * canonical_handle: str (normalized with @ prefix)
       * handles: List[str] (unique set of all known handles)
+      * handle_keys: List[str] (lowercased handles, queried by ResolveChannelHandles)
       * title: Optional[str]
       * custom_url: Optional[str]
       * thumbnails: Optional[Dict] (parsed from thumbnails_json)
@@ -138,6 +139,7 @@ class SaveChannelMapping(BaseTool):
                 update_data = {
                     'canonical_handle': canonical_handle,
                     'handles': updated_handles,
+                    'handle_keys': [h.lower() for h in updated_handles],
                     'last_resolved_at': current_time,
                     'updated_at': firestore.SERVER_TIMESTAMP
                 }
@@ -158,6 +160,7 @@ class SaveChannelMapping(BaseTool):
                     'channel_id': self.channel_id,
                     'canonical_handle': canonical_handle,
                     'handles': [canonical_handle],
+                    'handle_keys': [canonical_handle.lower()],
                     'last_resolved_at': current_time,
                     'created_at': firestore.SERVER_TIMESTAMP,
                     'updated_at': firestore.SERVER_TIMESTAMP
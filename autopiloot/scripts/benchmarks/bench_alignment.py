@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark for post-fusion evidence alignment in core.rag.evidence_alignment.
+
+Builds fused result lists of k synthetic transcript chunks in which a
+fraction are near-duplicates of another result (shifted chunk boundary,
+different casing, trailing text, as returned by different sinks) and times
+align_evidence() for each k. Reports latency percentiles and how many of
+the planted duplicates were merged, plus any unrelated pairs merged.
+
+Usage:
+    python scripts/benchmarks/bench_alignment.py
+    python scripts/benchmarks/bench_alignment.py --k 25 50 100 --chars 4000 --dup-ratio 0.2
+    python scripts/benchmarks/bench_alignment.py --json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import string
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+from rag.evidence_alignment import align_evidence
+
+
+CONFIG = {
+    "similarity_threshold": 0.85,
+    "trust_hierarchy": {"multi_source": 3, "zep": 2, "bigquery": 2, "opensearch": 1},
+    "conflict_detection": {"numerical_threshold": 0.5, "temporal_threshold": 0.5},
+    "signature": {"max_chars": 1024, "dimensions": 512, "sample_rate": 16},
+    "logging": {"enabled": False}
+}
+
+COMMON_WORDS = "the a and to of in that we you it is for on with this your so what when".split()
+
+
+def _make_results(k: int, chars: int, dup_ratio: float, rng: random.Random):
+    """k fused results, about dup_ratio of them near-duplicates of an earlier one."""
+    vocab = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10))) for _ in range(5000)]
+    variants = [
+        lambda t: t[rng.randint(20, 80):] + " and that is the key point",
+        lambda t: t.upper(),
+        lambda t: t + " so let's move on to the next topic",
+    ]
+    results, planted = [], 0
+    for i in range(k):
+        if results and rng.random() < dup_ratio:
+            original = rng.choice(results)
+            text = rng.choice(variants)(original["text"])
+            planted += 1
+        else:
+            words = []
+            while sum(len(w) + 1 for w in words) < chars:
+                words.append(rng.choice(COMMON_WORDS) if rng.random() < 0.4 else rng.choice(vocab))
+            text = " ".join(words)
+        source = rng.choice(["zep", "opensearch", "bigquery"])
+        results.append({"chunk_id": f"chunk_{i}", "text": text, "score": 1.0 / (60 + i),
+                        "sources": [source], "provenance": {source: {"score": 0.5, "rank": i + 1}}})
+    return results, planted
+
+
+def run(ks: list, chars: int, dup_ratio: float, iterations: int, signature: dict, seed: int = 17) -> dict:
+    rng = random.Random(seed)
+    config = dict(CONFIG, signature=signature)
+    report = {"chars_per_result": chars, "dup_ratio": dup_ratio, "iterations": iterations,
+              "signature": signature, "k": {}}
+
+    for k in ks:
+        results, planted = _make_results(k, chars, dup_ratio, rng)
+        align_evidence(results, config)  # warm up
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            outcome = align_evidence(results, config)
+            timings.append((time.perf_counter() - start) * 1_000_000)
+        timings.sort()
+        report["k"][k] = {
+            "p50_us": round(statistics.median(timings)),
+            "p95_us": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))]),
+            "planted_duplicates": planted,
+            "merged": outcome["duplicates_merged"],
+            "conflicts": len(outcome["conflicts"])
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate evidence alignment latency")
+    parser.add_argument("--k", type=int, nargs="+", default=[10, 25, 50, 100], help="Result counts (default: 10 25 50 100)")
+    parser.add_argument("--chars", type=int, default=4000, help="Characters per result (default: 4000, ~1000 tokens)")
+    parser.add_argument("--dup-ratio", type=float, default=0.2, help="Fraction of planted near-duplicates (default: 0.2)")
+    parser.add_argument("--max-chars", type=int, default=1024, help="signature.max_chars (default: 1024)")
+    parser.add_argument("--dimensions", type=int, default=512, help="signature.dimensions (default: 512)")
+    parser.add_argument("--sample-rate", type=int, default=16, help="signature.sample_rate (default: 16)")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed runs per k (default: 200)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    signature = {"max_chars": args.max_chars, "dimensions": args.dimensions, "sample_rate": args.sample_rate}
+    report = run(args.k, args.chars, args.dup_ratio, args.iterations, signature)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print("=" * 60)
+    print("📊 Evidence Alignment Benchmark")
+    print("=" * 60)
+    print(f"{report['chars_per_result']} chars/result | dup ratio {report['dup_ratio']} | {report['iterations']} runs")
+    print(f"Signature: {report['signature']}")
+    for k, entry in report["k"].items():
+        status = "✅" if entry["p50_us"] < 1000 else "⚠️"
+        print(f"  k={k:<4} p50 {entry['p50_us']:>5} µs  p95 {entry['p95_us']:>5} µs {status}  "
+              f"merged {entry['merged']}/{entry['planted_duplicates']} planted")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
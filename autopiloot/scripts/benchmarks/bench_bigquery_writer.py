@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the BigQuery writers in core.rag.bigquery_writer.
+
+Writes the same synthetic transcript chunk rows with each write mode
+(streaming inserts, Storage Write API committed stream, batched load jobs)
+into a fresh table per mode on a local BigQuery emulator, then reports
+rows/second and verifies the row count with a COUNT(*) query.
+
+Requires a running emulator, e.g.:
+    docker run -p 9050:9050 -p 9060:9060 ghcr.io/goccy/bigquery-emulator --project=bench
+
+Usage:
+    python scripts/benchmarks/bench_bigquery_writer.py
+    python scripts/benchmarks/bench_bigquery_writer.py --rows 20000 --batch-size 500 --modes storage_write load_job
+    python scripts/benchmarks/bench_bigquery_writer.py --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+from rag.bigquery_writer import WRITE_MODES, schema_fields, write_rows
+
+
+def _make_rows(count: int) -> list:
+    rows = []
+    for i in range(count):
+        video_id = f"vid{i // 40:05d}"
+        rows.append({
+            "video_id": video_id,
+            "chunk_id": f"{video_id}_chunk_{i % 40}",
+            "title": f"Benchmark video {i // 40}",
+            "channel_id": f"UC{i % 7}",
+            "published_at": f"2025-{(i % 12) + 1:02d}-15T12:00:00Z",
+            "duration_sec": 1200,
+            "content_sha256": uuid.UUID(int=i).hex * 2,
+            "tokens": 480,
+            "text_snippet": ("pricing retention hiring churn " * 9)[:256]
+        })
+    return rows
+
+
+def _emulator_reachable(endpoint: str) -> bool:
+    """Fail fast instead of letting the client retry a closed port for minutes."""
+    try:
+        urllib.request.urlopen(endpoint, timeout=3)
+    except urllib.error.HTTPError:
+        return True  # Listening (the root path is not an API route)
+    except Exception:
+        return False
+    return True
+
+
+def _clients(project: str, rest_endpoint: str, grpc_endpoint: str):
+    import grpc
+    from google.api_core.client_options import ClientOptions
+    from google.auth.credentials import AnonymousCredentials
+    from google.cloud import bigquery
+
+    client = bigquery.Client(
+        project=project,
+        credentials=AnonymousCredentials(),
+        client_options=ClientOptions(api_endpoint=rest_endpoint)
+    )
+
+    write_client = None
+    try:
+        from google.cloud import bigquery_storage_v1
+        from google.cloud.bigquery_storage_v1.services.big_query_write.transports import BigQueryWriteGrpcTransport
+        write_client = bigquery_storage_v1.BigQueryWriteClient(
+            transport=BigQueryWriteGrpcTransport(channel=grpc.insecure_channel(grpc_endpoint))
+        )
+    except ImportError:
+        pass
+
+    return bigquery, client, write_client
+
+
+def run(rows_count: int, batch_size: int, modes: list, project: str, dataset: str,
+        rest_endpoint: str, grpc_endpoint: str) -> dict:
+    bigquery, client, write_client = _clients(project, rest_endpoint, grpc_endpoint)
+    client.create_dataset(bigquery.Dataset(f"{project}.{dataset}"), exists_ok=True)
+    rows = _make_rows(rows_count)
+
+    report = {"rows": rows_count, "batch_size": batch_size, "emulator": rest_endpoint, "modes": {}}
+    for mode in modes:
+        if mode == "storage_write" and write_client is None:
+            report["modes"][mode] = {"error": "google-cloud-bigquery-storage not installed"}
+            continue
+
+        table_id = f"{project}.{dataset}.bench_{mode}_{uuid.uuid4().hex[:8]}"
+        client.create_table(bigquery.Table(table_id, schema=schema_fields(bigquery)))
+
+        start = time.perf_counter()
+        try:
+            result = write_rows(client, table_id, rows, bigquery, mode=mode, batch_size=batch_size,
+                                write_client=write_client)
+        except Exception as e:
+            report["modes"][mode] = {"error": str(e)}
+            continue
+        elapsed = time.perf_counter() - start
+
+        counted = list(client.query(f"SELECT COUNT(*) AS n FROM `{table_id}`").result())[0].n
+        report["modes"][mode] = {
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(rows_count / elapsed) if elapsed else None,
+            "inserted_count": result["inserted_count"],
+            "error_count": result["error_count"],
+            "rows_in_table": counted,
+            "requests": result.get("load_jobs") or result.get("appends") or 1
+        }
+        client.delete_table(table_id, not_found_ok=True)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BigQuery writer throughput against a local emulator")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows written per mode (default: 10000)")
+    parser.add_argument("--batch-size", type=int, default=500, help="rag.bigquery.batch_size (default: 500)")
+    parser.add_argument("--modes", nargs="+", choices=WRITE_MODES, default=list(WRITE_MODES),
+                        help="Write modes to benchmark (default: all)")
+    parser.add_argument("--project", default="bench", help="Emulator project (default: bench)")
+    parser.add_argument("--dataset", default="autopiloot_bench", help="Dataset created for the run (default: autopiloot_bench)")
+    parser.add_argument("--rest-endpoint", default=os.environ.get("BIGQUERY_EMULATOR_HOST", "http://localhost:9050"),
+                        help="Emulator REST endpoint (default: $BIGQUERY_EMULATOR_HOST or http://localhost:9050)")
+    parser.add_argument("--grpc-endpoint", default="localhost:9060",
+                        help="Emulator Storage API gRPC endpoint (default: localhost:9060)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    if not _emulator_reachable(args.rest_endpoint):
+        print(f"❌ BigQuery emulator not reachable at {args.rest_endpoint}")
+        sys.exit(1)
+
+    try:
+        report = run(args.rows, args.batch_size, args.modes, args.project, args.dataset,
+                     args.rest_endpoint, args.grpc_endpoint)
+    except Exception as e:
+        print(f"❌ Benchmark failed against {args.rest_endpoint}: {str(e)}")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print("=" * 60)
+    print("📊 BigQuery Writer Throughput Benchmark")
+    print("=" * 60)
+    print(f"{report['rows']} rows | batch size {report['batch_size']} | emulator {report['emulator']}")
+    for mode, entry in report["modes"].items():
+        if "error" in entry:
+            print(f"  {mode:<14} ❌ {entry['error']}")
+            continue
+        status = "✅" if entry["rows_in_table"] == report["rows"] else "❌"
+        print(f"  {mode:<14} {entry['rows_per_sec']:>8} rows/s  {entry['seconds']:>7}s  "
+              f"{entry['requests']:>4} requests  {entry['rows_in_table']} rows in table {status}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
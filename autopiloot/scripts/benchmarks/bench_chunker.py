@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark for transcript chunking in core.rag.chunker.
+
+Compares the legacy path (encode the whole text, decode every window, then
+re-encode every chunk in count_tokens) against the single-pass chunker
+(chunk_with_metadata / stream_chunks) on synthetic 1h and 3h transcripts.
+
+By default the real cl100k_base encoding is used. Pass --offline to run with a
+small byte-level BPE encoding when cl100k_base cannot be downloaded; absolute
+numbers are then not representative but the relative cost of the extra
+tokenization pass still shows.
+
+Usage:
+    python scripts/benchmarks/bench_chunker.py
+    python scripts/benchmarks/bench_chunker.py --hours 1 3 --repeat 5
+    python scripts/benchmarks/bench_chunker.py --offline --json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import rag.chunker as chunker
+
+
+WORDS_PER_MINUTE = 150
+
+VOCABULARY = (
+    "revenue offer funnel founder customer acquisition cost lifetime value payback "
+    "period hiring players systems processes playbook scale pricing churn retention "
+    "the a and to of in that we you it is for on with this your so what when"
+).split()
+
+
+def _offline_encoding():
+    import tiktoken
+
+    ranks = {bytes([i]): i for i in range(256)}
+    for word in VOCABULARY:
+        data = word.encode("utf-8")
+        for end in range(2, len(data) + 1):
+            ranks.setdefault(data[:end], len(ranks))
+    return tiktoken.Encoding(
+        name="bench_offline",
+        pat_str=r"""'s|'t|'re|'ve|'m|'ll|'d| ?\w+| ?[^\s\w]+|\s+(?!\S)|\s+""",
+        mergeable_ranks=ranks,
+        special_tokens={}
+    )
+
+
+def _make_transcript(hours: float, seed: int = 42) -> list:
+    """Synthetic transcript as a list of caption lines (~12 words each)."""
+    rng = random.Random(seed)
+    words = int(hours * 60 * WORDS_PER_MINUTE)
+    lines = []
+    while words > 0:
+        count = min(words, rng.randint(8, 16))
+        lines.append(" ".join(rng.choice(VOCABULARY) for _ in range(count)) + ".\n")
+        words -= count
+    return lines
+
+
+def _legacy_chunk_with_metadata(text: str, max_tokens: int, overlap_tokens: int, doc_id: str) -> list:
+    """Chunking path used before the single-pass chunker."""
+    encoding = chunker.get_encoding()
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        texts = [text]
+    else:
+        texts = []
+        start_idx = 0
+        while start_idx < len(tokens):
+            end_idx = min(start_idx + max_tokens, len(tokens))
+            texts.append(encoding.decode(tokens[start_idx:end_idx]))
+            if end_idx >= len(tokens):
+                break
+            start_idx = end_idx - overlap_tokens
+
+    return [
+        {
+            "text": chunk,
+            "tokens": len(encoding.encode(chunk)),
+            "chunk_index": i,
+            "total_chunks": len(texts),
+            "chunk_id": f"{doc_id}_chunk_{i}"
+        }
+        for i, chunk in enumerate(texts)
+    ]
+
+
+def _measure(fn, repeat: int) -> dict:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return {"median_ms": round(statistics.median(timings) * 1000, 2), "chunks": len(result)}
+
+
+def run(hours_list, max_tokens: int, overlap_tokens: int, repeat: int) -> dict:
+    # Load the encoding and per-token tables outside the timed region
+    chunker.chunk_with_metadata("warm up", max_tokens, overlap_tokens)
+
+    results = []
+    for hours in hours_list:
+        lines = _make_transcript(hours)
+        text = "".join(lines)
+
+        legacy = _measure(lambda: _legacy_chunk_with_metadata(text, max_tokens, overlap_tokens, "bench"), repeat)
+        single = _measure(lambda: chunker.chunk_with_metadata(text, max_tokens, overlap_tokens, "bench"), repeat)
+        streaming = _measure(lambda: list(chunker.stream_chunks(lines, max_tokens, overlap_tokens, "bench")), repeat)
+
+        results.append({
+            "hours": hours,
+            "chars": len(text),
+            "tokens": chunker.count_tokens(text),
+            "legacy": legacy,
+            "single_pass": single,
+            "streaming": streaming,
+            "speedup": round(legacy["median_ms"] / single["median_ms"], 2) if single["median_ms"] else None
+        })
+
+    return {
+        "encoding": chunker.get_encoding().name,
+        "max_tokens": max_tokens,
+        "overlap_tokens": overlap_tokens,
+        "repeat": repeat,
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark legacy vs single-pass transcript chunking")
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 3], help="Transcript lengths in hours (default: 1 3)")
+    parser.add_argument("--max-tokens", type=int, default=1000, help="Max tokens per chunk (default: 1000)")
+    parser.add_argument("--overlap-tokens", type=int, default=100, help="Overlap tokens (default: 100)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; median reported (default: 5)")
+    parser.add_argument("--offline", action="store_true", help="Use a local byte-level encoding instead of cl100k_base")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    if args.offline:
+        chunker._encoding = _offline_encoding()
+
+    report = run(args.hours, args.max_tokens, args.overlap_tokens, args.repeat)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print("=" * 60)
+    print("📊 Transcript Chunking Benchmark")
+    print("=" * 60)
+    print(f"Encoding: {report['encoding']} | max_tokens={args.max_tokens} overlap={args.overlap_tokens}")
+    for result in report["results"]:
+        print(f"\n{result['hours']}h transcript: {result['chars']:,} chars, {result['tokens']:,} tokens")
+        for mode in ("legacy", "single_pass", "streaming"):
+            stats = result[mode]
+            print(f"  {mode:>11}: {stats['median_ms']:>9} ms ({stats['chunks']} chunks)")
+        print(f"  Speedup: {result['speedup']}x")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
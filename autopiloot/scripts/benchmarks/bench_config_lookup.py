@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for config.loader.get_config_value lookups.
+
+Compares the legacy lookup path (load_app_config() + dotted walk on every call)
+against the cached ConfigSnapshot index used by get_config_value().
+
+Usage:
+    python scripts/benchmarks/bench_config_lookup.py
+    python scripts/benchmarks/bench_config_lookup.py --iterations 20000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from config.loader import load_app_config, get_config_value, reload_config
+
+
+DEFAULT_KEYS = [
+    "rag.opensearch.enabled",
+    "rag.zep.transcripts.chunking.max_tokens_per_chunk",
+    "rag.experiments.default_parameters.retrieval.top_k",
+    "rag.observability.latency.slow_path_threshold_ms",
+    "rag.policy.sensitive_patterns",
+    "scraper.handles",
+    "rag.does.not.exist",
+]
+
+
+def _legacy_get_config_value(key_path: str, default=None):
+    """Lookup path used before the snapshot cache: parse + validate per call."""
+    value = load_app_config()
+    for key in key_path.split('.'):
+        if isinstance(value, dict) and key in value:
+            value = value[key]
+        else:
+            return default
+    return value
+
+
+def _measure(lookup, keys, iterations: int) -> dict:
+    start = time.perf_counter()
+    for i in range(iterations):
+        lookup(keys[i % len(keys)])
+    elapsed = time.perf_counter() - start
+    return {
+        "iterations": iterations,
+        "elapsed_sec": round(elapsed, 4),
+        "lookups_per_sec": round(iterations / elapsed, 1) if elapsed > 0 else None,
+        "avg_us": round(elapsed / iterations * 1_000_000, 2),
+    }
+
+
+def run(iterations: int, legacy_iterations: int, keys=None) -> dict:
+    """Run both benchmarks and return a comparison report."""
+    keys = keys or DEFAULT_KEYS
+
+    # Sanity check: both paths must resolve identically
+    reload_config()
+    for key in keys:
+        assert _legacy_get_config_value(key) == get_config_value(key), key
+
+    legacy = _measure(_legacy_get_config_value, keys, legacy_iterations)
+    cached = _measure(get_config_value, keys, iterations)
+
+    speedup = None
+    if legacy["lookups_per_sec"] and cached["lookups_per_sec"]:
+        speedup = round(cached["lookups_per_sec"] / legacy["lookups_per_sec"], 1)
+
+    return {"legacy": legacy, "snapshot": cached, "speedup": speedup, "keys": keys}
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark config lookups (legacy vs snapshot)")
+    parser.add_argument("--iterations", type=int, default=100000, help="Snapshot lookups to time (default: 100000)")
+    parser.add_argument("--legacy-iterations", type=int, default=200, help="Legacy lookups to time (default: 200)")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON report")
+    args = parser.parse_args()
+
+    report = run(args.iterations, args.legacy_iterations)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print("=" * 60)
+    print("⚙️  Config lookup benchmark")
+    print("=" * 60)
+    print(f"Legacy (parse per call): {report['legacy']['lookups_per_sec']:>14,.1f} lookups/sec "
+          f"({report['legacy']['avg_us']} µs avg)")
+    print(f"Snapshot (indexed):      {report['snapshot']['lookups_per_sec']:>14,.1f} lookups/sec "
+          f"({report['snapshot']['avg_us']} µs avg)")
+    print(f"Speedup: {report['speedup']}x")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for result fusion in core.rag.fusion.
+
+Times the previous full-sort fusion (a {**result} copy per unique chunk,
+sort the whole unified set, then slice) against rag.fusion.fuse (compact
+accumulators, heap top-k, only `limit` output dicts) for rrf and weighted,
+and times the normalized methods (minmax, zscore) on the same inputs.
+Results carry content_sha256 as the sources provide it; --missing-hash-ratio
+drops it from a fraction of results to include text hashing.
+
+Usage:
+    python scripts/benchmarks/bench_fusion.py
+    python scripts/benchmarks/bench_fusion.py --top-k 200 --limit 10 --iterations 500
+    python scripts/benchmarks/bench_fusion.py --json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+from rag.fusion import fuse
+from rag.hashing import sha256_hex
+
+
+SOURCES = ("zep", "opensearch", "bigquery")
+WEIGHTS = {"zep": 0.6, "opensearch": 0.3, "bigquery": 0.1}
+
+
+def _make_source_results(top_k: int, overlap: float, missing_hash_ratio: float, seed: int = 13) -> dict:
+    rng = random.Random(seed)
+    pool = int(top_k * len(SOURCES) * (1 - overlap)) + top_k
+    source_results = {}
+    for name in SOURCES:
+        results = []
+        for i in rng.sample(range(pool), top_k):
+            text = f"chunk {i} " + "transcript words " * 30
+            result = {"chunk_id": f"vid{i // 10}_chunk_{i}", "video_id": f"vid{i // 10}", "title": f"Video {i // 10}",
+                      "text": text, "score": rng.random(), "source": name}
+            if rng.random() >= missing_hash_ratio:
+                result["content_sha256"] = sha256_hex(text)
+            results.append(result)
+        source_results[name] = results
+    return source_results
+
+
+def _legacy_fusion(source_results: dict, method: str, limit: int, k: int = 60) -> list:
+    """Fusion as implemented before rag.fusion (rrf / weighted)."""
+    unified = {}
+    for source_name, results in source_results.items():
+        weight = WEIGHTS.get(source_name, 1.0)
+        for rank, result in enumerate(results, start=1):
+            key = result.get("content_sha256") or sha256_hex(result.get("text", ""))
+            if key not in unified:
+                unified[key] = {**result, "fused_score": 0.0, "sources": [], "provenance": {}}
+            if method == "rrf":
+                unified[key]["fused_score"] += 1.0 / (k + rank)
+            else:
+                unified[key]["fused_score"] += result.get("score", 0.0) * weight
+            if source_name not in unified[key]["sources"]:
+                unified[key]["sources"].append(source_name)
+            unified[key]["provenance"][source_name] = {"score": result.get("score", 0.0), "rank": rank}
+
+    ranked = sorted(unified.values(), key=lambda x: x["fused_score"], reverse=True)
+    for result in ranked:
+        result["score"] = result.pop("fused_score")
+        result.pop("content_sha256", None)
+    return ranked[:limit]
+
+
+def _time(fn, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1_000_000, 1)
+
+
+def run(top_k: int, limit: int, overlap: float, missing_hash_ratio: float, iterations: int) -> dict:
+    source_results = _make_source_results(top_k, overlap, missing_hash_ratio)
+    report = {
+        "top_k": top_k,
+        "limit": limit,
+        "overlap": overlap,
+        "missing_hash_ratio": missing_hash_ratio,
+        "iterations": iterations,
+        "methods": {}
+    }
+
+    for method in ("rrf", "weighted", "minmax", "zscore"):
+        fused_us = _time(lambda: fuse(source_results, method, limit=limit, weights=WEIGHTS), iterations)
+        entry = {"fuse_us": fused_us}
+        if method in ("rrf", "weighted"):
+            legacy_us = _time(lambda: _legacy_fusion(source_results, method, limit), iterations)
+            legacy_ids = [r["chunk_id"] for r in _legacy_fusion(source_results, method, limit)]
+            fused_ids = [r["chunk_id"] for r in fuse(source_results, method, limit=limit, weights=WEIGHTS)]
+            entry.update({
+                "legacy_us": legacy_us,
+                "speedup": round(legacy_us / fused_us, 2) if fused_us else None,
+                "same_ranking": legacy_ids == fused_ids
+            })
+        report["methods"][method] = entry
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full-sort vs heap top-k result fusion")
+    parser.add_argument("--top-k", type=int, default=100, help="Results per source (default: 100)")
+    parser.add_argument("--limit", type=int, default=20, help="Fused results returned (default: 20)")
+    parser.add_argument("--overlap", type=float, default=0.3, help="Approximate cross-source overlap (default: 0.3)")
+    parser.add_argument("--missing-hash-ratio", type=float, default=0.0,
+                        help="Fraction of results without content_sha256 (default: 0.0)")
+    parser.add_argument("--iterations", type=int, default=300, help="Timed runs per method; median reported (default: 300)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    report = run(args.top_k, args.limit, args.overlap, args.missing_hash_ratio, args.iterations)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print("=" * 60)
+    print("📊 Result Fusion Benchmark")
+    print("=" * 60)
+    print(f"{len(SOURCES)} sources x top_k {report['top_k']} -> limit {report['limit']} "
+          f"(overlap {report['overlap']}, missing hashes {report['missing_hash_ratio']})")
+    for method, entry in report["methods"].items():
+        line = f"  {method:<9} fuse {entry['fuse_us']:>8} µs"
+        if "legacy_us" in entry:
+            status = "✅" if entry["same_ranking"] else "❌"
+            line += f" | full sort {entry['legacy_us']:>8} µs | {entry['speedup']}x {status}"
+        print(line)
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for OpenSearch transcript indexing.
+
+Compares the per-document path (one index request per chunk) against the
+_bulk engine in core.rag.opensearch_indexer.bulk_index and reports docs/sec.
+
+By default it runs against an in-process OpenSearch stand-in that charges a
+fixed round-trip latency per request plus a per-KB transfer cost, which is
+the cost structure bulk indexing optimizes. Pass --host to run against a
+real (local) OpenSearch cluster instead.
+
+Usage:
+    python scripts/benchmarks/bench_opensearch_bulk.py
+    python scripts/benchmarks/bench_opensearch_bulk.py --docs 2000 --rtt-ms 5
+    python scripts/benchmarks/bench_opensearch_bulk.py --host http://localhost:9200 --username admin --password admin
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+from rag.opensearch_indexer import bulk_index, _index_document
+
+
+class _LocalIndices:
+    def __init__(self):
+        self.settings = {}
+
+    def get_settings(self, index, name=None):
+        return {index: {"settings": {"index": dict(self.settings)}}}
+
+    def put_settings(self, index, body):
+        self.settings.update({k: v for k, v in body["index"].items() if v is not None})
+
+
+class LocalOpenSearch:
+    """In-memory stand-in charging per-request latency and per-KB transfer time."""
+
+    def __init__(self, rtt_ms: float = 2.0, us_per_kb: float = 20.0):
+        self.rtt_s = rtt_ms / 1000.0
+        self.s_per_byte = us_per_kb / 1_000_000 / 1024
+        self.docs = {}
+        self.requests = 0
+        self.indices = _LocalIndices()
+
+    def _charge(self, payload_bytes: int):
+        self.requests += 1
+        time.sleep(self.rtt_s + payload_bytes * self.s_per_byte)
+
+    def index(self, index, id, body, refresh=False):
+        self._charge(len(json.dumps(body)))
+        self.docs[id] = body
+        return {"result": "created"}
+
+    def bulk(self, body, request_timeout=None):
+        self._charge(len(body))
+        lines = body.splitlines()
+        items = []
+        for action_line, source_line in zip(lines[::2], lines[1::2]):
+            doc_id = json.loads(action_line)["index"]["_id"]
+            self.docs[doc_id] = json.loads(source_line)
+            items.append({"index": {"_id": doc_id, "status": 201}})
+        return {"errors": False, "items": items}
+
+
+def _make_docs(count: int, text_chars: int):
+    text = ("Revenue grows when you fix the offer before the funnel. " * (text_chars // 56 + 1))[:text_chars]
+    return [
+        (f"bench_video_chunk_{i}", {
+            "video_id": "bench_video",
+            "chunk_id": f"bench_video_chunk_{i}",
+            "chunk_index": i,
+            "total_chunks": count,
+            "title": "Benchmark video",
+            "channel_id": "UCbench",
+            "content_sha256": f"{i:064x}",
+            "tokens": text_chars // 4,
+            "text": text
+        })
+        for i in range(count)
+    ]
+
+
+def _measure(label: str, fn, doc_count: int, client) -> dict:
+    requests_before = getattr(client, "requests", None)
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    result = {
+        "mode": label,
+        "docs": doc_count,
+        "elapsed_sec": round(elapsed, 3),
+        "docs_per_sec": round(doc_count / elapsed, 1) if elapsed > 0 else None
+    }
+    if requests_before is not None:
+        result["requests"] = client.requests - requests_before
+    return result
+
+
+def run(docs: int, text_chars: int, max_batch_bytes: int, client, index_name: str) -> dict:
+    documents = _make_docs(docs, text_chars)
+
+    single = _measure(
+        "single",
+        lambda: [_index_document(client, index_name, doc_id, body) for doc_id, body in documents],
+        docs,
+        client
+    )
+    bulk = _measure(
+        "bulk",
+        lambda: bulk_index(client, index_name, documents, max_batch_bytes=max_batch_bytes,
+                           max_retries=3, retry_backoff_ms=100, disable_refresh=True, request_timeout=30),
+        docs,
+        client
+    )
+
+    speedup = round(bulk["docs_per_sec"] / single["docs_per_sec"], 1) if single["docs_per_sec"] else None
+    return {"results": [single, bulk], "speedup": speedup, "max_batch_bytes": max_batch_bytes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-document vs _bulk OpenSearch indexing")
+    parser.add_argument("--docs", type=int, default=500, help="Documents to index per mode (default: 500)")
+    parser.add_argument("--text-chars", type=int, default=4000, help="Chunk text size in characters (default: 4000, ~1000 tokens)")
+    parser.add_argument("--max-batch-bytes", type=int, default=5 * 1024 * 1024, help="Byte budget per _bulk request")
+    parser.add_argument("--rtt-ms", type=float, default=2.0, help="Stand-in round-trip latency per request (default: 2.0)")
+    parser.add_argument("--us-per-kb", type=float, default=20.0, help="Stand-in transfer cost per KB (default: 20)")
+    parser.add_argument("--host", help="Run against a real OpenSearch host instead of the stand-in")
+    parser.add_argument("--username", help="Basic auth username for --host")
+    parser.add_argument("--password", help="Basic auth password for --host")
+    parser.add_argument("--index", default="bench_transcripts", help="Index name (default: bench_transcripts)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    if args.host:
+        from rag.clients import get_opensearch_client
+        client = get_opensearch_client(args.host, username=args.username, password=args.password)
+    else:
+        client = LocalOpenSearch(rtt_ms=args.rtt_ms, us_per_kb=args.us_per_kb)
+
+    report = run(args.docs, args.text_chars, args.max_batch_bytes, client, args.index)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print("=" * 60)
+    print("📊 OpenSearch Indexing Benchmark")
+    print("=" * 60)
+    print(f"Target: {args.host or f'local stand-in (rtt {args.rtt_ms}ms, {args.us_per_kb}µs/KB)'}")
+    for result in report["results"]:
+        requests = f", {result['requests']} requests" if "requests" in result else ""
+        print(f"{result['mode']:>7}: {result['docs_per_sec']:>10} docs/sec ({result['elapsed_sec']}s{requests})")
+    print(f"Speedup: {report['speedup']}x")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
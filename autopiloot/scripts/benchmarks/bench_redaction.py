@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark for PII redaction in core.rag.retrieval_policy.
+
+Compares the previous path (one re.sub per configured pattern for every
+result) against the precompiled single-pass RedactionEngine, over synthetic
+transcript chunks where a fraction contain emails, phone numbers, SSNs or
+card numbers. Outputs of both paths are checked to be identical.
+
+Usage:
+    python scripts/benchmarks/bench_redaction.py
+    python scripts/benchmarks/bench_redaction.py --chunks 10000 --pii-ratio 0.1 --repeat 5
+    python scripts/benchmarks/bench_redaction.py --json
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+from rag.retrieval_policy import RedactionEngine
+
+
+# Mirrors rag.policy.sensitive_patterns in config/settings.yaml
+SENSITIVE_PATTERNS = [
+    {"name": "email", "pattern": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b", "replacement": "[EMAIL REDACTED]"},
+    {"name": "phone", "pattern": r"\b\d{3}[-.]?\d{3}[-.]?\d{4}\b", "replacement": "[PHONE REDACTED]"},
+    {"name": "ssn", "pattern": r"\b\d{3}-\d{2}-\d{4}\b", "replacement": "[SSN REDACTED]"},
+    {"name": "credit_card", "pattern": r"\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b", "replacement": "[CARD REDACTED]"},
+]
+
+VOCABULARY = (
+    "revenue offer funnel founder customer acquisition cost lifetime value payback "
+    "period hiring players systems processes playbook scale pricing churn retention "
+    "the a and to of in that we you it is for on with this your so what when 2024 100"
+).split()
+
+PII_SAMPLES = [
+    "email me at founder{n}@example.com",
+    "call 555-{n:03d}-4567",
+    "ssn 123-45-{n:04d}",
+    "card 4111 1111 1111 {n:04d}",
+]
+
+
+def _make_chunks(count: int, words: int, pii_ratio: float, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    chunks = []
+    for i in range(count):
+        tokens = [rng.choice(VOCABULARY) for _ in range(words)]
+        if rng.random() < pii_ratio:
+            tokens.insert(rng.randrange(len(tokens)), rng.choice(PII_SAMPLES).format(n=i % 1000))
+        chunks.append({"chunk_id": f"chunk_{i}", "text": " ".join(tokens)})
+    return chunks
+
+
+def _legacy_redact(results: list, patterns: list) -> list:
+    """Redaction path used before the single-pass engine."""
+    redacted_results = []
+    for result in results:
+        redacted = result.copy()
+        text = redacted.get("text", "")
+        for pattern_config in patterns:
+            text = re.sub(pattern_config["pattern"], pattern_config["replacement"], text)
+        redacted["text"] = text
+        redacted_results.append(redacted)
+    return redacted_results
+
+
+def _measure(fn, repeat: int):
+    timings = []
+    output = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = fn()
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1000, 2), output
+
+
+def run(chunk_count: int, words: int, pii_ratio: float, repeat: int) -> dict:
+    chunks = _make_chunks(chunk_count, words, pii_ratio)
+    engine = RedactionEngine(SENSITIVE_PATTERNS)
+
+    legacy_ms, legacy_out = _measure(lambda: _legacy_redact(chunks, SENSITIVE_PATTERNS), repeat)
+    engine_ms, (engine_out, _) = _measure(lambda: engine.redact_results(chunks), repeat)
+
+    mismatches = sum(1 for a, b in zip(legacy_out, engine_out) if a["text"] != b["text"])
+    stats = engine.get_stats()
+    return {
+        "chunks": chunk_count,
+        "words_per_chunk": words,
+        "pii_ratio": pii_ratio,
+        "repeat": repeat,
+        "engine_mode": engine.mode,
+        "legacy_ms": legacy_ms,
+        "single_pass_ms": engine_ms,
+        "speedup": round(legacy_ms / engine_ms, 2) if engine_ms else None,
+        "chunks_per_sec": int(chunk_count / (engine_ms / 1000)) if engine_ms else None,
+        "output_mismatches": mismatches,
+        "hits_per_run": {name: count // repeat for name, count in stats["hit_counts"].items()}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-pattern vs single-pass PII redaction")
+    parser.add_argument("--chunks", type=int, default=10000, help="Synthetic chunks (default: 10000)")
+    parser.add_argument("--words", type=int, default=150, help="Words per chunk (default: 150)")
+    parser.add_argument("--pii-ratio", type=float, default=0.1, help="Fraction of chunks containing PII (default: 0.1)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; median reported (default: 3)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    report = run(args.chunks, args.words, args.pii_ratio, args.repeat)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print("=" * 60)
+    print("📊 PII Redaction Benchmark")
+    print("=" * 60)
+    print(f"Chunks: {report['chunks']:,} x {report['words_per_chunk']} words | PII ratio: {report['pii_ratio']}")
+    print(f"  Per-pattern re.sub: {report['legacy_ms']:>9} ms")
+    print(f"  Single pass ({report['engine_mode']}): {report['single_pass_ms']:>9} ms")
+    print(f"  Speedup: {report['speedup']}x ({report['chunks_per_sec']:,} chunks/sec)")
+    print(f"  Hits per run: {report['hits_per_run']}")
+    status = "✅" if report["output_mismatches"] == 0 else "❌"
+    print(f"  {status} Output mismatches: {report['output_mismatches']}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
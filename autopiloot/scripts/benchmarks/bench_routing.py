@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark for adaptive query routing in core.rag.hybrid_retrieve.search.
+
+Runs a synthetic query mix (conceptual, factual with filters, strongly
+filtered, mixed intent, unmatched) through search() twice: once with
+rag.routing.mode "always_on" (every enabled source on every call) and once
+with "adaptive". Sources are in-process stand-ins with a fixed latency per
+source, so the report shows source calls saved and the latency effect of
+not waiting on the slowest source.
+
+Usage:
+    python scripts/benchmarks/bench_routing.py
+    python scripts/benchmarks/bench_routing.py --queries 400 --zep-ms 150 --bigquery-ms 300
+    python scripts/benchmarks/bench_routing.py --json
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import rag.config as rag_config
+import rag.cache as retrieval_cache
+import rag.routing as routing
+from rag import hybrid_retrieve
+
+
+# (weight, query templates, filter factory) for the synthetic mix
+QUERY_MIX = [
+    (0.35, [
+        "How to build a high-performance sales team",
+        "Why do most founders fail at hiring",
+        "Explain the framework for pricing an offer",
+        "What is the best approach to reduce churn",
+    ], lambda rng: None),
+    (0.25, [
+        "which episode covers pricing",
+        "when did he talk about payback period",
+        "how many customers before hiring a closer",
+    ], lambda rng: {"channel_id": rng.choice(["UC1", "UC2", "UC3"])}),
+    (0.15, [
+        "revenue",
+        "customer acquisition cost",
+    ], lambda rng: {"channel_id": "UC1", "date_from": "2025-01-01", "date_to": "2025-06-30"}),
+    (0.15, [
+        "How to price SaaS products when launching",
+        "Why did churn spike and when did it recover",
+    ], lambda rng: None),
+    (0.10, [
+        "lifetime value",
+        "offer stacking",
+    ], lambda rng: None),
+]
+
+
+def _make_queries(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    weights = [weight for weight, _, _ in QUERY_MIX]
+    queries = []
+    for _ in range(count):
+        _, templates, make_filters = rng.choices(QUERY_MIX, weights=weights)[0]
+        queries.append((rng.choice(templates), make_filters(rng)))
+    return queries
+
+
+class LocalSources:
+    """Stand-in sources charging a fixed latency and counting calls."""
+
+    def __init__(self, latencies_ms: dict):
+        self.latencies_s = {name: ms / 1000.0 for name, ms in latencies_ms.items()}
+        self.calls = {name: 0 for name in latencies_ms}
+        self._lock = threading.Lock()
+
+    def query_fn(self, name: str):
+        def query(query, filters, top_k, timeout):
+            with self._lock:
+                self.calls[name] += 1
+            time.sleep(self.latencies_s[name])
+            return {"status": "success", "results": [{
+                "chunk_id": f"{name}_{abs(hash(query)) % 1000}",
+                "text": f"{name}: {query}",
+                "score": 0.8,
+                "content_sha256": f"{name}_{query}",
+                "source": name
+            }]}
+        return query
+
+
+def run_mode(mode: str, queries: list, latencies_ms: dict) -> dict:
+    sources = LocalSources(latencies_ms)
+    rag_values = {
+        "timeouts.search_ms": 5000,
+        "experiments.default_parameters.fusion.algorithm": "rrf",
+        "experiments.default_parameters.fusion.rrf_k": 60,
+        "routing": {"mode": mode, "logging": {"enabled": False}},
+    }
+    timings = []
+    routing.reset_routing_stats()
+    retrieval_cache.configure_cache({"enabled": False})
+
+    with patch.object(rag_config, "is_sink_enabled", return_value=True), \
+            patch.object(rag_config, "get_retrieval_config", return_value={"top_k": 20, "timeout_ms": 5000, "weights": {}}), \
+            patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: rag_values.get(key, default)), \
+            patch.object(hybrid_retrieve, "_query_zep", sources.query_fn("zep")), \
+            patch.object(hybrid_retrieve, "_query_opensearch", sources.query_fn("opensearch")), \
+            patch.object(hybrid_retrieve, "_query_bigquery", sources.query_fn("bigquery")), \
+            patch("rag.tracing.emit_retrieval_event"):
+        for query, filters in queries:
+            start = time.perf_counter()
+            hybrid_retrieve.search(query, filters=filters, limit=10)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    retrieval_cache.reset_cache()
+    timings.sort()
+    return {
+        "mode": mode,
+        "source_calls": sum(sources.calls.values()),
+        "calls_per_source": sources.calls,
+        "mean_ms": round(statistics.mean(timings), 1),
+        "p50_ms": round(timings[len(timings) // 2], 1),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 1),
+        "routing": routing.get_routing_stats()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark adaptive query routing vs querying every source")
+    parser.add_argument("--queries", type=int, default=200, help="Queries in the synthetic mix (default: 200)")
+    parser.add_argument("--zep-ms", type=float, default=120, help="Zep stand-in latency (default: 120)")
+    parser.add_argument("--opensearch-ms", type=float, default=40, help="OpenSearch stand-in latency (default: 40)")
+    parser.add_argument("--bigquery-ms", type=float, default=250, help="BigQuery stand-in latency (default: 250)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    latencies_ms = {"zep": args.zep_ms, "opensearch": args.opensearch_ms, "bigquery": args.bigquery_ms}
+    queries = _make_queries(args.queries)
+
+    always_on = run_mode("always_on", queries, latencies_ms)
+    adaptive = run_mode("adaptive", queries, latencies_ms)
+    report = {
+        "queries": len(queries),
+        "source_latencies_ms": latencies_ms,
+        "always_on": always_on,
+        "adaptive": adaptive,
+        "source_calls_saved": always_on["source_calls"] - adaptive["source_calls"],
+        "saved_ratio": round(1 - adaptive["source_calls"] / always_on["source_calls"], 3),
+        "mean_latency_change_pct": round((adaptive["mean_ms"] / always_on["mean_ms"] - 1) * 100, 1)
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print("=" * 60)
+    print("📊 Adaptive Query Routing Benchmark")
+    print("=" * 60)
+    print(f"Queries: {report['queries']} | source latency (ms): {latencies_ms}")
+    for result in (always_on, adaptive):
+        print(f"\n{result['mode']}:")
+        print(f"  Source calls: {result['source_calls']} {result['calls_per_source']}")
+        print(f"  Latency:      mean {result['mean_ms']} ms, p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms")
+    print(f"\nRouting strategies: {adaptive['routing']['by_strategy']}")
+    print(f"Source calls saved: {report['source_calls_saved']} ({report['saved_ratio'] * 100:.1f}%)")
+    print(f"Mean latency change: {report['mean_latency_change_pct']}%")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
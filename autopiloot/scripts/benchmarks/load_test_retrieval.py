@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Load test and latency regression check for core.rag.hybrid_retrieve.search.
+
+Drives search() from a pool of worker threads against in-process stand-ins
+for Zep, OpenSearch and BigQuery whose latency is drawn from a configurable
+distribution per source. Three scenarios are run:
+
+- single_source: only OpenSearch enabled, rag.cache off
+- multi_source: all three sources (routing always_on), rag.cache off
+- cached: all three sources with the memory rag.cache on and a query mix
+  where --repeat-ratio of requests reuse an earlier query
+
+Each scenario reports p50/p95/p99 latency, QPS, errors and cache hit ratio.
+The run fails (exit code 1) when a p95 exceeds rag.mlops.ci_tests.benchmarks
+(single_source_latency_ms, multi_source_latency_ms, cache_hit_latency_ms for
+cache hits) or the cache hit ratio is below min_cache_hit_ratio, and, given
+--baseline, when p95/p99 latency rises or QPS falls by more than
+rag.mlops.performance_tracking.baseline.degradation_threshold percent.
+
+Latency specs (milliseconds): fixed:MS, uniform:LOW:HIGH, normal:MEAN:STD,
+lognormal:MEDIAN:SIGMA, exp:MEAN
+
+Usage:
+    python scripts/benchmarks/load_test_retrieval.py
+    python scripts/benchmarks/load_test_retrieval.py --requests 2000 --concurrency 32 --zep lognormal:150:0.5
+    python scripts/benchmarks/load_test_retrieval.py --output perf/latest.json --baseline perf/baseline.json
+    python scripts/benchmarks/load_test_retrieval.py --json
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import rag.config as rag_config
+import rag.cache as retrieval_cache
+from rag import hybrid_retrieve
+
+
+SOURCES = ("zep", "opensearch", "bigquery")
+SCENARIOS = ("single_source", "multi_source", "cached")
+DEFAULT_LATENCIES = {"zep": "lognormal:120:0.35", "opensearch": "lognormal:40:0.3", "bigquery": "lognormal:250:0.4"}
+DEFAULT_BENCHMARKS = {
+    "single_source_latency_ms": 500,
+    "multi_source_latency_ms": 2000,
+    "cache_hit_latency_ms": 100,
+    "min_cache_hit_ratio": 40
+}
+
+QUERY_TOPICS = (
+    "pricing", "hiring closers", "churn", "customer acquisition cost", "offer stacking",
+    "payback period", "sales team", "lifetime value", "lead generation", "founder burnout"
+)
+QUERY_TEMPLATES = (
+    "How to improve {}", "Why does {} matter", "Framework for {}", "{} mistakes", "What is the best approach to {}"
+)
+
+
+def parse_latency_spec(spec: str) -> Callable[[random.Random], float]:
+    """
+    Parse a latency distribution spec into a sampler returning milliseconds.
+
+    Args:
+        spec: "fixed:MS", "uniform:LOW:HIGH", "normal:MEAN:STD",
+            "lognormal:MEDIAN:SIGMA" or "exp:MEAN"
+
+    Returns:
+        Function taking a random.Random and returning a latency >= 0 in ms
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    kind, _, params = spec.partition(":")
+    try:
+        values = [float(value) for value in params.split(":")] if params else []
+    except ValueError:
+        raise ValueError(f"Invalid latency spec: {spec}")
+
+    arity = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exp": 1}
+    if kind not in arity or len(values) != arity[kind] or any(value < 0 for value in values):
+        raise ValueError(f"Invalid latency spec: {spec} (expected one of {', '.join(arity)} with non-negative values)")
+
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        low, high = sorted(values)
+        return lambda rng: rng.uniform(low, high)
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        mu = math.log(values[0]) if values[0] > 0 else 0.0
+        return lambda rng: rng.lognormvariate(mu, values[1]) if values[0] > 0 else 0.0
+    return lambda rng: rng.expovariate(1.0 / values[0]) if values[0] > 0 else 0.0
+
+
+class LocalSources:
+    """Stand-in sources sleeping for a sampled latency, optionally failing a fraction of calls."""
+
+    def __init__(self, latency_specs: Dict[str, str], error_rate: float = 0.0, seed: int = 11):
+        self.samplers = {name: parse_latency_spec(spec) for name, spec in latency_specs.items()}
+        self.error_rate = error_rate
+        self.calls = {name: 0 for name in latency_specs}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def query_fn(self, name: str):
+        def query(query, filters, top_k, timeout):
+            with self._lock:
+                self.calls[name] += 1
+                latency_s = self.samplers[name](self._rng) / 1000.0
+                failed = self._rng.random() < self.error_rate
+            time.sleep(min(latency_s, timeout))
+            if failed:
+                return {"status": "error", "error": f"{name} unavailable", "results": []}
+            return {"status": "success", "results": [{
+                "chunk_id": f"{name}_{query}_{rank}",
+                "video_id": f"vid{rank}",
+                "text": f"{name} {rank}: {query}",
+                "score": 1.0 - rank / (top_k + 1),
+                "content_sha256": f"{name}_{query}_{rank}",
+                "source": name
+            } for rank in range(min(top_k, 10))]}
+        return query
+
+
+def make_workload(count: int, repeat_ratio: float, seed: int = 7) -> List[str]:
+    """Build `count` queries where about `repeat_ratio` of them reuse an earlier query."""
+    rng = random.Random(seed)
+    workload = []
+    for i in range(count):
+        if workload and rng.random() < repeat_ratio:
+            workload.append(rng.choice(workload))
+        else:
+            workload.append(f"{rng.choice(QUERY_TEMPLATES).format(rng.choice(QUERY_TOPICS))} #{i}")
+    return workload
+
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return round(sorted_values[index], 2)
+
+
+def run_scenario(
+    scenario: str,
+    workload: List[str],
+    latency_specs: Dict[str, str],
+    concurrency: int,
+    limit: int = 10,
+    error_rate: float = 0.0,
+    search_budget_ms: int = 5000
+) -> dict:
+    """
+    Run one scenario's workload through search() and summarize latencies.
+
+    Args:
+        scenario: "single_source", "multi_source" or "cached"
+        workload: Queries to issue (in submission order)
+        latency_specs: Latency spec per source
+        concurrency: Worker threads issuing searches
+        limit: Results requested per search
+        error_rate: Fraction of source calls that fail
+        search_budget_ms: rag.timeouts.search_ms for the run
+
+    Returns:
+        Dictionary with requests, errors, qps, p50/p95/p99/mean/max latency,
+        cache hit counts and latencies, and source call counts
+    """
+    enabled = {"opensearch"} if scenario == "single_source" else set(SOURCES)
+    sources = LocalSources(latency_specs, error_rate)
+    rag_values = {
+        "timeouts.search_ms": search_budget_ms,
+        "experiments.default_parameters.fusion.algorithm": "rrf",
+        "experiments.default_parameters.fusion.rrf_k": 60,
+        "routing": {"mode": "always_on", "logging": {"enabled": False}},
+    }
+
+    if scenario == "cached":
+        cache_config = dict(rag_config.get_cache_config() or {}, enabled=True, backend="memory")
+        cache_config["logging"] = {"enabled": False}
+        retrieval_cache.configure_cache(cache_config)
+    else:
+        retrieval_cache.configure_cache({"enabled": False})
+
+    latencies, hit_latencies = [], []
+    errors = 0
+    lock = threading.Lock()
+
+    def issue(query: str) -> None:
+        nonlocal errors
+        start = time.perf_counter()
+        response = hybrid_retrieve.search(query, limit=limit)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed_ms)
+            if response.get("cache_hit"):
+                hit_latencies.append(elapsed_ms)
+            if response.get("error") or not response.get("results"):
+                errors += 1
+
+    try:
+        with patch.object(rag_config, "is_sink_enabled", side_effect=lambda name: name in enabled), \
+                patch.object(rag_config, "get_retrieval_config",
+                             return_value={"top_k": 20, "timeout_ms": search_budget_ms, "weights": {}}), \
+                patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: rag_values.get(key, default)), \
+                patch.object(hybrid_retrieve, "_query_zep", sources.query_fn("zep")), \
+                patch.object(hybrid_retrieve, "_query_opensearch", sources.query_fn("opensearch")), \
+                patch.object(hybrid_retrieve, "_query_bigquery", sources.query_fn("bigquery")), \
+                patch("rag.tracing.emit_retrieval_event"):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+                list(pool.map(issue, workload))
+            wall_s = time.perf_counter() - started
+    finally:
+        retrieval_cache.reset_cache()
+
+    latencies.sort()
+    hit_latencies.sort()
+    return {
+        "scenario": scenario,
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "wall_s": round(wall_s, 3),
+        "qps": round(len(latencies) / wall_s, 2) if wall_s else None,
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else None,
+        "p50_ms": _percentile(latencies, 50),
+        "p95_ms": _percentile(latencies, 95),
+        "p99_ms": _percentile(latencies, 99),
+        "max_ms": round(latencies[-1], 2) if latencies else None,
+        "cache_hits": len(hit_latencies),
+        "cache_hit_ratio_percent": round(len(hit_latencies) / len(latencies) * 100, 2) if latencies else 0.0,
+        "cache_hit_p95_ms": _percentile(hit_latencies, 95),
+        "source_calls": sources.calls
+    }
+
+
+def check_thresholds(scenarios: Dict[str, dict], benchmarks: dict) -> List[dict]:
+    """
+    Compare scenario results with rag.mlops.ci_tests.benchmarks.
+
+    Returns:
+        One check per threshold: name, scenario, metric, value, limit, passed
+    """
+    limits = dict(DEFAULT_BENCHMARKS, **(benchmarks or {}))
+    wanted = [
+        ("single_source_latency_ms", "single_source", "p95_ms", "max"),
+        ("multi_source_latency_ms", "multi_source", "p95_ms", "max"),
+        ("cache_hit_latency_ms", "cached", "cache_hit_p95_ms", "max"),
+        ("min_cache_hit_ratio", "cached", "cache_hit_ratio_percent", "min"),
+    ]
+    checks = []
+    for name, scenario, metric, kind in wanted:
+        if scenario not in scenarios:
+            continue
+        value = scenarios[scenario].get(metric)
+        limit = limits[name]
+        if value is None:
+            passed = False  # No requests (or no cache hits) to measure
+        else:
+            passed = value <= limit if kind == "max" else value >= limit
+        checks.append({"name": name, "scenario": scenario, "metric": metric, "value": value, "limit": limit, "passed": passed})
+    return checks
+
+
+def compare_to_baseline(scenarios: Dict[str, dict], baseline: dict, threshold_pct: float) -> List[dict]:
+    """
+    Compare scenario results with a previous report.
+
+    Latency metrics (p95_ms, p99_ms) regress when they rise, and qps when it
+    falls, by more than threshold_pct percent of the baseline value.
+
+    Args:
+        scenarios: Current scenario results
+        baseline: Report written by an earlier run (--output)
+        threshold_pct: rag.mlops.performance_tracking.baseline.degradation_threshold
+
+    Returns:
+        One comparison per metric: scenario, metric, baseline, current,
+        change_pct and regressed
+    """
+    comparisons = []
+    for scenario, current in scenarios.items():
+        previous = (baseline.get("scenarios") or {}).get(scenario)
+        if not previous:
+            continue
+        for metric, higher_is_worse in (("p95_ms", True), ("p99_ms", True), ("qps", False)):
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change_pct = round((new - old) / old * 100, 2)
+            degradation = change_pct if higher_is_worse else -change_pct
+            comparisons.append({
+                "scenario": scenario,
+                "metric": metric,
+                "baseline": old,
+                "current": new,
+                "change_pct": change_pct,
+                "regressed": degradation > threshold_pct
+            })
+    return comparisons
+
+
+def _load_settings() -> dict:
+    from rag.config import get_rag_value
+    benchmarks = get_rag_value("mlops.ci_tests.benchmarks", {}) or {}
+    baseline = get_rag_value("mlops.performance_tracking.baseline", {}) or {}
+    integration = get_rag_value("mlops.ci_tests.integration", {}) or {}
+    return {"benchmarks": benchmarks, "baseline": baseline, "integration": integration}
+
+
+def run(
+    requests: int,
+    concurrency: int,
+    latency_specs: Dict[str, str],
+    repeat_ratio: float = 0.6,
+    error_rate: float = 0.0,
+    scenarios: tuple = SCENARIOS,
+    baseline: Optional[dict] = None,
+    settings: Optional[dict] = None
+) -> dict:
+    """
+    Run the load test and evaluate thresholds and baseline degradation.
+
+    Returns:
+        Report dictionary (JSON-serializable) with scenarios, checks,
+        baseline_comparisons and passed
+    """
+    settings = settings if settings is not None else _load_settings()
+    baseline_config = settings.get("baseline") or {}
+
+    results = {}
+    for scenario in scenarios:
+        workload = make_workload(requests, repeat_ratio if scenario == "cached" else 0.0)
+        results[scenario] = run_scenario(scenario, workload, latency_specs, concurrency, error_rate=error_rate)
+
+    checks = check_thresholds(results, settings.get("benchmarks"))
+    comparisons = []
+    if baseline and baseline_config.get("enabled", True) is True:
+        threshold = float(baseline_config.get("degradation_threshold", 10.0))
+        comparisons = compare_to_baseline(results, baseline, threshold)
+
+    fail_on_degradation = (settings.get("integration") or {}).get("fail_on_performance_degradation", True) is True
+    passed = all(check["passed"] for check in checks) and not (
+        fail_on_degradation and any(comparison["regressed"] for comparison in comparisons)
+    )
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "requests": requests,
+        "concurrency": concurrency,
+        "repeat_ratio": repeat_ratio,
+        "error_rate": error_rate,
+        "source_latencies": latency_specs,
+        "scenarios": results,
+        "checks": checks,
+        "baseline_comparisons": comparisons,
+        "degradation_threshold_pct": baseline_config.get("degradation_threshold", 10.0),
+        "passed": passed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test hybrid retrieval and check latency regressions")
+    parser.add_argument("--requests", type=int, default=500, help="Searches per scenario (default: 500)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent searches (default: 16)")
+    for name in SOURCES:
+        parser.add_argument(f"--{name}", default=DEFAULT_LATENCIES[name],
+                            help=f"{name} latency spec in ms (default: {DEFAULT_LATENCIES[name]})")
+    parser.add_argument("--repeat-ratio", type=float, default=0.6,
+                        help="Fraction of cached-scenario requests repeating an earlier query (default: 0.6)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of source calls that fail (default: 0.0)")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS), help="Scenarios to run")
+    parser.add_argument("--baseline", help="Report JSON from an earlier run to compare against")
+    parser.add_argument("--output", help="Write the report JSON to this path")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    latency_specs = {name: getattr(args, name) for name in SOURCES}
+    report = run(args.requests, args.concurrency, latency_specs, args.repeat_ratio, args.error_rate,
+                 tuple(args.scenarios), baseline)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        sys.exit(0 if report["passed"] else 1)
+
+    print("=" * 60)
+    print("📊 Hybrid Retrieval Load Test")
+    print("=" * 60)
+    print(f"Requests/scenario: {report['requests']} | concurrency: {report['concurrency']}")
+    print(f"Source latency: {latency_specs}")
+    for scenario, result in report["scenarios"].items():
+        print(f"\n{scenario}:")
+        print(f"  Latency: p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms")
+        print(f"  QPS: {result['qps']} | errors: {result['errors']} | "
+              f"cache hits: {result['cache_hit_ratio_percent']}% (p95 {result['cache_hit_p95_ms']} ms)")
+    print("\nThresholds:")
+    for check in report["checks"]:
+        status = "✅" if check["passed"] else "❌"
+        print(f"  {status} {check['name']}: {check['value']} (limit {check['limit']})")
+    if report["baseline_comparisons"]:
+        print(f"\nBaseline (degradation threshold {report['degradation_threshold_pct']}%):")
+        for comparison in report["baseline_comparisons"]:
+            status = "❌" if comparison["regressed"] else "✅"
+            print(f"  {status} {comparison['scenario']} {comparison['metric']}: "
+                  f"{comparison['baseline']} → {comparison['current']} ({comparison['change_pct']:+}%)")
+    print("\n" + ("✅ PASSED" if report["passed"] else "❌ FAILED"))
+    print("=" * 60)
+
+    sys.exit(0 if report["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
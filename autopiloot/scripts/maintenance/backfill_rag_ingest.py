@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Backfill transcripts into the Hybrid RAG sinks (OpenSearch, BigQuery, Zep).
+
+Reads ingest payloads (one JSON object per line, same shape as
+core.rag.ingest_transcript.ingest) and drives ingest_many() over them, so
+chunking runs in a process pool and sink writes are shared across videos.
+
+Features:
+- Resumable: completed video IDs are recorded in a progress file after every
+  slice; re-running skips them (failed videos are retried)
+- Dry-run mode to count pending videos without writing
+- Throughput knobs: --max-workers, --videos-per-batch, --slice-size
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+
+class RagBackfill:
+    """Resumable bulk ingest of transcripts through ingest_many()."""
+
+    def __init__(
+        self,
+        input_path: str,
+        progress_path: str,
+        slice_size: int = 200,
+        max_workers: int = None,
+        videos_per_batch: int = None,
+        dry_run: bool = False
+    ):
+        """
+        Initialize backfill.
+
+        Args:
+            input_path: JSONL file of ingest payloads
+            progress_path: JSON file recording completed/failed video IDs
+            slice_size: Videos handed to one ingest_many() call (progress is
+                saved after each slice)
+            max_workers: Chunking processes (default: rag.ingest.batch.max_workers)
+            videos_per_batch: Videos per shared sink write (default: rag.ingest.batch.videos_per_batch)
+            dry_run: If True, only count pending videos
+        """
+        self.input_path = input_path
+        self.progress_path = progress_path
+        self.slice_size = max(1, slice_size)
+        self.max_workers = max_workers
+        self.videos_per_batch = videos_per_batch
+        self.dry_run = dry_run
+        self.progress = self.load_progress()
+        self.stats = {
+            "pending": 0,
+            "ingested": 0,
+            "failed": 0,
+            "skipped_completed": 0,
+            "chunks": 0,
+            "start_time": datetime.utcnow().isoformat()
+        }
+
+    def load_progress(self) -> Dict[str, Any]:
+        """Load the progress file, or start a fresh one."""
+        if os.path.exists(self.progress_path):
+            with open(self.progress_path, "r", encoding="utf-8") as f:
+                progress = json.load(f)
+            progress.setdefault("completed", [])
+            progress.setdefault("failed", {})
+            return progress
+        return {"input": self.input_path, "completed": [], "failed": {}}
+
+    def save_progress(self) -> None:
+        """Write the progress file atomically so an interrupted run can resume."""
+        self.progress["updated_at"] = datetime.utcnow().isoformat()
+        tmp_path = f"{self.progress_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.progress, f, indent=2)
+        os.replace(tmp_path, self.progress_path)
+
+    def iter_pending(self) -> Iterator[dict]:
+        """Yield payloads whose video_id is not yet completed."""
+        completed = set(self.progress["completed"])
+        with open(self.input_path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    payload = json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"   ⚠️  Skipping line {line_number}: invalid JSON ({e})")
+                    continue
+                if payload.get("video_id") in completed:
+                    self.stats["skipped_completed"] += 1
+                    continue
+                yield payload
+
+    def ingest_slice(self, payloads: List[dict]) -> None:
+        """Ingest one slice and record per-video outcomes."""
+        from rag.ingest_transcript import ingest_many
+
+        result = ingest_many(payloads, max_workers=self.max_workers, videos_per_batch=self.videos_per_batch)
+
+        for video in result["videos"]:
+            video_id = video.get("video_id")
+            if video["status"] == "success":
+                self.progress["completed"].append(video_id)
+                self.progress["failed"].pop(video_id, None)
+                self.stats["ingested"] += 1
+            else:
+                self.progress["failed"][video_id or "unknown"] = video.get("message")
+                self.stats["failed"] += 1
+
+        self.stats["chunks"] += result["chunk_count"]
+        print(f"   {result['succeeded_count']}/{result['video_count']} videos, {result['chunk_count']} chunks "
+              f"in {result['elapsed_sec']}s ({result['videos_per_sec']} videos/sec)")
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Execute backfill.
+
+        Returns:
+            Execution statistics
+        """
+        print("=" * 60)
+        print("🔄 RAG Transcript Backfill")
+        print("=" * 60)
+        print(f"Input:    {self.input_path}")
+        print(f"Progress: {self.progress_path} ({len(self.progress['completed'])} already completed)")
+
+        if self.dry_run:
+            print("\n⚠️  DRY RUN MODE - No changes will be made\n")
+            self.stats["pending"] = sum(1 for _ in self.iter_pending())
+            self.stats["end_time"] = datetime.utcnow().isoformat()
+            self.print_summary()
+            return self.stats
+
+        started = time.time()
+        slice_payloads: List[dict] = []
+        slice_number = 0
+
+        for payload in self.iter_pending():
+            self.stats["pending"] += 1
+            slice_payloads.append(payload)
+            if len(slice_payloads) >= self.slice_size:
+                slice_number += 1
+                print(f"\n📦 Slice {slice_number} ({len(slice_payloads)} videos)")
+                self.ingest_slice(slice_payloads)
+                self.save_progress()
+                slice_payloads = []
+
+        if slice_payloads:
+            slice_number += 1
+            print(f"\n📦 Slice {slice_number} ({len(slice_payloads)} videos)")
+            self.ingest_slice(slice_payloads)
+            self.save_progress()
+
+        elapsed = time.time() - started
+        self.stats["elapsed_sec"] = round(elapsed, 1)
+        self.stats["videos_per_sec"] = round(self.stats["pending"] / elapsed, 2) if elapsed > 0 else None
+        self.stats["end_time"] = datetime.utcnow().isoformat()
+        self.print_summary()
+
+        return self.stats
+
+    def print_summary(self):
+        """Print execution summary."""
+        print("\n" + "=" * 60)
+        print("📊 Backfill Summary")
+        print("=" * 60)
+        print(f"Pending videos:          {self.stats['pending']}")
+        print(f"Already completed:       {self.stats['skipped_completed']}")
+        print(f"Successfully ingested:   {self.stats['ingested']}")
+        print(f"Failed (will retry):     {self.stats['failed']}")
+        print(f"Chunks written:          {self.stats['chunks']}")
+        if "videos_per_sec" in self.stats:
+            print(f"Throughput:              {self.stats['videos_per_sec']} videos/sec")
+        print(f"Start time:              {self.stats['start_time']}")
+        print(f"End time:                {self.stats['end_time']}")
+
+        if self.dry_run:
+            print("\n⚠️  This was a DRY RUN - no changes were made")
+            print("   Run without --dry-run to execute changes")
+
+        print("=" * 60)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Backfill transcripts into the Hybrid RAG sinks",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Count pending videos
+  python backfill_rag_ingest.py --input transcripts.jsonl --dry-run
+
+  # Run (or resume) a backfill
+  python backfill_rag_ingest.py --input transcripts.jsonl
+
+  # More chunking processes and bigger shared sink writes
+  python backfill_rag_ingest.py --input transcripts.jsonl --max-workers 8 --videos-per-batch 50
+
+Input format (one JSON object per line):
+  {"video_id": "abc123", "transcript_text": "...", "channel_id": "UC123", "title": "..."}
+
+Resuming:
+  - Progress is saved after every slice to --progress-file
+  - Completed videos are skipped on the next run; failed videos are retried
+  - Use --restart to ignore existing progress
+        """
+    )
+
+    parser.add_argument("--input", required=True, help="JSONL file of ingest payloads")
+    parser.add_argument(
+        "--progress-file",
+        help="Progress file (default: <input>.progress.json)"
+    )
+    parser.add_argument(
+        "--slice-size",
+        type=int,
+        default=200,
+        help="Videos per ingest_many() call; progress is saved after each (default: 200)"
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        help="Chunking processes (default: rag.ingest.batch.max_workers)"
+    )
+    parser.add_argument(
+        "--videos-per-batch",
+        type=int,
+        help="Videos per shared sink write (default: rag.ingest.batch.videos_per_batch)"
+    )
+    parser.add_argument("--restart", action="store_true", help="Ignore existing progress and start over")
+    parser.add_argument("--dry-run", action="store_true", help="Count pending videos without writing")
+
+    args = parser.parse_args()
+
+    progress_path = args.progress_file or f"{args.input}.progress.json"
+    if args.restart and os.path.exists(progress_path) and not args.dry_run:
+        os.remove(progress_path)
+
+    backfill = RagBackfill(
+        input_path=args.input,
+        progress_path=progress_path,
+        slice_size=args.slice_size,
+        max_workers=args.max_workers,
+        videos_per_batch=args.videos_per_batch,
+        dry_run=args.dry_run
+    )
+
+    try:
+        stats = backfill.run()
+
+        # Exit with error if there were failures
+        if stats["failed"] > 0:
+            sys.exit(1)
+
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Backfill interrupted by user (progress saved up to the last completed slice)")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n\n❌ Fatal error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
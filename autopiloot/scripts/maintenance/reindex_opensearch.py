@@ -12,8 +12,9 @@ This script handles:
 Features:
 - Dry-run mode to preview changes
 - Batch processing with progress tracking
-- Configurable batch size and parallelism
-- Document transformation during reindex
+- Bulk writes through core.rag.opensearch_indexer.bulk_index (byte-budgeted
+  _bulk requests, per-item errors, retry of failed items only)
+- Refresh disabled on the target index while copying, restored afterwards
 - Validation and rollback capabilities
 """
 
@@ -23,10 +24,14 @@ import sys
 import os
 import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+# Index settings that can be copied to a new index (others are read-only)
+COPYABLE_INDEX_SETTINGS = ("number_of_shards", "number_of_replicas", "refresh_interval", "analysis")
 
 
 class OpenSearchReindexer:
@@ -36,29 +41,59 @@ class OpenSearchReindexer:
         self,
         dry_run: bool = False,
         batch_size: int = 1000,
-        parallel_shards: int = 1
+        parallel_shards: int = 1,
+        max_batch_bytes: Optional[int] = None,
+        disable_refresh: bool = True,
+        client: Any = None
     ):
         """
         Initialize OpenSearch reindexer.
 
         Args:
             dry_run: If True, preview changes without executing
-            batch_size: Number of documents per batch
+            batch_size: Number of documents per scroll batch
             parallel_shards: Number of parallel shard requests
+            max_batch_bytes: Byte budget per _bulk request (default: rag.opensearch.bulk.max_batch_bytes)
+            disable_refresh: Pause refresh on the target index while copying
+            client: OpenSearch client (default: shared client from OPENSEARCH_* env vars)
         """
         self.dry_run = dry_run
         self.batch_size = batch_size
         self.parallel_shards = parallel_shards
+        self.max_batch_bytes = max_batch_bytes
+        self.disable_refresh = disable_refresh
+        self._client = client
         self.stats = {
             "start_time": datetime.utcnow().isoformat(),
             "source_doc_count": 0,
             "target_doc_count": 0,
             "copied": 0,
             "failed": 0,
+            "retried": 0,
             "skipped": 0,
+            "docs_per_sec": None,
             "status": "unknown"
         }
 
+    @property
+    def client(self):
+        """Shared OpenSearch client, created from environment on first use."""
+        if self._client is None:
+            from config.env_loader import get_optional_env_var
+            from rag.clients import get_opensearch_client
+
+            host = get_optional_env_var("OPENSEARCH_HOST")
+            if not host:
+                raise RuntimeError("OPENSEARCH_HOST not set")
+
+            self._client = get_opensearch_client(
+                host,
+                api_key=get_optional_env_var("OPENSEARCH_API_KEY"),
+                username=get_optional_env_var("OPENSEARCH_USERNAME"),
+                password=get_optional_env_var("OPENSEARCH_PASSWORD")
+            )
+        return self._client
+
     def get_index_settings(self, index_name: str) -> Dict[str, Any]:
         """
         Get current index settings and mappings.
@@ -71,23 +106,17 @@ class OpenSearchReindexer:
         """
         print(f"\n⚙️  Retrieving settings for index: {index_name}")
 
-        # TODO: Implement actual OpenSearch API call
-        # For now, return mock settings
+        response = self.client.indices.get(index=index_name)
+        index_info = response.get(index_name) or next(iter(response.values()))
+        index_settings = index_info.get("settings", {}).get("index", {})
+
         settings = {
             "settings": {
-                "number_of_shards": 3,
-                "number_of_replicas": 1,
-                "refresh_interval": "1s"
+                key: index_settings[key]
+                for key in COPYABLE_INDEX_SETTINGS
+                if key in index_settings
             },
-            "mappings": {
-                "properties": {
-                    "video_id": {"type": "keyword"},
-                    "title": {"type": "text"},
-                    "content": {"type": "text"},
-                    "channel_id": {"type": "keyword"},
-                    "published_at": {"type": "date"}
-                }
-            }
+            "mappings": index_info.get("mappings", {})
         }
 
         print(f"   ✅ Retrieved settings for {index_name}")
@@ -116,14 +145,7 @@ class OpenSearchReindexer:
             return True
 
         try:
-            # TODO: Implement actual index creation
-            # For now, simulate success
-            # In production, this would:
-            # 1. Validate settings and mappings
-            # 2. Create index via OpenSearch API
-            # 3. Wait for index to be ready
-            # 4. Verify index creation
-
+            self.client.indices.create(index=target_index, body=settings)
             print(f"   ✅ Created target index: {target_index}")
             return True
 
@@ -141,9 +163,11 @@ class OpenSearchReindexer:
         Returns:
             Document count
         """
-        # TODO: Implement actual document count
-        # For now, return mock count
-        return 5000
+        try:
+            return self.client.count(index=index_name).get("count", 0)
+        except Exception as e:
+            print(f"   ⚠️  Could not count documents in {index_name}: {e}")
+            return 0
 
     def reindex_batch(
         self,
@@ -162,7 +186,7 @@ class OpenSearchReindexer:
         Returns:
             Batch statistics
         """
-        batch_stats = {"copied": 0, "failed": 0}
+        batch_stats = {"copied": 0, "failed": 0, "retried": 0}
 
         if self.dry_run:
             print(f"   [DRY RUN] Would reindex {len(batch)} documents")
@@ -170,16 +194,24 @@ class OpenSearchReindexer:
             return batch_stats
 
         try:
-            # TODO: Implement actual bulk reindex
-            # For now, simulate success
-            # In production, this would:
-            # 1. Transform documents if needed
-            # 2. Bulk index to target
-            # 3. Handle partial failures
-            # 4. Retry failed documents
-
-            batch_stats["copied"] = len(batch)
-            print(f"   ✅ Reindexed {len(batch)} documents")
+            from rag.opensearch_indexer import bulk_index
+
+            # Refresh is paused once for the whole run in run()
+            result = bulk_index(
+                self.client,
+                target_index,
+                [(hit["_id"], hit["_source"]) for hit in batch],
+                max_batch_bytes=self.max_batch_bytes,
+                disable_refresh=False
+            )
+
+            batch_stats["copied"] = result["indexed_count"]
+            batch_stats["failed"] = result["error_count"]
+            batch_stats["retried"] = result["retried_count"]
+            print(f"   ✅ Reindexed {result['indexed_count']}/{len(batch)} documents "
+                  f"({result['batches']} bulk requests, {result['docs_per_sec']} docs/sec)")
+            for error in result["errors"][:5]:
+                print(f"   ❌ {error['chunk_id']}: {error['status']} {error['error']}")
 
         except Exception as e:
             batch_stats["failed"] = len(batch)
@@ -191,7 +223,7 @@ class OpenSearchReindexer:
         self,
         source_index: str,
         scroll_size: int = 1000
-    ) -> List[List[Dict[str, Any]]]:
+    ) -> Iterator[List[Dict[str, Any]]]:
         """
         Scroll through all documents in source index.
 
@@ -199,44 +231,22 @@ class OpenSearchReindexer:
             source_index: Source index name
             scroll_size: Number of documents per scroll
 
-        Returns:
-            List of document batches
+        Yields:
+            Batches of hits ({"_id", "_source"}) of up to scroll_size documents
         """
+        from opensearchpy.helpers import scan
+
         print(f"\n📜 Scrolling documents from: {source_index}")
 
-        # TODO: Implement actual scroll API
-        # For now, return mock batches
-        # In production, this would:
-        # 1. Initialize scroll context
-        # 2. Fetch documents in batches
-        # 3. Maintain scroll context
-        # 4. Clear scroll when complete
-
-        # Mock 3 batches of documents
-        total_docs = self.count_documents(source_index)
-        num_batches = (total_docs + scroll_size - 1) // scroll_size
-
-        print(f"   ℹ️  Total documents: {total_docs}")
-        print(f"   ℹ️  Batches: {num_batches}")
-
-        # Return mock batches
-        batches = []
-        for i in range(num_batches):
-            batch_size = min(scroll_size, total_docs - (i * scroll_size))
-            batch = [
-                {
-                    "_id": f"doc_{j}",
-                    "_source": {
-                        "video_id": f"video_{j}",
-                        "title": f"Video {j}",
-                        "content": f"Content {j}"
-                    }
-                }
-                for j in range(i * scroll_size, i * scroll_size + batch_size)
-            ]
-            batches.append(batch)
-
-        return batches
+        batch = []
+        for hit in scan(self.client, index=source_index, query={"query": {"match_all": {}}}, size=scroll_size):
+            batch.append({"_id": hit["_id"], "_source": hit["_source"]})
+            if len(batch) >= scroll_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
 
     def validate_reindex(
         self,
@@ -260,13 +270,8 @@ class OpenSearchReindexer:
             return True
 
         try:
-            # TODO: Implement actual validation
-            # For now, simple count comparison
-            # In production, this would:
-            # 1. Compare document counts
-            # 2. Sample documents for data integrity
-            # 3. Verify mappings applied correctly
-            # 4. Check search functionality
+            # Make copied documents visible to count
+            self.client.indices.refresh(index=target_index)
 
             source_count = self.count_documents(source_index)
             target_count = self.count_documents(target_index)
@@ -309,14 +314,12 @@ class OpenSearchReindexer:
             return True
 
         try:
-            # TODO: Implement actual alias switch
-            # For now, simulate success
-            # In production, this would:
-            # 1. Add alias to new index
-            # 2. Remove alias from old index
-            # 3. Execute atomically
-            # 4. Verify alias points to new index
+            actions = [{"add": {"index": new_index, "alias": alias}}]
+            if self.client.indices.exists_alias(name=alias, index=old_index):
+                actions.insert(0, {"remove": {"index": old_index, "alias": alias}})
 
+            # Single request, so the switch is atomic
+            self.client.indices.update_aliases(body={"actions": actions})
             print(f"   ✅ Alias '{alias}' now points to {new_index}")
             return True
 
@@ -341,8 +344,7 @@ class OpenSearchReindexer:
             return True
 
         try:
-            # TODO: Implement actual index deletion
-            # For now, simulate success
+            self.client.indices.delete(index=index_name)
             print(f"   ✅ Deleted index: {index_name}")
             return True
 
@@ -401,16 +403,31 @@ class OpenSearchReindexer:
         # Step 4: Reindex documents in batches
         print(f"\n🔄 Reindexing documents (batch size: {self.batch_size})")
 
-        batches = self.scroll_documents(source_index, self.batch_size)
-        total_batches = len(batches)
+        total_batches = max(1, (self.stats["source_doc_count"] + self.batch_size - 1) // self.batch_size)
 
-        for i, batch in enumerate(batches):
-            batch_num = i + 1
-            print(f"\n📦 Processing batch {batch_num}/{total_batches} ({len(batch)} documents)")
+        previous_refresh = None
+        if self.disable_refresh and not self.dry_run:
+            from rag.opensearch_indexer import pause_refresh
+            previous_refresh = pause_refresh(self.client, target_index)
 
-            batch_stats = self.reindex_batch(source_index, target_index, batch)
-            self.stats["copied"] += batch_stats["copied"]
-            self.stats["failed"] += batch_stats["failed"]
+        copy_started = time.time()
+        try:
+            for i, batch in enumerate(self.scroll_documents(source_index, self.batch_size)):
+                batch_num = i + 1
+                print(f"\n📦 Processing batch {batch_num}/{total_batches} ({len(batch)} documents)")
+
+                batch_stats = self.reindex_batch(source_index, target_index, batch)
+                self.stats["copied"] += batch_stats["copied"]
+                self.stats["failed"] += batch_stats["failed"]
+                self.stats["retried"] += batch_stats.get("retried", 0)
+        finally:
+            if previous_refresh is not None:
+                from rag.opensearch_indexer import restore_refresh
+                restore_refresh(self.client, target_index, previous_refresh)
+
+        copy_elapsed = time.time() - copy_started
+        if copy_elapsed > 0:
+            self.stats["docs_per_sec"] = round(self.stats["copied"] / copy_elapsed, 1)
 
         # Step 5: Validate reindex
         validation_passed = self.validate_reindex(source_index, target_index)
@@ -452,6 +469,8 @@ class OpenSearchReindexer:
         print(f"Target documents: {self.stats['target_doc_count']}")
         print(f"Documents copied: {self.stats['copied']}")
         print(f"Documents failed: {self.stats['failed']}")
+        print(f"Documents retried: {self.stats['retried']}")
+        print(f"Throughput: {self.stats['docs_per_sec']} docs/sec")
         print(f"Start time: {self.stats['start_time']}")
         print(f"End time: {self.stats.get('end_time', 'N/A')}")
 
@@ -478,8 +497,8 @@ Examples:
   # Reindex with alias switch (zero downtime)
   python reindex_opensearch.py --source my_index --alias my_alias
 
-  # Reindex with custom batch size
-  python reindex_opensearch.py --source my_index --batch-size 500
+  # Reindex with custom batch size and 10 MB bulk requests
+  python reindex_opensearch.py --source my_index --batch-size 500 --max-batch-bytes 10485760
 
   # Reindex and delete source index after success
   python reindex_opensearch.py --source my_index --delete-source
@@ -530,6 +549,18 @@ Zero-Downtime Pattern:
         help="Number of parallel shard requests (default: 1)"
     )
 
+    parser.add_argument(
+        "--max-batch-bytes",
+        type=int,
+        help="Byte budget per _bulk request (default: rag.opensearch.bulk.max_batch_bytes)"
+    )
+
+    parser.add_argument(
+        "--keep-refresh",
+        action="store_true",
+        help="Keep refresh enabled on the target index while copying"
+    )
+
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -556,7 +587,9 @@ Zero-Downtime Pattern:
     reindexer = OpenSearchReindexer(
         dry_run=args.dry_run,
         batch_size=args.batch_size,
-        parallel_shards=args.parallel_shards
+        parallel_shards=args.parallel_shards,
+        max_batch_bytes=args.max_batch_bytes,
+        disable_refresh=not args.keep_refresh
     )
 
     try:
@@ -177,6 +177,7 @@ class ClusterTopicsEmbeddings(BaseTool):
                     "total_items_processed": len(valid_items),
                     "clustering_method": self.clustering_method,
                     "embedding_model": self.embedding_model,
+                    "embedding_cache": getattr(self, "_embedding_cache", None),
                     "num_clusters": len(clusters_with_topics),
                     "processed_at": datetime.now(timezone.utc).isoformat()
                 }
@@ -213,38 +214,48 @@ class ClusterTopicsEmbeddings(BaseTool):
         return None
 
     def _generate_embeddings(self, texts: List[str], embedding_model: str = None) -> Optional[np.ndarray]:
-        """Generate embeddings using OpenAI API."""
+        """
+        Generate embeddings using OpenAI API.
+
+        Texts already embedded with the same model are served from the
+        rag.cache.embeddings store; the rest are embedded in one batched
+        request per max_batch_size texts. Mock embeddings are used only when
+        OpenAI is not available (library or API key missing); if the API
+        rejects a batch, no embeddings are returned.
+        """
         try:
             # Try to import and use OpenAI
             import openai
+            from rag.embedding_cache import get_embeddings
 
             # Load API key
             api_key = get_required_env_var("OPENAI_API_KEY")
             client = openai.OpenAI(api_key=api_key)
+        except Exception as e:
+            print(f"OpenAI embedding unavailable: {e}, using mock embeddings")
+            return self._generate_mock_embeddings(texts)
 
-            # Use provided embedding model or fallback to instance embedding_model
-            model = embedding_model or self.embedding_model
-
-            # Generate embeddings in batches to handle API limits
-            batch_size = 100
-            all_embeddings = []
-
-            for i in range(0, len(texts), batch_size):
-                batch_texts = texts[i:i + batch_size]
-
-                response = client.embeddings.create(
-                    model=model,
-                    input=batch_texts
-                )
-
-                batch_embeddings = [embedding.embedding for embedding in response.data]
-                all_embeddings.extend(batch_embeddings)
+        # Use provided embedding model or fallback to instance embedding_model
+        model = embedding_model or self.embedding_model
 
-            return np.array(all_embeddings)
+        def embed_batch(batch_texts: List[str]) -> List[List[float]]:
+            response = client.embeddings.create(
+                model=model,
+                input=batch_texts
+            )
+            return [embedding.embedding for embedding in response.data]
 
+        try:
+            cached = get_embeddings(texts, model, embed_batch)
         except Exception as e:
-            print(f"OpenAI embedding failed: {e}, using mock embeddings")
-            return self._generate_mock_embeddings(texts)
+            # The API rejected a batch or answered with the wrong number of vectors:
+            # clustering mock vectors would look like a result, so report the failure
+            print(f"OpenAI embedding failed: {e}")
+            return None
+        self._embedding_cache = {
+            key: cached[key] for key in ("hits", "misses", "api_calls", "hit_ratio")
+        }
+        return cached["embeddings"]
 
     def _generate_mock_embeddings(self, texts: List[str]) -> np.ndarray:
         """Generate mock embeddings based on text characteristics."""
@@ -18,6 +18,8 @@ from pydantic import Field
 
 # Add parent directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+# Core directory too, so rag.* modules load under one name (shared refs buffer)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
 
 from agency_swarm.tools import BaseTool
 from core.rag.config import get_rag_flag
@@ -162,7 +164,7 @@ class RagIndexStrategy(BaseTool):
             # Optional: Write Firestore reference for audit/discovery (best-effort, never blocks)
             if result.get("status") == "success":
                 try:
-                    from core.rag.refs import upsert_ref
+                    from rag.refs import flush_refs, upsert_ref
 
                     # Build reference document
                     ref = {
@@ -195,6 +197,8 @@ class RagIndexStrategy(BaseTool):
 
                     # Write reference (best-effort, never raises)
                     upsert_ref(ref)
+                    # Commit now rather than waiting for the buffer's size/interval/exit flush
+                    flush_refs(reason="ingest")
                 except Exception:
                     # Silently ignore ref write failures (best-effort only)
                     pass
@@ -55,7 +55,6 @@ class TestHybridRAGCI(unittest.TestCase):
 
         # Import tools
         self.hybrid_retrieval = import_tool('hybrid_retrieval')
-        self.cache_tool = import_tool('cache_hybrid_retrieval')
 
     # ========================================================================
     # FUNCTIONAL TESTS
@@ -139,51 +138,6 @@ class TestHybridRAGCI(unittest.TestCase):
         self.assertGreater(len(data["results"]), 0, "Should return results from working sources")
         self.assertIn("zep", data.get("errors", {}), "Should log failed source")
 
-    def test_ci_cache_consistency(self):
-        """
-        [CI] Test cache maintains consistency across requests.
-
-        Ensures caching:
-        - Returns same results for same query
-        - Respects TTL expiration
-        - Handles cache misses correctly
-        """
-        CacheTool = self.cache_tool.CacheHybridRetrieval
-
-        # Clear cache
-        CacheTool._memory_cache = {}
-        CacheTool._cache_stats = {"hits": 0, "misses": 0, "sets": 0, "deletes": 0}
-
-        query = "test query"
-        results = [{"doc_id": "doc1", "score": 0.9}]
-
-        # Set cache
-        tool_set = CacheTool(
-            backend="memory",
-            operation="set",
-            query=query,
-            top_k=10,
-            results=json.dumps(results),
-            ttl_seconds=3600
-        )
-        set_result = tool_set.run()
-        set_data = json.loads(set_result)
-        self.assertEqual(set_data["status"], "success")
-
-        # Get from cache (should hit)
-        tool_get = CacheTool(
-            backend="memory",
-            operation="get",
-            query=query,
-            top_k=10
-        )
-        get_result = tool_get.run()
-        get_data = json.loads(get_result)
-
-        # Cache consistency assertions
-        self.assertTrue(get_data["hit"], "Should be cache hit")
-        self.assertEqual(get_data["results"], results, "Should return same results")
-
     # ========================================================================
     # PERFORMANCE TESTS
     # ========================================================================
@@ -221,52 +175,6 @@ class TestHybridRAGCI(unittest.TestCase):
         data = json.loads(result)
         self.assertEqual(data["status"], "success")
 
-    def test_ci_cache_performance_improvement(self):
-        """
-        [CI] Test cache provides expected performance improvement.
-
-        Cache should provide:
-        - 80-95% latency reduction on cache hits
-        - >40% hit ratio on typical workload
-        """
-        CacheTool = self.cache_tool.CacheHybridRetrieval
-
-        # Clear cache
-        CacheTool._memory_cache = {}
-        CacheTool._cache_stats = {"hits": 0, "misses": 0, "sets": 0, "deletes": 0}
-
-        query = "test query"
-        results = [{"doc_id": "doc1", "score": 0.9}]
-
-        # Populate cache
-        tool_set = CacheTool(
-            backend="memory",
-            operation="set",
-            query=query,
-            top_k=10,
-            results=json.dumps(results),
-            ttl_seconds=3600
-        )
-        tool_set.run()
-
-        # Measure cache hit latency
-        tool_get = CacheTool(
-            backend="memory",
-            operation="get",
-            query=query,
-            top_k=10
-        )
-
-        start_time = time.time()
-        result = tool_get.run()
-        cache_latency_ms = (time.time() - start_time) * 1000
-
-        # Cache performance assertions
-        self.assertLess(cache_latency_ms, 100, "Cache hit should be <100ms")
-
-        data = json.loads(result)
-        self.assertTrue(data["hit"])
-
     # ========================================================================
     # RELIABILITY TESTS
     # ========================================================================
@@ -487,6 +395,76 @@ class TestHybridRAGCI(unittest.TestCase):
         self.assertIn(data["status"], ["success", "error"], "Status should be valid")
 
 
+class TestHybridRAGCacheCI(unittest.TestCase):
+    """CI tests for the rag.cache retrieval cache (core/rag/cache.py)."""
+
+    def setUp(self):
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+        import rag.cache as retrieval_cache
+        self.cache = retrieval_cache
+        self.cache.configure_cache({
+            "enabled": True,
+            "backend": "memory",
+            "ttl": {"default_seconds": 3600},
+            "bypass": {"enabled": True, "small_top_k_threshold": 5},
+            "logging": {"enabled": False}
+        })
+
+    def tearDown(self):
+        self.cache.reset_cache()
+
+    def test_ci_cache_consistency(self):
+        """
+        [CI] Test cache maintains consistency across requests.
+
+        Ensures caching:
+        - Returns same results for same query
+        - Respects TTL expiration
+        - Handles cache misses correctly
+        """
+        query = "test query"
+        response = {"status": "success", "results": [{"doc_id": "doc1", "score": 0.9}]}
+
+        # Miss before set
+        self.assertIsNone(self.cache.get_cached("search", query, None, 10))
+
+        # Set cache
+        self.assertTrue(self.cache.set_cached("search", query, None, 10, response, ttl_seconds=3600))
+
+        # Get from cache (should hit, also for an equivalent query)
+        self.assertEqual(self.cache.get_cached("search", query, None, 10), response)
+        self.assertEqual(self.cache.get_cached("search", "  TEST   query ", None, 10), response)
+
+        # Expired entries are misses
+        with patch.object(self.cache.time, "time", return_value=time.time() + 3601):
+            self.assertIsNone(self.cache.get_cached("search", query, None, 10))
+
+        stats = self.cache.get_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 2))
+
+    def test_ci_cache_performance_improvement(self):
+        """
+        [CI] Test cache provides expected performance improvement.
+
+        Cache should provide:
+        - 80-95% latency reduction on cache hits
+        - >40% hit ratio on typical workload
+        """
+        query = "test query"
+        response = {"status": "success", "results": [{"doc_id": "doc1", "score": 0.9}]}
+
+        # Populate cache
+        self.cache.set_cached("search", query, None, 10, response)
+
+        # Typical workload: repeated queries
+        for _ in range(4):
+            self.assertIsNotNone(self.cache.get_cached("search", query, None, 10))
+        self.cache.get_cached("search", "another query", None, 10)
+
+        # Cache performance assertions
+        self.assertGreater(self.cache.get_cache_stats()["hit_ratio_percent"], 40)
+
+
 if __name__ == '__main__':
     # Run with verbose output for CI
     unittest.main(verbosity=2)
@@ -0,0 +1,138 @@
+"""
+CI tests for the hybrid retrieval load test (scripts/benchmarks/load_test_retrieval.py).
+
+Runs small workloads against the local source stand-ins and checks the
+report, the rag.mlops.ci_tests.benchmarks thresholds and the baseline
+degradation comparison. Wall-clock latency targets depend on the machine, so
+they are only asserted when RAG_LOAD_BENCHMARKS=1; the default run checks the
+report against thresholds no runner misses.
+"""
+
+import importlib.util
+import json
+import os
+import random
+import unittest
+
+
+def _load_harness():
+    path = os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'benchmarks', 'load_test_retrieval.py')
+    spec = importlib.util.spec_from_file_location("load_test_retrieval", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+load_test = _load_harness()
+
+FAST_LATENCIES = {"zep": "fixed:3", "opensearch": "uniform:1:3", "bigquery": "fixed:5"}
+SETTINGS = {
+    "benchmarks": {"single_source_latency_ms": 500, "multi_source_latency_ms": 2000,
+                   "cache_hit_latency_ms": 100, "min_cache_hit_ratio": 40},
+    "baseline": {"enabled": True, "degradation_threshold": 10.0},
+    "integration": {"fail_on_performance_degradation": True}
+}
+# Same checks with latency targets loose enough for any CI runner
+LENIENT_SETTINGS = dict(SETTINGS, benchmarks=dict(SETTINGS["benchmarks"], single_source_latency_ms=60000,
+                                                   multi_source_latency_ms=60000, cache_hit_latency_ms=60000))
+
+
+class TestLatencySpecs(unittest.TestCase):
+    """parse_latency_spec turns distribution specs into millisecond samplers."""
+
+    def test_distributions(self):
+        rng = random.Random(1)
+        self.assertEqual(load_test.parse_latency_spec("fixed:25")(rng), 25.0)
+        samples = [load_test.parse_latency_spec("uniform:10:20")(rng) for _ in range(200)]
+        self.assertTrue(all(10 <= s <= 20 for s in samples))
+        samples = sorted(load_test.parse_latency_spec("lognormal:100:0.3")(rng) for _ in range(2001))
+        self.assertAlmostEqual(samples[1000], 100, delta=10)
+        self.assertTrue(all(load_test.parse_latency_spec("normal:5:50")(rng) >= 0 for _ in range(200)))
+
+    def test_invalid_specs_rejected(self):
+        for spec in ("gamma:1:2", "fixed", "uniform:10", "fixed:abc", "exp:-5"):
+            with self.assertRaises(ValueError):
+                load_test.parse_latency_spec(spec)
+
+
+class TestRetrievalLoad(unittest.TestCase):
+    """[CI] Concurrent searches meet the configured latency and cache benchmarks."""
+
+    def test_ci_load_report(self):
+        report = load_test.run(80, 8, FAST_LATENCIES, repeat_ratio=0.7, settings=LENIENT_SETTINGS)
+
+        self.assertTrue(report["passed"], report["checks"])
+        self.assertEqual(set(report["scenarios"]), set(load_test.SCENARIOS))
+        for result in report["scenarios"].values():
+            self.assertEqual((result["requests"], result["errors"]), (80, 0))
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+            self.assertLessEqual(result["p95_ms"], result["p99_ms"])
+            self.assertGreater(result["qps"], 0)
+
+        self.assertEqual(report["scenarios"]["single_source"]["source_calls"]["zep"], 0)
+        self.assertEqual(report["scenarios"]["multi_source"]["source_calls"]["bigquery"], 80)
+        self.assertEqual(report["scenarios"]["multi_source"]["cache_hits"], 0)
+        self.assertGreaterEqual(report["scenarios"]["cached"]["cache_hit_ratio_percent"], 40)
+        json.dumps(report)  # Trend files are plain JSON
+
+    @unittest.skipUnless(os.environ.get("RAG_LOAD_BENCHMARKS") == "1",
+                         "wall-clock benchmark; set RAG_LOAD_BENCHMARKS=1 to run")
+    def test_ci_load_meets_benchmarks(self):
+        report = load_test.run(80, 8, FAST_LATENCIES, repeat_ratio=0.7, settings=SETTINGS)
+
+        self.assertTrue(report["passed"], report["checks"])
+
+    def test_threshold_breach_fails(self):
+        settings = dict(SETTINGS, benchmarks=dict(SETTINGS["benchmarks"], single_source_latency_ms=1))
+
+        report = load_test.run(20, 4, dict(FAST_LATENCIES, opensearch="fixed:15"),
+                               scenarios=("single_source",), settings=settings)
+
+        self.assertFalse(report["passed"])
+        (check,) = report["checks"]
+        self.assertEqual((check["name"], check["passed"]), ("single_source_latency_ms", False))
+
+    def test_no_cache_hits_fails_ratio(self):
+        report = load_test.run(20, 4, FAST_LATENCIES, repeat_ratio=0.0, scenarios=("cached",), settings=SETTINGS)
+
+        checks = {check["name"]: check for check in report["checks"]}
+        self.assertEqual(checks["min_cache_hit_ratio"]["value"], 0.0)
+        self.assertFalse(checks["min_cache_hit_ratio"]["passed"])
+        self.assertFalse(checks["cache_hit_latency_ms"]["passed"])
+
+    def test_source_errors_counted(self):
+        report = load_test.run(30, 4, FAST_LATENCIES, error_rate=1.0, scenarios=("single_source",), settings=SETTINGS)
+
+        self.assertEqual(report["scenarios"]["single_source"]["errors"], 30)
+
+
+class TestBaselineComparison(unittest.TestCase):
+    """Degradation beyond performance_tracking.baseline.degradation_threshold fails the run."""
+
+    def test_latency_rise_and_qps_drop_flagged(self):
+        baseline = {"scenarios": {"multi_source": {"p95_ms": 100.0, "p99_ms": 150.0, "qps": 200.0}}}
+        current = {"multi_source": {"p95_ms": 109.0, "p99_ms": 180.0, "qps": 170.0},
+                   "cached": {"p95_ms": 50.0, "p99_ms": 60.0, "qps": 400.0}}
+
+        comparisons = {c["metric"]: c for c in load_test.compare_to_baseline(current, baseline, 10.0)}
+
+        self.assertFalse(comparisons["p95_ms"]["regressed"])
+        self.assertEqual(comparisons["p99_ms"]["change_pct"], 20.0)
+        self.assertTrue(comparisons["p99_ms"]["regressed"])
+        self.assertTrue(comparisons["qps"]["regressed"])
+        self.assertEqual(len(comparisons), 3)  # cached has no baseline entry
+
+    def test_run_fails_on_degradation_unless_disabled(self):
+        baseline = {"scenarios": {"single_source": {"p95_ms": 0.01, "p99_ms": 0.01, "qps": 1e9}}}
+
+        report = load_test.run(20, 4, FAST_LATENCIES, scenarios=("single_source",), baseline=baseline, settings=SETTINGS)
+        self.assertFalse(report["passed"])
+        self.assertTrue(all(c["regressed"] for c in report["baseline_comparisons"]))
+
+        lenient = dict(SETTINGS, integration={"fail_on_performance_degradation": False})
+        report = load_test.run(20, 4, FAST_LATENCIES, scenarios=("single_source",), baseline=baseline, settings=lenient)
+        self.assertTrue(report["passed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
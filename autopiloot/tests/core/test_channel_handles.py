@@ -0,0 +1,147 @@
+"""
+Tests for cached handle → channel resolution in core/channel_handles.py.
+"""
+
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+from channel_handles import SEARCH_RESOLUTION_COST, clear_handle_cache, resolve_handles
+
+
+def _iso(days_ago):
+    return (datetime.now(timezone.utc) - timedelta(days=days_ago)).isoformat().replace('+00:00', 'Z')
+
+
+class FakeDoc:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class FakeChannelsDb:
+    """Answers where(field, 'array_contains_any', values).stream() over in-memory channel docs."""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def collection(self, name):
+        assert name == 'channels'
+        return self
+
+    def where(self, field, op, values):
+        self.queries.append((field, op, list(values)))
+        matches = [FakeDoc(doc_id, data) for doc_id, data in self.docs.items()
+                   if set(data.get(field, [])) & set(values)]
+        return MagicMock(stream=MagicMock(return_value=matches))
+
+
+def _channel(channel_id, custom_url, title="T"):
+    return {'id': channel_id, 'snippet': {'title': title, 'customUrl': custom_url, 'thumbnails': {}}}
+
+
+class TestResolveHandles(unittest.TestCase):
+
+    def setUp(self):
+        clear_handle_cache()
+        self.addCleanup(clear_handle_cache)
+        self.youtube = MagicMock()
+        self.search = MagicMock(side_effect=lambda youtube, handle: {'channel_id': f'UC_SEARCH_{handle}'})
+
+    def _list_calls(self):
+        return [call.kwargs for call in self.youtube.channels().list.call_args_list if call.kwargs]
+
+    def test_fresh_firestore_mapping_skips_api(self):
+        db = FakeChannelsDb({'UC1': {'channel_id': 'UC1', 'handles': ['@Alex'], 'handle_keys': ['@alex'],
+                                     'title': 'Alex', 'last_resolved_at': _iso(1)}})
+
+        result = resolve_handles(self.youtube, ['@ALEX'], self.search, db=db)
+
+        self.assertEqual(result['mappings']['@ALEX']['channel_id'], 'UC1')
+        self.assertEqual(result['stats']['sources']['firestore'], 1)
+        self.assertEqual(result['stats']['quota_units_used'], 0)
+        self.assertEqual(result['stats']['quota_units_saved'], SEARCH_RESOLUTION_COST)
+        self.assertEqual(self._list_calls(), [])
+        self.search.assert_not_called()
+
+        # Second run is served from the in-process cache without touching Firestore
+        result = resolve_handles(self.youtube, ['@alex'], self.search, db=db)
+        self.assertEqual(result['stats']['sources']['memory'], 1)
+        self.assertEqual(len(db.queries), 1)
+
+    def test_legacy_documents_found_by_exact_handle(self):
+        db = FakeChannelsDb({'UC1': {'handles': ['@Alex'], 'last_resolved_at': _iso(1)}})
+
+        result = resolve_handles(self.youtube, ['@Alex'], self.search, db=db)
+
+        self.assertEqual(result['mappings']['@Alex']['channel_id'], 'UC1')
+        self.assertEqual([q[0] for q in db.queries], ['handle_keys', 'handles'])
+
+    def test_for_handle_before_search(self):
+        self.youtube.channels().list().execute.side_effect = [
+            {'items': [_channel('UC2', '@new')]},  # forHandle hit
+            {'items': []}                           # forHandle miss
+        ]
+
+        result = resolve_handles(self.youtube, ['@New', '@Gone'], self.search, db=FakeChannelsDb({}))
+
+        self.assertEqual(result['mappings']['@New']['channel_id'], 'UC2')
+        self.assertEqual(result['mappings']['@Gone']['channel_id'], 'UC_SEARCH_@Gone')
+        self.assertEqual([c.get('forHandle') for c in self._list_calls()], ['@new', '@gone'])
+        stats = result['stats']
+        self.assertEqual((stats['sources']['for_handle'], stats['sources']['search']), (1, 1))
+        self.assertEqual(stats['quota_units_used'], 2 + SEARCH_RESOLUTION_COST)
+        self.assertEqual(stats['quota_units_saved'], SEARCH_RESOLUTION_COST - 2)
+
+    def test_expired_mappings_revalidated_in_one_call(self):
+        db = FakeChannelsDb({
+            'UC1': {'handles': ['@Alex'], 'handle_keys': ['@alex'], 'last_resolved_at': _iso(40)},
+            'UC3': {'handles': ['@Moved'], 'handle_keys': ['@moved'], 'last_resolved_at': _iso(40)}
+        })
+        self.youtube.channels().list().execute.side_effect = [
+            {'items': [_channel('UC1', '@alex', 'Alex v2'), _channel('UC3', '@renamed')]},  # revalidation
+            {'items': [_channel('UC9', '@moved')]}                                         # forHandle
+        ]
+
+        result = resolve_handles(self.youtube, ['@Alex', '@Moved'], self.search, ttl_days=30, db=db)
+
+        calls = self._list_calls()
+        self.assertEqual(calls[0]['id'], 'UC1,UC3')
+        self.assertEqual(result['mappings']['@Alex'], {'channel_id': 'UC1', 'title': 'Alex v2',
+                                                       'custom_url': '@alex', 'thumbnails': {}})
+        self.assertEqual(result['mappings']['@Moved']['channel_id'], 'UC9')
+        self.assertEqual(result['stats']['stale_mappings'],
+                         [{'handle': '@moved', 'channel_id': 'UC3', 'reason': 'handle_changed'}])
+        self.assertEqual(result['stats']['quota_units_used'], 2)
+
+    def test_failures_reported_per_handle(self):
+        self.youtube.channels().list().execute.return_value = {'items': []}
+        self.search.side_effect = ValueError("Channel not found for handle: @Nobody")
+
+        with patch('builtins.print'):
+            result = resolve_handles(self.youtube, ['@Nobody'], self.search, db=FakeChannelsDb({}))
+
+        self.assertEqual(result['mappings']['@Nobody'], {'error': 'Channel not found for handle: @Nobody'})
+        self.assertEqual(result['stats']['quota_units_saved'], 0)
+
+    def test_firestore_errors_fall_back_to_api(self):
+        db = MagicMock()
+        db.collection.side_effect = Exception("unavailable")
+        self.youtube.channels().list().execute.return_value = {'items': [_channel('UC2', '@new')]}
+
+        with patch('builtins.print'):
+            result = resolve_handles(self.youtube, ['@New'], self.search, db=db)
+
+        self.assertEqual(result['stats']['sources']['for_handle'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
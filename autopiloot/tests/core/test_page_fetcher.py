@@ -0,0 +1,117 @@
+"""
+Tests for per-host polite fetching and the page cache in core/page_fetcher.py.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+from page_fetcher import PageCache, PoliteFetcher
+
+
+def _response(status=200, text="<html></html>", headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.text = text
+    response.headers = headers or {}
+    if status >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(f"{status} error")
+    return response
+
+
+class TestPoliteFetcher(unittest.TestCase):
+
+    def test_requests_to_one_host_are_spaced(self):
+        fetcher = PoliteFetcher(per_host_concurrency=4, per_host_interval_sec=0.05)
+        waits = {}
+
+        # Frozen clock: each fetch's sleep is exactly its reserved offset from "now"
+        with patch('page_fetcher.time.monotonic', return_value=100.0), \
+                patch('page_fetcher.time.sleep', side_effect=lambda seconds: waits[host].append(round(seconds, 6))), \
+                patch('requests.get', return_value=_response()):
+            for i in range(3):
+                for host in ("a.com", "b.com"):
+                    waits.setdefault(host, [])
+                    fetcher.fetch(f"https://{host}/p{i}")
+
+        # Each host waits one interval more per request; other hosts do not add to it
+        self.assertEqual(waits, {"a.com": [0.05, 0.1], "b.com": [0.05, 0.1]})
+
+    def test_per_host_concurrency_limit(self):
+        fetcher = PoliteFetcher(per_host_concurrency=2, per_host_interval_sec=0)
+        lock = threading.Lock()
+        in_flight = {"now": 0, "max": 0}
+
+        def fake_get(url, headers=None, timeout=None):
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(0.02)
+            with lock:
+                in_flight["now"] -= 1
+            return _response()
+
+        with patch('requests.get', side_effect=fake_get):
+            threads = [threading.Thread(target=fetcher.fetch, args=(f"https://a.com/p{i}",)) for i in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(in_flight["max"], 2)
+
+    def test_conditional_request_and_304(self):
+        fetcher = PoliteFetcher(per_host_interval_sec=0)
+
+        with patch('requests.get', return_value=_response(304)) as mock_get:
+            result = fetcher.fetch("https://a.com/p", etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+
+        headers = mock_get.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertIn("If-Modified-Since", headers)
+        self.assertTrue(result.not_modified)
+
+    def test_validators_returned_and_errors_raised(self):
+        fetcher = PoliteFetcher(per_host_interval_sec=0)
+
+        with patch('requests.get', return_value=_response(headers={"ETag": '"v2"'})):
+            result = fetcher.fetch("https://a.com/p")
+        self.assertEqual((result.etag, result.last_modified, result.not_modified), ('"v2"', None, False))
+
+        with patch('requests.get', return_value=_response(404)):
+            with self.assertRaises(requests.RequestException):
+                fetcher.fetch("https://a.com/missing")
+
+
+class TestPageCache(unittest.TestCase):
+
+    def test_entries_need_validators_and_expire(self):
+        cache = PageCache(ttl_seconds=60)
+        cache.set("https://a.com/none", ["x"], None, None)
+        cache.set("https://a.com/p", ["x"], '"v1"', None)
+
+        self.assertIsNone(cache.get("https://a.com/none"))
+        self.assertEqual(cache.get("https://a.com/p")["value"], ["x"])
+        with patch('page_fetcher.time.time', return_value=time.time() + 120):
+            self.assertIsNone(cache.get("https://a.com/p"))
+
+    def test_lru_eviction(self):
+        cache = PageCache(max_entries=2)
+        cache.set("u1", [], '"1"', None)
+        cache.set("u2", [], '"2"', None)
+        cache.get("u1")
+        cache.set("u3", [], '"3"', None)
+
+        self.assertIsNone(cache.get("u2"))
+        self.assertEqual(len(cache), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
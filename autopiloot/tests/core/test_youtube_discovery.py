@@ -0,0 +1,206 @@
+"""
+Tests for multi-channel upload discovery in core/youtube_discovery.py.
+
+Uses an in-memory YouTube client that records every request, so the tests
+assert request batching, playlist ID caching and quota accounting.
+"""
+
+import os
+import sys
+import threading
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import youtube_discovery
+from youtube_discovery import discover_uploads, get_uploads_playlist_ids
+
+
+class _Request:
+    def __init__(self, handler, params):
+        self.handler = handler
+        self.params = params
+
+    def execute(self):
+        return self.handler(**self.params)
+
+
+class _Resource:
+    def __init__(self, client, method):
+        self.client = client
+        self.method = method
+
+    def list(self, **params):
+        with self.client.lock:
+            self.client.requests.append((self.method, params))
+        return _Request(getattr(self.client, self.method.replace('.', '_')), params)
+
+
+class FakeYouTube:
+    """Channels with uploads playlists; each playlist holds `videos` newest first."""
+
+    def __init__(self, uploads):
+        self.uploads = uploads  # channel_id -> list of (video_id, published_at)
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def channels(self):
+        return _Resource(self, 'channels.list')
+
+    def playlistItems(self):
+        return _Resource(self, 'playlistItems.list')
+
+    def videos(self):
+        return _Resource(self, 'videos.list')
+
+    def channels_list(self, part, id, maxResults=None):
+        return {'items': [
+            {'id': cid, 'contentDetails': {'relatedPlaylists': {'uploads': 'UU' + cid[2:]}}}
+            for cid in id.split(',') if cid in self.uploads
+        ]}
+
+    def playlistItems_list(self, part, playlistId, maxResults, pageToken=None):
+        videos = self.uploads['UC' + playlistId[2:]]
+        start = int(pageToken or 0)
+        page = videos[start:start + maxResults]
+        response = {'items': [{'snippet': {
+            'resourceId': {'videoId': vid}, 'title': vid, 'publishedAt': published, 'channelTitle': 'c'
+        }} for vid, published in page]}
+        if start + maxResults < len(videos):
+            response['nextPageToken'] = str(start + maxResults)
+        return response
+
+    def videos_list(self, part, id):
+        published = {vid: at for videos in self.uploads.values() for vid, at in videos}
+        return {'items': [{
+            'id': vid, 'snippet': {'title': vid, 'publishedAt': published[vid]},
+            'contentDetails': {'duration': 'PT5M'}
+        } for vid in id.split(',')]}
+
+    def count(self, method):
+        return sum(1 for m, _ in self.requests if m == method)
+
+
+def _uploads(channels, per_channel, day='2025-01-27'):
+    return {
+        cid: [(f'{cid}_v{i}', f'{day}T{23 - i % 24:02d}:00:00Z') for i in range(per_channel)]
+        for cid in channels
+    }
+
+
+class _FakeFirestore:
+    def __init__(self, docs=None):
+        self.docs = dict(docs or {})
+        self.get_all_calls = 0
+        self.commits = 0
+
+    def collection(self, name):
+        return SimpleNamespace(document=lambda doc_id: SimpleNamespace(id=doc_id))
+
+    def get_all(self, refs):
+        self.get_all_calls += 1
+        for ref in refs:
+            data = self.docs.get(ref.id)
+            yield SimpleNamespace(id=ref.id, exists=data is not None, to_dict=lambda data=data: data)
+
+    def batch(self):
+        db = self
+
+        class _Batch:
+            def set(self, ref, data, merge=False):
+                db.docs[ref.id] = dict(db.docs.get(ref.id, {}), **data)
+
+            def commit(self):
+                db.commits += 1
+        return _Batch()
+
+
+class TestYouTubeDiscovery(unittest.TestCase):
+
+    def setUp(self):
+        youtube_discovery.clear_playlist_cache()
+        self.addCleanup(youtube_discovery.clear_playlist_cache)
+        self.firestore = youtube_discovery.firestore if youtube_discovery.FIREBASE_AVAILABLE else None
+        youtube_discovery.firestore = SimpleNamespace(SERVER_TIMESTAMP='ts')
+        self.addCleanup(setattr, youtube_discovery, 'firestore', self.firestore)
+
+    def test_many_channels_share_batched_requests(self):
+        channels = [f'UC{i:03d}' for i in range(60)]
+        youtube = FakeYouTube(_uploads(channels, 2))
+        db = _FakeFirestore()
+
+        result = discover_uploads(channels, '2025-01-27T00:00:00Z', lambda: youtube, max_workers=8, db=db)
+
+        # 60 channels -> 2 channels().list, 120 videos -> 3 videos().list
+        self.assertEqual(youtube.count('channels.list'), 2)
+        self.assertEqual(youtube.count('playlistItems.list'), 60)
+        self.assertEqual(youtube.count('videos.list'), 3)
+        self.assertEqual(result['quota'], {'units': 65, 'calls': {
+            'channels.list': 2, 'playlistItems.list': 60, 'videos.list': 3}})
+        self.assertEqual([v['id'] for v in result['channels']['UC007']['videos']], ['UC007_v0', 'UC007_v1'])
+        self.assertEqual(db.docs['UC007']['uploads_playlist_id'], 'UU007')
+
+    def test_playlist_ids_cached_in_process_and_firestore(self):
+        youtube = FakeYouTube(_uploads(['UC1', 'UC2'], 1))
+        db = _FakeFirestore({'UC1': {'uploads_playlist_id': 'UU1'}})
+
+        self.assertEqual(get_uploads_playlist_ids(youtube, ['UC1', 'UC2'], db=db), {'UC1': 'UU1', 'UC2': 'UU2'})
+        (method, params), = youtube.requests
+        self.assertEqual(params['id'], 'UC2')  # UC1 came from Firestore
+
+        get_uploads_playlist_ids(youtube, ['UC1', 'UC2'], db=db)
+        self.assertEqual(len(youtube.requests), 1)
+        self.assertEqual(db.get_all_calls, 1)
+
+    def test_unknown_channel_and_checkpoint(self):
+        youtube = FakeYouTube(_uploads(['UC1'], 5))
+
+        result = discover_uploads(
+            ['UC1', 'UCmissing'], '2025-01-27T00:00:00Z', lambda: youtube,
+            checkpoints={'UC1': '2025-01-27T21:00:00Z'}, max_workers=1, db=_FakeFirestore()
+        )
+
+        self.assertEqual([v['id'] for v in result['channels']['UC1']['videos']], ['UC1_v0', 'UC1_v1'])
+        self.assertEqual(result['channels']['UCmissing']['error'], 'Could not find uploads playlist')
+
+    def test_pagination_stops_at_since(self):
+        youtube = FakeYouTube({'UC1': _uploads(['UC1'], 3)['UC1'] + [('old', '2025-01-01T00:00:00Z')] * 80})
+
+        result = discover_uploads(['UC1'], '2025-01-27T00:00:00Z', lambda: youtube, max_items_per_channel=100,
+                                  db=_FakeFirestore())
+
+        self.assertEqual(len(result['channels']['UC1']['videos']), 3)
+        self.assertEqual(youtube.count('playlistItems.list'), 1)
+
+    def test_playlist_failure_isolated_to_channel(self):
+        youtube = FakeYouTube(_uploads(['UC1', 'UC2'], 1))
+        original = youtube.playlistItems_list
+
+        def failing(**params):
+            if params['playlistId'] == 'UU1':
+                raise Exception('backendError')
+            return original(**params)
+        youtube.playlistItems_list = failing
+
+        result = discover_uploads(['UC1', 'UC2'], '2025-01-27T00:00:00Z', lambda: youtube, db=_FakeFirestore())
+
+        self.assertIn('backendError', result['channels']['UC1']['error'])
+        self.assertEqual(len(result['channels']['UC2']['videos']), 1)
+
+    def test_worker_threads_get_own_clients(self):
+        youtube = FakeYouTube(_uploads(['UC1', 'UC2', 'UC3'], 1))
+        built = []
+
+        def factory():
+            built.append(threading.get_ident())
+            return youtube
+
+        discover_uploads(['UC1', 'UC2', 'UC3'], '2025-01-27T00:00:00Z', factory, max_workers=3, db=_FakeFirestore())
+
+        self.assertGreaterEqual(len(built), 2)  # Caller's client plus at least one worker client
+        self.assertEqual(len(built), len(set(built)))
+
+
+if __name__ == '__main__':
+    unittest.main()
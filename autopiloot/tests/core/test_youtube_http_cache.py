@@ -0,0 +1,177 @@
+"""
+Tests for the YouTube Data API ETag cache in core/youtube_http_cache.py.
+
+Drives a real googleapiclient YouTube client over a fake httplib2 transport
+that honours If-None-Match, with the disk backend in a temporary directory.
+"""
+
+import importlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httplib2
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import youtube_http_cache
+from youtube_http_cache import (
+    build_youtube_http, cache_key, configure_http_cache, get_http_cache_stats, reset_http_cache
+)
+
+
+def _without_module_stubs(test, packages=("google", "googleapiclient")):
+    """
+    Set aside stubs other test modules leave in sys.modules (google, googleapiclient)
+    until cleanup, so the real discovery client and its lazy imports load.
+    """
+    stubs = {
+        name: module for name, module in list(sys.modules.items())
+        if name.split(".")[0] in packages
+        and not hasattr(module, "__path__") and getattr(module, "__file__", None) is None
+    }
+    for name in stubs:
+        del sys.modules[name]
+    test.addCleanup(sys.modules.update, stubs)
+
+    # A re-imported parent package does not know about submodules that stayed loaded
+    for name, module in sorted(sys.modules.items()):
+        parent, _, child = name.rpartition(".")
+        if parent.split(".")[0] in packages and parent in stubs:
+            setattr(importlib.import_module(parent), child, module)
+
+
+class FakeYouTubeTransport:
+    """Serves JSON bodies per API path with an ETag; answers 304 when If-None-Match matches."""
+
+    def __init__(self):
+        self.bodies = {}
+        self.requests = []
+
+    def set_body(self, resource, body):
+        self.bodies[resource] = (json.dumps(body), f'"etag-{resource}-{len(self.requests)}"')
+
+    def request(self, uri, method="GET", body=None, headers=None, redirections=5, connection_type=None):
+        headers = headers or {}
+        self.requests.append((method, uri, headers.get("If-None-Match")))
+        resource = uri.split("/youtube/v3/")[1].split("?")[0]
+        content, etag = self.bodies[resource]
+        if headers.get("If-None-Match") == etag:
+            return httplib2.Response({"status": "304", "etag": etag}), b""
+        return httplib2.Response({"status": "200", "etag": etag, "content-type": "application/json"}), content.encode()
+
+
+class TestYouTubeHttpCache(unittest.TestCase):
+
+    def setUp(self):
+        _without_module_stubs(self)
+        self.build = importlib.import_module("googleapiclient.discovery").build
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        reset_http_cache()
+        self.addCleanup(reset_http_cache)
+        configure_http_cache({"enabled": True, "backend": "disk", "path": self.tmpdir, "ttl_hours": 1})
+
+        self.transport = FakeYouTubeTransport()
+        self.transport.set_body("playlistItems", {"items": [{"id": "item1"}], "etag": "x"})
+        self.transport.set_body("search", {"items": [{"id": {"channelId": "UC1"}}]})
+
+    def _youtube(self):
+        return self.build('youtube', 'v3', developerKey='secret-key', http=build_youtube_http(http=self.transport))
+
+    def test_unchanged_page_served_from_304(self):
+        first = self._youtube().playlistItems().list(part='snippet', playlistId='UU1', maxResults=50).execute()
+        second = self._youtube().playlistItems().list(part='snippet', playlistId='UU1', maxResults=50).execute()
+
+        self.assertEqual(first, second)
+        self.assertIsNone(self.transport.requests[0][2])
+        self.assertTrue(self.transport.requests[1][2].startswith('"etag-playlistItems'))
+        stats = get_http_cache_stats()
+        self.assertEqual((stats["requests"], stats["not_modified"], stats["stored"]), (2, 1, 1))
+        self.assertEqual(stats["quota_units_saved"], 1)
+        self.assertEqual(stats["backend"], "disk")
+
+    def test_search_savings_use_search_cost(self):
+        for _ in range(3):
+            self._youtube().search().list(part='snippet', q='@handle', type='channel').execute()
+
+        self.assertEqual(get_http_cache_stats()["quota_units_saved"], 200)
+
+    def test_changed_page_refetched_and_restored(self):
+        youtube = self._youtube()
+        youtube.playlistItems().list(part='snippet', playlistId='UU1').execute()
+        self.transport.set_body("playlistItems", {"items": [{"id": "item2"}]})
+
+        response = youtube.playlistItems().list(part='snippet', playlistId='UU1').execute()
+
+        self.assertEqual(response["items"][0]["id"], "item2")
+        self.assertEqual(get_http_cache_stats()["stored"], 2)
+
+    def test_expired_entry_not_revalidated_and_pruned(self):
+        youtube = self._youtube()
+        youtube.playlistItems().list(part='snippet', playlistId='UU1').execute()
+
+        with patch.object(youtube_http_cache.time, "time", return_value=time.time() + 7200):
+            youtube.playlistItems().list(part='snippet', playlistId='UU1').execute()
+        self.assertIsNone(self.transport.requests[1][2])
+        self.assertEqual(get_http_cache_stats()["expired"], 1)
+
+        with patch.object(youtube_http_cache.time, "time", return_value=time.time() + 4 * 3600):
+            self.assertEqual(configure_http_cache({"path": self.tmpdir, "ttl_hours": 1})["pruned"], 1)
+        self.assertEqual(os.listdir(self.tmpdir), [])
+
+    def test_api_key_not_stored_in_clear(self):
+        self._youtube().playlistItems().list(part='snippet', playlistId='UU1').execute()
+
+        (filename,) = os.listdir(self.tmpdir)
+        with open(os.path.join(self.tmpdir, filename)) as f:
+            self.assertNotIn('secret-key', f.read() + filename)
+        self.assertEqual(cache_key("https://h/p?b=2&a=1"), cache_key("https://h/p?a=1&b=2"))
+
+    def test_store_failure_falls_back_to_network(self):
+        class BrokenStore:
+            name = "broken"
+
+            def get(self, key):
+                raise OSError("disk full")
+
+            def set(self, key, entry):
+                raise OSError("disk full")
+
+            def prune(self, now):
+                return 0
+
+        configure_http_cache({"enabled": True}, store=BrokenStore())
+        with patch("builtins.print"):
+            response = self._youtube().playlistItems().list(part='snippet', playlistId='UU1').execute()
+
+        self.assertEqual(response["items"][0]["id"], "item1")
+        self.assertEqual(get_http_cache_stats()["errors"], 2)
+
+    def test_disabled_returns_plain_transport(self):
+        configure_http_cache({"enabled": False})
+
+        self.assertIs(build_youtube_http(http=self.transport), self.transport)
+
+    def test_auto_backend_uses_firestore_on_cloud_functions(self):
+        firestore = MagicMock()
+        config = {"enabled": True, "backend": "auto", "path": self.tmpdir}
+
+        with patch.object(youtube_http_cache, "FIREBASE_AVAILABLE", True), \
+                patch.object(youtube_http_cache, "firestore", firestore, create=True), \
+                patch.dict(os.environ, {"K_SERVICE": "daily-digest"}):
+            self.assertEqual(configure_http_cache(config)["backend"], "firestore")
+
+        with patch.dict(os.environ, {"K_SERVICE": "", "FUNCTION_TARGET": ""}):
+            self.assertEqual(configure_http_cache(config)["backend"], "disk")
+
+
+
+if __name__ == '__main__':
+    unittest.main()
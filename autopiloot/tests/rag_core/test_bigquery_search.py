@@ -0,0 +1,183 @@
+"""
+Tests for the indexed BigQuery search path (hybrid_retrieve._query_bigquery)
+and the partitioned, search-indexed table layout (bigquery_streamer).
+"""
+
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import rag.config as rag_config
+from rag import bigquery_streamer, hybrid_retrieve
+
+
+SEARCH_CONFIG = {
+    "mode": "search_index",
+    "index_name": "transcript_chunks_search",
+    "columns": ["title", "text_snippet"],
+    "analyzer": "LOG_ANALYZER",
+    "max_terms": 8,
+    "title_weight": 0.5
+}
+
+
+# Records query parameters and table layout (other test modules replace google.cloud.bigquery in sys.modules)
+FAKE_BIGQUERY = SimpleNamespace(
+    ScalarQueryParameter=lambda name, type_, value: SimpleNamespace(name=name, type_=type_, value=value),
+    QueryJobConfig=lambda query_parameters: SimpleNamespace(query_parameters=query_parameters),
+    SchemaField=lambda name, field_type, mode=None: SimpleNamespace(name=name, field_type=field_type, mode=mode),
+    Table=lambda table_id, schema: SimpleNamespace(table_id=table_id, schema=schema),
+    TimePartitioning=lambda type_, field: SimpleNamespace(type_=type_, field=field),
+    TimePartitioningType=SimpleNamespace(DAY="DAY", MONTH="MONTH", YEAR="YEAR")
+)
+
+
+def _row(chunk_id, score):
+    row = MagicMock()
+    row.chunk_id = chunk_id
+    row.video_id = "vid"
+    row.title = "Pricing"
+    row.text = "pricing tiers"
+    row.score = score
+    row.content_sha256 = f"h_{chunk_id}"
+    return row
+
+
+class TestQueryBigQuery(unittest.TestCase):
+    """_query_bigquery builds SEARCH() queries with relevance scores and reports bytes scanned."""
+
+    def _query(self, query, filters=None, search_config=SEARCH_CONFIG, rows=()):
+        client = MagicMock()
+        job = client.query.return_value
+        job.result.return_value = list(rows)
+        job.total_bytes_processed = 4096
+        values = {"bigquery.search": search_config}
+
+        with patch.object(hybrid_retrieve, "get_optional_env_var", return_value="proj"), \
+                patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: values.get(key, default)), \
+                patch("rag.clients.get_bigquery_client", return_value=client), \
+                patch.dict(sys.modules, {"google.cloud": SimpleNamespace(bigquery=FAKE_BIGQUERY),
+                                         "google.cloud.bigquery": FAKE_BIGQUERY}):
+            outcome = hybrid_retrieve._query_bigquery(query, filters, 10, 2.0)
+
+        if not client.query.called:
+            return outcome, None, {}
+        sql = client.query.call_args.args[0]
+        params = {p.name: p.value for p in client.query.call_args.kwargs["job_config"].query_parameters}
+        return outcome, sql, params
+
+    def test_search_index_mode_scores_and_reports_bytes(self):
+        outcome, sql, params = self._query("How to price SaaS pricing?", rows=[_row("a", 0.75), _row("b", 0.25)])
+
+        self.assertEqual(outcome["status"], "success")
+        self.assertEqual(outcome["search_mode"], "search_index")
+        self.assertEqual(outcome["bytes_scanned"], 4096)
+        self.assertEqual([r["score"] for r in outcome["results"]], [0.75, 0.25])
+        self.assertNotIn("LIKE", sql)
+        self.assertIn("SEARCH(text_snippet, @term_0, analyzer => 'LOG_ANALYZER')", sql)
+        self.assertIn("ORDER BY score DESC", sql)
+        self.assertEqual([params[f"term_{i}"] for i in range(5)], ["how", "to", "price", "saas", "pricing"])
+        self.assertEqual(params["top_k"], 10)
+
+    def test_non_ascii_query_keeps_whole_words(self):
+        _, sql, params = self._query("Naïve café_über? привет 価格")
+
+        self.assertIsNotNone(sql)
+        self.assertEqual([params[f"term_{i}"] for i in range(5)], ["naïve", "café", "über", "привет", "価格"])
+
+    def test_score_is_normalized_weighted_match_share(self):
+        match_sql, score_sql = hybrid_retrieve._search_sql(2, ["title", "text_snippet"], "LOG_ANALYZER", 0.5)
+
+        self.assertEqual(match_sql.count("SEARCH("), 4)
+        self.assertIn(" OR ", match_sql)
+        self.assertTrue(score_sql.endswith("/ 3.0"))
+        self.assertIn("IF(SEARCH(title, @term_1, analyzer => 'LOG_ANALYZER'), 0.5, 0)", score_sql)
+
+    def test_filters_target_partition_and_cluster_columns(self):
+        filters = {"channel_id": "UC1", "date_from": "2025-01-01", "date_to": "2025-06-30", "min_duration_sec": 60}
+        _, sql, params = self._query("churn", filters)
+
+        self.assertIn("channel_id = @channel_id", sql)
+        self.assertIn("published_at >= TIMESTAMP(@date_from)", sql)
+        self.assertIn("published_at <= TIMESTAMP(@date_to)", sql)
+        self.assertIn("duration_sec >= @min_duration_sec", sql)
+        self.assertEqual(params["date_to"], "2025-06-30")
+
+    def test_like_mode_keeps_substring_scan(self):
+        outcome, sql, params = self._query("churn", search_config=dict(SEARCH_CONFIG, mode="like"), rows=[_row("a", 1.0)])
+
+        self.assertIn("LIKE LOWER(@query_pattern)", sql)
+        self.assertNotIn("SEARCH(", sql)
+        self.assertEqual(params["query_pattern"], "%churn%")
+        self.assertEqual(outcome["search_mode"], "like")
+        self.assertEqual(outcome["results"][0]["score"], 1.0)
+
+    def test_query_without_terms_skips_bigquery(self):
+        outcome, sql, _ = self._query("? !")
+
+        self.assertIsNone(sql)
+        self.assertEqual(outcome, {"status": "success", "results": [], "search_mode": "search_index", "bytes_scanned": 0})
+
+
+class TestEnsureTableExists(unittest.TestCase):
+    """New tables are partitioned and clustered; the search index is ensured once per process."""
+
+    values = {
+        "bigquery.partitioning": {"field": "published_at", "type": "MONTH"},
+        "bigquery.clustering_fields": ["channel_id", "video_id"],
+        "bigquery.search": SEARCH_CONFIG
+    }
+
+    def setUp(self):
+        bigquery_streamer._search_indexes_ensured.clear()
+
+    def tearDown(self):
+        bigquery_streamer._search_indexes_ensured.clear()
+
+    def _ensure(self, client):
+        with patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: self.values.get(key, default)):
+            return bigquery_streamer._ensure_table_exists(client, "proj.autopiloot.transcript_chunks", FAKE_BIGQUERY)
+
+    def test_new_table_is_partitioned_clustered_and_indexed(self):
+        client = MagicMock()
+        client.get_table.side_effect = Exception("Not found")
+
+        result = self._ensure(client)
+
+        self.assertEqual(result, {"success": True, "status": "created", "search_index": "ensured"})
+        table = client.create_table.call_args.args[0]
+        self.assertEqual(table.time_partitioning.field, "published_at")
+        self.assertEqual(table.time_partitioning.type_, "MONTH")
+        self.assertEqual(table.clustering_fields, ["channel_id", "video_id"])
+        ddl = client.query.call_args.args[0]
+        self.assertIn("CREATE SEARCH INDEX IF NOT EXISTS `transcript_chunks_search`", ddl)
+        self.assertIn("(title, text_snippet)", ddl)
+
+    def test_existing_table_gets_index_once(self):
+        client = MagicMock()
+
+        first = self._ensure(client)
+        second = self._ensure(client)
+
+        client.create_table.assert_not_called()
+        self.assertEqual(first["search_index"], "ensured")
+        self.assertEqual(second["search_index"], "cached")
+        self.assertEqual(client.query.call_count, 1)
+
+    def test_index_failure_does_not_fail_table(self):
+        client = MagicMock()
+        client.query.side_effect = Exception("permission denied")
+
+        result = self._ensure(client)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["search_index"], "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,275 @@
+"""
+Tests for the pluggable BigQuery writers in core/rag/bigquery_writer.py
+and write-mode selection in bigquery_streamer.stream_transcript_chunks.
+"""
+
+import importlib
+import os
+import sys
+import unittest
+from concurrent.futures import Future
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import rag.config as rag_config
+from rag import bigquery_streamer, bigquery_writer
+from rag.bigquery_writer import TRANSCRIPT_CHUNK_SCHEMA, encode_row, row_message_class, schema_fields, write_rows
+
+
+# Records schema and load job settings (other test modules replace google.cloud.bigquery in sys.modules)
+FAKE_BIGQUERY = SimpleNamespace(
+    SchemaField=lambda name, field_type, mode=None: SimpleNamespace(name=name, field_type=field_type, mode=mode),
+    LoadJobConfig=lambda **kwargs: SimpleNamespace(**kwargs),
+    SourceFormat=SimpleNamespace(NEWLINE_DELIMITED_JSON="NEWLINE_DELIMITED_JSON"),
+    Dataset=lambda dataset_id: SimpleNamespace(dataset_id=dataset_id, location=None),
+    QueryJobConfig=lambda **kwargs: SimpleNamespace(**kwargs),
+    ArrayQueryParameter=lambda name, array_type, values: SimpleNamespace(name=name, array_type=array_type,
+                                                                         values=values)
+)
+
+
+def _without_module_stubs(test, packages=("google", "datetime")):
+    """
+    Set aside stubs other test modules leave in sys.modules (google, datetime) until cleanup,
+    so protobuf and the Storage Write client import for real. Real modules are never removed:
+    re-importing protobuf's C extension crashes the interpreter.
+    """
+    stubs = {
+        name: module for name, module in list(sys.modules.items())
+        if name.split(".")[0] in packages
+        and not hasattr(module, "__path__") and getattr(module, "__file__", None) is None
+    }
+    for name in stubs:
+        del sys.modules[name]
+    test.addCleanup(sys.modules.update, stubs)
+
+    # A re-imported parent package does not know about submodules that stayed loaded
+    for name, module in sorted(sys.modules.items()):
+        parent, _, child = name.rpartition(".")
+        if parent.split(".")[0] in packages and parent in stubs:
+            setattr(importlib.import_module(parent), child, module)
+
+
+def _bigquery_client(existing=()):
+    """bigquery.Client-shaped mock whose query() returns rows for the existing chunk_ids."""
+    client = MagicMock(spec=["create_dataset", "query"])
+    client.query.return_value.result.return_value = [SimpleNamespace(chunk_id=c) for c in existing]
+    return client
+
+
+def _rows(count):
+    return [{"video_id": "vid", "chunk_id": f"vid_chunk_{i}", "published_at": "2025-10-08T12:00:00Z",
+             "content_sha256": f"h{i}", "tokens": 100} for i in range(count)]
+
+
+def _future(result=None, error=None):
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+class TestSharedSchema(unittest.TestCase):
+    """Table schema, load job schema and Storage Write rows come from one definition."""
+
+    def setUp(self):
+        _without_module_stubs(self)
+
+    def test_schema_fields_and_proto_match(self):
+        fields = schema_fields(FAKE_BIGQUERY)
+        proto_fields = row_message_class().DESCRIPTOR.fields
+
+        self.assertEqual([f.name for f in fields], [name for name, _, _ in TRANSCRIPT_CHUNK_SCHEMA])
+        self.assertEqual([f.name for f in proto_fields], [f.name for f in fields])
+        self.assertEqual(fields[0].mode, "REQUIRED")
+
+    def test_encode_row_round_trip(self):
+        row = dict(_rows(1)[0], duration_sec="1200", title=None)
+        decoded = row_message_class().FromString(encode_row(row))
+
+        self.assertEqual(decoded.chunk_id, "vid_chunk_0")
+        self.assertEqual(decoded.published_at, 1759924800000000)
+        self.assertEqual(decoded.duration_sec, 1200)
+        self.assertFalse(decoded.HasField("title"))
+
+    def test_missing_required_column_fails_to_encode(self):
+        from google.protobuf.message import EncodeError
+
+        with self.assertRaises(EncodeError):
+            encode_row({"video_id": "vid"})
+
+
+class TestWriters(unittest.TestCase):
+    """Streaming and load job writers report rejected rows by chunk_id."""
+
+    def test_load_jobs_honour_batch_size(self):
+        client = MagicMock()
+        jobs = [MagicMock(), MagicMock(), MagicMock()]
+        jobs[1].result.side_effect = Exception("load failed")
+        jobs[1].errors = [{"reason": "invalid"}]
+        client.load_table_from_json.side_effect = jobs
+
+        result = write_rows(client, "p.d.t", _rows(1200), FAKE_BIGQUERY, mode="load_job", batch_size=500)
+
+        self.assertEqual([len(c.args[0]) for c in client.load_table_from_json.call_args_list], [500, 500, 200])
+        job_config = client.load_table_from_json.call_args.kwargs["job_config"]
+        self.assertEqual(job_config.write_disposition, "WRITE_APPEND")
+        self.assertEqual([f.name for f in job_config.schema][:2], ["video_id", "chunk_id"])
+        self.assertEqual(result["write_mode"], "load_job")
+        self.assertEqual(result["load_jobs"], 3)
+        self.assertEqual(result["inserted_count"], 700)
+        self.assertEqual(result["error_chunk_ids"][0], "vid_chunk_500")
+        self.assertEqual(len(result["error_chunk_ids"]), 500)
+
+    def test_streaming_maps_errors_to_chunk_ids(self):
+        client = MagicMock()
+        client.insert_rows_json.return_value = [{"index": 2, "errors": ["bad"]}]
+
+        result = write_rows(client, "p.d.t", _rows(3), FAKE_BIGQUERY, mode="streaming")
+
+        self.assertEqual(result["inserted_count"], 2)
+        self.assertEqual(result["error_chunk_ids"], ["vid_chunk_2"])
+
+
+class TestStorageWrite(unittest.TestCase):
+    """Storage Write committed stream lifecycle."""
+
+    def setUp(self):
+        _without_module_stubs(self)
+        # Load protobuf before patch.dict(sys.modules) so it is never unloaded and re-imported
+        row_message_class()
+
+    def test_finalize_failure_is_a_warning(self):
+        write_client = MagicMock()
+        write_client.create_write_stream.return_value = SimpleNamespace(name="streams/s1")
+        write_client.table_path.return_value = "projects/p/datasets/d/tables/t"
+        write_client.finalize_write_stream.side_effect = RuntimeError("deadline exceeded")
+        append_stream = MagicMock()
+        append_stream.send.side_effect = lambda request: _future()
+        storage = SimpleNamespace(types=MagicMock(),
+                                  writer=SimpleNamespace(AppendRowsStream=MagicMock(return_value=append_stream)))
+        api_core = SimpleNamespace(exceptions=SimpleNamespace(AlreadyExists=type("AlreadyExists", (Exception,), {})))
+
+        with patch.dict(sys.modules, {"google.cloud.bigquery_storage_v1": storage, "google.api_core": api_core}), \
+                patch("builtins.print"):
+            result = write_rows(None, "p.d.t", _rows(3), FAKE_BIGQUERY, mode="storage_write",
+                                batch_size=2, write_client=write_client)
+
+        self.assertEqual(result["inserted_count"], 3)
+        self.assertEqual(result["error_count"], 0)
+        self.assertEqual(result["errors"], [])
+        self.assertEqual(result["appends"], 2)
+        self.assertIn("deadline exceeded", result["warnings"][0])
+
+
+class TestAppendExactlyOnce(unittest.TestCase):
+    """Storage Write retries reuse offsets; duplicates of landed appends count as written."""
+
+    def _run(self, outcomes, max_attempts=3):
+        sent = []
+        resets = []
+
+        def send(offset, batch):
+            sent.append(offset)
+            return outcomes.pop(0)
+
+        failed, errors, appends = bigquery_writer._append_exactly_once(
+            [(0, [b"a"]), (1, [b"b"]), (2, [b"c"])],
+            send,
+            lambda: resets.append(True),
+            lambda e: isinstance(e, KeyError),
+            max_attempts
+        )
+        return failed, errors, appends, sent, resets
+
+    def test_failure_resends_from_same_offsets(self):
+        # Attempt 1: offset 1 fails and the connection drops offset 2.
+        # Attempt 2: offset 1 had actually landed (duplicate), offset 2 lands.
+        outcomes = [_future(), _future(error=RuntimeError("unavailable")), _future(error=RuntimeError("closed")),
+                    _future(error=KeyError("already exists")), _future()]
+        failed, errors, appends, sent, resets = self._run(outcomes)
+
+        self.assertEqual(sent, [0, 1, 2, 1, 2])
+        self.assertEqual(failed, [])
+        self.assertEqual(errors, {})
+        self.assertEqual(appends, 5)
+        self.assertEqual(len(resets), 1)
+
+    def test_gives_up_after_max_attempts(self):
+        outcomes = [_future(), _future(), _future(error=RuntimeError("bad rows")),
+                    _future(error=RuntimeError("bad rows"))]
+        failed, errors, _, sent, _ = self._run(outcomes, max_attempts=2)
+
+        self.assertEqual(sent, [0, 1, 2, 2])
+        self.assertEqual(failed, [2])
+        self.assertEqual(errors, {2: "bad rows"})
+
+
+class TestStreamerWriteMode(unittest.TestCase):
+    """stream_transcript_chunks filters existing chunks before every writer."""
+
+    def _stream(self, write_mode, existing=()):
+        values = {"bigquery.write_mode": write_mode, "bigquery.batch_size": 250}
+        written = {"inserted_count": 2, "error_count": 0, "errors": [], "error_chunk_ids": []}
+        client = _bigquery_client(existing)
+
+        with patch.object(rag_config, "is_sink_enabled", return_value=True), \
+                patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: values.get(key, default)), \
+                patch.object(bigquery_streamer, "get_optional_env_var", return_value="configured"), \
+                patch.object(bigquery_streamer, "resolve_write_mode", side_effect=lambda mode: mode), \
+                patch.object(bigquery_streamer, "_ensure_table_exists", return_value={"success": True}), \
+                patch.object(bigquery_streamer, "write_rows", return_value=written) as writer, \
+                patch("rag.clients.get_bigquery_client", return_value=client), \
+                patch.dict(sys.modules, {"google.cloud": SimpleNamespace(bigquery=FAKE_BIGQUERY),
+                                         "google.cloud.bigquery": FAKE_BIGQUERY}):
+            result = bigquery_streamer.stream_transcript_chunks(_rows(2))
+        return result, client, writer
+
+    def test_storage_write_filters_existing_chunks(self):
+        result, client, writer = self._stream("storage_write")
+
+        client.query.assert_called_once()
+        self.assertEqual(writer.call_args.kwargs["mode"], "storage_write")
+        self.assertEqual(writer.call_args.kwargs["batch_size"], 250)
+        self.assertEqual(result["status"], "streamed")
+        self.assertEqual(result["write_mode"], "storage_write")
+
+    def test_streaming_filters_existing_chunks(self):
+        result, client, writer = self._stream("streaming", existing={"vid_chunk_0"})
+
+        client.query.assert_called_once()
+        self.assertEqual([row["chunk_id"] for row in writer.call_args.args[2]], ["vid_chunk_1"])
+        self.assertEqual(result["skipped_count"], 1)
+
+
+class TestExistingChunkIds(unittest.TestCase):
+    """The pre-write query runs against a bigquery.Client with an ARRAY<STRING> parameter."""
+
+    def test_query_binds_video_ids(self):
+        client = _bigquery_client(existing={"vid_chunk_0"})
+
+        with patch.dict(sys.modules, {"google.cloud": SimpleNamespace(bigquery=FAKE_BIGQUERY),
+                                      "google.cloud.bigquery": FAKE_BIGQUERY}):
+            existing = bigquery_streamer._get_existing_chunk_ids(client, "p.d.t", ["vid"])
+
+        self.assertEqual(existing, {"vid_chunk_0"})
+        parameter = client.query.call_args.kwargs["job_config"].query_parameters[0]
+        self.assertEqual((parameter.name, parameter.array_type, parameter.values), ("video_ids", "STRING", ["vid"]))
+
+    def test_query_failure_writes_everything(self):
+        client = _bigquery_client()
+        client.query.side_effect = RuntimeError("not found")
+
+        with patch.dict(sys.modules, {"google.cloud": SimpleNamespace(bigquery=FAKE_BIGQUERY),
+                                      "google.cloud.bigquery": FAKE_BIGQUERY}), \
+                patch("builtins.print"):
+            self.assertEqual(bigquery_streamer._get_existing_chunk_ids(client, "p.d.t", ["vid"]), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
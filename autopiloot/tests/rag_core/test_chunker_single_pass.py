@@ -0,0 +1,137 @@
+"""
+Tests for the single-pass chunker (chunker.stream_chunks / chunk_with_metadata).
+
+A small byte-level BPE encoding is injected in place of cl100k_base so the
+tests run offline and exercise multi-byte characters split across tokens.
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import tiktoken
+
+import rag.chunker as chunker
+
+
+def _test_encoding():
+    ranks = {bytes([i]): i for i in range(256)}
+    for merged in (b"th", b"the", b"in", b"er", b"he"):
+        ranks[merged] = len(ranks)
+    return tiktoken.Encoding(
+        name="test_bytes",
+        pat_str=r"\S+|\s+",
+        mergeable_ranks=ranks,
+        special_tokens={}
+    )
+
+
+ENCODING = _test_encoding()
+
+ASCII_TEXT = " ".join(f"the other word{i} in her theory" for i in range(60))
+UNICODE_TEXT = " ".join(f"naïve 日本語 emoji😀 café{i}" for i in range(40))
+
+
+def _legacy_chunks(text, max_tokens, overlap_tokens):
+    """The encode-then-decode-each-window algorithm the chunker replaced."""
+    tokens = ENCODING.encode(text)
+    if len(tokens) <= max_tokens:
+        return [text]
+    chunks, start = [], 0
+    while True:
+        end = min(start + max_tokens, len(tokens))
+        chunks.append(ENCODING.decode(tokens[start:end]))
+        if end >= len(tokens):
+            return chunks
+        start = end - overlap_tokens
+
+
+def _word_segments(text):
+    words = text.split(" ")
+    return [w + " " for w in words[:-1]] + [words[-1]]
+
+
+class TestSinglePassChunker(unittest.TestCase):
+    """Window boundaries, derived counts, offsets and streaming."""
+
+    def setUp(self):
+        self.patches = [
+            patch.object(chunker, "_encoding", ENCODING),
+            patch.object(chunker, "_char_tables", None),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def test_matches_legacy_windows(self):
+        for max_tokens, overlap in ((50, 10), (37, 0), (20, 19)):
+            chunks = chunker.chunk_text(ASCII_TEXT, max_tokens, overlap)
+            self.assertEqual(chunks, _legacy_chunks(ASCII_TEXT, max_tokens, overlap))
+
+    def test_counts_and_token_ids_come_from_windows(self):
+        tokens = ENCODING.encode(ASCII_TEXT)
+        chunks = chunker.chunk_with_metadata(ASCII_TEXT, 64, 8, doc_id="vid")
+
+        for i, chunk in enumerate(chunks):
+            self.assertEqual(chunk["token_ids"], tokens[chunk["token_start"]:chunk["token_end"]])
+            self.assertEqual(chunk["tokens"], len(chunk["token_ids"]))
+            self.assertEqual(chunk["chunk_id"], f"vid_chunk_{i}")
+            self.assertEqual(chunk["total_chunks"], len(chunks))
+        self.assertEqual(chunks[1]["token_start"], 56)
+        self.assertEqual(chunks[-1]["token_end"], len(tokens))
+
+    def test_char_offsets_slice_original_text(self):
+        for text in (ASCII_TEXT, UNICODE_TEXT):
+            chunks = chunker.chunk_with_metadata(text, 25, 5)
+            self.assertGreater(len(chunks), 3)
+            for chunk in chunks:
+                self.assertEqual(chunk["text"], text[chunk["char_start"]:chunk["char_end"]])
+            self.assertEqual(chunks[0]["char_start"], 0)
+            self.assertEqual(chunks[-1]["char_end"], len(text))
+
+    def test_tokenizes_once(self):
+        with patch.object(ENCODING, "encode", wraps=ENCODING.encode) as encode, \
+                patch.object(ENCODING, "decode", wraps=ENCODING.decode) as decode:
+            chunks = chunker.chunk_with_metadata(ASCII_TEXT, 40, 4)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(encode.call_count, 1)
+        decode.assert_not_called()
+
+    def test_stream_matches_single_text(self):
+        expected = chunker.chunk_with_metadata(UNICODE_TEXT, 30, 6, doc_id="doc")
+        streamed = list(chunker.stream_chunks(_word_segments(UNICODE_TEXT), 30, 6, doc_id="doc"))
+
+        for chunk in expected:
+            del chunk["total_chunks"]
+        self.assertEqual(streamed, expected)
+
+    def test_stream_compacts_buffers(self):
+        text = " ".join(["the other word"] * 4000)
+        with patch.object(chunker, "_COMPACT_TOKENS", 100):
+            streamed = list(chunker.stream_chunks(_word_segments(text), 50, 10))
+
+        self.assertEqual([c["text"] for c in streamed], _legacy_chunks(text, 50, 10))
+        for chunk in streamed:
+            self.assertEqual(chunk["text"], text[chunk["char_start"]:chunk["char_end"]])
+
+    def test_edge_cases(self):
+        self.assertEqual(chunker.chunk_text(""), [])
+        self.assertEqual(chunker.chunk_text("   \n "), [])
+        self.assertEqual(list(chunker.stream_chunks(["  ", "\n"])), [])
+        self.assertEqual(chunker.chunk_text("short text", max_tokens=100), ["short text"])
+
+        leading = list(chunker.stream_chunks(["   ", "hello"], max_tokens=100))
+        self.assertEqual(leading[0]["text"], "   hello")
+        self.assertEqual(chunker.count_tokens("the"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+"""
+Tests for the content-addressed embedding store in core/rag/embedding_cache.py.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+from rag import embedding_cache
+from rag.embedding_cache import configure_embedding_cache, get_embedding_cache_stats, get_embeddings
+
+
+class _Embedder:
+    """Deterministic embed_fn that records each batch it is called with."""
+
+    def __init__(self, dimensions=4):
+        self.dimensions = dimensions
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        return [[float(len(text)), float(sum(map(ord, text)) % 97), 1.0, 0.5][:self.dimensions] for text in texts]
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Memory and disk tiers, batching and hit ratio."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.config = {"enabled": True, "memory_entries": 100, "max_batch_size": 1000,
+                       "disk": {"enabled": True, "path": self.directory}}
+        configure_embedding_cache(self.config, ttl_seconds=60)
+
+    def tearDown(self):
+        embedding_cache.reset_embedding_cache()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_misses_filled_in_one_call_then_served_from_memory(self):
+        embed = _Embedder()
+        texts = ["pricing", "hiring", "pricing", "churn"]
+
+        cold = get_embeddings(texts, "model-a", embed)
+        warm = get_embeddings(texts, "model-a", embed)
+
+        self.assertEqual(embed.batches, [["pricing", "hiring", "churn"]])
+        self.assertEqual(cold["embeddings"].shape, (4, 4))
+        self.assertEqual(cold["embeddings"].dtype, np.float32)
+        np.testing.assert_array_equal(cold["embeddings"][0], cold["embeddings"][2])
+        self.assertEqual((cold["misses"], cold["api_calls"], cold["hit_ratio"]), (3, 1, 0.0))
+        self.assertEqual((warm["memory_hits"], warm["api_calls"], warm["hit_ratio"]), (4, 0, 1.0))
+        np.testing.assert_array_equal(cold["embeddings"], warm["embeddings"])
+
+    def test_disk_tier_survives_restart_and_is_per_model(self):
+        embed = _Embedder()
+        first = get_embeddings(["pricing", "hiring"], "model-a", embed)
+
+        # New process: empty memory tier, same directory
+        configure_embedding_cache(self.config, ttl_seconds=60)
+        restarted = get_embeddings(["hiring", "pricing", "churn"], "model-a", embed)
+        other_model = get_embeddings(["pricing"], "model-b", embed)
+
+        self.assertEqual(restarted["disk_hits"], 2)
+        self.assertEqual(restarted["misses"], 1)
+        np.testing.assert_array_equal(restarted["embeddings"][1], first["embeddings"][0])
+        self.assertEqual(other_model["misses"], 1)
+        self.assertEqual(embed.batches, [["pricing", "hiring"], ["churn"], ["pricing"]])
+        self.assertTrue(os.path.exists(os.path.join(self.directory, "model-a", "vectors.f32")))
+
+    def test_rows_appended_by_another_worker_are_visible(self):
+        embed = _Embedder()
+        get_embeddings(["pricing"], "model-a", embed)
+        reader = embedding_cache._DiskTier(os.path.join(self.directory, "model-a"))
+        self.assertEqual(list(reader.get_many([embedding_cache.sha256_hex("pricing")])), [embedding_cache.sha256_hex("pricing")])
+
+        get_embeddings(["churn"], "model-a", embed)
+        found = reader.get_many([embedding_cache.sha256_hex("churn")])
+
+        np.testing.assert_array_equal(found[embedding_cache.sha256_hex("churn")], np.float32(embed(["churn"])[0]))
+
+    def test_misses_are_batched_by_max_batch_size(self):
+        configure_embedding_cache(dict(self.config, max_batch_size=2), ttl_seconds=60)
+        embed = _Embedder()
+
+        result = get_embeddings(["a", "b", "c", "d", "e"], "model-a", embed)
+
+        self.assertEqual([len(batch) for batch in embed.batches], [2, 2, 1])
+        self.assertEqual(result["api_calls"], 3)
+
+    def test_wrong_vector_count_raises_and_caches_nothing(self):
+        with self.assertRaises(ValueError):
+            get_embeddings(["pricing", "hiring"], "model-a", lambda texts: [[1.0, 2.0]])
+
+        embed = _Embedder()
+        self.assertEqual(get_embeddings(["pricing"], "model-a", embed)["misses"], 1)
+
+    def test_unusable_disk_path_falls_back_to_memory(self):
+        blocker = os.path.join(self.directory, "not_a_directory")
+        with open(blocker, "w") as f:
+            f.write("x")
+        configure_embedding_cache(dict(self.config, disk={"enabled": True, "path": blocker}), ttl_seconds=60)
+        embed = _Embedder()
+
+        with patch("builtins.print"):
+            cold = get_embeddings(["pricing"], "model-a", embed)
+        warm = get_embeddings(["pricing"], "model-a", embed)
+
+        self.assertEqual(cold["misses"], 1)
+        self.assertEqual(warm["memory_hits"], 1)
+        self.assertEqual(get_embedding_cache_stats()["errors"], 1)
+
+    def test_partial_row_truncated_before_append(self):
+        embed = _Embedder()
+        get_embeddings(["a", "b"], "model-a", embed)
+        vectors_path = os.path.join(self.directory, "model-a", "vectors.f32")
+        with open(vectors_path, "ab") as f:
+            f.write(b"\x00" * 6)  # Interrupted append: 1.5 float32 values
+
+        get_embeddings(["c"], "model-a", embed)
+        self.assertEqual(os.path.getsize(vectors_path), 3 * 4 * 4)
+
+        configure_embedding_cache(self.config, ttl_seconds=60)
+        restarted = get_embeddings(["a", "b", "c"], "model-a", _Embedder())
+        self.assertEqual(restarted["disk_hits"], 3)
+        np.testing.assert_array_equal(restarted["embeddings"][2], np.asarray(embed(["c"])[0], dtype=np.float32))
+
+    def test_disk_tier_is_opt_in(self):
+        status = configure_embedding_cache({"enabled": True}, ttl_seconds=60)
+        self.assertEqual(status["tiers"], ["memory"])
+
+    def test_memory_ttl_and_lru_bound(self):
+        configure_embedding_cache(dict(self.config, memory_entries=2, disk={"enabled": False}), ttl_seconds=0.05)
+        embed = _Embedder()
+
+        get_embeddings(["a", "b", "c"], "model-a", embed)
+        self.assertEqual(get_embedding_cache_stats()["memory_entries"], 2)
+        self.assertEqual(get_embeddings(["c"], "model-a", embed)["memory_hits"], 1)
+        self.assertEqual(get_embeddings(["a"], "model-a", embed)["misses"], 1)
+
+        time.sleep(0.06)
+        self.assertEqual(get_embeddings(["a"], "model-a", embed)["misses"], 1)
+
+    def test_disabled_cache_embeds_every_call(self):
+        configure_embedding_cache({"enabled": False}, ttl_seconds=60)
+        embed = _Embedder()
+
+        get_embeddings(["pricing"], "model-a", embed)
+        result = get_embeddings(["pricing"], "model-a", embed)
+
+        self.assertEqual(result["misses"], 1)
+        self.assertEqual(len(embed.batches), 2)
+        self.assertFalse(get_embedding_cache_stats()["enabled"])
+
+    def test_stats_hit_ratio(self):
+        embed = _Embedder()
+        get_embeddings(["a", "b"], "model-a", embed)
+        get_embeddings(["a", "b"], "model-a", embed)
+
+        stats = get_embedding_cache_stats()
+        self.assertEqual(stats["lookups"], 4)
+        self.assertEqual(stats["api_calls"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
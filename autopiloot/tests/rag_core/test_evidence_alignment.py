@@ -0,0 +1,180 @@
+"""
+Tests for post-fusion near-duplicate alignment in core/rag/evidence_alignment.py.
+"""
+
+import copy
+import os
+import random
+import string
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import rag.config as rag_config
+import rag.cache as retrieval_cache
+from rag import hybrid_retrieve
+from rag.evidence_alignment import align_evidence, similarity_matrix, trust_score
+
+
+CONFIG = {
+    "similarity_threshold": 0.85,
+    "trust_hierarchy": {"multi_source": 3, "zep": 2, "bigquery": 2, "opensearch": 1},
+    "conflict_detection": {"numerical_threshold": 0.5, "temporal_threshold": 0.5},
+    "signature": {"max_chars": 1024, "dimensions": 512, "sample_rate": 16},
+    "logging": {"enabled": False}
+}
+
+
+def _passages(count, seed=4):
+    rng = random.Random(seed)
+    vocab = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))) for _ in range(4000)]
+    return [" ".join(rng.choice(vocab) for _ in range(rng.randint(120, 180))) for _ in range(count)]
+
+
+def _result(chunk_id, text, source, rank, score):
+    return {"chunk_id": chunk_id, "text": text, "score": score, "sources": [source],
+            "provenance": {source: {"score": 0.9, "rank": rank}}}
+
+
+class TestSimilarityMatrix(unittest.TestCase):
+    """Signature similarity separates near-duplicates from distinct passages."""
+
+    def test_near_duplicates_score_high(self):
+        texts = _passages(40)
+        texts.append(texts[0][40:] + " trailing words")     # shifted chunk boundary
+        texts.append(texts[1].upper())                      # casing
+        texts.append("  ".join(texts[2].split(" ")))        # whitespace (partial)
+        sims = similarity_matrix(texts)
+
+        self.assertEqual(sims.shape, (43, 43))
+        self.assertGreater(sims[0, 40], 0.85)
+        self.assertGreater(sims[1, 41], 0.99)
+        unrelated = [sims[i, j] for i in range(40) for j in range(i + 1, 40)]
+        self.assertLess(max(unrelated), 0.5)
+
+    def test_empty_and_short_texts(self):
+        sims = similarity_matrix(["", "", "short text about pricing"])
+        self.assertEqual(float(sims[0, 1]), 0.0)
+        self.assertAlmostEqual(float(sims[2, 2]), 1.0, places=5)
+        self.assertEqual(similarity_matrix([]).shape, (0, 0))
+
+
+class TestAlignEvidence(unittest.TestCase):
+    """Merging, trust hierarchy and conflicts."""
+
+    def setUp(self):
+        self.texts = _passages(6)
+
+    def test_merges_near_duplicates_and_provenance(self):
+        results = [
+            _result("os_a", self.texts[0], "opensearch", 1, 0.05),
+            _result("b", self.texts[1], "zep", 1, 0.04),
+            _result("zep_a", self.texts[0].upper(), "zep", 2, 0.03),
+            _result("c", self.texts[2], "bigquery", 1, 0.02),
+        ]
+        before = copy.deepcopy(results)
+        outcome = align_evidence(results, CONFIG)
+
+        self.assertEqual([r["chunk_id"] for r in outcome["results"]], ["zep_a", "b", "c"])
+        merged = outcome["results"][0]
+        self.assertEqual(merged["score"], 0.05)
+        self.assertEqual(merged["sources"], ["zep", "opensearch"])
+        self.assertEqual(set(merged["provenance"]), {"zep", "opensearch"})
+        self.assertEqual(merged["aligned_chunk_ids"], ["os_a"])
+        self.assertEqual(merged["trust_score"], 3)
+        self.assertEqual(outcome["duplicates_merged"], 1)
+        self.assertEqual(outcome["groups"][0]["kept"], "zep_a")
+        self.assertEqual(results, before)
+
+    def test_rank_breaks_trust_ties(self):
+        results = [_result("first", self.texts[3], "zep", 1, 0.9),
+                   _result("second", self.texts[3] + " end", "bigquery", 1, 0.8)]
+        outcome = align_evidence(results, CONFIG)
+        self.assertEqual(outcome["results"][0]["chunk_id"], "first")
+        self.assertEqual(outcome["results"][0]["sources"], ["zep", "bigquery"])
+
+    def test_numerical_conflicts_are_flagged_not_merged(self):
+        base = self.texts[4]
+        results = [_result("a", base + " churn fell to 5% in 2023", "zep", 1, 0.9),
+                   _result("b", base + " churn fell to 9% in 2023", "opensearch", 1, 0.8)]
+        outcome = align_evidence(results, CONFIG)
+
+        self.assertEqual(len(outcome["results"]), 2)
+        self.assertEqual(outcome["duplicates_merged"], 0)
+        conflict = outcome["conflicts"][0]
+        self.assertEqual(conflict["type"], "numerical")
+        self.assertEqual(conflict["values"], [["5%"], ["9%"]])
+        self.assertEqual(conflict["preferred"], "a")
+
+    def test_added_detail_is_merged_not_a_conflict(self):
+        base = self.texts[4]
+        results = [_result("a", base + " churn fell to 5%", "zep", 1, 0.9),
+                   _result("b", base + " churn fell to 5% across 40 clients", "opensearch", 1, 0.8)]
+        outcome = align_evidence(results, CONFIG)
+
+        self.assertEqual(outcome["conflicts"], [])
+        self.assertEqual(outcome["duplicates_merged"], 1)
+
+    def test_differing_units_are_not_a_conflict(self):
+        base = self.texts[4]
+        results = [_result("a", base + " churn fell to 5%", "zep", 1, 0.9),
+                   _result("b", base + " churn fell to $5", "opensearch", 1, 0.8)]
+        outcome = align_evidence(results, CONFIG)
+
+        self.assertEqual(outcome["conflicts"], [])
+
+    def test_trust_score(self):
+        hierarchy = CONFIG["trust_hierarchy"]
+        self.assertEqual(trust_score(["opensearch"], hierarchy), 1)
+        self.assertEqual(trust_score(["opensearch", "zep"], hierarchy), 3)
+        self.assertEqual(trust_score(["unknown"], hierarchy), 0)
+
+
+class TestSearchAlignment(unittest.TestCase):
+    """search() aligns an enlarged candidate pool and reports a summary."""
+
+    def setUp(self):
+        retrieval_cache.configure_cache({"enabled": False})
+
+    def tearDown(self):
+        retrieval_cache.reset_cache()
+
+    def _search(self, alignment_config, limit=2):
+        texts = _passages(3)
+        zep = [{"chunk_id": "z0", "text": texts[0], "score": 0.9, "content_sha256": "h_z0"},
+               {"chunk_id": "z1", "text": texts[1], "score": 0.8, "content_sha256": "h_z1"}]
+        opensearch = [{"chunk_id": "o0", "text": texts[0].upper(), "score": 9.0, "content_sha256": "h_o0"},
+                      {"chunk_id": "o2", "text": texts[2], "score": 7.0, "content_sha256": "h_o2"}]
+        values = {"timeouts.search_ms": 2000, "routing": {"mode": "always_on"},
+                  "experiments.default_parameters.fusion.algorithm": "rrf"}
+        sources = {"zep": zep, "opensearch": opensearch}
+
+        with patch.object(rag_config, "is_sink_enabled", side_effect=lambda name: name in sources), \
+                patch.object(rag_config, "get_retrieval_config", return_value={"top_k": 10, "timeout_ms": 1000, "weights": {}}), \
+                patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: values.get(key, default)), \
+                patch.object(rag_config, "get_evidence_alignment_config", return_value=alignment_config), \
+                patch.object(hybrid_retrieve, "_query_zep", return_value={"status": "success", "results": zep}), \
+                patch.object(hybrid_retrieve, "_query_opensearch", return_value={"status": "success", "results": opensearch}), \
+                patch("rag.tracing.emit_retrieval_event"):
+            return hybrid_retrieve.search("pricing", limit=limit)
+
+    def test_merged_duplicates_are_backfilled(self):
+        response = self._search(dict(CONFIG, enabled=True, candidate_pool_factor=2))
+
+        self.assertEqual(response["total_results"], 2)
+        self.assertEqual(response["results"][0]["sources"], ["zep", "opensearch"])
+        self.assertEqual(response["alignment"]["duplicates_merged"], 1)
+        self.assertEqual(len({r["chunk_id"] for r in response["results"]} & {"z0", "o0"}), 1)
+
+    def test_disabled_alignment_keeps_fusion_output(self):
+        response = self._search(dict(CONFIG, enabled=False))
+
+        self.assertIsNone(response["alignment"])
+        self.assertEqual({r["chunk_id"] for r in response["results"]}, {"z0", "o0"})
+
+
+if __name__ == "__main__":
+    unittest.main()
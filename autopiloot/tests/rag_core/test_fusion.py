@@ -0,0 +1,117 @@
+"""
+Tests for heap-based result fusion in core/rag/fusion.py.
+"""
+
+import copy
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+from rag import hybrid_retrieve
+from rag.fusion import fuse, FUSION_METHODS
+from rag.hashing import sha256_hex
+
+
+def _sources(seed=5, per_source=40, pool=60):
+    rng = random.Random(seed)
+    sources = {}
+    for name, scale in (("zep", 1.0), ("opensearch", 20.0), ("bigquery", 1.0)):
+        ids = rng.sample(range(pool), per_source)
+        sources[name] = [
+            {"chunk_id": f"c{i}", "text": f"chunk {i}", "score": round(scale * rng.random(), 4),
+             "content_sha256": f"h{i}"}
+            for i in ids
+        ]
+    return sources
+
+
+def _reference(source_results, method, weights, k=60):
+    """Full-sort fusion used before rag.fusion."""
+    unified = {}
+    for name, results in source_results.items():
+        scores = [r["score"] for r in results]
+        low, high = min(scores), max(scores)
+        mean = sum(scores) / len(scores)
+        std = (sum((s - mean) ** 2 for s in scores) / len(scores)) ** 0.5
+        for rank, result in enumerate(results, start=1):
+            key = result.get("content_sha256") or sha256_hex(result["text"])
+            entry = unified.setdefault(key, {"chunk_id": result["chunk_id"], "score": 0.0})
+            if method == "rrf":
+                entry["score"] += 1.0 / (k + rank)
+            elif method == "weighted":
+                entry["score"] += result["score"] * weights.get(name, 1.0)
+            elif method == "minmax":
+                entry["score"] += (result["score"] - low) / (high - low) * weights.get(name, 1.0)
+            elif method == "zscore":
+                entry["score"] += (result["score"] - mean) / std * weights.get(name, 1.0)
+    return sorted(unified.values(), key=lambda e: e["score"], reverse=True)
+
+
+class TestFuse(unittest.TestCase):
+    """Scores and top-k selection match a full sort."""
+
+    def setUp(self):
+        self.sources = _sources()
+        self.weights = {"zep": 0.6, "opensearch": 0.3, "bigquery": 0.1}
+
+    def test_top_k_matches_full_sort(self):
+        for method in ("rrf", "weighted", "minmax", "zscore"):
+            expected = _reference(self.sources, method, self.weights)
+            fused = fuse(self.sources, method, limit=10, weights=self.weights)
+
+            self.assertEqual(len(fused), 10, method)
+            self.assertEqual([r["chunk_id"] for r in fused], [e["chunk_id"] for e in expected[:10]], method)
+            for result, entry in zip(fused, expected):
+                self.assertAlmostEqual(result["score"], entry["score"], msg=method)
+
+    def test_inputs_not_modified(self):
+        before = copy.deepcopy(self.sources)
+        for method in FUSION_METHODS:
+            fused = fuse(self.sources, method, limit=5, weights=self.weights)
+            self.assertNotIn("content_sha256", fused[0])
+        self.assertEqual(self.sources, before)
+
+    def test_provenance_and_sources(self):
+        sources = {
+            "zep": [{"chunk_id": "a", "text": "A", "score": 0.9}, {"chunk_id": "b", "text": "B", "score": 0.5}],
+            "opensearch": [{"chunk_id": "b", "text": "B", "score": 12.0}],
+        }
+        fused = fuse(sources, "rrf")
+
+        self.assertEqual(fused[0]["chunk_id"], "b")
+        self.assertEqual(fused[0]["sources"], ["zep", "opensearch"])
+        self.assertEqual(fused[0]["provenance"], {"zep": {"score": 0.5, "rank": 2},
+                                                  "opensearch": {"score": 12.0, "rank": 1}})
+        self.assertAlmostEqual(fused[0]["score"], 1 / 62 + 1 / 61)
+
+    def test_normalized_methods_handle_constant_scores(self):
+        sources = {"bigquery": [{"chunk_id": c, "text": c, "score": 1.0} for c in "xyz"]}
+        self.assertEqual([r["score"] for r in fuse(sources, "minmax")], [1.0, 1.0, 1.0])
+        self.assertEqual([r["chunk_id"] for r in fuse(sources, "zscore")], ["x", "y", "z"])
+
+    def test_unknown_method_falls_back_to_first_seen(self):
+        fused = fuse(self.sources, "cascade", limit=3)
+        self.assertEqual([r["chunk_id"] for r in fused], [r["chunk_id"] for r in self.sources["zep"][:3]])
+        self.assertEqual(fused[0]["score"], self.sources["zep"][0]["score"])
+
+    def test_empty_sources(self):
+        self.assertEqual(fuse({"zep": [], "opensearch": []}, "zscore", limit=5), [])
+
+
+class TestSearchUsesFusion(unittest.TestCase):
+    """hybrid_retrieve helpers delegate to rag.fusion."""
+
+    def test_legacy_helpers_accept_limit(self):
+        sources = _sources()
+        self.assertEqual(hybrid_retrieve._rrf_fusion(sources, k=60, limit=7), fuse(sources, "rrf", limit=7))
+        unique = {r["content_sha256"] for results in sources.values() for r in results}
+        self.assertEqual(len(hybrid_retrieve._weighted_fusion(sources, {"zep": 1.0})), len(unique))
+        self.assertEqual(len(hybrid_retrieve._simple_fusion(sources, limit=4)), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Tests for concurrent source fan-out in hybrid_retrieve.search.
+
+Sources are replaced with sleeping fakes so the tests exercise the real
+deadline handling without network access.
+"""
+
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+from core.rag import hybrid_retrieve
+import rag.config as rag_config
+import rag.cache as retrieval_cache
+
+
+def _fake_source(name, delay_s, status="success"):
+    def query(query, filters, top_k, timeout):
+        time.sleep(delay_s)
+        return {
+            "status": status,
+            "results": [{
+                "chunk_id": f"{name}_0",
+                "text": f"{name} result",
+                "score": 0.9,
+                "content_sha256": f"hash_{name}",
+                "source": name
+            }]
+        }
+    return query
+
+
+class TestHybridRetrieveFanOut(unittest.TestCase):
+    """Fan-out concurrency and deadline behaviour."""
+
+    def setUp(self):
+        retrieval_cache.configure_cache({"enabled": False})
+
+    def tearDown(self):
+        retrieval_cache.reset_cache()
+
+    def _search(self, zep, opensearch, bigquery, search_ms=2000):
+        rag_values = {
+            "timeouts.search_ms": search_ms,
+            "experiments.default_parameters.fusion.algorithm": "rrf",
+            "experiments.default_parameters.fusion.rrf_k": 60,
+        }
+        retrieval_config = {"top_k": 20, "timeout_ms": 2000, "weights": {}}
+
+        with patch.object(rag_config, "is_sink_enabled", return_value=True), \
+                patch.object(rag_config, "get_retrieval_config", return_value=retrieval_config), \
+                patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: rag_values.get(key, default)), \
+                patch.object(hybrid_retrieve, "_query_zep", zep), \
+                patch.object(hybrid_retrieve, "_query_opensearch", opensearch), \
+                patch.object(hybrid_retrieve, "_query_bigquery", bigquery), \
+                patch("rag.tracing.emit_retrieval_event"):
+            return hybrid_retrieve.search("revenue growth", limit=10)
+
+    def test_sources_queried_concurrently(self):
+        started = time.time()
+        result = self._search(
+            _fake_source("zep", 0.3),
+            _fake_source("opensearch", 0.3),
+            _fake_source("bigquery", 0.3)
+        )
+        elapsed = time.time() - started
+
+        self.assertLess(elapsed, 0.8, "sources should not run sequentially")
+        self.assertEqual(set(result["sources_used"]), {"zep", "opensearch", "bigquery"})
+        self.assertEqual(result["timed_out_sources"], [])
+        self.assertEqual(result["coverage"], 100.0)
+
+    def test_slow_source_dropped_at_deadline(self):
+        started = time.time()
+        result = self._search(
+            _fake_source("zep", 0.0),
+            _fake_source("opensearch", 0.0),
+            _fake_source("bigquery", 2.0),
+            search_ms=300
+        )
+        elapsed = time.time() - started
+
+        self.assertLess(elapsed, 1.0, "search must not wait for the slow source")
+        self.assertEqual(result["timed_out_sources"], ["bigquery"])
+        self.assertNotIn("bigquery", result["sources_used"])
+        self.assertEqual(result["source_latencies"]["bigquery"], 300)
+        self.assertAlmostEqual(result["coverage"], 200 / 3)
+        self.assertEqual({r["chunk_id"] for r in result["results"]}, {"zep_0", "opensearch_0"})
+
+    def test_all_sources_time_out(self):
+        result = self._search(
+            _fake_source("zep", 1.0),
+            _fake_source("opensearch", 1.0),
+            _fake_source("bigquery", 1.0),
+            search_ms=100
+        )
+
+        self.assertEqual(result["results"], [])
+        self.assertEqual(result["coverage"], 0.0)
+        self.assertEqual(result["timed_out_sources"], ["zep", "opensearch", "bigquery"])
+
+    def test_source_exception_isolated(self):
+        def broken(query, filters, top_k, timeout):
+            raise RuntimeError("boom")
+
+        result = self._search(broken, _fake_source("opensearch", 0.0), _fake_source("bigquery", 0.0))
+
+        self.assertEqual(set(result["sources_used"]), {"opensearch", "bigquery"})
+        self.assertIn("zep", result["source_latencies"])
+        self.assertEqual(result["timed_out_sources"], [])
+
+    def test_per_source_timeout_capped_by_budget(self):
+        seen = {}
+
+        def capture(name):
+            def query(query, filters, top_k, timeout):
+                seen[name] = timeout
+                return {"status": "success", "results": []}
+            return query
+
+        self._search(capture("zep"), capture("opensearch"), capture("bigquery"), search_ms=500)
+        self.assertEqual(set(seen.values()), {0.5})
+
+
+if __name__ == "__main__":
+    unittest.main()
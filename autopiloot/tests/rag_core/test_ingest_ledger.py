@@ -0,0 +1,271 @@
+"""
+Tests for the content-hash ingest ledger (core/rag/ledger.py) and its use in
+ingest_transcript.ingest() / ingest_many().
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch, MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import rag.config as rag_config
+import rag.tracing as tracing
+import rag.ledger as ledger
+import rag.ingest_transcript as ingest_transcript
+
+
+MEMORY_CONFIG = {"enabled": True, "local_path": ":memory:", "firestore": {"enabled": False}}
+
+
+class FakeFirestore:
+    """Minimal collection/document store with optional failures."""
+
+    def __init__(self, fail=False):
+        self.docs = {}
+        self.fail = fail
+
+    def collection(self, name):
+        return self
+
+    def document(self, doc_id):
+        store = self
+        doc = MagicMock()
+
+        def get():
+            if store.fail:
+                raise RuntimeError("firestore down")
+            snapshot = MagicMock(exists=doc_id in store.docs)
+            snapshot.to_dict.return_value = store.docs.get(doc_id)
+            return snapshot
+
+        def set_(data):
+            if store.fail:
+                raise RuntimeError("firestore down")
+            store.docs[doc_id] = data
+
+        doc.get.side_effect = get
+        doc.set.side_effect = set_
+        return doc
+
+
+def _fake_chunks(text, max_tokens, overlap_tokens, doc_id=None):
+    return [
+        {"text": part, "tokens": 1, "chunk_index": i, "total_chunks": 0, "chunk_id": f"{doc_id}_chunk_{i}"}
+        for i, part in enumerate(text.split("|"))
+    ]
+
+
+class TestLedgerPlan(unittest.TestCase):
+    """plan_chunks / record_chunks bookkeeping."""
+
+    def setUp(self):
+        ledger.configure_ledger(dict(MEMORY_CONFIG))
+
+    def tearDown(self):
+        ledger.reset_ledger()
+
+    def test_disabled_ledger_returns_none(self):
+        ledger.configure_ledger({"enabled": False})
+        self.assertIsNone(ledger.plan_chunks("vid", ["a"], ["opensearch"]))
+        self.assertFalse(ledger.is_ledger_enabled())
+
+    def test_unchanged_chunks_skipped_and_diff_pending(self):
+        sinks = ["opensearch", "zep"]
+        plan = ledger.plan_chunks("vid", ["a", "b", "c"], sinks)
+        self.assertEqual(plan["pending"], {"opensearch": [0, 1, 2], "zep": [0, 1, 2]})
+        self.assertTrue(ledger.record_chunks(plan, {"opensearch": [0, 1, 2], "zep": [0, 1, 2]}))
+
+        plan = ledger.plan_chunks("vid", ["a", "B", "c", "d"], sinks)
+        self.assertEqual(plan["skipped_count"], 2)
+        self.assertEqual(plan["changed_count"], 2)
+        self.assertEqual(plan["pending"], {"opensearch": [1, 3], "zep": [1, 3]})
+
+    def test_failed_sink_write_stays_pending(self):
+        plan = ledger.plan_chunks("vid", ["a", "b"], ["opensearch", "zep"])
+        ledger.record_chunks(plan, {"opensearch": [0, 1], "zep": [0]})
+
+        plan = ledger.plan_chunks("vid", ["a", "b"], ["opensearch", "zep"])
+        self.assertEqual(plan["pending"], {"opensearch": [], "zep": [1]})
+        self.assertEqual(plan["skipped_count"], 1)
+
+    def test_newly_enabled_sink_is_backfilled(self):
+        plan = ledger.plan_chunks("vid", ["a", "b"], ["opensearch"])
+        ledger.record_chunks(plan, {"opensearch": [0, 1]})
+
+        plan = ledger.plan_chunks("vid", ["a", "b"], ["opensearch", "bigquery"])
+        self.assertEqual(plan["pending"], {"opensearch": [], "bigquery": [0, 1]})
+        self.assertEqual(plan["changed_count"], 0)
+
+    def test_shrunk_transcript_reports_removed(self):
+        plan = ledger.plan_chunks("vid", ["a", "b", "c"], ["opensearch"])
+        ledger.record_chunks(plan, {"opensearch": [0, 1, 2]})
+
+        plan = ledger.plan_chunks("vid", ["a"], ["opensearch"])
+        self.assertEqual(plan["removed_count"], 2)
+        self.assertTrue(ledger.record_chunks(plan, {"opensearch": []}))
+        self.assertEqual(list(ledger.get_ledger().local.get("vid")), [0])
+
+    def test_firestore_warms_local_tier(self):
+        remote = FakeFirestore()
+        ledger.configure_ledger({**MEMORY_CONFIG, "firestore": {"enabled": True}}, firestore_client=remote)
+        plan = ledger.plan_chunks("vid", ["a"], ["opensearch"])
+        ledger.record_chunks(plan, {"opensearch": [0]})
+        self.assertEqual(remote.docs["vid"]["chunks"]["0"]["content_sha256"], "a")
+
+        # Fresh worker: empty local tier, shared Firestore tier
+        ledger.configure_ledger({**MEMORY_CONFIG, "firestore": {"enabled": True}}, firestore_client=remote)
+        plan = ledger.plan_chunks("vid", ["a"], ["opensearch"])
+        self.assertEqual(plan["skipped_count"], 1)
+        self.assertEqual(ledger.get_ledger_stats()["remote_hits"], 1)
+
+        ledger.plan_chunks("vid", ["a"], ["opensearch"])
+        self.assertEqual(ledger.get_ledger_stats()["local_hits"], 1)
+
+    def test_firestore_failure_is_best_effort(self):
+        ledger.configure_ledger({**MEMORY_CONFIG, "firestore": {"enabled": True}}, firestore_client=FakeFirestore(fail=True))
+        plan = ledger.plan_chunks("vid", ["a"], ["opensearch"])
+        self.assertTrue(ledger.record_chunks(plan, {"opensearch": [0]}))
+
+        plan = ledger.plan_chunks("vid", ["a"], ["opensearch"])
+        self.assertEqual(plan["skipped_count"], 1)
+        self.assertGreaterEqual(ledger.get_ledger_stats()["remote_errors"], 2)
+
+
+    def test_expired_local_entries_reconfirmed_by_firestore(self):
+        remote = FakeFirestore()
+        ledger.configure_ledger({**MEMORY_CONFIG, "local_ttl_sec": 60, "firestore": {"enabled": True}},
+                                firestore_client=remote)
+        plan = ledger.plan_chunks("vid", ["a"], ["opensearch"])
+        ledger.record_chunks(plan, {"opensearch": [0]})
+
+        # Another worker re-ingested an edited chunk; this worker's copy is past its TTL
+        remote.docs["vid"]["chunks"]["0"]["content_sha256"] = "b"
+        with patch.object(ledger.time, "time", return_value=ledger.time.time() + 120):
+            plan = ledger.plan_chunks("vid", ["b"], ["opensearch"])
+
+        self.assertEqual(plan["skipped_count"], 1)
+        self.assertEqual(ledger.get_ledger_stats()["remote_hits"], 1)
+
+    def test_local_tier_failure_falls_back_to_firestore_only(self):
+        remote = FakeFirestore()
+        with patch.object(ledger, "_LocalLedger", side_effect=OSError("read-only filesystem")), \
+                patch("builtins.print"):
+            status = ledger.configure_ledger({**MEMORY_CONFIG, "firestore": {"enabled": True}},
+                                             firestore_client=remote)
+        self.assertEqual(status["tiers"], ["firestore"])
+
+        plan = ledger.plan_chunks("vid", ["a"], ["opensearch"])
+        self.assertTrue(ledger.record_chunks(plan, {"opensearch": [0]}))
+        self.assertEqual(ledger.plan_chunks("vid", ["a"], ["opensearch"])["skipped_count"], 1)
+
+
+class TestIngestUsesLedger(unittest.TestCase):
+    """ingest() and ingest_many() ship only new or changed chunks."""
+
+    def setUp(self):
+        ledger.configure_ledger(dict(MEMORY_CONFIG))
+        self.sent = {"opensearch": [], "bigquery": [], "zep": []}
+
+        def index(docs):
+            self.sent["opensearch"].append([d["chunk_id"] for d in docs])
+            return {"status": "indexed", "indexed_count": len(docs), "error_count": 0, "errors": []}
+
+        def stream(rows):
+            self.sent["bigquery"].append([r["chunk_id"] for r in rows])
+            return {"status": "streamed", "inserted_count": len(rows)}
+
+        def upsert(video_id, messages):
+            self.sent["zep"].append([m["metadata"]["chunk_id"] for m in messages])
+            return {
+                "status": "upserted",
+                "upserted_count": len(messages),
+                "chunks": [{"chunk_id": m["metadata"]["chunk_id"], "status": "upserted"} for m in messages]
+            }
+
+        self.patches = [
+            patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: default),
+            patch.object(rag_config, "get_rag_flag", return_value=True),
+            patch.object(rag_config, "get_chunking_config", return_value={"max_tokens_per_chunk": 1000, "overlap_tokens": 100}),
+            patch.object(tracing, "emit_ingest_event"),
+            patch("rag.cache.invalidate_on_new_content"),
+            patch.object(ingest_transcript, "chunk_with_metadata", side_effect=_fake_chunks),
+            patch.object(ingest_transcript, "index_transcript_chunks", side_effect=index),
+            patch.object(ingest_transcript, "stream_transcript_chunks", side_effect=stream),
+            patch.object(ingest_transcript, "upsert_transcript_batch", side_effect=upsert),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        ledger.reset_ledger()
+
+    def _ingest(self, text, video_id="vid"):
+        return ingest_transcript.ingest({"video_id": video_id, "transcript_text": text, "channel_id": "UC1"})
+
+    def test_reingest_unchanged_skips_every_sink(self):
+        first = self._ingest("one|two|three")
+        self.assertEqual(first["ledger"]["changed_count"], 3)
+
+        self.sent = {"opensearch": [], "bigquery": [], "zep": []}
+        second = self._ingest("one|two|three")
+
+        self.assertEqual(self.sent, {"opensearch": [], "bigquery": [], "zep": []})
+        self.assertEqual(second["status"], "success")
+        self.assertEqual(second["ledger"]["skipped_count"], 3)
+        self.assertEqual(second["ledger"]["sent"], {"opensearch": 0, "bigquery": 0, "zep": 0})
+        self.assertEqual(second["sinks"]["zep"]["status"], "skipped")
+
+    def test_ingest_flushes_queued_refs(self):
+        with patch("rag.refs.flush_refs") as flush:
+            self._ingest("one|two")
+
+        flush.assert_called_once_with(reason="ingest")
+
+    def test_changed_chunk_ships_only_the_diff(self):
+        self._ingest("one|two|three")
+        self.sent = {"opensearch": [], "bigquery": [], "zep": []}
+
+        result = self._ingest("one|TWO|three")
+
+        for sink in ("opensearch", "bigquery", "zep"):
+            self.assertEqual(self.sent[sink], [["vid_chunk_1"]])
+        self.assertEqual(result["ledger"]["skipped_count"], 2)
+        self.assertEqual(result["ledger"]["changed_count"], 1)
+
+    def test_failed_sink_retried_on_next_ingest(self):
+        with patch.object(ingest_transcript, "stream_transcript_chunks", return_value={"status": "error", "message": "down"}):
+            self._ingest("one|two")
+        self.sent = {"opensearch": [], "bigquery": [], "zep": []}
+
+        self._ingest("one|two")
+        self.assertEqual(self.sent["opensearch"], [])
+        self.assertEqual(self.sent["bigquery"], [["vid_chunk_0", "vid_chunk_1"]])
+
+    def test_ingest_many_skips_unchanged_videos(self):
+        ingest_transcript.ingest_many([
+            {"video_id": "a", "transcript_text": "x|y", "channel_id": "UC1"},
+            {"video_id": "b", "transcript_text": "z", "channel_id": "UC1"},
+        ], max_workers=1)
+        self.sent = {"opensearch": [], "bigquery": [], "zep": []}
+
+        result = ingest_transcript.ingest_many([
+            {"video_id": "a", "transcript_text": "x|y2", "channel_id": "UC1"},
+            {"video_id": "b", "transcript_text": "z", "channel_id": "UC1"},
+        ], max_workers=1)
+
+        self.assertEqual(self.sent["opensearch"], [["a_chunk_1"]])
+        self.assertEqual(self.sent["zep"], [["a_chunk_1"]])
+        self.assertEqual(result["succeeded_count"], 2)
+        videos = {v["video_id"]: v for v in result["videos"]}
+        self.assertEqual(videos["b"]["ledger"]["skipped_count"], 1)
+        self.assertEqual(videos["b"]["sinks"]["opensearch"]["status"], "skipped")
+        self.assertEqual(videos["a"]["ledger"]["changed_count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+"""
+Tests for bulk transcript ingestion (ingest_transcript.ingest_many) and the
+resumable backfill CLI in scripts/maintenance/backfill_rag_ingest.py.
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import rag.config as rag_config
+import rag.tracing as tracing
+import rag.ingest_transcript as ingest_transcript
+
+
+def _fake_chunks(text, max_tokens, overlap_tokens, doc_id=None):
+    """Two chunks per transcript; the text records the worker PID."""
+    parts = [f"{text} part {i} pid {os.getpid()}" for i in range(2)]
+    return [
+        {"text": part, "tokens": 3, "chunk_index": i, "total_chunks": 2, "chunk_id": f"{doc_id}_chunk_{i}"}
+        for i, part in enumerate(parts)
+    ]
+
+
+def _payloads(count):
+    return [{"video_id": f"vid{i}", "transcript_text": f"transcript {i}", "channel_id": "UC1"} for i in range(count)]
+
+
+class TestIngestMany(unittest.TestCase):
+    """Shared sink writes across videos and per-video results."""
+
+    def setUp(self):
+        self.opensearch_calls = []
+        self.bigquery_calls = []
+        self.zep_calls = []
+        self.opensearch_errors = []
+
+        def index(docs):
+            self.opensearch_calls.append(docs)
+            failed = {e["chunk_id"] for e in self.opensearch_errors}
+            return {"status": "indexed", "indexed_count": len([d for d in docs if d["chunk_id"] not in failed]),
+                    "error_count": len(self.opensearch_errors), "errors": list(self.opensearch_errors) or None}
+
+        def stream(rows):
+            self.bigquery_calls.append(rows)
+            return {"status": "streamed", "inserted_count": len(rows)}
+
+        def upsert(video_id, messages):
+            self.zep_calls.append(video_id)
+            return {"status": "upserted", "upserted_count": len(messages), "error_count": 0, "chunks": []}
+
+        rag_values = {"ingest.batch.sink_timeout_ms": 5000, "ingest.batch.zep_concurrency": 2}
+        self.patches = [
+            patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: rag_values.get(key, default)),
+            patch.object(rag_config, "get_chunking_config", return_value={"max_tokens_per_chunk": 1000, "overlap_tokens": 100}),
+            patch.object(tracing, "emit_ingest_event"),
+            patch("rag.cache.invalidate_on_new_content"),
+            patch.object(ingest_transcript, "chunk_with_metadata", side_effect=_fake_chunks),
+            patch.object(ingest_transcript, "index_transcript_chunks", side_effect=index),
+            patch.object(ingest_transcript, "stream_transcript_chunks", side_effect=stream),
+            patch.object(ingest_transcript, "upsert_transcript_batch", side_effect=upsert),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def test_sink_writes_shared_across_videos(self):
+        result = ingest_transcript.ingest_many(_payloads(5), max_workers=1, videos_per_batch=2)
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["succeeded_count"], 5)
+        self.assertEqual(result["chunk_count"], 10)
+        self.assertEqual([len(call) for call in self.opensearch_calls], [4, 4, 2])
+        self.assertEqual([len(call) for call in self.bigquery_calls], [4, 4, 2])
+        self.assertEqual(sorted(self.zep_calls), [f"vid{i}" for i in range(5)])
+        self.assertEqual(len(result["batches"]), 3)
+        self.assertEqual(set(result["batches"][0]["sink_latencies"]), {"opensearch", "bigquery", "zep"})
+        self.assertEqual(tracing.emit_ingest_event.call_count, 3)
+
+    def test_per_video_results_in_input_order(self):
+        self.opensearch_errors = [{"chunk_id": "vid1_chunk_0", "status": 400, "error": "bad"}]
+        payloads = _payloads(3)
+        payloads.insert(1, {"video_id": "broken", "channel_id": "UC1"})
+
+        result = ingest_transcript.ingest_many(payloads, max_workers=1, videos_per_batch=10)
+
+        self.assertEqual([v["video_id"] for v in result["videos"]], ["vid0", "broken", "vid1", "vid2"])
+        self.assertEqual([v["status"] for v in result["videos"]], ["success", "error", "success", "success"])
+        self.assertEqual(result["videos"][2]["sinks"]["opensearch"], {"status": "indexed", "indexed_count": 1, "error_count": 1})
+        self.assertEqual(result["status"], "partial")
+        self.assertEqual(result["failed_count"], 1)
+        self.assertEqual(len(self.opensearch_calls), 1)
+
+    def test_chunking_runs_in_process_pool(self):
+        result = ingest_transcript.ingest_many(_payloads(4), max_workers=2, videos_per_batch=4)
+
+        self.assertEqual(result["succeeded_count"], 4)
+        pids = {doc["text"].rsplit(" ", 1)[1] for doc in self.opensearch_calls[0]}
+        self.assertNotIn(str(os.getpid()), pids)
+
+    def test_broken_pool_falls_back_in_process(self):
+        class BrokenPool:
+            def __init__(self, max_workers):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+            def map(self, fn, *iterables, chunksize=1):
+                first = next(zip(*iterables))
+                yield fn(*first)
+                raise BrokenProcessPool("worker died")
+
+        with patch.object(ingest_transcript, "ProcessPoolExecutor", BrokenPool), patch("builtins.print"):
+            result = ingest_transcript.ingest_many(_payloads(3), max_workers=2, videos_per_batch=10)
+
+        self.assertEqual(result["succeeded_count"], 3)
+        self.assertEqual([v["video_id"] for v in result["videos"]], ["vid0", "vid1", "vid2"])
+        self.assertEqual(len(self.opensearch_calls[0]), 6)
+
+    def test_unexpected_preparation_error_recorded_per_video(self):
+        with patch.object(ingest_transcript, "sha256_hex", side_effect=lambda text: 1 / 0 if "transcript 1" in text else "h"):
+            result = ingest_transcript.ingest_many(_payloads(3), max_workers=1, videos_per_batch=10)
+
+        self.assertEqual([v["status"] for v in result["videos"]], ["success", "error", "success"])
+        self.assertIn("Preparation failed", result["videos"][1]["message"])
+
+    def test_sink_skip_propagates_to_videos(self):
+        with patch.object(ingest_transcript, "stream_transcript_chunks", return_value={"status": "skipped", "message": "disabled"}):
+            result = ingest_transcript.ingest_many(_payloads(2), max_workers=1)
+
+        for video in result["videos"]:
+            self.assertEqual(video["sinks"]["bigquery"]["status"], "skipped")
+            self.assertEqual(video["status"], "success")
+
+
+def _load_backfill_module():
+    path = os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'maintenance', 'backfill_rag_ingest.py')
+    spec = importlib.util.spec_from_file_location("backfill_rag_ingest", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestBackfillResume(unittest.TestCase):
+    """Progress file skips completed videos and records failures."""
+
+    def test_resume_skips_completed(self):
+        backfill = _load_backfill_module()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, "payloads.jsonl")
+            progress_path = os.path.join(tmp, "progress.json")
+            with open(input_path, "w") as f:
+                for payload in _payloads(5):
+                    f.write(json.dumps(payload) + "\n")
+            with open(progress_path, "w") as f:
+                json.dump({"completed": ["vid0", "vid1"], "failed": {}}, f)
+
+            seen = []
+
+            def fake_ingest_many(payloads, max_workers=None, videos_per_batch=None):
+                seen.append([p["video_id"] for p in payloads])
+                videos = [{"video_id": p["video_id"], "status": "error" if p["video_id"] == "vid4" else "success",
+                           "message": "boom"} for p in payloads]
+                return {"videos": videos, "chunk_count": 2 * len(payloads), "succeeded_count": 0,
+                        "video_count": len(payloads), "elapsed_sec": 0.1, "videos_per_sec": 10}
+
+            with patch.object(ingest_transcript, "ingest_many", side_effect=fake_ingest_many):
+                runner = backfill.RagBackfill(input_path, progress_path, slice_size=2)
+                stats = runner.run()
+
+            with open(progress_path) as f:
+                progress = json.load(f)
+
+        self.assertEqual(seen, [["vid2", "vid3"], ["vid4"]])
+        self.assertEqual(stats["skipped_completed"], 2)
+        self.assertEqual(stats["ingested"], 2)
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(progress["completed"], ["vid0", "vid1", "vid2", "vid3"])
+        self.assertEqual(progress["failed"], {"vid4": "boom"})
+
+
+if __name__ == "__main__":
+    unittest.main()
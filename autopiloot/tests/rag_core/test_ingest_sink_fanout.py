@@ -0,0 +1,164 @@
+"""
+Tests for concurrent sink writes during ingest (core/rag/sinks.py and the
+ingest_transcript / ingest_document flows).
+"""
+
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import rag.config as rag_config
+import rag.tracing as tracing
+import rag.sinks as sinks
+import rag.ingest_transcript as ingest_transcript
+import rag.ingest_document as ingest_document
+
+
+def _sleeping(delay_s, result):
+    def write():
+        time.sleep(delay_s)
+        return result
+    return write
+
+
+class TestWriteToSinks(unittest.TestCase):
+    """Concurrency, per-sink timeouts and latency capture."""
+
+    def test_sinks_run_concurrently(self):
+        started = time.time()
+        results, latencies, timed_out = sinks.write_to_sinks({
+            "opensearch": _sleeping(0.2, {"status": "indexed"}),
+            "bigquery": _sleeping(0.2, {"status": "streamed"}),
+            "zep": _sleeping(0.2, {"status": "upserted"}),
+        }, timeout_ms=2000)
+
+        self.assertLess(time.time() - started, 0.5)
+        self.assertEqual(timed_out, [])
+        self.assertEqual(set(results), {"opensearch", "bigquery", "zep"})
+        for latency in latencies.values():
+            self.assertGreaterEqual(latency, 190)
+
+    def test_slow_sink_times_out_without_gating_others(self):
+        started = time.time()
+        results, latencies, timed_out = sinks.write_to_sinks({
+            "zep": _sleeping(1.0, {"status": "upserted"}),
+            "opensearch": _sleeping(0.01, {"status": "indexed", "indexed_count": 2}),
+        }, timeout_ms=150)
+
+        self.assertLess(time.time() - started, 0.5)
+        self.assertEqual(timed_out, ["zep"])
+        self.assertEqual(results["zep"]["status"], "timeout")
+        self.assertEqual(latencies["zep"], 150)
+        self.assertEqual(results["opensearch"]["indexed_count"], 2)
+        self.assertLess(latencies["opensearch"], 150)
+
+    def test_exception_becomes_error_result(self):
+        def broken():
+            raise RuntimeError("boom")
+
+        results, _, _ = sinks.write_to_sinks({"bigquery": broken}, timeout_ms=1000)
+        self.assertEqual(results["bigquery"], {"status": "error", "message": "boom"})
+
+    def test_timeout_from_config(self):
+        with patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: {"timeouts.index_ms": 1234}.get(key, default)):
+            self.assertEqual(sinks.get_index_timeout_ms(), 1234)
+        with patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: {"timeouts.index_ms": "bad"}.get(key, default)):
+            self.assertEqual(sinks.get_index_timeout_ms(), sinks.DEFAULT_INDEX_TIMEOUT_MS)
+
+    def test_summarize_counts(self):
+        summary = sinks.summarize_sink_results({
+            "opensearch": {"status": "indexed", "indexed_count": 4, "error_count": 1},
+            "bigquery": {"status": "skipped"},
+            "zep": {"status": "timeout"},
+        }, chunk_count=5)
+
+        self.assertEqual(summary["status"], "partial")
+        self.assertEqual(summary["sinks_used"], ["opensearch", "zep"])
+        self.assertEqual(summary["success_count"], 4)
+        self.assertEqual(summary["error_count"], 6)
+
+
+class TestIngestFlowsUseFanOut(unittest.TestCase):
+    """Ingest results and ingest events carry per-sink latency."""
+
+    CHUNKS = [
+        {"text": f"chunk {i}", "tokens": 2, "chunk_index": i, "total_chunks": 2, "chunk_id": f"vid_chunk_{i}"}
+        for i in range(2)
+    ]
+
+    def setUp(self):
+        rag_values = {"timeouts.index_ms": 300}
+        self.patches = [
+            patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: rag_values.get(key, default)),
+            patch.object(rag_config, "get_chunking_config", return_value={"max_tokens_per_chunk": 1000, "overlap_tokens": 100}),
+            patch.object(tracing, "emit_ingest_event"),
+            patch("rag.cache.invalidate_on_new_content"),
+        ]
+        for p in self.patches:
+            p.start()
+        self.emit = tracing.emit_ingest_event
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+
+    def test_transcript_ingest_reports_sink_latencies(self):
+        with patch.object(ingest_transcript, "chunk_with_metadata", return_value=[dict(c) for c in self.CHUNKS]), \
+                patch.object(ingest_transcript, "index_transcript_chunks", side_effect=lambda *_: time.sleep(0.05) or {"status": "indexed", "indexed_count": 2}), \
+                patch.object(ingest_transcript, "stream_transcript_chunks", return_value={"status": "streamed", "inserted_count": 2}), \
+                patch.object(ingest_transcript, "upsert_transcript_batch", side_effect=lambda *_: time.sleep(1.0) or {"status": "upserted"}):
+            started = time.time()
+            result = ingest_transcript.ingest({"video_id": "vid", "transcript_text": "text", "channel_id": "UC1"})
+
+        self.assertLess(time.time() - started, 0.9)
+        self.assertEqual(result["status"], "partial")
+        self.assertEqual(result["timed_out_sinks"], ["zep"])
+        self.assertEqual(set(result["sink_latencies"]), {"opensearch", "bigquery", "zep"})
+        self.assertGreaterEqual(result["sink_latencies"]["opensearch"], 40)
+
+        kwargs = self.emit.call_args.kwargs
+        self.assertEqual(kwargs["operation"], "transcript")
+        self.assertEqual(kwargs["sink_latencies"], result["sink_latencies"])
+        self.assertEqual(kwargs["success_count"], 4)
+        self.assertEqual(kwargs["error_count"], 2)
+
+    def test_document_ingest_reports_sink_latencies(self):
+        with patch.object(ingest_document, "chunk_with_metadata", return_value=[dict(c) for c in self.CHUNKS]), \
+                patch.object(ingest_document, "index_documents", return_value={"status": "indexed", "indexed_count": 2}), \
+                patch.object(ingest_document, "stream_documents", return_value={"status": "skipped"}):
+            result = ingest_document.ingest({"document_id": "doc", "document_text": "text"})
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["timed_out_sinks"], [])
+        self.assertEqual(set(result["sink_latencies"]), {"opensearch", "bigquery"})
+        self.assertEqual(self.emit.call_args.kwargs["sinks_used"], ["opensearch"])
+
+
+class TestIngestEventSinkLatencies(unittest.TestCase):
+    """emit_ingest_event stores the per-sink breakdown."""
+
+    def setUp(self):
+        tracing.reset_metrics()
+
+    def tearDown(self):
+        tracing.reset_metrics()
+
+    def test_sink_latencies_recorded(self):
+        with patch.object(rag_config, "get_observability_config", return_value={"enabled": True, "logging": {"enabled": False}}):
+            tracing.emit_ingest_event("transcript", "vid", 3, ["zep", "opensearch"], 6, 0, 900,
+                                      sink_latencies={"zep": 850, "opensearch": 120})
+
+        event = tracing.get_recent_events(1)[-1]
+        self.assertEqual(event["sink_latencies"], {"zep": 850, "opensearch": 120})
+        summary = tracing.get_metrics_summary()
+        self.assertEqual(summary["per_source_percentiles"]["ingest_zep"]["count"], 1)
+        self.assertAlmostEqual(summary["per_source_latency"]["ingest_zep"], 850, delta=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+"""
+Tests for the bounded metrics store (core/rag/metrics_store.py) behind
+core/rag/tracing.py.
+"""
+
+import json
+import math
+import os
+import random
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import rag.config as rag_config
+import rag.tracing as tracing
+from rag.metrics_store import QuantileSketch, BucketedMetricsStore
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+class TestQuantileSketch(unittest.TestCase):
+    """Relative accuracy, merging and serialization."""
+
+    def setUp(self):
+        rng = random.Random(3)
+        self.values = [rng.lognormvariate(5, 1) for _ in range(20000)]
+
+    def test_quantiles_within_relative_accuracy(self):
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in self.values:
+            sketch.add(value)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = _exact(self.values, q)
+            self.assertLessEqual(abs(sketch.quantile(q) - exact) / exact, 0.011, f"q={q}")
+        self.assertEqual(sketch.count, len(self.values))
+        self.assertLess(len(sketch.bins), 1000)
+
+    def test_merge_equals_single_sketch(self):
+        whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for i, value in enumerate(self.values):
+            whole.add(value)
+            (left if i % 2 else right).add(value)
+        left.merge(right)
+
+        self.assertEqual(left.bins, whole.bins)
+        self.assertEqual(left.quantile(0.95), whole.quantile(0.95))
+        self.assertAlmostEqual(left.mean, whole.mean)
+
+    def test_zero_and_roundtrip(self):
+        sketch = QuantileSketch()
+        for value in (0, 0, 0, 10, 20):
+            sketch.add(value)
+        self.assertEqual(sketch.quantile(0.5), 0)
+
+        restored = QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+        self.assertEqual(restored.quantile(0.99), sketch.quantile(0.99))
+        self.assertEqual(restored.count, 5)
+
+    def test_bins_are_capped(self):
+        sketch = QuantileSketch(max_bins=50)
+        for exponent in range(200):
+            sketch.add(1.1 ** exponent)
+        self.assertLessEqual(len(sketch.bins), 50)
+        self.assertEqual(sketch.count, 200)
+
+    def test_mismatched_accuracy_rejected(self):
+        with self.assertRaises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+
+class TestBucketedMetricsStore(unittest.TestCase):
+    """Ring buffer bounds, windows and export/merge."""
+
+    NOW = 1_800_000_000  # multiple of 300
+
+    def test_ring_memory_is_fixed(self):
+        store = BucketedMetricsStore(interval_minutes=5, window_minutes=60)
+        self.assertEqual(store.slot_count, 12)
+
+        for minute in range(0, 24 * 60, 1):
+            store.record_retrieval(100, {"zep": 50}, 100.0, ["zep"], timestamp=self.NOW + minute * 60)
+
+        end = self.NOW + 24 * 60 * 60 - 60
+        self.assertEqual(store.bucket_count(now=end), 12)
+        self.assertEqual(len(store._slots), 12)
+        self.assertEqual(store.aggregate(now=end).retrievals, 60)
+
+    def test_window_selects_recent_buckets(self):
+        store = BucketedMetricsStore(interval_minutes=5, window_minutes=60)
+        store.record_retrieval(100, {}, 50.0, [], timestamp=self.NOW)
+        store.record_retrieval(300, {}, 100.0, [], timestamp=self.NOW + 40 * 60)
+
+        now = self.NOW + 41 * 60
+        self.assertEqual(store.aggregate(10, now=now).retrievals, 1)
+        self.assertEqual(store.aggregate(now=now).retrievals, 2)
+        self.assertEqual(store.aggregate(now=now).coverage_sum, 150.0)
+
+    def test_late_sample_older_than_ring_is_dropped(self):
+        store = BucketedMetricsStore(interval_minutes=5, window_minutes=10)
+        store.record_retrieval(100, {}, 100.0, [], timestamp=self.NOW + 600)
+        store.record_retrieval(100, {}, 100.0, [], timestamp=self.NOW)
+        self.assertEqual(store.aggregate(now=self.NOW + 600).retrievals, 1)
+
+    def test_export_merge_across_workers(self):
+        workers = [BucketedMetricsStore(5, 60) for _ in range(3)]
+        for i, worker in enumerate(workers):
+            for j in range(100):
+                worker.record_retrieval(100 + i * 100 + j, {"opensearch": 40 + j}, 100.0, ["opensearch"],
+                                        timestamp=self.NOW + j * 10)
+            worker.record_ingest("transcript", 2, {"zep": 900}, timestamp=self.NOW)
+
+        aggregator = BucketedMetricsStore(5, 60)
+        for worker in workers:
+            self.assertGreater(aggregator.merge_export(json.loads(json.dumps(worker.export(now=self.NOW)))), 0)
+
+        merged = aggregator.aggregate(now=self.NOW + 1000)
+        self.assertEqual(merged.retrievals, 300)
+        self.assertEqual(merged.ingests, 3)
+        self.assertEqual(merged.error_counts, {"transcript": 6})
+        self.assertEqual(merged.source_availability, {"opensearch": 300})
+        self.assertEqual(merged.latency["total"].count, 300)
+
+    def test_interval_mismatch_rejected(self):
+        with self.assertRaises(ValueError):
+            BucketedMetricsStore(5, 60).merge_export(BucketedMetricsStore(1, 60).export())
+
+
+class TestTracingUsesStore(unittest.TestCase):
+    """tracing reads its interval from config and summarizes from buckets."""
+
+    def setUp(self):
+        tracing.reset_metrics()
+
+    def tearDown(self):
+        tracing.reset_metrics()
+
+    def test_interval_from_config(self):
+        values = {"observability.metrics.aggregation_interval_minutes": 1, "observability.metrics.window_minutes": 30}
+        with patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: values.get(key, default)):
+            self.assertEqual(tracing.export_metrics()["interval_seconds"], 60)
+        self.assertEqual(tracing._get_store().slot_count, 30)
+
+    def test_summary_percentiles_and_export(self):
+        obs = {"enabled": True, "logging": {"enabled": False}, "alerts": {"enabled": False}}
+        with patch.object(rag_config, "get_observability_config", return_value=obs):
+            for latency in range(1, 101):
+                tracing.emit_retrieval_event(f"t{latency}", "q", None, 1, ["zep"], latency * 10,
+                                             {"zep": latency}, 100.0)
+
+        summary = tracing.get_metrics_summary(time_window_minutes=60)
+        self.assertEqual(summary["total_retrievals"], 100)
+        self.assertAlmostEqual(summary["p50_latency_ms"], 500, delta=10)
+        self.assertAlmostEqual(summary["p95_latency_ms"], 950, delta=19)
+        self.assertAlmostEqual(summary["p99_latency_ms"], 990, delta=20)
+        self.assertEqual(summary["per_source_percentiles"]["zep"]["count"], 100)
+        self.assertEqual(len(tracing.get_recent_events(500)), 100)
+
+        exported = tracing.export_metrics()
+        tracing.reset_metrics()
+        tracing.merge_metrics(exported)
+        self.assertEqual(tracing.get_metrics_summary()["total_retrievals"], 100)
+
+    def test_recent_events_are_bounded(self):
+        obs = {"enabled": True, "logging": {"enabled": False}}
+        with patch.object(rag_config, "get_observability_config", return_value=obs):
+            for i in range(tracing.RECENT_EVENTS_LIMIT + 50):
+                tracing.emit_ingest_event("transcript", f"v{i}", 1, ["zep"], 1, 0, 10)
+
+        self.assertEqual(len(tracing.get_recent_events(10_000)), tracing.RECENT_EVENTS_LIMIT)
+        self.assertEqual(tracing.get_metrics_summary()["total_ingests"], tracing.RECENT_EVENTS_LIMIT + 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+"""
+Tests for the OpenSearch _bulk indexing engine (opensearch_indexer.bulk_index).
+
+A small in-memory client stands in for OpenSearch and can fail chosen items
+or whole requests.
+"""
+
+import json
+import os
+import sys
+import unittest
+from unittest.mock import patch, MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import rag.config as rag_config
+import rag.opensearch_indexer as indexer
+
+
+class FakeOpenSearch:
+    """Records _bulk payloads; item_failures maps doc_id -> list of statuses to return first."""
+
+    def __init__(self, item_failures=None, request_failures=0):
+        self.item_failures = {k: list(v) for k, v in (item_failures or {}).items()}
+        self.request_failures = request_failures
+        self.payloads = []
+        self.docs = {}
+        self.indices = MagicMock()
+        self.indices.get_settings.return_value = {"idx": {"settings": {"index": {"refresh_interval": "5s"}}}}
+
+    def bulk(self, body, request_timeout=None):
+        self.payloads.append(body)
+        if self.request_failures:
+            self.request_failures -= 1
+            raise ConnectionError("connection reset")
+
+        lines = body.splitlines()
+        items = []
+        for action_line, source_line in zip(lines[::2], lines[1::2]):
+            doc_id = json.loads(action_line)["index"]["_id"]
+            statuses = self.item_failures.get(doc_id)
+            if statuses:
+                status = statuses.pop(0)
+                items.append({"index": {"_id": doc_id, "status": status, "error": {"type": f"error_{status}"}}})
+                continue
+            self.docs[doc_id] = json.loads(source_line)
+            items.append({"index": {"_id": doc_id, "status": 201}})
+        return {"errors": any(i["index"]["status"] >= 300 for i in items), "items": items}
+
+
+def _docs(count, text="x" * 100):
+    return [(f"vid_chunk_{i}", {"chunk_id": f"vid_chunk_{i}", "text": text}) for i in range(count)]
+
+
+def _bulk(client, documents, **kwargs):
+    options = {"max_batch_bytes": 1024 * 1024, "max_retries": 3, "retry_backoff_ms": 0,
+               "disable_refresh": False, "request_timeout": 5}
+    options.update(kwargs)
+    return indexer.bulk_index(client, "idx", documents, **options)
+
+
+class TestBulkIndex(unittest.TestCase):
+    """Batching, per-item errors, selective retry and refresh handling."""
+
+    def test_all_documents_in_one_request(self):
+        client = FakeOpenSearch()
+        result = _bulk(client, _docs(50))
+
+        self.assertEqual(result["indexed_count"], 50)
+        self.assertEqual(result["error_count"], 0)
+        self.assertEqual(result["batches"], 1)
+        self.assertEqual(len(client.docs), 50)
+
+    def test_batches_respect_byte_budget(self):
+        client = FakeOpenSearch()
+        result = _bulk(client, _docs(20, text="y" * 400), max_batch_bytes=2000)
+
+        self.assertEqual(result["indexed_count"], 20)
+        self.assertGreater(result["batches"], 1)
+        for payload in client.payloads:
+            self.assertLessEqual(len(payload.encode("utf-8")), 2000)
+        self.assertEqual(result["bytes_sent"], sum(len(p) for p in client.payloads))
+
+    def test_oversized_document_sent_alone(self):
+        client = FakeOpenSearch()
+        result = _bulk(client, _docs(3, text="z" * 5000), max_batch_bytes=1000)
+
+        self.assertEqual(result["indexed_count"], 3)
+        self.assertEqual(result["batches"], 3)
+
+    def test_only_failed_items_retried(self):
+        client = FakeOpenSearch(item_failures={"vid_chunk_3": [429], "vid_chunk_7": [503, 503]})
+        result = _bulk(client, _docs(10))
+
+        self.assertEqual(result["indexed_count"], 10)
+        self.assertEqual(result["error_count"], 0)
+        self.assertEqual(result["retried_count"], 3)
+        self.assertEqual(client.payloads[1].count('"_id"'), 2)
+        self.assertEqual(client.payloads[2].count('"_id"'), 1)
+
+    def test_non_retryable_errors_reported_not_retried(self):
+        client = FakeOpenSearch(item_failures={"vid_chunk_1": [400]})
+        result = _bulk(client, _docs(5))
+
+        self.assertEqual(result["indexed_count"], 4)
+        self.assertEqual(result["error_count"], 1)
+        self.assertEqual(result["errors"][0]["chunk_id"], "vid_chunk_1")
+        self.assertEqual(result["errors"][0]["status"], 400)
+        self.assertEqual(len(client.payloads), 1)
+
+    def test_retries_exhausted(self):
+        client = FakeOpenSearch(item_failures={"vid_chunk_0": [429] * 10})
+        result = _bulk(client, _docs(2), max_retries=2)
+
+        self.assertEqual(result["indexed_count"], 1)
+        self.assertEqual(result["errors"], [{"chunk_id": "vid_chunk_0", "status": 429, "error": '{"type": "error_429"}'}])
+        self.assertEqual(len(client.payloads), 3)
+
+    def test_request_failure_retries_whole_batch(self):
+        client = FakeOpenSearch(request_failures=1)
+        result = _bulk(client, _docs(4))
+
+        self.assertEqual(result["indexed_count"], 4)
+        self.assertEqual(result["retried_count"], 4)
+
+    def test_refresh_disabled_and_restored(self):
+        client = FakeOpenSearch(request_failures=5)
+        _bulk(client, _docs(2), max_retries=1, disable_refresh=True)
+
+        calls = [c.kwargs["body"] for c in client.indices.put_settings.call_args_list]
+        self.assertEqual(calls, [{"index": {"refresh_interval": "-1"}}, {"index": {"refresh_interval": "5s"}}])
+
+
+class TestIndexTranscriptChunksBulk(unittest.TestCase):
+    """index_transcript_chunks routes through bulk_index when enabled."""
+
+    def _index(self, docs, bulk_enabled):
+        rag_values = {
+            "opensearch.index_transcripts": "idx",
+            "opensearch.bulk.enabled": bulk_enabled,
+            "opensearch.bulk.max_batch_bytes": 1024 * 1024,
+            "opensearch.bulk.max_retries": 1,
+            "opensearch.bulk.retry_backoff_ms": 0,
+            "opensearch.bulk.disable_refresh": False,
+            "timeouts.index_ms": 5000,
+        }
+        client = FakeOpenSearch()
+        client.index = MagicMock(return_value={"result": "created"})
+        with patch.object(rag_config, "is_sink_enabled", return_value=True), \
+                patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: rag_values.get(key, default)), \
+                patch.object(indexer, "get_optional_env_var", side_effect=lambda name, default="": {"OPENSEARCH_HOST": "http://localhost:9200", "OPENSEARCH_API_KEY": "key"}.get(name, default)), \
+                patch.object(indexer, "_initialize_client", return_value=client), \
+                patch.object(indexer, "_ensure_index_exists", return_value={"success": True}):
+            return indexer.index_transcript_chunks(docs), client
+
+    def test_bulk_mode(self):
+        docs = [{"video_id": "vid", "chunk_id": f"vid_chunk_{i}", "text": "t"} for i in range(5)]
+        docs.append({"video_id": "vid", "text": "no id"})
+        result, client = self._index(docs, bulk_enabled=True)
+
+        self.assertEqual(result["status"], "indexed")
+        self.assertEqual(result["indexed_count"], 5)
+        self.assertEqual(result["error_count"], 1)
+        self.assertEqual(len(client.payloads), 1)
+        client.index.assert_not_called()
+
+    def test_single_document_mode(self):
+        docs = [{"video_id": "vid", "chunk_id": f"vid_chunk_{i}", "text": "t"} for i in range(3)]
+        result, client = self._index(docs, bulk_enabled=False)
+
+        self.assertEqual(result["indexed_count"], 3)
+        self.assertEqual(client.index.call_count, 3)
+        self.assertEqual(client.payloads, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+"""
+Tests for adaptive query routing (core/rag/routing.py) and its use in
+hybrid_retrieve.search.
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+from core.rag import hybrid_retrieve
+import rag.config as rag_config
+import rag.cache as retrieval_cache
+import rag.routing as routing
+
+
+ALL = ["zep", "opensearch", "bigquery"]
+
+
+def _config(**overrides):
+    config = {
+        "mode": "adaptive",
+        "always_use_all_sources": False,
+        "min_confidence": 0.6,
+        "logging": {"enabled": False, "log_level": "info"}
+    }
+    config.update(overrides)
+    return config
+
+
+class TestClassifyQuery(unittest.TestCase):
+    """Intent and filter strength."""
+
+    def test_intents(self):
+        self.assertEqual(routing.classify_query("How to build a sales team")["intent_type"], "conceptual")
+        self.assertEqual(routing.classify_query("When was the pricing episode published")["intent_type"], "factual")
+        self.assertEqual(routing.classify_query("How to price SaaS when launching")["intent_type"], "mixed")
+        self.assertEqual(routing.classify_query("revenue")["intent_type"], "unknown")
+
+    def test_filter_strength(self):
+        self.assertEqual(routing.classify_query("q")["filter_strength"], "none")
+        self.assertEqual(routing.classify_query("q", {"channel_id": "UC1"})["filter_strength"], "moderate")
+        self.assertEqual(routing.classify_query("q", {"channel_id": "UC1", "date_from": "2025-01-01"})["filter_strength"], "strong")
+        self.assertEqual(routing.classify_query("q", {"video_id": "abc"})["filter_strength"], "strong")
+        self.assertEqual(routing.classify_query("q", {"channel_id": None})["filter_strength"], "none")
+
+
+class TestRouteQuery(unittest.TestCase):
+    """Routing rules, fallbacks and stats."""
+
+    def setUp(self):
+        routing.reset_routing_stats()
+
+    def test_strong_filters_skip_zep(self):
+        decision = routing.route_query("revenue", {"channel_id": "UC1", "date_from": "2025-01-01"}, ALL, config=_config())
+        self.assertEqual(decision["selected_sources"], ["opensearch", "bigquery"])
+        self.assertEqual(decision["skipped_sources"], ["zep"])
+        self.assertEqual(decision["routing_strategy"], "filter_optimized")
+        self.assertFalse(decision["fallback"])
+
+    def test_conceptual_unfiltered_goes_to_zep(self):
+        decision = routing.route_query("How to build a sales team", None, ALL, config=_config())
+        self.assertEqual(decision["selected_sources"], ["zep"])
+        self.assertEqual(decision["routing_strategy"], "semantic_optimized")
+
+    def test_factual_with_filter(self):
+        decision = routing.route_query("which episode covers pricing", {"channel_id": "UC1"}, ALL, config=_config())
+        self.assertEqual(decision["selected_sources"], ["opensearch", "bigquery"])
+        self.assertEqual(decision["routing_strategy"], "keyword_optimized")
+
+    def test_mixed_and_unmatched_use_all_sources(self):
+        mixed = routing.route_query("How to price SaaS when launching", None, ALL, config=_config())
+        self.assertEqual(mixed["selected_sources"], ALL)
+        self.assertEqual(mixed["routing_strategy"], "comprehensive")
+
+        unmatched = routing.route_query("revenue", None, ALL, config=_config())
+        self.assertEqual(unmatched["selected_sources"], ALL)
+        self.assertTrue(unmatched["fallback"])
+
+    def test_low_confidence_falls_back_to_all(self):
+        decision = routing.route_query("How to build a sales team", None, ALL, config=_config(min_confidence=0.95))
+        self.assertEqual(decision["selected_sources"], ALL)
+        self.assertEqual(decision["routing_strategy"], "low_confidence")
+        self.assertTrue(decision["fallback"])
+        self.assertEqual(routing.get_routing_stats()["low_confidence_fallbacks"], 1)
+
+    def test_unavailable_routed_sources_fall_back(self):
+        decision = routing.route_query("How to build a sales team", None, ["opensearch"], config=_config())
+        self.assertEqual(decision["selected_sources"], ["opensearch"])
+        self.assertTrue(decision["fallback"])
+
+    def test_always_on_mode(self):
+        for config in (_config(mode="always_on"), _config(always_use_all_sources=True)):
+            decision = routing.route_query("How to build a sales team", None, ALL, config=config)
+            self.assertEqual(decision["selected_sources"], ALL)
+            self.assertEqual(decision["routing_strategy"], "always_on")
+
+    def test_stats_count_saved_calls(self):
+        routing.route_query("How to build a sales team", None, ALL, config=_config())
+        routing.route_query("revenue", None, ALL, config=_config())
+
+        stats = routing.get_routing_stats()
+        self.assertEqual(stats["decisions"], 2)
+        self.assertEqual(stats["source_calls"], 4)
+        self.assertEqual(stats["source_calls_saved"], 2)
+        self.assertEqual(stats["saved_ratio"], 0.333)
+
+    def test_logging_honours_config(self):
+        with patch("builtins.print") as mock_print:
+            routing.route_query("revenue", None, ALL, trace_id="rag_1", config=_config())
+        mock_print.assert_not_called()
+
+        with patch("builtins.print") as mock_print:
+            routing.route_query("revenue", None, ALL, trace_id="rag_1",
+                                config=_config(logging={"enabled": True, "log_level": "debug"}))
+        lines = [call.args[0] for call in mock_print.call_args_list]
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith("[RAG Route rag_1]"))
+        self.assertIn("reasoning=", lines[1])
+
+        with patch("builtins.print") as mock_print:
+            routing.route_query("revenue", None, ALL, config=_config(logging={"enabled": True, "log_level": "warning"}))
+        mock_print.assert_not_called()
+
+    def test_config_from_settings(self):
+        values = {"routing": {"mode": "always_on", "min_confidence": "bad", "logging": {"enabled": False}}}
+        with patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: values.get(key, default)):
+            config = routing.get_routing_config()
+        self.assertEqual(config["mode"], "always_on")
+        self.assertEqual(config["min_confidence"], routing.DEFAULT_MIN_CONFIDENCE)
+        self.assertFalse(config["logging"]["enabled"])
+
+
+class TestSearchUsesRouting(unittest.TestCase):
+    """search() calls only the routed sources."""
+
+    def setUp(self):
+        retrieval_cache.configure_cache({"enabled": False})
+        self.calls = []
+
+    def tearDown(self):
+        retrieval_cache.reset_cache()
+
+    def _source(self, name, results=True):
+        def query(query, filters, top_k, timeout):
+            self.calls.append(name)
+            rows = [{"chunk_id": f"{name}_0", "text": name, "score": 0.9, "content_sha256": f"h_{name}"}]
+            return {"status": "success", "results": rows if results else []}
+        return query
+
+    def _search(self, query, filters=None, routing_config=None, empty=()):
+        rag_values = {
+            "timeouts.search_ms": 2000,
+            "routing": routing_config or {"mode": "adaptive", "logging": {"enabled": False}},
+        }
+        with patch.object(rag_config, "is_sink_enabled", return_value=True), \
+                patch.object(rag_config, "get_retrieval_config", return_value={"top_k": 20, "timeout_ms": 2000, "weights": {}}), \
+                patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: rag_values.get(key, default)), \
+                patch.object(hybrid_retrieve, "_query_zep", self._source("zep", "zep" not in empty)), \
+                patch.object(hybrid_retrieve, "_query_opensearch", self._source("opensearch", "opensearch" not in empty)), \
+                patch.object(hybrid_retrieve, "_query_bigquery", self._source("bigquery", "bigquery" not in empty)), \
+                patch("rag.tracing.emit_retrieval_event"):
+            return hybrid_retrieve.search(query, filters=filters, limit=10)
+
+    def test_filtered_query_skips_zep(self):
+        result = self._search("revenue", {"channel_id": "UC1", "video_id": "abc"})
+
+        self.assertEqual(sorted(self.calls), ["bigquery", "opensearch"])
+        self.assertEqual(result["routing"]["skipped_sources"], ["zep"])
+        self.assertEqual(result["coverage"], 100.0)
+        self.assertNotIn("zep", result["source_latencies"])
+
+    def test_conceptual_query_only_zep(self):
+        result = self._search("How to build a sales team")
+
+        self.assertEqual(self.calls, ["zep"])
+        self.assertEqual(result["sources_used"], ["zep"])
+        self.assertEqual(result["routing"]["routing_strategy"], "semantic_optimized")
+
+    def test_always_on_queries_everything(self):
+        result = self._search("How to build a sales team", routing_config={"mode": "always_on", "logging": {"enabled": False}})
+
+        self.assertEqual(sorted(self.calls), ["bigquery", "opensearch", "zep"])
+        self.assertEqual(result["routing"]["routing_strategy"], "always_on")
+
+    def test_empty_routed_sources_fall_back_to_skipped(self):
+        result = self._search("How to build a sales team", empty=("zep",))
+
+        self.assertEqual(sorted(self.calls), ["bigquery", "opensearch", "zep"])
+        self.assertTrue(result["routing"]["fallback"])
+        self.assertEqual(result["sources_used"], ["zep", "opensearch", "bigquery"])
+        self.assertEqual(result["total_results"], 2)
+
+    def test_routing_failure_uses_all_sources(self):
+        with patch("rag.routing.route_query", side_effect=RuntimeError("boom")):
+            result = self._search("How to build a sales team")
+
+        self.assertEqual(sorted(self.calls), ["bigquery", "opensearch", "zep"])
+        self.assertIsNone(result["routing"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Tests for the pooled RAG client registry (core/rag/clients.py).
+"""
+
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import rag.config as rag_config
+import rag.clients as clients
+
+
+def _rag_value(values):
+    return lambda key, default=None: values.get(key, default)
+
+
+class TestClientRegistry(unittest.TestCase):
+    """Lazy creation, reuse and reset of shared clients."""
+
+    def setUp(self):
+        clients.reset_clients()
+        self.rag_values = patch.object(
+            rag_config, "get_rag_value",
+            side_effect=_rag_value({"opensearch.connection.pool_maxsize": 4})
+        )
+        self.rag_values.start()
+
+    def tearDown(self):
+        self.rag_values.stop()
+        clients.reset_clients()
+
+    def test_opensearch_client_reused_per_credentials(self):
+        opensearch = MagicMock(side_effect=lambda **kwargs: MagicMock())
+        with patch.dict(sys.modules, {"opensearchpy": MagicMock(OpenSearch=opensearch)}):
+            first = clients.get_opensearch_client("https://search.example.com", api_key="key")
+            again = clients.get_opensearch_client("https://search.example.com", api_key="key")
+            other = clients.get_opensearch_client("https://search.example.com", username="u", password="p")
+
+        self.assertIs(first, again)
+        self.assertIsNot(first, other)
+        self.assertEqual(opensearch.call_count, 2)
+
+        kwargs = opensearch.call_args_list[0].kwargs
+        self.assertEqual(kwargs["hosts"], [{"host": "search.example.com", "port": 443}])
+        self.assertEqual(kwargs["pool_maxsize"], 4)
+        self.assertTrue(kwargs["use_ssl"])
+
+    def test_bigquery_client_reused_per_project(self):
+        bq_client = MagicMock(side_effect=lambda project: MagicMock(project=project))
+        bigquery = MagicMock(Client=bq_client)
+        google_cloud = MagicMock(bigquery=bigquery)
+        modules = {"google": MagicMock(cloud=google_cloud), "google.cloud": google_cloud, "google.cloud.bigquery": bigquery}
+
+        with patch.dict(sys.modules, modules):
+            first = clients.get_bigquery_client("proj-a")
+            self.assertIs(first, clients.get_bigquery_client("proj-a"))
+            self.assertIsNot(first, clients.get_bigquery_client("proj-b"))
+        self.assertEqual(bq_client.call_count, 2)
+
+    def test_http_session_pool_size_and_reuse(self):
+        session = clients.get_http_session("https://api.getzep.com/")
+        self.assertIs(session, clients.get_http_session("https://api.getzep.com"))
+
+        adapter = session.get_adapter("https://api.getzep.com/v3/threads")
+        self.assertEqual(adapter._pool_maxsize, 4)
+
+    def test_concurrent_first_use_creates_one_client(self):
+        created = []
+
+        def factory():
+            created.append(1)
+            return object()
+
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(clients._get_or_create(("test", "key"), factory))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(created), 1)
+        self.assertEqual(len({id(r) for r in results}), 1)
+
+    def test_reset_closes_and_drops_clients(self):
+        session = clients.get_http_session("https://api.getzep.com")
+        with patch.object(session, "close") as close:
+            self.assertEqual(clients.reset_clients(), 1)
+            close.assert_called_once()
+        self.assertIsNot(session, clients.get_http_session("https://api.getzep.com"))
+
+    def test_forked_process_gets_fresh_clients(self):
+        session = clients.get_http_session("https://api.getzep.com")
+
+        # Simulate running in a child process that inherited the registry
+        with patch.object(clients.os, "getpid", return_value=clients._owner_pid + 1):
+            child_session = clients.get_http_session("https://api.getzep.com")
+            self.assertIsNot(session, child_session)
+            self.assertEqual(clients.get_registry_stats()["total_clients"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
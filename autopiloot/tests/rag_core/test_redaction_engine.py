@@ -0,0 +1,148 @@
+"""
+Tests for the single-pass PII redaction engine in core/rag/retrieval_policy.py.
+"""
+
+import os
+import re
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import rag.config as rag_config
+import rag.retrieval_policy as retrieval_policy
+
+
+PATTERNS = [
+    {"name": "email", "pattern": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b", "replacement": "[EMAIL REDACTED]"},
+    {"name": "phone", "pattern": r"\b\d{3}[-.]?\d{3}[-.]?\d{4}\b", "replacement": "[PHONE REDACTED]"},
+    {"name": "ssn", "pattern": r"\b\d{3}-\d{2}-\d{4}\b", "replacement": "[SSN REDACTED]"},
+    {"name": "credit_card", "pattern": r"\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b", "replacement": "[CARD REDACTED]"},
+]
+
+TEXTS = [
+    "Call 555-123-4567 or mail jane.doe@example.com today.",
+    "SSN 123-45-6789, card 4111 1111 1111 1111, backup 555.987.6543.",
+    "Revenue grew to $1M with no contact details.",
+    "",
+]
+
+
+def _legacy(text, patterns):
+    for pattern in patterns:
+        text = re.sub(pattern["pattern"], pattern["replacement"], text)
+    return text
+
+
+class TestRedactionEngine(unittest.TestCase):
+    """Single-pass output, hit counters and fallbacks."""
+
+    def setUp(self):
+        retrieval_policy.reset_redaction_engines()
+
+    def test_matches_per_pattern_substitution(self):
+        engine = retrieval_policy.RedactionEngine(PATTERNS)
+        self.assertEqual(engine.mode, "single_pass")
+        for text in TEXTS:
+            self.assertEqual(engine.redact(text)[0], _legacy(text, PATTERNS))
+
+    def test_hits_per_pattern(self):
+        engine = retrieval_policy.RedactionEngine(PATTERNS)
+        _, hits = engine.redact(TEXTS[1])
+        self.assertEqual(hits, {"ssn": 1, "credit_card": 1, "phone": 1})
+
+        engine.redact(TEXTS[0])
+        stats = engine.get_stats()
+        self.assertEqual(stats["hit_counts"], {"email": 1, "phone": 2, "ssn": 1, "credit_card": 1})
+        self.assertEqual(stats["texts_scanned"], 2)
+        self.assertEqual(stats["texts_redacted"], 2)
+
+    def test_batch_apply_does_not_modify_inputs(self):
+        engine = retrieval_policy.RedactionEngine(PATTERNS)
+        results = [{"chunk_id": f"c{i}", "text": text} for i, text in enumerate(TEXTS)]
+
+        redacted, per_result = engine.redact_results(results)
+
+        self.assertEqual(results[0]["text"], TEXTS[0])
+        self.assertEqual(redacted[0]["text"], _legacy(TEXTS[0], PATTERNS))
+        self.assertTrue(redacted[0]["metadata"]["redacted"])
+        self.assertNotIn("metadata", redacted[2])
+        self.assertIsNot(redacted[2], results[2])
+        self.assertEqual(per_result[2], {})
+
+    def test_backreference_patterns_fall_back(self):
+        patterns = [{"name": "repeat", "pattern": r"\b(\w+) \1\b", "replacement": "[DUP]"}] + PATTERNS
+        engine = retrieval_policy.RedactionEngine(patterns)
+        self.assertEqual(engine.mode, "per_pattern")
+        text = "the the number 555-123-4567"
+        self.assertEqual(engine.redact(text)[0], _legacy(text, patterns))
+
+    def test_template_replacements_expand(self):
+        patterns = [{"name": "email", "pattern": r"\b[\w.]+@(?P<domain>[\w.]+)\b", "replacement": r"[EMAIL @\g<domain>]"},
+                    {"name": "phone", "pattern": r"\b(\d{3})-\d{3}-\d{4}\b", "replacement": r"\1-XXX-XXXX"}]
+        engine = retrieval_policy.RedactionEngine(patterns)
+        self.assertEqual(engine.mode, "per_pattern")
+        text = "Mail jane@example.com or call 555-123-4567."
+        self.assertEqual(engine.redact(text)[0], "Mail [EMAIL @example.com] or call 555-XXX-XXXX.")
+
+    def test_leftmost_match_wins_across_patterns(self):
+        patterns = [{"name": "late", "pattern": r"BC", "replacement": "[LATE]"},
+                    {"name": "early", "pattern": r"AB", "replacement": "[EARLY]"}]
+        engine = retrieval_policy.RedactionEngine(patterns)
+        self.assertEqual(engine.redact("ABC")[0], "[EARLY]C")
+
+    def test_word_boundary_hoisted_only_when_safe(self):
+        engine = retrieval_policy.RedactionEngine(PATTERNS)
+        self.assertTrue(engine._combined.pattern.startswith(r"\b(?:"))
+
+        patterns = [{"name": "code", "pattern": r"\bAB\d+|XY\d+", "replacement": "[CODE]"}] + PATTERNS
+        engine = retrieval_policy.RedactionEngine(patterns)
+        self.assertFalse(engine._combined.pattern.startswith(r"\b(?:"))
+        text = "codes zXY12 and AB3, call 555-123-4567"
+        self.assertEqual(engine.redact(text)[0], _legacy(text, patterns))
+
+    def test_engine_compiled_once_per_config(self):
+        first = retrieval_policy.get_redaction_engine(PATTERNS)
+        self.assertIs(retrieval_policy.get_redaction_engine([dict(p) for p in PATTERNS]), first)
+        self.assertIsNot(retrieval_policy.get_redaction_engine(PATTERNS[:1]), first)
+
+    def test_invalid_pattern_raises(self):
+        with self.assertRaises(re.error):
+            retrieval_policy.RedactionEngine([{"name": "bad", "pattern": "("}])
+
+
+class TestEnforcePolicyRedaction(unittest.TestCase):
+    """enforce_policy reports per-pattern hits."""
+
+    def setUp(self):
+        retrieval_policy.reset_redaction_engines()
+
+    def test_redaction_hits_reported(self):
+        config = {"enabled": True, "default_mode": "filter", "sensitive_patterns": PATTERNS, "authorization": {}}
+        results = [{"chunk_id": f"c{i}", "text": text} for i, text in enumerate(TEXTS)]
+
+        with patch.object(rag_config, "get_policy_config", return_value=config), \
+                patch("builtins.print"):
+            outcome = retrieval_policy.enforce_policy(results)
+            stats = retrieval_policy.get_redaction_stats()
+
+        self.assertEqual(outcome["redacted_count"], 2)
+        self.assertEqual(outcome["redaction_hits"], {"email": 1, "phone": 2, "ssn": 1, "credit_card": 1})
+        self.assertEqual([v["patterns"] for v in outcome["violations"]], [["email", "phone"], ["credit_card", "phone", "ssn"]])
+        self.assertEqual(stats["hit_counts"]["phone"], 2)
+
+    def test_redaction_disabled_keeps_text(self):
+        config = {"enabled": True, "default_mode": "filter", "sensitive_patterns": PATTERNS, "authorization": {}}
+        results = [{"chunk_id": "c0", "text": TEXTS[0]}]
+
+        with patch.object(rag_config, "get_policy_config", return_value=config):
+            outcome = retrieval_policy.enforce_policy(results, {"redact_pii": False})
+
+        self.assertEqual(outcome["results"][0]["text"], TEXTS[0])
+        self.assertEqual(outcome["redaction_hits"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
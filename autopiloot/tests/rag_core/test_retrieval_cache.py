@@ -0,0 +1,286 @@
+"""
+Tests for the rag.cache retrieval cache and its use in hybrid_retrieve.search.
+
+The Redis backend runs against fakeredis; search tests use counting fake
+sources so cache hits are observable without network access.
+"""
+
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+try:
+    import fakeredis
+except ImportError:  # Test dependency (pyproject dev extras)
+    fakeredis = None
+
+from core.rag import hybrid_retrieve
+import rag.config as rag_config
+import rag.cache as retrieval_cache
+
+
+def _cache_config(**overrides):
+    config = {
+        "enabled": True,
+        "backend": "memory",
+        "cache_keys": {"normalization": True, "include_filters": True, "include_top_k": True, "hash_algorithm": "sha256"},
+        "ttl": {"default_seconds": 3600, "opensearch_results_seconds": 1800, "zep_results_seconds": 3600, "bigquery_results_seconds": 1800},
+        "bypass": {"enabled": True, "strict_filters": True, "small_top_k_threshold": 5, "explicit_bypass_flag": True},
+        "limits": {"max_entries": 10000, "max_memory_mb": 500, "eviction_policy": "lru"},
+        "metrics": {"enabled": True, "track_per_source": True, "track_per_query_type": True},
+        "invalidation": {"enabled": True, "on_new_content": True},
+        "performance": {"alert_on_high_miss_rate": True, "miss_rate_threshold": 50},
+        "logging": {"enabled": False}
+    }
+    for section, value in overrides.items():
+        if isinstance(value, dict):
+            config[section] = {**config.get(section, {}), **value}
+        else:
+            config[section] = value
+    return config
+
+
+class TestCacheKeysAndRules(unittest.TestCase):
+    """Key normalization, bypass rules and TTL selection."""
+
+    def setUp(self):
+        retrieval_cache.configure_cache(_cache_config())
+
+    def tearDown(self):
+        retrieval_cache.reset_cache()
+
+    def test_equivalent_requests_share_key(self):
+        key_a = retrieval_cache.build_cache_key("search", "  How to GROW  revenue", {"channel_id": "UC1"}, 10)
+        key_b = retrieval_cache.build_cache_key("search", "how to grow revenue", {"video_id": None, "channel_id": "UC1"}, 10)
+        self.assertEqual(key_a, key_b)
+        self.assertTrue(key_a.startswith("rag_cache:search:"))
+
+    def test_key_varies_by_filters_top_k_and_scope(self):
+        base = retrieval_cache.build_cache_key("search", "q", {"channel_id": "UC1"}, 10)
+        self.assertNotEqual(base, retrieval_cache.build_cache_key("search", "q", {"channel_id": "UC2"}, 10))
+        self.assertNotEqual(base, retrieval_cache.build_cache_key("search", "q", {"channel_id": "UC1"}, 20))
+        self.assertNotEqual(base, retrieval_cache.build_cache_key("zep", "q", {"channel_id": "UC1"}, 10))
+
+    def test_key_settings_honoured(self):
+        retrieval_cache.configure_cache(_cache_config(cache_keys={"normalization": False, "include_top_k": False}))
+        self.assertNotEqual(
+            retrieval_cache.build_cache_key("search", "Q", None, 10),
+            retrieval_cache.build_cache_key("search", "q", None, 10)
+        )
+        self.assertEqual(
+            retrieval_cache.build_cache_key("search", "q", None, 10),
+            retrieval_cache.build_cache_key("search", "q", None, 50)
+        )
+
+    def test_bypass_rules(self):
+        self.assertEqual(retrieval_cache.get_bypass_reason(None, 10, bypass=True), "explicit_flag")
+        self.assertEqual(retrieval_cache.get_bypass_reason({"date_from": "2025-01-01"}, 10), "time_bounded_filters")
+        self.assertEqual(retrieval_cache.get_bypass_reason(None, 3), "small_top_k")
+        self.assertIsNone(retrieval_cache.get_bypass_reason({"channel_id": "UC1"}, 10))
+
+        retrieval_cache.configure_cache(_cache_config(bypass={"enabled": False}))
+        self.assertIsNone(retrieval_cache.get_bypass_reason({"date_from": "2025-01-01"}, 3, bypass=True))
+
+    def test_per_source_ttl(self):
+        self.assertEqual(retrieval_cache.get_ttl_seconds("search"), 3600)
+        self.assertEqual(retrieval_cache.get_ttl_seconds("opensearch"), 1800)
+        self.assertEqual(retrieval_cache.get_ttl_seconds("bigquery"), 1800)
+
+    def test_disabled_cache_is_inert(self):
+        retrieval_cache.configure_cache({"enabled": False})
+        self.assertFalse(retrieval_cache.is_cache_enabled())
+        self.assertFalse(retrieval_cache.set_cached("search", "q", None, 10, {"results": []}))
+        self.assertIsNone(retrieval_cache.get_cached("search", "q", None, 10))
+
+
+class TestMemoryBackend(unittest.TestCase):
+    """TTL expiry, size limits and eviction policies."""
+
+    def tearDown(self):
+        retrieval_cache.reset_cache()
+
+    def test_ttl_expiry(self):
+        retrieval_cache.configure_cache(_cache_config())
+        retrieval_cache.set_cached("search", "q", None, 10, {"results": [1]}, ttl_seconds=0.05)
+        self.assertIsNotNone(retrieval_cache.get_cached("search", "q", None, 10))
+        time.sleep(0.1)
+        self.assertIsNone(retrieval_cache.get_cached("search", "q", None, 10))
+
+    def test_cached_values_are_copies(self):
+        retrieval_cache.configure_cache(_cache_config())
+        retrieval_cache.set_cached("search", "q", None, 10, {"results": [1]})
+        retrieval_cache.get_cached("search", "q", None, 10)["results"].append(2)
+        self.assertEqual(retrieval_cache.get_cached("search", "q", None, 10)["results"], [1])
+
+    def test_lru_eviction(self):
+        retrieval_cache.configure_cache(_cache_config(limits={"max_entries": 2, "eviction_policy": "lru"}))
+        retrieval_cache.set_cached("search", "a", None, 10, {"v": "a"})
+        retrieval_cache.set_cached("search", "b", None, 10, {"v": "b"})
+        retrieval_cache.get_cached("search", "a", None, 10)
+        retrieval_cache.set_cached("search", "c", None, 10, {"v": "c"})
+
+        self.assertIsNotNone(retrieval_cache.get_cached("search", "a", None, 10))
+        self.assertIsNone(retrieval_cache.get_cached("search", "b", None, 10))
+        self.assertEqual(retrieval_cache.get_cache_stats()["evictions"], 1)
+
+    def test_lfu_eviction(self):
+        retrieval_cache.configure_cache(_cache_config(limits={"max_entries": 2, "eviction_policy": "lfu"}))
+        retrieval_cache.set_cached("search", "a", None, 10, {"v": "a"})
+        retrieval_cache.set_cached("search", "b", None, 10, {"v": "b"})
+        for _ in range(3):
+            retrieval_cache.get_cached("search", "a", None, 10)
+        retrieval_cache.get_cached("search", "b", None, 10)
+        retrieval_cache.set_cached("search", "c", None, 10, {"v": "c"})
+
+        self.assertIsNotNone(retrieval_cache.get_cached("search", "a", None, 10))
+        self.assertIsNone(retrieval_cache.get_cached("search", "b", None, 10))
+        self.assertIsNotNone(retrieval_cache.get_cached("search", "c", None, 10))
+
+    def test_memory_limit_evicts(self):
+        retrieval_cache.configure_cache(_cache_config(limits={"max_memory_mb": 0.001}))
+        for i in range(10):
+            retrieval_cache.set_cached("search", f"q{i}", None, 10, {"text": "x" * 200})
+
+        stats = retrieval_cache.get_cache_stats()
+        self.assertLessEqual(stats["memory_mb"], 0.001)
+        self.assertLess(stats["entries"], 10)
+        self.assertGreater(stats["evictions"], 0)
+
+    def test_invalidate_scope(self):
+        retrieval_cache.configure_cache(_cache_config())
+        retrieval_cache.set_cached("search", "q", None, 10, {"v": 1})
+        retrieval_cache.set_cached("zep", "q", None, 10, {"v": 1})
+        retrieval_cache.set_cached("embeddings", "q", None, None, {"v": 1})
+
+        self.assertEqual(retrieval_cache.invalidate_on_new_content(), 2)
+        self.assertIsNone(retrieval_cache.get_cached("search", "q", None, 10))
+        self.assertIsNotNone(retrieval_cache.get_cached("embeddings", "q", None, None))
+
+
+@unittest.skipUnless(fakeredis, "fakeredis not installed")
+class TestRedisBackend(unittest.TestCase):
+    """Redis backend against fakeredis."""
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        retrieval_cache.configure_cache(_cache_config(backend="redis"), redis_client=self.redis)
+
+    def tearDown(self):
+        retrieval_cache.reset_cache()
+
+    def test_round_trip_with_native_ttl(self):
+        retrieval_cache.set_cached("opensearch", "q", {"channel_id": "UC1"}, 20, {"status": "success", "results": []})
+        key = retrieval_cache.build_cache_key("opensearch", "q", {"channel_id": "UC1"}, 20)
+
+        self.assertEqual(retrieval_cache.get_cache_stats()["backend"], "redis")
+        self.assertTrue(0 < self.redis.ttl(key) <= 1800)
+        self.assertEqual(retrieval_cache.get_cached("opensearch", "Q", {"channel_id": "UC1"}, 20)["status"], "success")
+
+    def test_invalidate_all(self):
+        for i in range(3):
+            retrieval_cache.set_cached("search", f"q{i}", None, 10, {"v": i})
+        self.redis.set("unrelated", "keep")
+
+        self.assertEqual(retrieval_cache.invalidate_cache(), 3)
+        self.assertEqual(self.redis.get("unrelated"), "keep")
+        self.assertEqual(retrieval_cache.get_cache_stats()["entries"], 0)
+
+    def test_backend_errors_degrade_to_miss(self):
+        with patch.object(self.redis, "get", side_effect=ConnectionError("down")):
+            self.assertIsNone(retrieval_cache.get_cached("search", "q", None, 10))
+        self.assertEqual(retrieval_cache.get_cache_stats()["errors"], 1)
+
+
+class TestSearchCaching(unittest.TestCase):
+    """Cache layers around hybrid_retrieve.search and the per-source queries."""
+
+    def setUp(self):
+        retrieval_cache.configure_cache(_cache_config())
+        self.calls = {"zep": 0, "opensearch": 0, "bigquery": 0}
+
+    def tearDown(self):
+        retrieval_cache.reset_cache()
+
+    def _source(self, name):
+        def query(query, filters, top_k, timeout):
+            self.calls[name] += 1
+            return {"status": "success", "results": [{
+                "chunk_id": f"{name}_0",
+                "text": f"{name} result",
+                "score": 0.9,
+                "content_sha256": f"hash_{name}",
+                "source": name
+            }]}
+        return query
+
+    def _search(self, query="revenue growth", filters=None, limit=10, **kwargs):
+        rag_values = {
+            "timeouts.search_ms": 2000,
+            "experiments.default_parameters.fusion.algorithm": "rrf",
+            "experiments.default_parameters.fusion.rrf_k": 60,
+        }
+        with patch.object(rag_config, "is_sink_enabled", return_value=True), \
+                patch.object(rag_config, "get_retrieval_config", return_value={"top_k": 20, "timeout_ms": 2000, "weights": {}}), \
+                patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: rag_values.get(key, default)), \
+                patch.object(hybrid_retrieve, "_query_zep", self._source("zep")), \
+                patch.object(hybrid_retrieve, "_query_opensearch", self._source("opensearch")), \
+                patch.object(hybrid_retrieve, "_query_bigquery", self._source("bigquery")), \
+                patch("rag.tracing.emit_retrieval_event"):
+            return hybrid_retrieve.search(query, filters=filters, limit=limit, **kwargs)
+
+    def test_repeat_search_served_from_cache(self):
+        first = self._search()
+        second = self._search(query="  Revenue GROWTH ")
+
+        self.assertFalse(first["cache_hit"])
+        self.assertTrue(second["cache_hit"])
+        self.assertEqual(second["results"], first["results"])
+        self.assertNotEqual(second["trace_id"], first["trace_id"])
+        self.assertEqual(self.calls, {"zep": 1, "opensearch": 1, "bigquery": 1})
+
+        stats = retrieval_cache.get_cache_stats()
+        self.assertEqual(stats["per_source"]["search"], {"hits": 1, "misses": 1, "hit_ratio_percent": 50.0})
+
+    def test_source_results_cached_across_limits(self):
+        self._search(limit=10)
+        result = self._search(limit=15)
+
+        self.assertFalse(result["cache_hit"])
+        self.assertEqual(self.calls, {"zep": 1, "opensearch": 1, "bigquery": 1})
+        self.assertEqual(retrieval_cache.get_cache_stats()["per_source"]["zep"]["hits"], 1)
+
+    def test_bypass_skips_both_layers(self):
+        self._search()
+        self._search(bypass_cache=True)
+        self._search(filters={"date_from": "2025-01-01"})
+
+        self.assertEqual(self.calls, {"zep": 3, "opensearch": 3, "bigquery": 3})
+        self.assertEqual(
+            retrieval_cache.get_cache_stats()["bypass_reasons"],
+            {"explicit_flag": 1, "time_bounded_filters": 1}
+        )
+
+    def test_warm_cache_preloads_queries(self):
+        retrieval_cache.configure_cache(_cache_config(warming={"enabled": True, "preload_queries": ["pricing", "hiring"]}))
+        warm = retrieval_cache.warm_cache(search_fn=lambda q, filters=None, limit=20: self._search(q, filters, limit))
+
+        self.assertEqual(warm["warmed_count"], 2)
+        self.assertTrue(self._search("pricing", limit=20)["cache_hit"])
+
+    def test_first_search_runs_configured_warming_once(self):
+        retrieval_cache.configure_cache(_cache_config(warming={"enabled": True, "preload_queries": ["pricing"]}))
+
+        self._search("hiring", limit=20)
+        self._search("hiring", limit=20)
+
+        self.assertTrue(self._search("pricing", limit=20)["cache_hit"])
+        self.assertEqual(self.calls, {"zep": 2, "opensearch": 2, "bigquery": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
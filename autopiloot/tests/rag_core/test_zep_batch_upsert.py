@@ -0,0 +1,145 @@
+"""
+Tests for batched Zep transcript upsert (zep_upsert.upsert_transcript_batch).
+
+HTTP goes through a fake session injected in place of the shared client
+registry's keep-alive session.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+import rag.config as rag_config
+import rag.clients as rag_clients
+import rag.zep_upsert as zep_upsert
+
+
+class FakeSession:
+    """Records requests; thread GET returns thread_status, message posts can fail."""
+
+    def __init__(self, thread_status=200, fail_batches=(), delay_s=0.0):
+        self.thread_status = thread_status
+        self.fail_batches = set(fail_batches)
+        self.delay_s = delay_s
+        self.calls = []
+        self.message_posts = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _response(self, status=200, payload=None):
+        response = MagicMock(status_code=status)
+        response.json.return_value = payload or {}
+        if status >= 400:
+            response.raise_for_status.side_effect = RuntimeError(f"HTTP {status}")
+        return response
+
+    def get(self, url, headers=None, timeout=None):
+        self.calls.append(("GET", url))
+        return self._response(self.thread_status)
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        with self._lock:
+            self.calls.append(("POST", url))
+            if not url.endswith("/messages"):
+                return self._response(201)
+            batch_number = self.message_posts
+            self.message_posts += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        time.sleep(self.delay_s)
+        with self._lock:
+            self.in_flight -= 1
+
+        if batch_number in self.fail_batches:
+            return self._response(500)
+        uuids = [f"uuid_{m['metadata']['chunk_id']}" for m in json["messages"]]
+        return self._response(200, {"message_uuids": uuids})
+
+
+def _chunks(count, video_id="vid123"):
+    return [
+        {"text": f"chunk {i}", "metadata": {"video_id": video_id, "chunk_id": f"{video_id}_chunk_{i}", "channel_id": "UC1"}}
+        for i in range(count)
+    ]
+
+
+class TestUpsertTranscriptBatch(unittest.TestCase):
+    """Thread ensured once, batched posts, per-chunk status."""
+
+    def _run(self, chunks, session, per_request=10, concurrency=4, enabled=True):
+        rag_values = {
+            "zep.transcripts.thread_id_format": "transcript_{video_id}",
+            "zep.transcripts.user_id_format": "youtube_{channel_id}",
+            "zep.transcripts.batch.messages_per_request": per_request,
+            "zep.transcripts.batch.max_concurrency": concurrency,
+        }
+        env = {"ZEP_API_KEY": "key", "ZEP_API_URL": "https://zep.test"}
+        with patch.object(rag_config, "get_rag_flag", return_value=enabled), \
+                patch.object(rag_config, "get_rag_value", side_effect=lambda key, default=None: rag_values.get(key, default)), \
+                patch.object(zep_upsert, "get_optional_env_var", side_effect=lambda name, default="": env.get(name, default)), \
+                patch.object(rag_clients, "get_http_session", return_value=session):
+            return zep_upsert.upsert_transcript_batch("vid123", chunks)
+
+    def test_call_count_is_chunks_over_batch(self):
+        session = FakeSession()
+        result = self._run(_chunks(25), session, per_request=10)
+
+        self.assertEqual(result["status"], "upserted")
+        self.assertEqual(result["upserted_count"], 25)
+        self.assertEqual(session.message_posts, 3)
+        self.assertEqual(sum(1 for method, _ in session.calls if method == "GET"), 1)
+        self.assertEqual(result["request_count"], 4)
+        self.assertEqual(result["thread_id"], "transcript_vid123")
+
+    def test_thread_created_once_when_missing(self):
+        session = FakeSession(thread_status=404)
+        result = self._run(_chunks(5), session)
+
+        thread_posts = [url for method, url in session.calls if method == "POST" and url.endswith("/v3/threads")]
+        self.assertEqual(len(thread_posts), 1)
+        self.assertEqual(result["request_count"], 3)
+
+    def test_per_chunk_status_in_input_order(self):
+        session = FakeSession(fail_batches={1})
+        result = self._run(_chunks(6), session, per_request=2, concurrency=1)
+
+        self.assertEqual(result["status"], "partial")
+        self.assertEqual([c["status"] for c in result["chunks"]],
+                         ["upserted", "upserted", "error", "error", "upserted", "upserted"])
+        self.assertEqual(result["chunks"][0]["message_id"], "uuid_vid123_chunk_0")
+        self.assertEqual(result["error_count"], 2)
+
+    def test_concurrency_is_bounded(self):
+        session = FakeSession(delay_s=0.05)
+        result = self._run(_chunks(40), session, per_request=5, concurrency=3)
+
+        self.assertEqual(result["upserted_count"], 40)
+        self.assertLessEqual(session.max_in_flight, 3)
+        self.assertGreater(session.max_in_flight, 1)
+
+    def test_disabled_skips_every_chunk(self):
+        session = FakeSession()
+        result = self._run(_chunks(3), session, enabled=False)
+
+        self.assertEqual(result["status"], "skipped")
+        self.assertEqual(result["skipped_count"], 3)
+        self.assertEqual(session.calls, [])
+
+    def test_missing_channel_is_error(self):
+        chunks = [{"text": "t", "metadata": {"chunk_id": "c0"}}]
+        result = self._run(chunks, FakeSession())
+
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["chunks"], [{"chunk_id": "c0", "status": "error"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+"""
+Tests for the buffered ref writer in core/rag/refs.py (WriteBatch flushes,
+size/interval thresholds and flush metrics).
+"""
+
+import os
+import sys
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+from rag import refs
+from rag.refs import configure_ref_writer, flush_refs, get_ref_writer_stats, upsert_ref
+
+
+# Other test modules replace google.cloud.firestore in sys.modules
+FAKE_FIRESTORE = SimpleNamespace(SERVER_TIMESTAMP="SERVER_TIMESTAMP")
+
+
+class _Batch:
+    def __init__(self, client):
+        self.client = client
+        self.writes = []
+
+    def set(self, doc_ref, data, merge=False):
+        self.writes.append((doc_ref.id, dict(data), merge))
+
+    def commit(self):
+        if self.client.fail_commits:
+            self.client.fail_commits -= 1
+            raise RuntimeError("deadline exceeded")
+        self.client.commits.append(self.writes)
+
+
+class _FirestoreClient:
+    """Records WriteBatch commits; collection().document() returns id-only refs."""
+
+    def __init__(self):
+        self.commits = []
+        self.fail_commits = 0
+
+    def collection(self, name):
+        return SimpleNamespace(document=lambda doc_id: SimpleNamespace(id=f"{name}/{doc_id}"))
+
+    def batch(self):
+        return _Batch(self)
+
+
+def _ref(source_ref, **extra):
+    ref = {
+        "type": "transcript", "source_ref": source_ref, "created_by_agent": "transcriber_agent",
+        "content_hashes": ["h1"], "chunk_count": 1, "total_tokens": 100, "indexing_status": "success",
+        "sink_statuses": {"opensearch": "indexed"}, "indexing_duration_ms": 12
+    }
+    ref.update(extra)
+    return ref
+
+
+class TestRefWriter(unittest.TestCase):
+    """upsert_ref queues on one shared client; flush_refs commits in WriteBatch groups."""
+
+    def setUp(self):
+        refs.reset_ref_writer()
+        self.client = _FirestoreClient()
+        self.factory_calls = []
+
+        def get_client(project_id):
+            self.factory_calls.append(project_id)
+            return self.client
+
+        patches = [
+            patch.object(refs, "get_config_value", side_effect=lambda key, default=None: key == "rag.features.write_firestore_refs" or default),
+            patch("env_loader.get_required_env_var", return_value="proj"),
+            patch("rag.clients.get_firestore_client", side_effect=get_client),
+            patch.dict(sys.modules, {"google.cloud": SimpleNamespace(firestore=FAKE_FIRESTORE),
+                                     "google.cloud.firestore": FAKE_FIRESTORE}),
+            patch("builtins.print")
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(refs.reset_ref_writer)
+
+    def test_refs_buffered_until_flush_then_committed_in_groups(self):
+        configure_ref_writer({"max_buffered": 10000, "flush_interval_seconds": 0.5, "batch_size": 500})
+
+        for i in range(1200):
+            upsert_ref(_ref(f"vid{i}"))
+        self.assertEqual(self.client.commits, [])
+        self.assertEqual(get_ref_writer_stats()["buffered"], 1200)
+
+        result = flush_refs()
+
+        self.assertEqual([len(c) for c in self.client.commits], [500, 500, 200])
+        self.assertEqual((result["flushed"], result["failed"], result["batches"]), (1200, 0, 3))
+        self.assertEqual(self.client.commits[0][0][0], "rag_refs/transcript_vid0")
+        self.assertTrue(all(merge for commit in self.client.commits for _, _, merge in commit))
+        self.assertEqual(len(self.factory_calls), 1200)  # Registry lookups; one shared client object
+
+    def test_batch_size_capped_at_firestore_limit(self):
+        self.assertEqual(configure_ref_writer({"batch_size": 2000})["batch_size"], 500)
+
+    def test_size_threshold_flushes(self):
+        configure_ref_writer({"max_buffered": 3, "flush_interval_seconds": 60})
+
+        for i in range(7):
+            upsert_ref(_ref(f"vid{i}"))
+
+        self.assertEqual([len(c) for c in self.client.commits], [3, 3])
+        stats = get_ref_writer_stats()
+        self.assertEqual((stats["buffered"], stats["written"]), (1, 6))
+        self.assertEqual(stats["flush_reasons"], {"size": 2})
+
+    def test_interval_timer_flushes_idle_buffer(self):
+        configure_ref_writer({"max_buffered": 100, "flush_interval_seconds": 0.05})
+
+        upsert_ref(_ref("vid0"))
+        deadline = time.time() + 2
+        while not self.client.commits and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(len(self.client.commits), 1)
+        self.assertEqual(get_ref_writer_stats()["flush_reasons"], {"interval": 1})
+
+    def test_same_document_coalesced_with_merge(self):
+        configure_ref_writer({"max_buffered": 100, "flush_interval_seconds": 60})
+
+        upsert_ref(_ref("vid0", title="Draft"))
+        upsert_ref(_ref("vid0", indexing_status="partial"))
+        flush_refs()
+
+        (writes,) = self.client.commits
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(writes[0][1]["title"], "Draft")
+        self.assertEqual(writes[0][1]["indexing_status"], "partial")
+        self.assertEqual(get_ref_writer_stats()["coalesced"], 1)
+
+    def test_failed_commit_is_best_effort(self):
+        configure_ref_writer({"max_buffered": 100, "flush_interval_seconds": 60, "batch_size": 2})
+        self.client.fail_commits = 1
+
+        for i in range(3):
+            upsert_ref(_ref(f"vid{i}"))
+        result = flush_refs()
+
+        self.assertEqual((result["flushed"], result["failed"]), (1, 2))
+        stats = get_ref_writer_stats()
+        self.assertEqual((stats["written"], stats["failed"], stats["buffered"]), (1, 2, 0))
+
+    def test_buffer_disabled_commits_each_ref(self):
+        configure_ref_writer({"enabled": False})
+
+        upsert_ref(_ref("vid0"))
+        upsert_ref(_ref("vid1"))
+
+        self.assertEqual([len(c) for c in self.client.commits], [1, 1])
+
+    def test_flush_with_nothing_queued_is_a_no_op(self):
+        self.assertEqual(flush_refs()["batches"], 0)
+        self.assertEqual(get_ref_writer_stats()["flushes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
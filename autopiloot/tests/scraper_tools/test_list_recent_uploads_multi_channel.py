@@ -0,0 +1,127 @@
+"""
+Tests for multi-channel runs of ListRecentUploads.
+Verifies channel_ids are discovered together and results/quota are reported per run.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+import json
+import os
+import sys
+
+
+class MockBaseTool:
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+def mock_field(default=None, **kwargs):
+    return default
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+with patch.dict('sys.modules', {
+    'agency_swarm': MagicMock(),
+    'agency_swarm.tools': MagicMock(BaseTool=MockBaseTool),
+    'pydantic': MagicMock(Field=mock_field),
+    'googleapiclient': MagicMock(),
+    'googleapiclient.discovery': MagicMock(),
+    'google': MagicMock(),
+    'google.oauth2': MagicMock(),
+    'firebase_admin': MagicMock(),
+    'firebase_admin.firestore': MagicMock(),
+    'config': MagicMock(),
+    'config.env_loader': MagicMock(get_required_env_var=lambda x, y: 'mock_value'),
+    'config.loader': MagicMock(get_config_value=lambda key, default=None: default)
+}):
+    import importlib.util
+    tool_path = os.path.join(
+        os.path.dirname(__file__), '..', '..',
+        'scraper_agent', 'tools', 'list_recent_uploads.py'
+    )
+    spec = importlib.util.spec_from_file_location("list_recent_uploads", tool_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    ListRecentUploads = module.ListRecentUploads
+
+
+def _item(video_id, published_at, duration='PT10M'):
+    return {'id': video_id, 'snippet': {'title': video_id, 'publishedAt': published_at},
+            'contentDetails': {'duration': duration}}
+
+
+DISCOVERY = {
+    'channels': {
+        'UC1': {'uploads_playlist_id': 'UU1', 'error': None, 'videos': [
+            _item('a2', '2025-01-27T20:00:00Z'), _item('a1', '2025-01-27T08:00:00Z'),
+            _item('a0', '2025-01-26T08:00:00Z')
+        ]},
+        'UC2': {'uploads_playlist_id': 'UU2', 'error': None, 'videos': [_item('b1', '2025-01-27T12:00:00Z', 'PT1H')]},
+        'UC3': {'uploads_playlist_id': None, 'error': 'Could not find uploads playlist', 'videos': []}
+    },
+    'quota': {'units': 5, 'calls': {'channels.list': 1, 'playlistItems.list': 2, 'videos.list': 1}}
+}
+
+
+class TestListRecentUploadsMultiChannel(unittest.TestCase):
+    """Test multi-channel discovery through core/youtube_discovery.py."""
+
+    def _tool(self, **kwargs):
+        params = {'channel_id': None, 'channel_ids': None, 'since_utc': '2025-01-27T00:00:00Z',
+                  'until_utc': '2025-01-28T00:00:00Z', 'page_size': 10, 'use_checkpoint': True}
+        params.update(kwargs)
+        return ListRecentUploads(**params)
+
+    def test_channels_discovered_in_one_run(self):
+        tool = self._tool(channel_id='UC1', channel_ids=['UC2', 'UC1', 'UC3'])
+
+        with patch.object(module, 'discover_uploads', return_value=DISCOVERY) as mock_discover, \
+                patch.object(ListRecentUploads, '_load_checkpoint', return_value=None), \
+                patch.object(ListRecentUploads, '_save_checkpoint') as mock_save:
+            data = json.loads(tool.run())
+
+        args, kwargs = mock_discover.call_args
+        self.assertEqual(args[0], ['UC1', 'UC2', 'UC3'])
+        self.assertEqual(kwargs['max_items_per_channel'], 20)
+        self.assertEqual(kwargs['checkpoints'], {'UC1': None, 'UC2': None, 'UC3': None})
+
+        self.assertEqual([v['video_id'] for v in data['items']], ['a2', 'b1', 'a1'])
+        self.assertEqual(data['items'][1]['duration_sec'], 3600)
+        self.assertEqual(data['total_found'], 3)
+        self.assertEqual(data['channels']['UC3']['error'], 'Could not find uploads playlist')
+        self.assertEqual((data['quota_units_used'], data['quota_calls']['videos.list']), (5, 1))
+        self.assertEqual(sorted(call.args for call in mock_save.call_args_list),
+                         [('UC1', '2025-01-27T20:00:00Z'), ('UC2', '2025-01-27T12:00:00Z')])
+
+    def test_single_channel_keeps_response_shape(self):
+        tool = self._tool(channel_id='UC1', use_checkpoint=False)
+        discovery = {'channels': {'UC1': DISCOVERY['channels']['UC1']}, 'quota': {'units': 3, 'calls': {}}}
+
+        with patch.object(module, 'discover_uploads', return_value=discovery):
+            data = json.loads(tool.run())
+
+        self.assertNotIn('channels', data)
+        self.assertEqual([v['video_id'] for v in data['items']], ['a2', 'a1'])
+        self.assertFalse(data['checkpoint_updated'])
+        self.assertEqual(data['quota_units_used'], 3)
+
+    def test_single_channel_without_playlist(self):
+        tool = self._tool(channel_id='UC3', use_checkpoint=False)
+        discovery = {'channels': {'UC3': DISCOVERY['channels']['UC3']}, 'quota': {'units': 1, 'calls': {}}}
+
+        with patch.object(module, 'discover_uploads', return_value=discovery):
+            data = json.loads(tool.run())
+
+        self.assertEqual(data['error'], 'Could not find uploads playlist')
+        self.assertEqual(data['items'], [])
+
+    def test_requires_a_channel(self):
+        data = json.loads(self._tool().run())
+
+        self.assertIn('channel_id or channel_ids is required', data['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Tests for concurrent page fetching in ReadSheetLinks.
+Verifies pages are fetched once per URL, results keep row order, the regex scan
+runs before BeautifulSoup, and unchanged pages are served from the ETag cache.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+import json
+import os
+import sys
+
+
+class MockBaseTool:
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+def mock_field(default=None, **kwargs):
+    return default
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+with patch.dict('sys.modules', {
+    'agency_swarm': MagicMock(),
+    'agency_swarm.tools': MagicMock(BaseTool=MockBaseTool),
+    'pydantic': MagicMock(Field=mock_field),
+    'googleapiclient': MagicMock(),
+    'googleapiclient.discovery': MagicMock(),
+    'google': MagicMock(),
+    'google.oauth2': MagicMock(),
+    'google.oauth2.service_account': MagicMock(),
+    'config': MagicMock(),
+    'config.env_loader': MagicMock(get_required_env_var=lambda x, y: 'mock_value'),
+    'config.loader': MagicMock()
+}):
+    import importlib.util
+    tool_path = os.path.join(
+        os.path.dirname(__file__), '..', '..',
+        'scraper_agent', 'tools', 'read_sheet_links.py'
+    )
+    spec = importlib.util.spec_from_file_location("read_sheet_links", tool_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    ReadSheetLinks = module.ReadSheetLinks
+
+
+PAGES = {
+    "https://blog.example.com/a": '<iframe src="https://www.youtube.com/embed/AAAAAAAAAAA"></iframe>',
+    "https://blog.example.com/b": '<a href="https://youtube.com/watch?feature=share&amp;v=BBBBBBBBBBB">x</a>',
+    "https://news.example.org/c": '<p>no videos here</p>',
+}
+
+
+def _response(url, status=200, etag=None):
+    response = MagicMock()
+    response.status_code = status
+    response.text = PAGES.get(url, "")
+    response.headers = {"ETag": etag} if etag else {}
+    return response
+
+
+class TestReadSheetLinksConcurrent(unittest.TestCase):
+
+    def setUp(self):
+        module._page_cache.clear()
+        self.addCleanup(module._page_cache.clear)
+
+    def _run(self, rows, fake_get):
+        service = MagicMock()
+        service.spreadsheets().values().get().execute.return_value = {"values": rows}
+        config = {"sheet": "sheet1", "sheets": {"page_fetch": {"max_workers": 4, "per_host_interval_sec": 0}}}
+        tool = ReadSheetLinks(sheet_id=None, range_a1="Sheet1!A:A", max_rows=None, timeout_sec=5)
+
+        with patch.object(module, 'load_app_config', return_value=config), \
+                patch.object(ReadSheetLinks, '_initialize_sheets_service', return_value=service), \
+                patch('requests.get', side_effect=fake_get) as mock_get, \
+                patch('builtins.print'):
+            return json.loads(tool.run()), mock_get
+
+    def test_pages_fetched_once_and_rows_kept_in_order(self):
+        rows = [["https://blog.example.com/a"], ["https://youtu.be/CCCCCCCCCCC"], ["https://blog.example.com/b"],
+                ["https://blog.example.com/a"], ["https://news.example.org/c"], ["not-a-url"]]
+
+        with patch('bs4.BeautifulSoup') as mock_bs:
+            mock_bs.return_value.find_all.return_value = []
+            data, mock_get = self._run(rows, lambda url, headers=None, timeout=None: _response(url))
+
+        self.assertEqual(sorted(call.args[0] for call in mock_get.call_args_list),
+                         sorted(["https://blog.example.com/a", "https://blog.example.com/b", "https://news.example.org/c"]))
+        self.assertEqual([(item["sheet_row_index"], item["video_url"][-11:]) for item in data["items"]],
+                         [(1, "AAAAAAAAAAA"), (2, "CCCCCCCCCCC"), (3, "BBBBBBBBBBB")])
+        self.assertEqual((data["summary"]["pages_processed"], data["summary"]["pages_failed"]), (5, 1))
+        # Only the page without regex matches was parsed
+        self.assertEqual(mock_bs.call_count, 1)
+
+    def test_unchanged_page_served_from_cache(self):
+        def first(url, headers=None, timeout=None):
+            return _response(url, etag='"v1"')
+
+        def second(url, headers=None, timeout=None):
+            self.assertEqual(headers.get("If-None-Match"), '"v1"')
+            return _response(url, status=304)
+
+        self._run([["https://blog.example.com/a"]], first)
+        data, mock_get = self._run([["https://blog.example.com/a"]], second)
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(data["items"][0]["video_url"], "https://www.youtube.com/watch?v=AAAAAAAAAAA")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Tests for cached resolution in ResolveChannelHandles.
+Verifies handles go through core/channel_handles.py and resolution stats are reported.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+import json
+import os
+import sys
+
+
+class MockBaseTool:
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+def mock_field(default=None, **kwargs):
+    return default
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+with patch.dict('sys.modules', {
+    'agency_swarm': MagicMock(),
+    'agency_swarm.tools': MagicMock(BaseTool=MockBaseTool),
+    'pydantic': MagicMock(Field=mock_field),
+    'googleapiclient': MagicMock(),
+    'googleapiclient.discovery': MagicMock(),
+    'googleapiclient.errors': MagicMock(HttpError=type('HttpError', (Exception,), {})),
+    'google': MagicMock(),
+    'google.oauth2': MagicMock(),
+    'config': MagicMock(),
+    'config.env_loader': MagicMock(get_required_env_var=lambda x, y: 'mock_value'),
+    'config.loader': MagicMock(get_config_value=lambda key, default=None: default)
+}):
+    import importlib.util
+    tool_path = os.path.join(
+        os.path.dirname(__file__), '..', '..',
+        'scraper_agent', 'tools', 'resolve_channel_handles.py'
+    )
+    spec = importlib.util.spec_from_file_location("resolve_channel_handles", tool_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    ResolveChannelHandles = module.ResolveChannelHandles
+
+
+class TestResolveChannelHandlesCached(unittest.TestCase):
+
+    def test_run_reports_mappings_and_resolution_stats(self):
+        stats = {'sources': {'memory': 0, 'firestore': 1, 'for_handle': 0, 'search': 0},
+                 'stale_mappings': [], 'quota_units_used': 0, 'quota_calls': {}, 'quota_units_saved': 101}
+        resolved = {'mappings': {'@Alex': {'channel_id': 'UC1'}, '@Bad': {'error': 'not found'}}, 'stats': stats}
+        tool = ResolveChannelHandles(max_retries=3)
+
+        with patch.object(ResolveChannelHandles, '_load_handles_from_config', return_value=['@Alex', '@Bad']), \
+                patch.object(ResolveChannelHandles, '_initialize_youtube_client', return_value='yt'), \
+                patch.object(module, 'resolve_handles', return_value=resolved) as mock_resolve:
+            data = json.loads(tool.run())
+
+        args, kwargs = mock_resolve.call_args
+        self.assertEqual(args, ('yt', ['@Alex', '@Bad']))
+        self.assertEqual(kwargs['search_fallback'], tool._resolve_single_handle_with_metadata)
+        self.assertEqual(kwargs['ttl_days'], 30)
+        self.assertEqual(set(data), {'mappings', 'resolution'})
+        self.assertEqual(data['mappings']['@Alex']['channel_id'], 'UC1')
+        self.assertIn('error', data['mappings']['@Bad'])
+        self.assertEqual(data['resolution']['quota_units_saved'], 101)
+        self.assertEqual(data['resolution']['http_cache'], {'not_modified': 0, 'quota_units_saved': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Tests for batched sheet row archiving.
+Verifies RemoveSheetRow reads and deletes rows with O(1) Sheets calls per sheet,
+and MarkSheetRowsProcessed commits status updates through a Firestore WriteBatch.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+import json
+import os
+import sys
+
+
+class MockBaseTool:
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+def mock_field(default=None, **kwargs):
+    return default
+
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
+
+from sheets import batch_read_rows, build_row_delete_requests, coalesce_row_indices, get_row_block_ranges
+
+
+def _load_tool(module_name, filename):
+    import importlib.util
+    tool_path = os.path.join(os.path.dirname(__file__), '..', '..', 'scraper_agent', 'tools', filename)
+    spec = importlib.util.spec_from_file_location(module_name, tool_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+with patch.dict('sys.modules', {
+    'agency_swarm': MagicMock(),
+    'agency_swarm.tools': MagicMock(BaseTool=MockBaseTool),
+    'pydantic': MagicMock(Field=mock_field),
+    'googleapiclient': MagicMock(),
+    'googleapiclient.discovery': MagicMock(),
+    'google': MagicMock(),
+    'google.oauth2': MagicMock(),
+    'google.oauth2.service_account': MagicMock(),
+    'google.cloud': MagicMock(),
+    'config': MagicMock(),
+    'config.env_loader': MagicMock(),
+    'env_loader': MagicMock(),
+    'loader': MagicMock(),
+    'scraper_agent.tools.remove_sheet_row': MagicMock()
+}):
+    remove_module = _load_tool("remove_sheet_row", "remove_sheet_row.py")
+    mark_module = _load_tool("mark_sheet_rows_processed", "mark_sheet_rows_processed.py")
+    RemoveSheetRow = remove_module.RemoveSheetRow
+    MarkSheetRowsProcessed = mark_module.MarkSheetRowsProcessed
+
+
+class TestRowBatchHelpers(unittest.TestCase):
+
+    def test_coalesce_and_ranges(self):
+        self.assertEqual(coalesce_row_indices([8, 2, 3, 5, 4, 3]), [(2, 5), (8, 8)])
+        self.assertEqual(get_row_block_ranges("Sheet1", [8, 2, 3]), ["Sheet1!A2:Z3", "Sheet1!A8:Z8"])
+        self.assertEqual(coalesce_row_indices([]), [])
+
+    def test_delete_requests_are_bottom_up(self):
+        requests = build_row_delete_requests(7, [2, 3, 9])
+
+        self.assertEqual([(r['deleteRange']['range']['startRowIndex'], r['deleteRange']['range']['endRowIndex'])
+                          for r in requests], [(8, 9), (1, 3)])
+        self.assertEqual(requests[0]['deleteRange']['range']['sheetId'], 7)
+
+    def test_batch_read_maps_rows_including_omitted_trailing_rows(self):
+        service = MagicMock()
+        service.spreadsheets().values().batchGet().execute.return_value = {
+            'valueRanges': [{'values': [['a'], [], ['c']]}, {}]
+        }
+
+        rows = batch_read_rows(service, "sid", "Sheet1", [2, 3, 4, 5, 9])
+
+        self.assertEqual(rows, {2: ['a'], 3: [], 4: ['c'], 5: [], 9: []})
+        service.spreadsheets().values().batchGet.assert_called_with(
+            spreadsheetId="sid", ranges=["Sheet1!A2:Z5", "Sheet1!A9:Z9"]
+        )
+
+
+class TestRemoveSheetRowBatching(unittest.TestCase):
+
+    def test_archive_uses_constant_number_of_calls(self):
+        service = MagicMock()
+        service.spreadsheets().get().execute.return_value = {'sheets': [
+            {'properties': {'title': 'Sheet1', 'sheetId': 0}},
+            {'properties': {'title': 'Archive', 'sheetId': 1}}
+        ]}
+        service.spreadsheets().values().batchGet().execute.return_value = {
+            'valueRanges': [{'values': [['u2'], ['u3'], ['u4']]}, {'values': [['u7']]}]
+        }
+        service.reset_mock()
+
+        tool = RemoveSheetRow(sheet_id='sid', row_indices=[7, 3, 2, 4, 3], archive_mode=True,
+                              source_sheet_name='Sheet1')
+        with patch.object(remove_module, 'load_app_config', return_value={}), \
+                patch.object(RemoveSheetRow, '_initialize_sheets_service', return_value=service):
+            data = json.loads(tool.run())
+
+        self.assertEqual((data['processed_rows'], data['skipped_rows']), (4, 0))
+        values = service.spreadsheets().values()
+        self.assertEqual(values.batchGet.call_count, 1)
+        self.assertFalse(values.get.called)
+        self.assertEqual(values.append.call_count, 1)
+        archived = values.append.call_args.kwargs['body']['values']
+        self.assertEqual([row[0] for row in archived], ['u7', 'u4', 'u3', 'u2'])
+        self.assertEqual(archived[0][-1], 'Original row: 7')
+
+        self.assertEqual(service.spreadsheets().batchUpdate.call_count, 1)
+        requests = service.spreadsheets().batchUpdate.call_args.kwargs['body']['requests']
+        self.assertEqual([r['deleteRange']['range']['startRowIndex'] for r in requests], [6, 1])
+
+    def test_clear_coalesces_ranges(self):
+        service = MagicMock()
+        tool = RemoveSheetRow(sheet_id='sid', row_indices=[4, 2, 3], archive_mode=False,
+                              source_sheet_name='Sheet1')
+        with patch.object(remove_module, 'load_app_config', return_value={}), \
+                patch.object(RemoveSheetRow, '_initialize_sheets_service', return_value=service):
+            data = json.loads(tool.run())
+
+        self.assertEqual(data['processed_rows'], 3)
+        service.spreadsheets().values().batchClear.assert_called_with(
+            spreadsheetId='sid', body={'ranges': ['Sheet1!A2:Z4']}
+        )
+
+
+class TestMarkSheetRowsProcessedBatching(unittest.TestCase):
+
+    def test_status_updates_committed_in_one_write_batch(self):
+        db = MagicMock()
+        rows_info = [{'video_id': f'vid{i}', 'row_index': i} for i in range(3)]
+
+        MarkSheetRowsProcessed(dry_run=False)._mark_videos_processed(db, rows_info)
+
+        self.assertEqual(db.batch.call_count, 1)
+        batch = db.batch.return_value
+        self.assertEqual(batch.update.call_count, 3)
+        self.assertEqual(batch.commit.call_count, 1)
+        self.assertIn('sheet_metadata.processed_at', batch.update.call_args.args[1])
+
+    def test_large_updates_split_at_firestore_limit(self):
+        db = MagicMock()
+        rows_info = [{'video_id': f'vid{i}', 'row_index': i} for i in range(mark_module.MAX_BATCH_WRITES + 1)]
+
+        MarkSheetRowsProcessed(dry_run=False)._mark_videos_processed(db, rows_info)
+
+        self.assertEqual(db.batch.return_value.commit.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
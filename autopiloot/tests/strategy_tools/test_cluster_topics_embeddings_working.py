@@ -458,6 +458,19 @@ class TestClusterTopicsEmbeddingsWorking(unittest.TestCase):
             self.assertEqual(data['error'], 'embedding_failed')
             self.assertIn('message', data)
 
+    def test_rejected_embedding_batch_is_not_replaced_by_mock_vectors(self):
+        """An API error fails the run instead of clustering mock embeddings."""
+        tool = ClusterTopicsEmbeddings(items=self.sample_items)
+        client = MagicMock()
+        client.embeddings.create.side_effect = Exception("maximum context length exceeded")
+
+        with patch.object(sys.modules['openai'], 'OpenAI', return_value=client), \
+                patch.object(tool, '_generate_mock_embeddings') as mock_embeddings:
+            result = tool.run()
+
+        self.assertEqual(json.loads(result)['error'], 'embedding_failed')
+        mock_embeddings.assert_not_called()
+
     def test_clustering_failure_path(self):
         """Test clustering failure (lines 140-144)."""
         import numpy as np
@@ -0,0 +1,106 @@
+"""
+Tests for the cached ConfigSnapshot behind config.loader.get_config_value.
+"""
+
+import importlib.util
+import os
+import tempfile
+import unittest
+import yaml
+from unittest.mock import patch
+
+# Load loader.py directly: other suites replace sys.modules['loader'] with mocks
+_LOADER_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'loader.py')
+_spec = importlib.util.spec_from_file_location("config_loader_under_test", _LOADER_PATH)
+loader = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(loader)
+
+
+def _base_config(**overrides):
+    config = {
+        "sheet": "sheet123",
+        "scraper": {"handles": ["@one"], "daily_limit_per_channel": 10},
+        "rag": {"opensearch": {"enabled": True, "timeout_ms": 1500}, "dotted.key": 1},
+    }
+    config.update(overrides)
+    return config
+
+
+class TestConfigSnapshot(unittest.TestCase):
+    """Test snapshot caching, dotted index and invalidation."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.tmpdir.name, "settings.yaml")
+        self._write(_base_config())
+
+        self.path_patch = patch.object(loader, "DEFAULT_CONFIG_PATH", self.config_path)
+        self.path_patch.start()
+        loader._invalidate_snapshot()
+
+    def tearDown(self):
+        self.path_patch.stop()
+        loader._invalidate_snapshot()
+        self.tmpdir.cleanup()
+
+    def _write(self, config):
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            yaml.dump(config, f)
+
+    def test_lookup_matches_nested_walk(self):
+        self.assertEqual(loader.get_config_value("rag.opensearch.timeout_ms"), 1500)
+        self.assertEqual(loader.get_config_value("scraper.handles"), ["@one"])
+        self.assertEqual(loader.get_config_value("rag.missing.key", "fallback"), "fallback")
+        self.assertEqual(loader.get_config_value("rag.opensearch"), {"enabled": True, "timeout_ms": 1500})
+
+    def test_dotted_keys_are_not_indexed(self):
+        # key.split('.') can never reach a key containing a dot
+        self.assertIsNone(loader.get_config_value("rag.dotted.key"))
+
+    def test_file_parsed_once(self):
+        with patch.object(loader, "load_app_config", wraps=loader.load_app_config) as mock_load:
+            for _ in range(50):
+                loader.get_config_value("rag.opensearch.enabled")
+            self.assertEqual(mock_load.call_count, 1)
+
+    def test_returned_containers_are_copies(self):
+        handles = loader.get_config_value("scraper.handles")
+        handles.append("@mutated")
+        self.assertEqual(loader.get_config_value("scraper.handles"), ["@one"])
+
+    def test_mtime_change_invalidates(self):
+        self.assertEqual(loader.get_config_value("rag.opensearch.timeout_ms"), 1500)
+
+        config = _base_config()
+        config["rag"]["opensearch"]["timeout_ms"] = 900
+        self._write(config)
+        stat = os.stat(self.config_path)
+        os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        with patch.object(loader, "SNAPSHOT_MTIME_CHECK_INTERVAL_SEC", 0):
+            self.assertEqual(loader.get_config_value("rag.opensearch.timeout_ms"), 900)
+
+    def test_mtime_not_checked_within_interval(self):
+        loader.get_config_value("sheet")
+        with patch.object(loader, "SNAPSHOT_MTIME_CHECK_INTERVAL_SEC", 3600):
+            with patch("os.stat") as mock_stat:
+                loader.get_config_value("sheet")
+                mock_stat.assert_not_called()
+
+    def test_reload_config(self):
+        first = loader.get_config_snapshot()
+        config = _base_config(sheet="other_sheet")
+        self._write(config)
+
+        snapshot = loader.reload_config()
+        self.assertIsNot(first, snapshot)
+        self.assertEqual(loader.get_config_value("sheet"), "other_sheet")
+
+    def test_invalid_config_raises(self):
+        self._write(_base_config(sheet=""))
+        with self.assertRaises(loader.ConfigValidationError):
+            loader.reload_config()
+
+
+if __name__ == "__main__":
+    unittest.main()
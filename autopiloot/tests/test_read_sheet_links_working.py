@@ -47,7 +47,7 @@ class TestReadSheetLinksWorking(unittest.TestCase):
         self.assertIn("No sheet ID", data["error"])
         self.assertEqual(data["items"], [])
 
-    @patch('scraper_agent.tools.read_sheet_links.time.sleep')
+    @patch('time.sleep')
     @patch('scraper_agent.tools.read_sheet_links.build')
     @patch('scraper_agent.tools.read_sheet_links.Credentials.from_service_account_file')
     @patch('scraper_agent.tools.read_sheet_links.os.path.exists')
@@ -76,7 +76,7 @@ class TestReadSheetLinksWorking(unittest.TestCase):
         self.assertEqual(data["summary"]["total_rows"], 0)
         self.assertEqual(data["summary"]["pages_processed"], 0)
 
-    @patch('scraper_agent.tools.read_sheet_links.time.sleep')
+    @patch('time.sleep')
     @patch('bs4.BeautifulSoup')
     @patch('requests.get')
     @patch('scraper_agent.tools.read_sheet_links.build')
@@ -167,7 +167,7 @@ class TestReadSheetLinksWorking(unittest.TestCase):
         self.assertIsNone(tool._normalize_youtube_url(""))
         self.assertIsNone(tool._normalize_youtube_url("https://example.com"))
 
-    @patch('scraper_agent.tools.read_sheet_links.time.sleep')
+    @patch('time.sleep')
     @patch('bs4.BeautifulSoup')
     @patch('requests.get')
     @patch('scraper_agent.tools.read_sheet_links.build')
@@ -212,7 +212,7 @@ class TestReadSheetLinksWorking(unittest.TestCase):
         self.assertEqual(data["summary"]["processed_rows"], 2)
         self.assertEqual(data["summary"]["total_rows"], 3)
 
-    @patch('scraper_agent.tools.read_sheet_links.time.sleep')
+    @patch('time.sleep')
     @patch('bs4.BeautifulSoup')
     @patch('requests.get')
     @patch('scraper_agent.tools.read_sheet_links.build')
@@ -292,7 +292,7 @@ class TestReadSheetLinksWorking(unittest.TestCase):
         self.assertIn("error", data)
         self.assertIn("Failed to read sheet links", data["error"])
 
-    @patch('scraper_agent.tools.read_sheet_links.time.sleep')
+    @patch('time.sleep')
     @patch('scraper_agent.tools.read_sheet_links.build')
     @patch('scraper_agent.tools.read_sheet_links.Credentials.from_service_account_file')
     @patch('scraper_agent.tools.read_sheet_links.os.path.exists')
@@ -322,7 +322,7 @@ class TestReadSheetLinksWorking(unittest.TestCase):
         # Should have 1 failed page (invalid URL)
         self.assertEqual(data["summary"]["pages_failed"], 1)
 
-    @patch('scraper_agent.tools.read_sheet_links.time.sleep')
+    @patch('time.sleep')
     @patch('requests.get')
     @patch('scraper_agent.tools.read_sheet_links.build')
     @patch('scraper_agent.tools.read_sheet_links.Credentials.from_service_account_file')
@@ -359,7 +359,7 @@ class TestReadSheetLinksWorking(unittest.TestCase):
         self.assertEqual(data["summary"]["pages_failed"], 1)
         self.assertEqual(data["summary"]["pages_processed"], 0)
 
-    @patch('scraper_agent.tools.read_sheet_links.time.sleep')
+    @patch('time.sleep')
     @patch('bs4.BeautifulSoup')
     @patch('requests.get')
     @patch('scraper_agent.tools.read_sheet_links.build')
@@ -400,7 +400,7 @@ class TestReadSheetLinksWorking(unittest.TestCase):
         self.assertEqual(data["summary"]["pages_processed"], 1)
         self.assertGreater(len(data["items"]), 0)
 
-    @patch('scraper_agent.tools.read_sheet_links.time.sleep')
+    @patch('time.sleep')
     @patch('bs4.BeautifulSoup')
     @patch('requests.get')
     @patch('scraper_agent.tools.read_sheet_links.build')
@@ -98,9 +98,9 @@ class TestResolveChannelHandles100Coverage(unittest.TestCase):
         result = tool.run()
         data = json.loads(result)
 
-        self.assertIn('@TestChannel', data)
-        self.assertIsInstance(data['@TestChannel'], dict)
-        self.assertEqual(data['@TestChannel']['channel_id'], 'UC123456')
+        self.assertIn('@TestChannel', data['mappings'])
+        self.assertIsInstance(data['mappings']['@TestChannel'], dict)
+        self.assertEqual(data['mappings']['@TestChannel']['channel_id'], 'UC123456')
 
     @patch('scraper_agent.tools.resolve_channel_handles.get_config_value')
     @patch('scraper_agent.tools.resolve_channel_handles.load_app_config')
@@ -145,10 +145,10 @@ class TestResolveChannelHandles100Coverage(unittest.TestCase):
         result = tool.run()
         data = json.loads(result)
 
-        self.assertIsInstance(data['@Good'], dict)
-        self.assertEqual(data['@Good']['channel_id'], 'UC_GOOD')
-        self.assertIsInstance(data['@Bad'], dict)
-        self.assertIn('error', data['@Bad'])
+        self.assertIsInstance(data['mappings']['@Good'], dict)
+        self.assertEqual(data['mappings']['@Good']['channel_id'], 'UC_GOOD')
+        self.assertIsInstance(data['mappings']['@Bad'], dict)
+        self.assertIn('error', data['mappings']['@Bad'])
 
     @patch('scraper_agent.tools.resolve_channel_handles.load_app_config')
     def test_top_level_exception_handling(self, mock_config):
@@ -123,7 +123,7 @@ class RagIndexTranscript(BaseTool):
             # Optional: Write Firestore reference for audit/discovery (best-effort, never blocks)
             if result.get("status") in ["indexed", "partial"]:
                 try:
-                    from rag.refs import upsert_ref
+                    from rag.refs import flush_refs, upsert_ref
 
                     # Build reference document
                     ref = {
@@ -156,6 +156,8 @@ class RagIndexTranscript(BaseTool):
 
                     # Write reference (best-effort, never raises)
                     upsert_ref(ref)
+                    # Commit now rather than waiting for the buffer's size/interval/exit flush
+                    flush_refs(reason="ingest")
                 except Exception:
                     # Silently ignore ref write failures (best-effort only)
                     pass